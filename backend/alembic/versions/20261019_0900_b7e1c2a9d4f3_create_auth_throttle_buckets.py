@@ -0,0 +1,37 @@
+"""Create auth_throttle_buckets table
+
+Revision ID: b7e1c2a9d4f3
+Revises: a5b3c4d5e6f7
+Create Date: 2026-10-19 09:00:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e1c2a9d4f3"
+down_revision: Union[str, None] = "a5b3c4d5e6f7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "auth_throttle_buckets",
+        sa.Column("key", sa.String(length=320), nullable=False),
+        sa.Column("tokens", sa.Float(), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("key"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("auth_throttle_buckets")
@@ -0,0 +1,26 @@
+"""Add logo_key to business_profiles
+
+Revision ID: d4a9e2b7c1f8
+Revises: c3d8f1e2a7b6
+Create Date: 2026-10-19 09:30:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d4a9e2b7c1f8"
+down_revision: Union[str, None] = "c3d8f1e2a7b6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("business_profiles", sa.Column("logo_key", sa.String(length=500), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("business_profiles", "logo_key")
@@ -0,0 +1,56 @@
+"""Add integer cents columns to invoices and line_items
+
+Revision ID: e8b2f4c6a1d3
+Revises: d4a9e2b7c1f8
+Create Date: 2026-10-19 09:45:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e8b2f4c6a1d3"
+down_revision: Union[str, None] = "d4a9e2b7c1f8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Stored generated columns: Postgres backfills existing rows and keeps
+    # them in step with every write path, including raw SQL and COPY.
+    op.add_column(
+        "invoices",
+        sa.Column(
+            "tax_rate_bps",
+            sa.Integer(),
+            sa.Computed("CAST(ROUND(tax_rate * 100) AS INTEGER)", persisted=True),
+            nullable=True,
+        ),
+    )
+    op.add_column(
+        "line_items",
+        sa.Column(
+            "quantity_hundredths",
+            sa.BigInteger(),
+            sa.Computed("CAST(ROUND(quantity * 100) AS BIGINT)", persisted=True),
+            nullable=True,
+        ),
+    )
+    op.add_column(
+        "line_items",
+        sa.Column(
+            "unit_price_cents",
+            sa.BigInteger(),
+            sa.Computed("CAST(ROUND(unit_price * 100) AS BIGINT)", persisted=True),
+            nullable=True,
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("line_items", "unit_price_cents")
+    op.drop_column("line_items", "quantity_hundredths")
+    op.drop_column("invoices", "tax_rate_bps")
@@ -0,0 +1,41 @@
+"""Add composite indexes for invoice list filters
+
+Revision ID: f1c7a3e9b2d5
+Revises: e8b2f4c6a1d3
+Create Date: 2026-10-19 10:00:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f1c7a3e9b2d5"
+down_revision: Union[str, None] = "e8b2f4c6a1d3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_invoices_user_id_created_at", "invoices", ["user_id", "created_at"], unique=False
+    )
+    op.create_index(
+        "ix_invoices_user_id_status_created_at",
+        "invoices",
+        ["user_id", "status", "created_at"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_invoices_user_id_trade_type_created_at",
+        "invoices",
+        ["user_id", "trade_type", "created_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_invoices_user_id_trade_type_created_at", table_name="invoices")
+    op.drop_index("ix_invoices_user_id_status_created_at", table_name="invoices")
+    op.drop_index("ix_invoices_user_id_created_at", table_name="invoices")
@@ -0,0 +1,82 @@
+"""Add full-text and trigram search indexes for invoices and line items
+
+Revision ID: a2d8e4f0c6b1
+Revises: f1c7a3e9b2d5
+Create Date: 2026-10-19 10:15:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "a2d8e4f0c6b1"
+down_revision: Union[str, None] = "f1c7a3e9b2d5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # Generated tsvector columns, kept current by Postgres on every write.
+    # The 'simple' config does no stemming, which suits names and addresses.
+    op.add_column(
+        "invoices",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "to_tsvector('simple', coalesce(client_name, '') || ' ' || "
+                "coalesce(client_email, '') || ' ' || coalesce(job_address, ''))",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+    op.add_column(
+        "line_items",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed("to_tsvector('simple', description)", persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_invoices_search_vector",
+        "invoices",
+        ["search_vector"],
+        unique=False,
+        postgresql_using="gin",
+    )
+    op.create_index(
+        "ix_line_items_search_vector",
+        "line_items",
+        ["search_vector"],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+    # Trigram indexes for fragments in the middle of a word (ILIKE '%...%').
+    # The invoice expression must match app.search.INVOICE_SEARCH_TEXT.
+    op.execute(
+        "CREATE INDEX ix_invoices_search_trgm ON invoices USING gin "
+        "((client_name || ' ' || client_email || ' ' || job_address) gin_trgm_ops)"
+    )
+    op.execute(
+        "CREATE INDEX ix_line_items_description_trgm ON line_items USING gin "
+        "(description gin_trgm_ops)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_line_items_description_trgm", table_name="line_items")
+    op.drop_index("ix_invoices_search_trgm", table_name="invoices")
+    op.drop_index("ix_line_items_search_vector", table_name="line_items")
+    op.drop_index("ix_invoices_search_vector", table_name="invoices")
+    op.drop_column("line_items", "search_vector")
+    op.drop_column("invoices", "search_vector")
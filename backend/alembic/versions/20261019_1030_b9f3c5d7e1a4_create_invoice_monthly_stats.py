@@ -0,0 +1,78 @@
+"""Create invoice_monthly_stats rollup table
+
+Revision ID: b9f3c5d7e1a4
+Revises: a2d8e4f0c6b1
+Create Date: 2026-10-19 10:30:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "b9f3c5d7e1a4"
+down_revision: Union[str, None] = "a2d8e4f0c6b1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "invoice_monthly_stats",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("month", sa.Date(), nullable=False),
+        sa.Column(
+            "status",
+            postgresql.ENUM("draft", "sent", "paid", name="invoicestatus", create_type=False),
+            nullable=False,
+        ),
+        sa.Column(
+            "trade_type",
+            postgresql.ENUM("plumbing", "electrical", "hvac", name="tradetype", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("invoice_count", sa.Integer(), nullable=False),
+        sa.Column("total_cents", sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("user_id", "month", "status", "trade_type"),
+    )
+
+    # Backfill from existing invoices, rounding totals exactly as app.money
+    # does: subtotal and tax each rounded half up, then added.
+    # `python -m app.commands.rebuild_stats` recomputes the same rows.
+    op.execute("""
+        INSERT INTO invoice_monthly_stats (user_id, month, status, trade_type, invoice_count, total_cents)
+        SELECT user_id, month, status, trade_type, count(*), sum(total_cents)
+        FROM (
+            SELECT
+                user_id,
+                month,
+                status,
+                trade_type,
+                (floor((exact + 50) / 100) + floor((exact * tax_rate_bps + 500000) / 1000000))::bigint
+                    AS total_cents
+            FROM (
+                SELECT
+                    i.user_id,
+                    date_trunc('month', i.created_at AT TIME ZONE 'UTC')::date AS month,
+                    i.status,
+                    i.trade_type,
+                    i.tax_rate_bps,
+                    coalesce(sum(li.quantity_hundredths::numeric * li.unit_price_cents), 0) AS exact
+                FROM invoices i
+                LEFT JOIN line_items li ON li.invoice_id = i.id
+                GROUP BY i.id
+            ) AS invoice_subtotals
+        ) AS invoice_totals
+        GROUP BY user_id, month, status, trade_type
+        """)
+
+
+def downgrade() -> None:
+    op.drop_table("invoice_monthly_stats")
@@ -0,0 +1,28 @@
+"""Add version column to invoices for optimistic concurrency
+
+Revision ID: c4e6a8b0d2f5
+Revises: b9f3c5d7e1a4
+Create Date: 2026-10-19 10:45:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c4e6a8b0d2f5"
+down_revision: Union[str, None] = "b9f3c5d7e1a4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "invoices", sa.Column("version", sa.Integer(), server_default="1", nullable=False)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("invoices", "version")
@@ -0,0 +1,81 @@
+"""Add invoice change sequence, counters and tombstones for delta sync
+
+Revision ID: d7a9c1e3f5b7
+Revises: c4e6a8b0d2f5
+Create Date: 2026-10-19 11:00:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d7a9c1e3f5b7"
+down_revision: Union[str, None] = "c4e6a8b0d2f5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "invoices", sa.Column("change_seq", sa.BigInteger(), server_default="0", nullable=False)
+    )
+    op.create_table(
+        "invoice_change_counters",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("last_seq", sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+    op.create_table(
+        "invoice_tombstones",
+        sa.Column("invoice_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("change_seq", sa.BigInteger(), nullable=False),
+        sa.Column(
+            "deleted_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("invoice_id"),
+    )
+
+    # Number existing invoices 1..n per user, oldest first, so a first sync
+    # from 0 returns them, and start each user's counter after them
+    op.execute("""
+        UPDATE invoices SET change_seq = numbered.seq
+        FROM (
+            SELECT id, row_number() OVER (PARTITION BY user_id ORDER BY id) AS seq
+            FROM invoices
+        ) AS numbered
+        WHERE invoices.id = numbered.id
+        """)
+    op.execute("""
+        INSERT INTO invoice_change_counters (user_id, last_seq)
+        SELECT user_id, max(change_seq) FROM invoices GROUP BY user_id
+        """)
+
+    op.create_index(
+        "ix_invoices_user_id_change_seq", "invoices", ["user_id", "change_seq"], unique=False
+    )
+    op.create_index(
+        "ix_invoice_tombstones_user_id_change_seq",
+        "invoice_tombstones",
+        ["user_id", "change_seq"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_invoice_tombstones_user_id_change_seq", table_name="invoice_tombstones")
+    op.drop_index("ix_invoices_user_id_change_seq", table_name="invoices")
+    op.drop_table("invoice_tombstones")
+    op.drop_table("invoice_change_counters")
+    op.drop_column("invoices", "change_seq")
@@ -0,0 +1,29 @@
+"""Allow idempotency keys claimed by a request that hasn't finished
+
+Revision ID: f3c5e7a9b1d4
+Revises: e2b4d6f8a0c3
+Create Date: 2026-10-19 11:30:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f3c5e7a9b1d4"
+down_revision: Union[str, None] = "e2b4d6f8a0c3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.alter_column("idempotency_keys", "status_code", existing_type=sa.Integer(), nullable=True)
+    op.alter_column("idempotency_keys", "response", existing_type=sa.Text(), nullable=True)
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM idempotency_keys WHERE status_code IS NULL")
+    op.alter_column("idempotency_keys", "response", existing_type=sa.Text(), nullable=False)
+    op.alter_column("idempotency_keys", "status_code", existing_type=sa.Integer(), nullable=False)
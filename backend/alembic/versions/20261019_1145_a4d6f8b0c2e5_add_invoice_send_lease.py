@@ -0,0 +1,26 @@
+"""Add invoice send lease so only one request sends an invoice
+
+Revision ID: a4d6f8b0c2e5
+Revises: f3c5e7a9b1d4
+Create Date: 2026-10-19 11:45:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a4d6f8b0c2e5"
+down_revision: Union[str, None] = "f3c5e7a9b1d4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("invoices", sa.Column("sending_until", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("invoices", "sending_until")
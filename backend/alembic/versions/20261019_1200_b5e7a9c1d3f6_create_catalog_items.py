@@ -0,0 +1,84 @@
+"""Create catalog_items and learn them from existing line items
+
+Revision ID: b5e7a9c1d3f6
+Revises: a4d6f8b0c2e5
+Create Date: 2026-10-19 12:00:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "b5e7a9c1d3f6"
+down_revision: Union[str, None] = "a4d6f8b0c2e5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "catalog_items",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("description", sa.String(length=500), nullable=False),
+        sa.Column("unit_price", sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column(
+            "category",
+            postgresql.ENUM("parts", "labor", name="lineitemcategory", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("use_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("last_used_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True
+        ),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "user_id",
+            "description",
+            "category",
+            name="uq_catalog_items_user_id_description_category",
+        ),
+    )
+    op.create_index(op.f("ix_catalog_items_id"), "catalog_items", ["id"], unique=False)
+
+    # One item per description and category already billed, at the price it
+    # was billed at most recently
+    op.execute("""
+        INSERT INTO catalog_items (user_id, description, unit_price, category, use_count, last_used_at)
+        SELECT user_id, description, unit_price, category, use_count, last_used_at
+        FROM (
+            SELECT
+                invoices.user_id,
+                btrim(line_items.description) AS description,
+                line_items.unit_price,
+                line_items.category,
+                count(*) OVER learned AS use_count,
+                max(invoices.created_at) OVER learned AS last_used_at,
+                row_number() OVER (
+                    PARTITION BY invoices.user_id, btrim(line_items.description), line_items.category
+                    ORDER BY invoices.created_at DESC, line_items.id DESC
+                ) AS recency
+            FROM line_items
+            JOIN invoices ON invoices.id = line_items.invoice_id
+            WHERE btrim(line_items.description) <> ''
+            WINDOW learned AS (
+                PARTITION BY invoices.user_id, btrim(line_items.description), line_items.category
+            )
+        ) AS billed
+        WHERE recency = 1
+        """)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_catalog_items_id"), table_name="catalog_items")
+    op.drop_table("catalog_items")
@@ -0,0 +1,112 @@
+"""Create recurring_invoices and invoice_send_queue
+
+Revision ID: c6f8b0d2e4a7
+Revises: b5e7a9c1d3f6
+Create Date: 2026-10-19 12:15:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c6f8b0d2e4a7"
+down_revision: Union[str, None] = "b5e7a9c1d3f6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "recurring_invoices",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("template_invoice_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "frequency",
+            sa.Enum("weekly", "monthly", "quarterly", "yearly", name="recurrencefrequency"),
+            nullable=False,
+        ),
+        sa.Column("anchor_day", sa.Integer(), nullable=False),
+        sa.Column("next_run_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("active", sa.Boolean(), server_default=sa.text("true"), nullable=False),
+        sa.Column("auto_send", sa.Boolean(), server_default=sa.text("false"), nullable=False),
+        sa.Column("last_run_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_invoice_id", sa.Integer(), nullable=True),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True
+        ),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["template_invoice_id"],
+            ["invoices.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_recurring_invoices_id"), "recurring_invoices", ["id"], unique=False)
+    op.create_index(
+        op.f("ix_recurring_invoices_user_id"), "recurring_invoices", ["user_id"], unique=False
+    )
+    op.create_index(
+        op.f("ix_recurring_invoices_template_invoice_id"),
+        "recurring_invoices",
+        ["template_invoice_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_recurring_invoices_next_run_at",
+        "recurring_invoices",
+        ["next_run_at"],
+        unique=False,
+        postgresql_where=sa.text("active"),
+    )
+
+    op.create_table(
+        "invoice_send_queue",
+        sa.Column("invoice_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("available_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("attempts", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column(
+            "queued_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True
+        ),
+        sa.ForeignKeyConstraint(
+            ["invoice_id"],
+            ["invoices.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("invoice_id"),
+    )
+    op.create_index(
+        op.f("ix_invoice_send_queue_available_at"),
+        "invoice_send_queue",
+        ["available_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_invoice_send_queue_available_at"), table_name="invoice_send_queue")
+    op.drop_table("invoice_send_queue")
+    op.drop_index(
+        "ix_recurring_invoices_next_run_at",
+        table_name="recurring_invoices",
+        postgresql_where=sa.text("active"),
+    )
+    op.drop_index(
+        op.f("ix_recurring_invoices_template_invoice_id"), table_name="recurring_invoices"
+    )
+    op.drop_index(op.f("ix_recurring_invoices_user_id"), table_name="recurring_invoices")
+    op.drop_index(op.f("ix_recurring_invoices_id"), table_name="recurring_invoices")
+    op.drop_table("recurring_invoices")
+    sa.Enum(name="recurrencefrequency").drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,80 @@
+"""Add invoice due dates and payment reminders
+
+Revision ID: d7a9c1e3f5b8
+Revises: c6f8b0d2e4a7
+Create Date: 2026-10-19 12:30:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d7a9c1e3f5b8"
+down_revision: Union[str, None] = "c6f8b0d2e4a7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Left empty on existing invoices, so clients aren't sent reminders for
+    # invoices that went out before due dates existed
+    op.add_column("invoices", sa.Column("due_date", sa.Date(), nullable=True))
+    op.create_index(
+        "ix_invoices_due_date_sent",
+        "invoices",
+        ["due_date"],
+        unique=False,
+        postgresql_where=sa.text("status = 'sent'"),
+    )
+
+    op.create_table(
+        "invoice_reminders",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("invoice_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("stage", sa.Integer(), nullable=False),
+        sa.Column("available_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("attempts", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("sent_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True
+        ),
+        sa.ForeignKeyConstraint(
+            ["invoice_id"],
+            ["invoices.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("invoice_id", "stage", name="uq_invoice_reminders_invoice_id_stage"),
+    )
+    op.create_index(op.f("ix_invoice_reminders_id"), "invoice_reminders", ["id"], unique=False)
+    op.create_index(
+        "ix_invoice_reminders_available_at",
+        "invoice_reminders",
+        ["available_at"],
+        unique=False,
+        postgresql_where=sa.text("sent_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_invoice_reminders_available_at",
+        table_name="invoice_reminders",
+        postgresql_where=sa.text("sent_at IS NULL"),
+    )
+    op.drop_index(op.f("ix_invoice_reminders_id"), table_name="invoice_reminders")
+    op.drop_table("invoice_reminders")
+    op.drop_index(
+        "ix_invoices_due_date_sent",
+        table_name="invoices",
+        postgresql_where=sa.text("status = 'sent'"),
+    )
+    op.drop_column("invoices", "due_date")
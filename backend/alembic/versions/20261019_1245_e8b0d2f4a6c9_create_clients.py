@@ -0,0 +1,116 @@
+"""Create clients, backfilled from invoices, and link invoices to them
+
+Revision ID: e8b0d2f4a6c9
+Revises: d7a9c1e3f5b8
+Create Date: 2026-10-19 12:45:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e8b0d2f4a6c9"
+down_revision: Union[str, None] = "d7a9c1e3f5b8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _key(column: str) -> str:
+    """SQL for app.services.clients.normalize: lowercase, whitespace collapsed."""
+    return f"lower(btrim(regexp_replace({column}, '\\s+', ' ', 'g')))"
+
+
+def upgrade() -> None:
+    op.create_table(
+        "clients",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.Column("email", sa.String(length=255), nullable=False),
+        sa.Column("address", sa.String(length=500), nullable=False),
+        sa.Column("name_key", sa.String(length=255), nullable=False),
+        sa.Column("email_key", sa.String(length=255), nullable=False),
+        sa.Column("address_key", sa.String(length=500), nullable=False),
+        sa.Column("last_invoiced_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True
+        ),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "user_id",
+            "name_key",
+            "email_key",
+            "address_key",
+            name="uq_clients_user_id_name_key_email_key_address_key",
+        ),
+    )
+    op.add_column("invoices", sa.Column("client_id", sa.Integer(), nullable=True))
+    op.create_foreign_key("invoices_client_id_fkey", "invoices", "clients", ["client_id"], ["id"])
+
+    # One client per distinct normalized name, email and address, spelled as
+    # on their latest invoice
+    op.execute(f"""
+        INSERT INTO clients (user_id, name, email, address, name_key, email_key, address_key, last_invoiced_at)
+        SELECT DISTINCT ON (user_id, name_key, email_key, address_key)
+            user_id, btrim(client_name), btrim(client_email), btrim(job_address),
+            name_key, email_key, address_key,
+            max(created_at) OVER (PARTITION BY user_id, name_key, email_key, address_key)
+        FROM (
+            SELECT
+                invoices.*,
+                {_key('client_name')} AS name_key,
+                {_key('client_email')} AS email_key,
+                {_key('job_address')} AS address_key
+            FROM invoices
+        ) AS keyed
+        ORDER BY user_id, name_key, email_key, address_key, created_at DESC, id DESC
+        """)
+    op.execute(f"""
+        UPDATE invoices SET client_id = clients.id
+        FROM clients
+        WHERE clients.user_id = invoices.user_id
+          AND clients.name_key = {_key('invoices.client_name')}
+          AND clients.email_key = {_key('invoices.client_email')}
+          AND clients.address_key = {_key('invoices.job_address')}
+        """)
+
+    op.create_index(op.f("ix_clients_id"), "clients", ["id"], unique=False)
+    op.create_index(
+        "ix_clients_user_id_name_key",
+        "clients",
+        ["user_id", "name_key"],
+        unique=False,
+        postgresql_ops={"name_key": "text_pattern_ops"},
+    )
+    op.create_index(
+        "ix_clients_user_id_email_key",
+        "clients",
+        ["user_id", "email_key"],
+        unique=False,
+        postgresql_ops={"email_key": "text_pattern_ops"},
+    )
+    # Later words of a name: LIKE '% word%'
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE INDEX ix_clients_name_key_trgm ON clients USING gin (name_key gin_trgm_ops)")
+    op.create_index(
+        "ix_invoices_client_id_created_at", "invoices", ["client_id", "created_at"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_invoices_client_id_created_at", table_name="invoices")
+    op.drop_index("ix_clients_name_key_trgm", table_name="clients")
+    op.drop_index("ix_clients_user_id_email_key", table_name="clients")
+    op.drop_index("ix_clients_user_id_name_key", table_name="clients")
+    op.drop_index(op.f("ix_clients_id"), table_name="clients")
+    op.drop_constraint("invoices_client_id_fkey", "invoices", type_="foreignkey")
+    op.drop_column("invoices", "client_id")
+    op.drop_table("clients")
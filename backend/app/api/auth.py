@@ -1,104 +1,201 @@
 """Authentication API endpoints."""
+
 from datetime import timedelta
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
-from app.core.config import settings
 from app.core.auth import (
-    verify_password,
-    get_password_hash,
     create_access_token,
     decode_access_token,
+    issue_refresh_token,
+    revoke_access_token,
+    revoke_refresh_token,
+    rotate_refresh_token,
 )
+from app.core.config import settings
 from app.core.database import get_db
-from app.models import User, BusinessProfile
+from app.core.hashing import PasswordHasherBusyError, password_hasher
+from app.core.rate_limit import auth_throttle
+from app.core.revocation import revocation_list
+from app.models import User
 from app.schemas import (
-    UserCreate,
-    UserLogin,
+    RefreshTokenRequest,
     Token,
+    UserCreate,
     UserResponse,
-    BusinessProfileCreate,
-    BusinessProfileResponse,
 )
+from app.services.catalog import catalog_index
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
-) -> User:
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
     """Get the current authenticated user from JWT token."""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
+
     payload = decode_access_token(token)
-    if payload is None:
+    if payload is None or revocation_list.is_revoked(payload.get("jti")):
         raise credentials_exception
-    
+
     user_id: Optional[int] = payload.get("sub")
     if user_id is None:
         raise credentials_exception
-    
+
     user = db.query(User).filter(User.id == user_id).first()
     if user is None:
         raise credentials_exception
-    
+
     return user
 
 
+def _hasher_busy_exception() -> HTTPException:
+    """Error returned when the password hashing queue is saturated."""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Server is busy. Please try again shortly.",
+        headers={"Retry-After": "1"},
+    )
+
+
+def _issue_tokens(user_id: int, refresh_token: str) -> Token:
+    """Build the token response for a freshly authenticated user."""
+    access_token_expires = timedelta(minutes=settings.JWT_EXPIRE_MINUTES)
+    access_token = create_access_token(data={"sub": user_id}, expires_delta=access_token_expires)
+    return Token(
+        access_token=access_token,
+        token_type="bearer",
+        expires_in=int(access_token_expires.total_seconds()),
+        refresh_token=refresh_token,
+    )
+
+
+def _find_user(db: Session, email: str) -> Optional[User]:
+    """Look up a user by email."""
+    return db.query(User).filter(User.email == email).first()
+
+
+def _create_user(db: Session, email: str, hashed_password: str) -> User:
+    """Insert a newly registered user."""
+    new_user = User(email=email, hashed_password=hashed_password)
+    db.add(new_user)
+    db.commit()
+    db.refresh(new_user)
+    return new_user
+
+
+def _complete_login(db: Session, user: User, new_hash: Optional[str]) -> Token:
+    """Store an upgraded password hash if there is one and issue tokens."""
+    # Cost parameters changed since this hash was made; store the upgraded hash
+    if new_hash:
+        user.hashed_password = new_hash
+        db.commit()
+    return _issue_tokens(user.id, issue_refresh_token(db, user.id))
+
+
+# register and login are async so waiting on bcrypt doesn't hold a request
+# thread. Their database work is synchronous, so it's pushed to the threadpool
+# rather than stalling the event loop.
+
+
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register(user_data: UserCreate, db: Session = Depends(get_db)) -> User:
+async def register(user_data: UserCreate, request: Request, db: Session = Depends(get_db)) -> User:
     """Register a new user with email and password."""
+    await run_in_threadpool(
+        auth_throttle.check,
+        db,
+        request.client.host if request.client else None,
+        user_data.email,
+    )
+
     # Check if user already exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
-    if existing_user:
+    if await run_in_threadpool(_find_user, db, user_data.email):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered",
         )
-    
+
     # Hash password and create user
-    pw_hash = get_password_hash(user_data.password)
-    new_user = User(
-        email=user_data.email,
-        hashed_password=pw_hash,
-    )
-    
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
-    
-    return new_user
+    try:
+        pw_hash = await password_hasher.hash(user_data.password)
+    except PasswordHasherBusyError:
+        raise _hasher_busy_exception()
+
+    return await run_in_threadpool(_create_user, db, user_data.email, pw_hash)
 
 
 @router.post("/login", response_model=Token)
-def login(
-    form_data: OAuth2PasswordRequestForm = Depends(), 
-    db: Session = Depends(get_db)
+async def login(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: Session = Depends(get_db),
 ) -> Token:
     """Login with email and password, returns JWT token."""
+    ip = request.client.host if request.client else None
+    await run_in_threadpool(auth_throttle.check, db, ip, form_data.username, True)
+
     # Find user by email (OAuth2PasswordRequestForm uses username field for email)
-    user = db.query(User).filter(User.email == form_data.username).first()
-    
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    user = await run_in_threadpool(_find_user, db, form_data.username)
+
+    try:
+        if user:
+            verified, new_hash = await password_hasher.verify_and_update(
+                form_data.password, user.hashed_password
+            )
+        else:
+            await password_hasher.dummy_verify()
+            verified, new_hash = False, None
+    except PasswordHasherBusyError:
+        raise _hasher_busy_exception()
+
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    
-    # Create access token
-    access_token_expires = timedelta(minutes=settings.JWT_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": user.id}, expires_delta=access_token_expires
-    )
-    
-    return Token(access_token=access_token, token_type="bearer")
+
+    # Have line item suggestions ready before the first invoice is typed
+    background_tasks.add_task(catalog_index.warm_in_background, db.get_bind(), user.id)
+
+    await run_in_threadpool(auth_throttle.succeeded, db, ip, form_data.username, True)
+    return await run_in_threadpool(_complete_login, db, user, new_hash)
+
+
+@router.post("/refresh", response_model=Token)
+def refresh(token_data: RefreshTokenRequest, db: Session = Depends(get_db)) -> Token:
+    """Exchange a refresh token for a new access token and refresh token."""
+    rotated = rotate_refresh_token(db, token_data.refresh_token)
+    if rotated is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    user_id, refresh_token = rotated
+    return _issue_tokens(user_id, refresh_token)
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+def logout(
+    token_data: Optional[RefreshTokenRequest] = None,
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db),
+) -> None:
+    """Revoke the current access token and, if given, its refresh token."""
+    payload = decode_access_token(token)
+    if payload is not None:
+        revoke_access_token(db, payload)
+    if token_data is not None:
+        revoke_refresh_token(db, token_data.refresh_token)
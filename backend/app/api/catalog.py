@@ -0,0 +1,136 @@
+"""Line item catalog API endpoints."""
+
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.auth import get_current_user
+from app.core.database import get_db
+from app.models.catalog_item import CatalogItem
+from app.models.line_item import LineItemCategory
+from app.models.user import User
+from app.schemas.catalog import (
+    CatalogItemCreate,
+    CatalogItemResponse,
+    CatalogItemUpdate,
+    CatalogSuggestion,
+)
+from app.serialization import json_response
+from app.services.catalog import CatalogEntry, catalog_index, index_after_commit
+
+router = APIRouter(prefix="/catalog", tags=["Catalog"])
+
+
+def _get_item(db: Session, user_id: int, item_id: int) -> CatalogItem:
+    item = (
+        db.query(CatalogItem)
+        .filter(CatalogItem.id == item_id, CatalogItem.user_id == user_id)
+        .first()
+    )
+    if not item:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Catalog item not found",
+        )
+    return item
+
+
+def _save(db: Session, item: CatalogItem) -> CatalogItem:
+    """Flush an added or edited item and commit it, keeping the index in step."""
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="An item with this description and category is already in the catalog",
+        )
+    index_after_commit(db, item.user_id, [CatalogEntry.from_row(item)])
+    db.commit()
+    db.refresh(item)
+    return item
+
+
+@router.get("", response_model=List[CatalogItemResponse])
+async def list_catalog_items(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """List the user's saved parts and labor rates, alphabetically."""
+    items = (
+        db.query(CatalogItem)
+        .filter(CatalogItem.user_id == current_user.id)
+        .order_by(CatalogItem.description, CatalogItem.id)
+        .all()
+    )
+    return json_response(List[CatalogItemResponse], items, from_attributes=True)
+
+
+# Sync so a cold or expired index is rebuilt on the threadpool, not the event loop
+@router.get("/suggest", response_model=List[CatalogSuggestion])
+def suggest_catalog_items(
+    prefix: str = Query(..., min_length=1, max_length=100),
+    category: Optional[LineItemCategory] = None,
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Suggest catalog items while a line item is typed.
+
+    Matches items with a word starting with ``prefix`` (case-insensitive),
+    most used first. Served from memory; see app.services.catalog.
+    """
+    prefix = prefix.lstrip()
+    entries = catalog_index.suggest(db, current_user.id, prefix, limit, category) if prefix else []
+    return json_response(List[CatalogSuggestion], entries, from_attributes=True)
+
+
+@router.post("", response_model=CatalogItemResponse, status_code=status.HTTP_201_CREATED)
+async def create_catalog_item(
+    item_data: CatalogItemCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Save a part or labor rate to the catalog."""
+    item = CatalogItem(
+        user_id=current_user.id,
+        description=item_data.description.strip(),
+        unit_price=item_data.unit_price,
+        category=item_data.category,
+    )
+    db.add(item)
+    return _save(db, item)
+
+
+@router.put("/{item_id}", response_model=CatalogItemResponse)
+async def update_catalog_item(
+    item_id: int,
+    item_data: CatalogItemUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Edit a catalog item."""
+    item = _get_item(db, current_user.id, item_id)
+    item.description = item_data.description.strip()
+    item.unit_price = item_data.unit_price
+    item.category = item_data.category
+    return _save(db, item)
+
+
+@router.delete("/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_catalog_item(
+    item_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Remove an item from the catalog.
+
+    It is learned again if a later line item uses it.
+    """
+    item = _get_item(db, current_user.id, item_id)
+    db.delete(item)
+    index_after_commit(db, current_user.id, removed=[item_id])
+    db.commit()
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,102 @@
+"""Client directory API endpoints."""
+
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import case, desc, func, select
+from sqlalchemy.orm import Session
+
+from app.api.invoices import invoice_list_query
+from app.core.auth import get_current_user
+from app.core.database import get_db
+from app.models.client import Client
+from app.models.invoice import Invoice, InvoiceStatus
+from app.models.user import User
+from app.schemas.client import ClientDetail, ClientResponse
+from app.schemas.invoice import InvoiceListResponse
+from app.serialization import json_response
+from app.services.clients import match_prefix
+
+router = APIRouter(prefix="/clients", tags=["Clients"])
+
+
+def _get_client(db: Session, user_id: int, client_id: int) -> Client:
+    client = db.query(Client).filter(Client.id == client_id, Client.user_id == user_id).first()
+    if not client:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Client not found",
+        )
+    return client
+
+
+@router.get("", response_model=List[ClientResponse])
+async def list_clients(
+    prefix: Optional[str] = Query(None, max_length=255),
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """List the user's clients, most recently invoiced first.
+
+    With ``prefix``, only clients whose name, a word of their name, or
+    email starts with it (case-insensitive), for autocomplete.
+    """
+    query = db.query(Client).filter(Client.user_id == current_user.id)
+    if prefix and prefix.strip():
+        query = query.filter(match_prefix(prefix))
+    clients = (
+        query.order_by(desc(Client.last_invoiced_at), Client.name, Client.id).limit(limit).all()
+    )
+    return json_response(List[ClientResponse], clients, from_attributes=True)
+
+
+@router.get("/{client_id}", response_model=ClientDetail)
+async def get_client(
+    client_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Get a client with totals over their invoices."""
+    client = _get_client(db, current_user.id, client_id)
+
+    query, _ = invoice_list_query(db, current_user.id)
+    invoices = query.filter(Invoice.client_id == client_id).group_by(Invoice.id).subquery()
+    billed = case((invoices.c.status != InvoiceStatus.DRAFT, invoices.c.total), else_=0)
+    paid = case((invoices.c.status == InvoiceStatus.PAID, invoices.c.total), else_=0)
+    outstanding = case((invoices.c.status == InvoiceStatus.SENT, invoices.c.total), else_=0)
+    totals = db.execute(
+        select(
+            func.count(),
+            func.coalesce(func.sum(billed), 0),
+            func.coalesce(func.sum(paid), 0),
+            func.coalesce(func.sum(outstanding), 0),
+        ).select_from(invoices)
+    ).one()
+
+    return ClientDetail(
+        **ClientResponse.model_validate(client).model_dump(),
+        invoice_count=totals[0],
+        billed=float(totals[1]),
+        paid=float(totals[2]),
+        outstanding=float(totals[3]),
+    )
+
+
+@router.get("/{client_id}/invoices", response_model=List[InvoiceListResponse])
+async def list_client_invoices(
+    client_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """List a client's invoices, newest first."""
+    _get_client(db, current_user.id, client_id)
+    query, _ = invoice_list_query(db, current_user.id)
+    rows = (
+        # Follows ix_invoices_client_id_created_at
+        query.filter(Invoice.client_id == client_id)
+        .group_by(Invoice.id)
+        .order_by(desc(Invoice.created_at), desc(Invoice.id))
+        .all()
+    )
+    return json_response(List[InvoiceListResponse], rows, from_attributes=True)
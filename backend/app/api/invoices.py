@@ -1,58 +1,239 @@
 """Invoice API endpoints."""
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+
+import csv
+import io
+import tempfile
+from dataclasses import replace
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    UploadFile,
+    status,
+)
+from fastapi.responses import Response, StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy import asc, bindparam, delete, desc, func, insert, literal, select, update
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
 
-from app.core.database import get_db
 from app.core.auth import get_current_user
+from app.core.config import settings
+from app.core.database import get_db
+from app.etags import cache_headers, etag_matches, make_etag, not_modified
+from app.models.invoice import STATUS_TRANSITIONS, Invoice, InvoiceStatus, TradeType
+from app.models.invoice_change import InvoiceTombstone
+from app.models.invoice_reminder import InvoiceReminder
+from app.models.invoice_stats import InvoiceMonthlyStats
+from app.models.line_item import LineItem
+from app.models.recurring_invoice import QueuedSend, RecurringInvoice
 from app.models.user import User
-from app.models.invoice import Invoice, InvoiceStatus, TradeType
-from app.models.line_item import LineItem, LineItemCategory
-from app.models.business_profile import BusinessProfile
+from app.money import (
+    TotalsBatch,
+    cents_to_float,
+    compute_invoice_totals,
+    compute_totals,
+    to_cents,
+    to_hundredths,
+)
+from app.pdf_generator import pdf_generator
 from app.schemas.invoice import (
+    ExportFormat,
+    InvoiceBulkCreate,
+    InvoiceBulkItemResult,
+    InvoiceBulkResponse,
+    InvoiceBulkStatusResponse,
+    InvoiceBulkStatusUpdate,
+    InvoiceChanges,
+    InvoiceClone,
     InvoiceCreate,
-    InvoiceUpdate,
-    InvoiceStatusUpdate,
-    InvoiceResponse,
+    InvoiceImportReport,
     InvoiceListResponse,
+    InvoiceReminderResponse,
+    InvoiceResponse,
+    InvoiceSort,
+    InvoiceStats,
+    InvoiceStatusUpdate,
     InvoiceTotals,
+    InvoiceUpdate,
     LineItemSummary,
+    MonthStats,
+    StatusStats,
+    TradeStats,
 )
-from app.pdf_generator import pdf_generator
-from app.services.storage import r2_storage
+from app.search import matching_invoice_ids
+from app.serialization import json_response, type_adapter
+from app.services import catalog, clients, invoice_changes, invoice_stats
 from app.services.email import email_service
+from app.services.idempotency import idempotency_store, request_fingerprint
+from app.services.invoice_export import MEDIA_TYPES, stream_export
+from app.services.invoice_import import InvalidImportFileError, InvoiceImporter
+from app.services.profile_cache import profile_cache
+from app.services.storage import r2_storage
 
 router = APIRouter(prefix="/invoices", tags=["invoices"])
 
 
 def calculate_invoice_totals(invoice: Invoice) -> InvoiceTotals:
-    """Calculate totals for an invoice."""
-    category_totals = {}
-    subtotal = 0.0
-
-    for item in invoice.line_items:
-        line_total = item.line_total
-        subtotal += line_total
-        category = item.category.value
-        category_totals[category] = category_totals.get(category, 0) + line_total
-
-    tax_amount = subtotal * (float(invoice.tax_rate) / 100)
-    total = subtotal + tax_amount
+    """Calculate totals for an invoice (exact, via integer cents)."""
+    totals = compute_invoice_totals([invoice])[0]
 
     breakdown = [
-        LineItemSummary(category=cat, total=amount)
-        for cat, amount in category_totals.items()
+        LineItemSummary(category=cat, total=cents_to_float(amount))
+        for cat, amount in totals.by_category.items()
     ]
 
     return InvoiceTotals(
-        subtotal=round(subtotal, 2),
-        tax_amount=round(tax_amount, 2),
-        total=round(total, 2),
+        subtotal=cents_to_float(totals.subtotal),
+        tax_amount=cents_to_float(totals.tax_amount),
+        total=cents_to_float(totals.total),
         category_breakdown=breakdown,
     )
 
 
+# Built once: the response path is hot enough that constructing the
+# statements per request shows up next to executing them
+_INVOICE_PAYLOAD_QUERY = select(
+    Invoice.id,
+    Invoice.user_id,
+    Invoice.client_name,
+    Invoice.client_email,
+    Invoice.job_address,
+    Invoice.client_id,
+    Invoice.trade_type,
+    Invoice.tax_rate,
+    Invoice.tax_rate_bps,
+    Invoice.status,
+    Invoice.pdf_url,
+    Invoice.due_date,
+    Invoice.version,
+    Invoice.created_at,
+    Invoice.updated_at,
+).where(
+    Invoice.user_id == bindparam("user_id"),
+    Invoice.id.in_(bindparam("invoice_ids", expanding=True)),
+)
+
+_LINE_ITEM_PAYLOAD_QUERY = (
+    select(
+        LineItem.invoice_id,
+        LineItem.id,
+        LineItem.description,
+        LineItem.quantity,
+        LineItem.unit_price,
+        LineItem.category,
+        LineItem.quantity_hundredths,
+        LineItem.unit_price_cents,
+    )
+    .where(LineItem.invoice_id.in_(bindparam("invoice_ids", expanding=True)))
+    .order_by(LineItem.id)
+)
+
+
+def load_invoice_payloads(db: Session, user_id: int, invoice_ids: List[int]) -> Dict[int, dict]:
+    """Build InvoiceResponse data for invoices straight from column rows.
+
+    Two column-only queries, no ORM objects; totals come from the integer
+    money engine in one batch. Returns payloads keyed by invoice id, leaving
+    out ids that don't exist or belong to someone else.
+    """
+    invoice_rows = db.execute(
+        _INVOICE_PAYLOAD_QUERY, {"user_id": user_id, "invoice_ids": list(invoice_ids)}
+    ).all()
+    if not invoice_rows:
+        return {}
+
+    line_rows = db.execute(
+        _LINE_ITEM_PAYLOAD_QUERY, {"invoice_ids": [row.id for row in invoice_rows]}
+    ).all()
+
+    totals = compute_totals(
+        TotalsBatch.from_rows(
+            ((row.id, row.tax_rate_bps) for row in invoice_rows),
+            (
+                (row.invoice_id, row.quantity_hundredths, row.unit_price_cents, row.category)
+                for row in line_rows
+            ),
+        )
+    )
+
+    payloads = {}
+    for row, invoice_totals in zip(invoice_rows, totals):
+        payload = row._asdict()
+        del payload["tax_rate_bps"]
+        payload["line_items"] = []
+        payload["totals"] = {
+            "subtotal": cents_to_float(invoice_totals.subtotal),
+            "tax_amount": cents_to_float(invoice_totals.tax_amount),
+            "total": cents_to_float(invoice_totals.total),
+            "category_breakdown": [
+                {"category": category, "total": cents_to_float(amount)}
+                for category, amount in invoice_totals.by_category.items()
+            ],
+        }
+        payloads[row.id] = payload
+
+    for row in line_rows:
+        payloads[row.invoice_id]["line_items"].append(
+            {
+                "id": row.id,
+                "description": row.description,
+                "quantity": row.quantity,
+                "unit_price": row.unit_price,
+                "category": row.category,
+                # hundredths x cents is in units of 1/10000 of a dollar
+                "line_total": row.quantity_hundredths * row.unit_price_cents / 10000,
+            }
+        )
+
+    return payloads
+
+
+def invoice_etag(invoice_id: int, version: int, updated_at: Optional[datetime]) -> str:
+    """ETag of one invoice; every write bumps its version."""
+    return make_etag("invoice", invoice_id, version, updated_at)
+
+
+_INVOICE_ETAG_QUERY = select(Invoice.id, Invoice.version, Invoice.updated_at).where(
+    Invoice.user_id == bindparam("user_id"),
+    Invoice.id == bindparam("invoice_id"),
+)
+
+# Changes whenever an invoice is added, removed or written (which bumps its
+# version), so it stands in for the whole list without building it
+_INVOICE_LIST_STAMP_QUERY = select(
+    func.count(Invoice.id),
+    func.max(Invoice.id),
+    func.max(Invoice.updated_at),
+    func.sum(Invoice.version),
+).where(Invoice.user_id == bindparam("user_id"))
+
+
+def invoice_json_response(
+    db: Session, user_id: int, invoice_id: int, status_code: int = status.HTTP_200_OK
+):
+    """Encode one invoice as an InvoiceResponse, or 404 if it isn't the user's.
+
+    The response carries the invoice's ETag, so clients can revalidate it.
+    """
+    payload = load_invoice_payloads(db, user_id, [invoice_id]).get(invoice_id)
+    if payload is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Invoice not found",
+        )
+    etag = invoice_etag(payload["id"], payload["version"], payload["updated_at"])
+    return json_response(
+        InvoiceResponse, payload, status_code=status_code, headers=cache_headers(etag)
+    )
+
+
 def get_compliance_notes(trade_type: TradeType) -> str:
     """Get default compliance notes for a trade type."""
     notes = {
@@ -83,98 +264,620 @@ def get_compliance_notes(trade_type: TradeType) -> str:
 @router.post("", response_model=InvoiceResponse, status_code=status.HTTP_201_CREATED)
 async def create_invoice(
     invoice_data: InvoiceCreate,
+    idempotency_key: Optional[str] = Header(None, max_length=255),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Create a new invoice."""
-    # Create invoice
-    invoice = Invoice(
-        user_id=current_user.id,
-        client_name=invoice_data.client_name,
-        client_email=invoice_data.client_email,
-        job_address=invoice_data.job_address,
-        trade_type=invoice_data.trade_type,
-        tax_rate=invoice_data.tax_rate,
-        status=InvoiceStatus.DRAFT,
-    )
-    db.add(invoice)
-    db.flush()  # Get the invoice ID
-
-    # Create line items
-    for item_data in invoice_data.line_items:
-        line_item = LineItem(
-            invoice_id=invoice.id,
-            description=item_data.description,
-            quantity=item_data.quantity,
-            unit_price=item_data.unit_price,
-            category=item_data.category,
-        )
-        db.add(line_item)
+    """Create a new invoice.
+
+    With an ``Idempotency-Key`` header, a retry returns the invoice the first
+    request created instead of creating another.
+    """
+
+    def create():
+        invoice_id = apply_invoice_create(db, current_user.id, invoice_data)
+        return invoice_json_response(
+            db, current_user.id, invoice_id, status_code=status.HTTP_201_CREATED
+        )
+
+    return idempotency_store.run(
+        db,
+        current_user.id,
+        idempotency_key,
+        "invoices.create",
+        request_fingerprint(invoice_data.model_dump(mode="json")),
+        create,
+    )
+
+
+def insert_invoices(
+    db: Session,
+    user_id: int,
+    invoices: Sequence[InvoiceCreate],
+    invoice_status: InvoiceStatus = InvoiceStatus.DRAFT,
+) -> List[int]:
+    """Insert validated invoices and their line items, returning the new ids.
+
+    Invoices go in as multi-row ``INSERT ... RETURNING`` batches, and line
+    items as multi-row INSERTs, rather than one round trip per row. Ids come
+    back in input order. The caller commits.
+    """
+    if not invoices:
+        return []
+
+    invoice_ids = (
+        db.execute(
+            insert(Invoice).returning(Invoice.id, sort_by_parameter_order=True),
+            [
+                {
+                    "user_id": user_id,
+                    "client_name": data.client_name,
+                    "client_email": data.client_email,
+                    "job_address": data.job_address,
+                    "trade_type": data.trade_type,
+                    "tax_rate": data.tax_rate,
+                    "due_date": data.due_date,
+                    "status": invoice_status,
+                }
+                for data in invoices
+            ],
+        )
+        .scalars()
+        .all()
+    )
+
+    db.execute(
+        insert(LineItem),
+        [
+            {
+                "invoice_id": invoice_id,
+                "description": item.description,
+                "quantity": item.quantity,
+                "unit_price": item.unit_price,
+                "category": item.category,
+            }
+            for invoice_id, data in zip(invoice_ids, invoices)
+            for item in data.line_items
+        ],
+    )
+    return list(invoice_ids)
+
+
+def apply_invoice_create(db: Session, user_id: int, invoice_data: InvoiceCreate) -> int:
+    """Create a draft invoice with its line items and return its id; the caller commits."""
+    invoice_id = insert_invoices(db, user_id, [invoice_data])[0]
+    catalog.learn(db, user_id, invoice_data.line_items)
+    clients.link(db, [invoice_id])
+    invoice_stats.record_changes(db, {}, invoice_stats.snapshot(db, [invoice_id]))
+    invoice_changes.record(db, user_id, [invoice_id])
+    return invoice_id
+
+
+@router.post("/bulk", response_model=InvoiceBulkResponse)
+def bulk_create_invoices(
+    payload: InvoiceBulkCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Create many invoices in one transaction.
+
+    Every item is validated before anything is written. Valid items are
+    inserted together; invalid ones are reported with their errors, by
+    position in the request.
+    """
+    adapter = type_adapter(InvoiceCreate)
+    results = [InvoiceBulkItemResult(index=i) for i in range(len(payload.invoices))]
+    valid: List[InvoiceCreate] = []
+    valid_indexes: List[int] = []
+
+    for index, raw in enumerate(payload.invoices):
+        try:
+            valid.append(adapter.validate_python(raw))
+            valid_indexes.append(index)
+        except ValidationError as e:
+            results[index].errors = e.errors(
+                include_url=False, include_context=False, include_input=False
+            )
 
+    invoice_ids = insert_invoices(db, current_user.id, valid)
+    for index, invoice_id in zip(valid_indexes, invoice_ids):
+        results[index].id = invoice_id
+
+    catalog.learn(db, current_user.id, [item for data in valid for item in data.line_items])
+    clients.link(db, invoice_ids)
+    invoice_stats.record_changes(db, {}, invoice_stats.snapshot(db, invoice_ids))
+    invoice_changes.record(db, current_user.id, invoice_ids)
     db.commit()
-    db.refresh(invoice)
 
-    # Calculate totals
-    invoice_response = InvoiceResponse.model_validate(invoice)
+    return InvoiceBulkResponse(
+        created=len(invoice_ids),
+        failed=len(results) - len(invoice_ids),
+        results=results,
+    )
+
+
+@router.post("/import", response_model=InvoiceImportReport)
+def import_invoices(
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Import historical invoices from a CSV upload.
+
+    The upload is streamed through the importer (see
+    app.services.invoice_import), never read into memory whole. Valid
+    invoices are committed together. Rejected rows are uploaded as an error
+    CSV, whose key is returned with the first few errors.
+    """
+    lines = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    with tempfile.SpooledTemporaryFile(mode="w+", newline="", max_size=1024 * 1024) as error_out:
+        importer = InvoiceImporter(db, current_user.id, error_out=error_out)
+        try:
+            report = importer.run(lines)
+        except (InvalidImportFileError, UnicodeDecodeError, csv.Error) as e:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Could not import file: {e}",
+            )
+
+        error_file_key = None
+        if report.rows_rejected:
+            error_out.seek(0)
+            try:
+                error_file_key = r2_storage.upload_import_errors(
+                    error_out.read().encode("utf-8"), current_user.id
+                )
+            except Exception as e:
+                db.rollback()
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=f"Failed to store import errors: {str(e)}",
+                )
 
-    return invoice_response
+    db.commit()
+
+    return InvoiceImportReport(
+        rows_read=report.rows_read,
+        invoices_imported=report.invoices_imported,
+        line_items_imported=report.line_items_imported,
+        rows_rejected=report.rows_rejected,
+        errors=[vars(error) for error in report.errors],
+        error_file_key=error_file_key,
+    )
+
+
+def invoice_list_query(db: Session, user_id: int):
+    """Build the invoice list query with its SQL-aggregated total.
+
+    Returns the query and the labelled total column, for filtering and
+    sorting on it. Callers add their own filters, then ``group_by(Invoice.id)``.
+    """
+    subtotal = func.coalesce(func.sum(LineItem.quantity * LineItem.unit_price), 0)
+    total = func.round(subtotal + subtotal * Invoice.tax_rate / 100, 2).label("total")
+
+    query = (
+        db.query(
+            Invoice.id,
+            Invoice.client_name,
+            Invoice.job_address,
+            Invoice.trade_type,
+            Invoice.status,
+            total,
+            Invoice.due_date,
+            Invoice.created_at,
+        )
+        .outerjoin(LineItem, LineItem.invoice_id == Invoice.id)
+        .filter(Invoice.user_id == user_id)
+    )
+    return query, total
 
 
 @router.get("", response_model=List[InvoiceListResponse])
 async def list_invoices(
+    request: Request,
+    status_filter: Optional[InvoiceStatus] = Query(None, alias="status"),
+    trade_type: Optional[TradeType] = None,
+    created_from: Optional[date] = Query(None, description="Earliest creation date, inclusive"),
+    created_to: Optional[date] = Query(None, description="Latest creation date, inclusive"),
+    min_total: Optional[float] = Query(None, ge=0),
+    max_total: Optional[float] = Query(None, ge=0),
+    sort: InvoiceSort = InvoiceSort.NEWEST,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """List all invoices for the current user, ordered by date descending."""
-    invoices = (
-        db.query(Invoice)
-        .filter(Invoice.user_id == current_user.id)
+    """List the current user's invoices, filtered and sorted in the database.
+
+    Totals are aggregated in SQL and the plain rows go straight to the
+    response model, so no Invoice or LineItem objects are loaded. Status,
+    trade and date filters use the ``(user_id, <filter>, created_at)``
+    indexes; total bounds apply to the aggregated total.
+
+    The ETag comes from a count/max aggregate over the user's invoices, so
+    an unchanged list is answered with 304 before the list query runs.
+    """
+    # Read before the list: a write in between leaves the tag older than the
+    # body, which only costs the client one extra full fetch
+    stamp = db.execute(_INVOICE_LIST_STAMP_QUERY, {"user_id": current_user.id}).one()
+    etag = make_etag("invoices", current_user.id, request.url.query, *stamp)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    query, total = invoice_list_query(db, current_user.id)
+
+    if status_filter is not None:
+        query = query.filter(Invoice.status == status_filter)
+    if trade_type is not None:
+        query = query.filter(Invoice.trade_type == trade_type)
+    if created_from is not None:
+        query = query.filter(
+            Invoice.created_at >= datetime.combine(created_from, time.min, tzinfo=timezone.utc)
+        )
+    if created_to is not None:
+        query = query.filter(
+            Invoice.created_at
+            < datetime.combine(created_to + timedelta(days=1), time.min, tzinfo=timezone.utc)
+        )
+
+    query = query.group_by(Invoice.id)
+    if min_total is not None:
+        query = query.having(total >= min_total)
+    if max_total is not None:
+        query = query.having(total <= max_total)
+
+    sort_column = {
+        InvoiceSort.NEWEST: desc(Invoice.created_at),
+        InvoiceSort.OLDEST: asc(Invoice.created_at),
+        InvoiceSort.TOTAL_DESC: desc(total),
+        InvoiceSort.TOTAL_ASC: asc(total),
+        InvoiceSort.CLIENT_ASC: asc(Invoice.client_name),
+        InvoiceSort.CLIENT_DESC: desc(Invoice.client_name),
+    }[sort]
+    tiebreak = asc(Invoice.id) if sort == InvoiceSort.OLDEST else desc(Invoice.id)
+    rows = query.order_by(sort_column, tiebreak).all()
+
+    return json_response(
+        List[InvoiceListResponse], rows, from_attributes=True, headers=cache_headers(etag)
+    )
+
+
+@router.get("/search", response_model=List[InvoiceListResponse])
+async def search_invoices(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Search invoices by client, email, job address and line item descriptions.
+
+    Matching invoice ids come from the full-text indexes (see app.search);
+    the page of matches is then totalled like the plain list, newest first.
+    """
+    matches = matching_invoice_ids(db, current_user.id, q).subquery()
+    # Pick the page first, so only the returned invoices get totalled
+    page = (
+        select(Invoice.id)
+        .where(Invoice.id.in_(select(matches.c[0])))
+        .order_by(desc(Invoice.created_at), desc(Invoice.id))
+        .limit(limit)
+        .scalar_subquery()
+    )
+    query, _ = invoice_list_query(db, current_user.id)
+    rows = (
+        query.filter(Invoice.id.in_(page))
+        .group_by(Invoice.id)
         .order_by(desc(Invoice.created_at), desc(Invoice.id))
         .all()
     )
 
-    result = []
-    for invoice in invoices:
-        totals = calculate_invoice_totals(invoice)
-        result.append(
-            InvoiceListResponse(
-                id=invoice.id,
-                client_name=invoice.client_name,
-                job_address=invoice.job_address,
-                trade_type=invoice.trade_type,
-                status=invoice.status,
-                total=totals.total,
-                created_at=invoice.created_at,
+    return json_response(List[InvoiceListResponse], rows, from_attributes=True)
+
+
+@router.get("/changes", response_model=InvoiceChanges)
+async def list_invoice_changes(
+    since: int = Query(0, ge=0, description="Token from the previous sync; 0 for everything"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Invoices created, updated or deleted after the change token ``since``.
+
+    Changed invoices come back as list rows and deleted ones as ids. Both are
+    found through ``(user_id, change_seq)`` indexes, so an unchanged account
+    costs a counter lookup. The returned token is the one to pass next time.
+    """
+    # Read first: every change numbered up to the token is already committed
+    # (see app.services.invoice_changes)
+    token = invoice_changes.current_token(db, current_user.id)
+    if since > token:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unknown change token. Sync again from 0.",
+        )
+    if since == token:
+        return json_response(InvoiceChanges, {"token": token, "invoices": [], "deleted": []})
+
+    query, _ = invoice_list_query(db, current_user.id)
+    rows = (
+        query.filter(Invoice.change_seq > since, Invoice.change_seq <= token)
+        .group_by(Invoice.id)
+        .order_by(Invoice.change_seq, Invoice.id)
+        .all()
+    )
+    # A full sync starts from nothing, so there is nothing to delete
+    deleted = []
+    if since:
+        deleted = [
+            row.invoice_id
+            for row in db.query(InvoiceTombstone.invoice_id)
+            .filter(
+                InvoiceTombstone.user_id == current_user.id,
+                InvoiceTombstone.change_seq > since,
+                InvoiceTombstone.change_seq <= token,
             )
+            .order_by(InvoiceTombstone.change_seq, InvoiceTombstone.invoice_id)
+        ]
+
+    return json_response(
+        InvoiceChanges,
+        {"token": token, "invoices": rows, "deleted": deleted},
+        from_attributes=True,
+    )
+
+
+@router.get("/export")
+async def export_invoices(
+    export_format: ExportFormat = Query(ExportFormat.CSV, alias="format"),
+    created_from: Optional[date] = Query(
+        None, alias="from", description="Earliest creation date, inclusive"
+    ),
+    created_to: Optional[date] = Query(
+        None, alias="to", description="Latest creation date, inclusive"
+    ),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Download every invoice and line item in a date range as CSV or NDJSON.
+
+    The file is streamed from a server-side cursor as it is read (see
+    app.services.invoice_export), so memory stays flat however large the
+    export is.
+    """
+    start = (
+        datetime.combine(created_from, time.min, tzinfo=timezone.utc)
+        if created_from is not None
+        else None
+    )
+    end = (
+        datetime.combine(created_to + timedelta(days=1), time.min, tzinfo=timezone.utc)
+        if created_to is not None
+        else None
+    )
+    filename = "invoices"
+    if created_from is not None:
+        filename += f"_from_{created_from.isoformat()}"
+    if created_to is not None:
+        filename += f"_to_{created_to.isoformat()}"
+
+    return StreamingResponse(
+        stream_export(db.get_bind(), current_user.id, export_format, start, end),
+        media_type=MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}.{export_format.value}"',
+            "Cache-Control": "private, no-store",
+        },
+    )
+
+
+@router.get("/stats", response_model=InvoiceStats)
+async def get_invoice_stats(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Totals by status, trade and month for the dashboard.
+
+    Read from the monthly rollup table, so the cost grows with the number
+    of months, not invoices.
+    """
+    rows = (
+        db.query(InvoiceMonthlyStats)
+        .filter(
+            InvoiceMonthlyStats.user_id == current_user.id,
+            InvoiceMonthlyStats.invoice_count != 0,
         )
+        .order_by(InvoiceMonthlyStats.month)
+        .all()
+    )
 
-    return result
+    by_status: Dict[InvoiceStatus, List[int]] = {s: [0, 0] for s in InvoiceStatus}
+    by_trade: Dict[TradeType, List[int]] = {t: [0, 0] for t in TradeType}
+    by_month: Dict[date, List[int]] = {}
+    for row in rows:
+        for bucket in (
+            by_status[row.status],
+            by_trade[row.trade_type],
+            by_month.setdefault(row.month, [0, 0]),
+        ):
+            bucket[0] += row.invoice_count
+            bucket[1] += row.total_cents
+
+    return InvoiceStats(
+        count=sum(count for count, _ in by_status.values()),
+        total=cents_to_float(sum(cents for _, cents in by_status.values())),
+        by_status=[
+            StatusStats(status=key, count=count, total=cents_to_float(cents))
+            for key, (count, cents) in by_status.items()
+        ],
+        by_trade=[
+            TradeStats(trade_type=key, count=count, total=cents_to_float(cents))
+            for key, (count, cents) in by_trade.items()
+        ],
+        by_month=[
+            MonthStats(month=key, count=count, total=cents_to_float(cents))
+            for key, (count, cents) in by_month.items()
+        ],
+    )
 
 
 @router.get("/{invoice_id}", response_model=InvoiceResponse)
 async def get_invoice(
     invoice_id: int,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Get a specific invoice by ID."""
-    invoice = (
-        db.query(Invoice)
-        .filter(Invoice.id == invoice_id, Invoice.user_id == current_user.id)
+    """Get a specific invoice by ID.
+
+    Answers 304 from the invoice's version alone when the client's copy
+    is current.
+    """
+    row = db.execute(
+        _INVOICE_ETAG_QUERY, {"user_id": current_user.id, "invoice_id": invoice_id}
+    ).first()
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Invoice not found",
+        )
+    etag = invoice_etag(row.id, row.version, row.updated_at)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return invoice_json_response(db, current_user.id, invoice_id)
+
+
+@router.get("/{invoice_id}/reminders", response_model=List[InvoiceReminderResponse])
+async def list_invoice_reminders(
+    invoice_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """List the payment reminders queued or sent for an invoice, oldest first."""
+    if (
+        db.execute(
+            _INVOICE_ETAG_QUERY, {"user_id": current_user.id, "invoice_id": invoice_id}
+        ).first()
+        is None
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Invoice not found",
+        )
+    reminders = (
+        db.query(InvoiceReminder)
+        .filter(InvoiceReminder.invoice_id == invoice_id)
+        .order_by(InvoiceReminder.stage)
+        .all()
+    )
+    return json_response(List[InvoiceReminderResponse], reminders, from_attributes=True)
+
+
+def apply_invoice_update(
+    db: Session, user_id: int, invoice_id: int, invoice_data: InvoiceUpdate
+) -> None:
+    """Update an invoice, touching only the line items that changed.
+
+    Items with an id are updated if any field differs, items without one
+    are inserted, and existing items left out are deleted, each as one
+    batched statement. Passing ``version`` makes the update conditional on
+    nobody else having changed the invoice since it was read. Raises
+    HTTPException when the update can't be applied; the caller commits.
+    """
+    current = (
+        db.query(Invoice.id, Invoice.version)
+        .filter(Invoice.id == invoice_id, Invoice.user_id == user_id)
         .first()
     )
 
-    if not invoice:
+    if not current:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Invoice not found",
         )
 
-    totals = calculate_invoice_totals(invoice)
-    invoice_response = InvoiceResponse.model_validate(invoice)
-    invoice_response.totals = totals
+    expected_version = invoice_data.version if invoice_data.version is not None else current.version
+    existing = {
+        row.id: row
+        for row in db.query(
+            LineItem.id,
+            LineItem.description,
+            LineItem.quantity_hundredths,
+            LineItem.unit_price_cents,
+            LineItem.category,
+        ).filter(LineItem.invoice_id == invoice_id)
+    }
+
+    kept_ids = [item.id for item in invoice_data.line_items if item.id is not None]
+    unknown_ids = set(kept_ids) - existing.keys()
+    if unknown_ids or len(kept_ids) != len(set(kept_ids)):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Line item ids must be unique and belong to this invoice",
+        )
+
+    stats_before = invoice_stats.snapshot(db, [invoice_id])
+
+    # Conditional on the version, so concurrent edits can't overwrite each other
+    claimed = db.execute(
+        update(Invoice)
+        .where(
+            Invoice.id == invoice_id,
+            Invoice.user_id == user_id,
+            Invoice.version == expected_version,
+        )
+        .values(
+            client_name=invoice_data.client_name,
+            client_email=invoice_data.client_email,
+            job_address=invoice_data.job_address,
+            trade_type=invoice_data.trade_type,
+            tax_rate=invoice_data.tax_rate,
+            due_date=invoice_data.due_date,
+            version=Invoice.version + 1,
+        )
+    ).rowcount
+    if not claimed:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Invoice was changed by someone else. Reload it and try again.",
+        )
+
+    changed = []
+    added = []
+    learned = []
+    for item in invoice_data.line_items:
+        values = {
+            "description": item.description,
+            "quantity": item.quantity,
+            "unit_price": item.unit_price,
+            "category": item.category,
+        }
+        if item.id is None:
+            added.append({"invoice_id": invoice_id, **values})
+            learned.append(item)
+            continue
+        row = existing[item.id]
+        if (
+            row.description != item.description
+            or row.quantity_hundredths != to_hundredths(item.quantity)
+            or row.unit_price_cents != to_cents(item.unit_price)
+            or row.category != item.category
+        ):
+            changed.append({"id": item.id, **values})
+            learned.append(item)
+    removed = existing.keys() - set(kept_ids)
+
+    if changed:
+        db.execute(update(LineItem), changed)
+    if added:
+        db.execute(insert(LineItem), added)
+    if removed:
+        db.execute(
+            delete(LineItem).where(LineItem.id.in_(removed)),
+            execution_options={"synchronize_session": False},
+        )
 
-    return invoice_response
+    catalog.learn(db, user_id, learned)
+    clients.link(db, [invoice_id])
+    invoice_stats.record_changes(db, stats_before, invoice_stats.snapshot(db, [invoice_id]))
+    invoice_changes.record(db, user_id, [invoice_id])
 
 
 @router.put("/{invoice_id}", response_model=InvoiceResponse)
@@ -184,61 +887,155 @@ async def update_invoice(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Update an invoice."""
+    """Update an invoice, touching only the line items that changed.
+
+    See apply_invoice_update. A stale ``version`` gets 409 Conflict.
+    """
+    apply_invoice_update(db, current_user.id, invoice_id, invoice_data)
+    db.commit()
+
+    return invoice_json_response(db, current_user.id, invoice_id)
+
+
+@router.delete("/{invoice_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_invoice(
+    invoice_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Delete a draft invoice.
+
+    Sent and paid invoices are records of money owed and stay. The deletion
+    leaves a tombstone, so synced clients drop the invoice too.
+    """
     invoice = (
-        db.query(Invoice)
+        db.query(Invoice.id, Invoice.status)
         .filter(Invoice.id == invoice_id, Invoice.user_id == current_user.id)
+        .with_for_update()
         .first()
     )
-
     if not invoice:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Invoice not found",
         )
+    if invoice.status != InvoiceStatus.DRAFT:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Only draft invoices can be deleted",
+        )
+    if (
+        db.query(RecurringInvoice.id)
+        .filter(RecurringInvoice.template_invoice_id == invoice_id)
+        .first()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Invoice is the template of a recurring invoice; delete that first",
+        )
 
-    # Update invoice fields
-    invoice.client_name = invoice_data.client_name
-    invoice.client_email = invoice_data.client_email
-    invoice.job_address = invoice_data.job_address
-    invoice.trade_type = invoice_data.trade_type
-    invoice.tax_rate = invoice_data.tax_rate
+    stats_before = invoice_stats.snapshot(db, [invoice_id])
+    db.execute(delete(QueuedSend).where(QueuedSend.invoice_id == invoice_id))
+    db.execute(delete(LineItem).where(LineItem.invoice_id == invoice_id))
+    db.execute(delete(Invoice).where(Invoice.id == invoice_id))
+    invoice_stats.record_changes(db, stats_before, {})
+    invoice_changes.record_deletes(db, current_user.id, [invoice_id])
+    db.commit()
 
-    # Delete existing line items
-    db.query(LineItem).filter(LineItem.invoice_id == invoice.id).delete()
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
 
-    # Create new line items
-    for item_data in invoice_data.line_items:
-        line_item = LineItem(
-            invoice_id=invoice.id,
-            description=item_data.description,
-            quantity=item_data.quantity,
-            unit_price=item_data.unit_price,
-            category=item_data.category,
-        )
-        db.add(line_item)
 
-    db.commit()
-    db.refresh(invoice)
+def default_due_date() -> date:
+    """Due date for an invoice sent without one."""
+    return datetime.now(timezone.utc).date() + timedelta(days=settings.INVOICE_PAYMENT_TERMS_DAYS)
 
-    totals = calculate_invoice_totals(invoice)
-    invoice_response = InvoiceResponse.model_validate(invoice)
-    invoice_response.totals = totals
 
-    return invoice_response
+def _send_lease_free(now: datetime):
+    """Condition matching invoices nobody holds a live send lease on."""
+    return Invoice.sending_until.is_(None) | (Invoice.sending_until < now)
 
 
-@router.patch("/{invoice_id}/status", response_model=InvoiceResponse)
-async def update_invoice_status(
-    invoice_id: int,
-    status_update: InvoiceStatusUpdate,
+def _status_values(new_status: InvoiceStatus) -> dict:
+    """Columns to set when moving invoices to ``new_status``."""
+    values = {"status": new_status, "version": Invoice.version + 1}
+    if new_status == InvoiceStatus.SENT:
+        values["due_date"] = func.coalesce(Invoice.due_date, default_due_date())
+    return values
+
+
+@router.patch("/status", response_model=InvoiceBulkStatusResponse)
+async def bulk_update_invoice_status(
+    status_update: InvoiceBulkStatusUpdate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Update the status of an invoice."""
+    """Move many invoices to one status with a single UPDATE.
+
+    The allowed source statuses (STATUS_TRANSITIONS) are part of the WHERE
+    clause, so invalid transitions are skipped by the database itself, as are
+    invoices that are being sent.
+    """
+    target = status_update.status
+    sources = [source for source, targets in STATUS_TRANSITIONS.items() if target in targets]
+    requested = list(dict.fromkeys(status_update.ids))
+
+    # Rollup contributions before the change; only the status moves, so the
+    # after-image is derived from this rather than read again
+    stats_before = invoice_stats.snapshot(db, requested)
+
+    updated = set(
+        db.execute(
+            update(Invoice)
+            .where(
+                Invoice.user_id == current_user.id,
+                Invoice.id.in_(requested),
+                Invoice.status.in_(sources),
+                _send_lease_free(datetime.now(timezone.utc)),
+            )
+            .values(**_status_values(target))
+            .returning(Invoice.id),
+            # Python can't evaluate the lease condition against SQLite's naive datetimes
+            execution_options={"synchronize_session": "fetch"},
+        ).scalars()
+    )
+
+    stats_before = {
+        invoice_id: contribution
+        for invoice_id, contribution in stats_before.items()
+        if invoice_id in updated
+    }
+    invoice_stats.record_changes(
+        db,
+        stats_before,
+        {
+            invoice_id: replace(contribution, status=target)
+            for invoice_id, contribution in stats_before.items()
+        },
+    )
+    invoice_changes.record(db, current_user.id, updated)
+    db.commit()
+
+    return InvoiceBulkStatusResponse(
+        status=target,
+        updated=[invoice_id for invoice_id in requested if invoice_id in updated],
+        skipped=[invoice_id for invoice_id in requested if invoice_id not in updated],
+    )
+
+
+def apply_status_change(
+    db: Session, user_id: int, invoice_id: int, new_status: InvoiceStatus
+) -> None:
+    """Set an invoice's status; the caller commits.
+
+    404 if the invoice isn't the user's, 409 while it's being sent: the send
+    would overwrite the new status when it finishes. The row is locked before
+    the rollup snapshot, so two concurrent changes can't both count the same
+    before-image.
+    """
     invoice = (
         db.query(Invoice)
-        .filter(Invoice.id == invoice_id, Invoice.user_id == current_user.id)
+        .filter(Invoice.id == invoice_id, Invoice.user_id == user_id)
+        .with_for_update()
         .first()
     )
 
@@ -247,56 +1044,212 @@ async def update_invoice_status(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Invoice not found",
         )
+    if invoice.sending_until is not None:
+        sending_until = invoice.sending_until
+        if sending_until.tzinfo is None:  # SQLite drops the offset
+            sending_until = sending_until.replace(tzinfo=timezone.utc)
+        if sending_until > datetime.now(timezone.utc):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Invoice is being sent",
+            )
+
+    stats_before = invoice_stats.snapshot(db, [invoice.id])
+    for column, value in _status_values(new_status).items():
+        setattr(invoice, column, value)
+    db.flush()
+    invoice_stats.record_changes(db, stats_before, invoice_stats.snapshot(db, [invoice.id]))
+    invoice_changes.record(db, user_id, [invoice.id])
 
-    invoice.status = status_update.status
+
+@router.patch("/{invoice_id}/status", response_model=InvoiceResponse)
+async def update_invoice_status(
+    invoice_id: int,
+    status_update: InvoiceStatusUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Update the status of an invoice."""
+    apply_status_change(db, current_user.id, invoice_id, status_update.status)
     db.commit()
-    db.refresh(invoice)
 
-    totals = calculate_invoice_totals(invoice)
-    invoice_response = InvoiceResponse.model_validate(invoice)
-    invoice_response.totals = totals
+    return invoice_json_response(db, current_user.id, invoice_id)
 
-    return invoice_response
 
+def apply_invoice_clone(db: Session, user_id: int, invoice_id: int, overrides: InvoiceClone) -> int:
+    """Copy an invoice and its line items as a new draft; return the new id.
 
-@router.post("/{invoice_id}/send", response_model=InvoiceResponse)
-async def send_invoice(
+    Two ``INSERT ... SELECT`` statements, so the rows are copied inside the
+    database without loading them here. Fields set in ``overrides`` replace
+    the source's. 404 if the invoice isn't the user's. The caller commits.
+    """
+    overridden = overrides.model_dump(exclude_none=True)
+    copied = [
+        Invoice.user_id,
+        Invoice.client_name,
+        Invoice.client_email,
+        Invoice.job_address,
+        Invoice.client_id,
+        Invoice.trade_type,
+        Invoice.tax_rate,
+    ]
+    clone_id = db.execute(
+        insert(Invoice)
+        .from_select(
+            [column.key for column in copied] + ["status"],
+            select(
+                *(
+                    (
+                        literal(overridden[column.key], column.type)
+                        if column.key in overridden
+                        else column
+                    )
+                    for column in copied
+                ),
+                literal(InvoiceStatus.DRAFT, Invoice.status.type),
+            ).where(Invoice.id == invoice_id, Invoice.user_id == user_id),
+        )
+        .returning(Invoice.id)
+    ).scalar()
+    if clone_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Invoice not found",
+        )
+
+    db.execute(
+        insert(LineItem).from_select(
+            ["invoice_id", "description", "quantity", "unit_price", "category"],
+            select(
+                literal(clone_id),
+                LineItem.description,
+                LineItem.quantity,
+                LineItem.unit_price,
+                LineItem.category,
+            )
+            .where(LineItem.invoice_id == invoice_id)
+            .order_by(LineItem.id),
+        )
+    )
+    if overridden:
+        clients.link(db, [clone_id])
+    invoice_stats.record_changes(db, {}, invoice_stats.snapshot(db, [clone_id]))
+    invoice_changes.record(db, user_id, [clone_id])
+    return clone_id
+
+
+@router.post(
+    "/{invoice_id}/clone", response_model=InvoiceResponse, status_code=status.HTTP_201_CREATED
+)
+def clone_invoice(
     invoice_id: int,
+    overrides: Optional[InvoiceClone] = None,
+    idempotency_key: Optional[str] = Header(None, max_length=255),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Send an invoice: generate PDF, upload to R2, email to client."""
-    # Fetch invoice with line items
-    invoice = (
-        db.query(Invoice)
-        .filter(Invoice.id == invoice_id, Invoice.user_id == current_user.id)
-        .first()
+    """Create a draft copy of an invoice, optionally for another client or address."""
+    overrides = overrides or InvoiceClone()
+
+    def clone():
+        clone_id = apply_invoice_clone(db, current_user.id, invoice_id, overrides)
+        return invoice_json_response(
+            db, current_user.id, clone_id, status_code=status.HTTP_201_CREATED
+        )
+
+    return idempotency_store.run(
+        db,
+        current_user.id,
+        idempotency_key,
+        "invoices.clone",
+        request_fingerprint(invoice_id, overrides.model_dump(mode="json")),
+        clone,
     )
-    if not invoice:
+
+
+def claim_invoice_send(
+    db: Session, user_id: int, invoice_id: int
+) -> Tuple[datetime, InvoiceStatus]:
+    """Take the invoice's send lease, or fail if it's sent or being sent.
+
+    A conditional UPDATE, so of two concurrent sends exactly one gets the
+    lease and does the rendering and emailing. The lease lapses after
+    ``SEND_LEASE_SECONDS``, so a worker that dies mid-send doesn't leave the
+    invoice stuck. Commits, so other requests see the claim. Returns the
+    lease's expiry and the status the invoice had when it was claimed.
+    """
+    now = datetime.now(timezone.utc)
+    lease = now + timedelta(seconds=settings.SEND_LEASE_SECONDS)
+    claimed_status = db.execute(
+        update(Invoice)
+        .where(
+            Invoice.id == invoice_id,
+            Invoice.user_id == user_id,
+            Invoice.status.in_([InvoiceStatus.DRAFT, InvoiceStatus.PAID]),
+            _send_lease_free(now),
+        )
+        # Not a change clients see, so updated_at (and the ETag) stay put
+        .values(sending_until=lease, updated_at=Invoice.updated_at)
+        .returning(Invoice.status)
+    ).scalar()
+    if claimed_status is not None:
+        db.commit()
+        return lease, claimed_status
+
+    current_status = (
+        db.query(Invoice.status)
+        .filter(Invoice.id == invoice_id, Invoice.user_id == user_id)
+        .scalar()
+    )
+    if current_status is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Invoice not found",
         )
-
     # Prevent re-sending if already sent
-    if invoice.status == InvoiceStatus.SENT:
+    if current_status == InvoiceStatus.SENT:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invoice has already been sent",
         )
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="Invoice is already being sent",
+    )
 
-    # Fetch business profile
-    business_profile = (
-        db.query(BusinessProfile)
-        .filter(BusinessProfile.user_id == current_user.id)
-        .first()
+
+def release_invoice_send(db: Session, invoice_id: int) -> None:
+    """Give up the send lease after a failed send, so it can be retried at once."""
+    db.execute(
+        update(Invoice)
+        .where(Invoice.id == invoice_id)
+        .values(sending_until=None, updated_at=Invoice.updated_at)
     )
+    db.commit()
+
+
+def apply_invoice_send(db: Session, user_id: int, invoice_id: int) -> None:
+    """Render, upload and email an invoice, then mark it sent.
+
+    Commits the send lease up front; the caller commits the invoice's new
+    status. The invoice is only marked sent if this send still holds the
+    lease and nothing changed its status meanwhile; a send that outlived its
+    lease leaves the row to whoever took it over.
+    """
+    lease, claimed_status = claim_invoice_send(db, user_id, invoice_id)
+
+    # Business profile, prepared for rendering (cached per user)
+    business_profile = profile_cache.get(db, user_id)
     if not business_profile:
+        release_invoice_send(db, invoice_id)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Business profile not set up. Please complete your business profile first.",
         )
 
+    # Fetch invoice with line items
+    invoice = db.query(Invoice).filter(Invoice.id == invoice_id).one()
+
     # Get compliance notes for trade
     compliance_notes = get_compliance_notes(invoice.trade_type)
 
@@ -312,28 +1265,23 @@ async def send_invoice(
         "totals": calculate_invoice_totals(invoice).model_dump(),
     }
 
-    business_profile_dict = {
-        "business_name": business_profile.business_name,
-        "phone": business_profile.phone,
-        "email": business_profile.email,
-        "license_number": business_profile.license_number,
-    }
-
     line_items = []
     for item in invoice.line_items:
-        line_items.append({
-            "description": item.description,
-            "quantity": float(item.quantity),
-            "unit_price": float(item.unit_price),
-            "category": item.category,
-            "line_total": item.line_total,
-        })
+        line_items.append(
+            {
+                "description": item.description,
+                "quantity": float(item.quantity),
+                "unit_price": float(item.unit_price),
+                "category": item.category,
+                "line_total": item.line_total,
+            }
+        )
 
     try:
         # Generate PDF
         pdf_bytes = pdf_generator.generate_pdf(
             invoice=invoice_dict,
-            business_profile=business_profile_dict,
+            business_profile=business_profile,
             line_items=line_items,
             compliance_notes=compliance_notes,
         )
@@ -343,7 +1291,7 @@ async def send_invoice(
         pdf_url = r2_storage.get_public_url(pdf_key)
 
         # Send email with PDF attachment
-        pdf_filename = f"invoice_{invoice.id}_{business_profile.business_name.replace(' ', '_')}.pdf"
+        pdf_filename = business_profile.pdf_filename(invoice.id)
         email_service.send_invoice_email(
             to_email=invoice.client_email,
             business_name=business_profile.business_name,
@@ -353,24 +1301,57 @@ async def send_invoice(
             pdf_filename=pdf_filename,
         )
 
-        # Update invoice
-        invoice.status = InvoiceStatus.SENT
-        invoice.pdf_url = pdf_url
-        db.commit()
-        db.refresh(invoice)
+        # Update invoice, if the lease is still ours
+        stats_before = invoice_stats.snapshot(db, [invoice.id])
+        sent = db.execute(
+            update(Invoice)
+            .where(
+                Invoice.id == invoice.id,
+                Invoice.sending_until == lease,
+                Invoice.status == claimed_status,
+            )
+            .values(**_status_values(InvoiceStatus.SENT), pdf_url=pdf_url, sending_until=None)
+            .returning(Invoice.id),
+            execution_options={"synchronize_session": "fetch"},
+        ).scalar()
+        if sent is not None:
+            invoice_stats.record_changes(db, stats_before, invoice_stats.snapshot(db, [invoice.id]))
+            invoice_changes.record(db, user_id, [invoice.id])
 
     except Exception as e:
         db.rollback()
+        release_invoice_send(db, invoice_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to send invoice: {str(e)}",
         )
 
-    totals = calculate_invoice_totals(invoice)
-    invoice_response = InvoiceResponse.model_validate(invoice)
-    invoice_response.totals = totals
 
-    return invoice_response
+@router.post("/{invoice_id}/send", response_model=InvoiceResponse)
+def send_invoice(
+    invoice_id: int,
+    idempotency_key: Optional[str] = Header(None, max_length=255),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Send an invoice: generate PDF, upload to R2, email to client.
+
+    With an ``Idempotency-Key`` header, a retry returns the first request's
+    response without rendering or emailing again.
+    """
+
+    def send():
+        apply_invoice_send(db, current_user.id, invoice_id)
+        return invoice_json_response(db, current_user.id, invoice_id)
+
+    return idempotency_store.run(
+        db,
+        current_user.id,
+        idempotency_key,
+        "invoices.send",
+        request_fingerprint(invoice_id),
+        send,
+    )
 
 
 @router.get("/templates/compliance-notes")
@@ -1,39 +1,51 @@
 """Business profile API endpoints."""
-from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile, status
 from sqlalchemy.orm import Session
 
+from app.api.auth import get_current_user
+from app.core.config import settings
 from app.core.database import get_db
-from app.models import User, BusinessProfile
+from app.etags import cache_headers, etag_matches, make_etag, not_modified
+from app.models import BusinessProfile, User
 from app.schemas import (
-    UserResponse,
     BusinessProfileCreate,
-    BusinessProfileUpdate,
     BusinessProfileResponse,
+    BusinessProfileUpdate,
 )
-from app.api.auth import get_current_user
+from app.serialization import json_response
+from app.services.logo import InvalidLogoError, logo_cache, prepare_logo
+from app.services.profile_cache import profile_cache
+from app.services.storage import r2_storage
 
 router = APIRouter(prefix="/profile", tags=["Profile"])
 
 
 @router.get("", response_model=BusinessProfileResponse)
 def get_profile(
+    request: Request,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
-) -> BusinessProfile:
-    """Get the current user's business profile."""
-    profile = db.query(BusinessProfile).filter(
-        BusinessProfile.user_id == current_user.id
-    ).first()
-    
+):
+    """Get the current user's business profile.
+
+    The profile is one small row that has to be read anyway, so its ETag
+    is a hash of the encoded body; an unchanged profile is answered with 304.
+    """
+    profile = db.query(BusinessProfile).filter(BusinessProfile.user_id == current_user.id).first()
+
     if not profile:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Business profile not found",
         )
-    
-    return profile
+
+    response = json_response(BusinessProfileResponse, profile, from_attributes=True)
+    etag = make_etag("profile", response.body.decode())
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers.update(cache_headers(etag))
+    return response
 
 
 @router.put("", response_model=BusinessProfileResponse)
@@ -43,23 +55,22 @@ def update_profile(
     db: Session = Depends(get_db),
 ) -> BusinessProfile:
     """Update the current user's business profile."""
-    profile = db.query(BusinessProfile).filter(
-        BusinessProfile.user_id == current_user.id
-    ).first()
-    
+    profile = db.query(BusinessProfile).filter(BusinessProfile.user_id == current_user.id).first()
+
     if not profile:
         # Create profile if it doesn't exist
         profile = BusinessProfile(user_id=current_user.id)
         db.add(profile)
-    
+
     # Update fields if provided
     update_data = profile_data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(profile, field, value)
-    
+
     db.commit()
     db.refresh(profile)
-    
+    profile_cache.invalidate(current_user.id)
+
     return profile
 
 
@@ -71,24 +82,108 @@ def create_profile(
 ) -> BusinessProfile:
     """Create a business profile for the current user."""
     # Check if profile already exists
-    existing_profile = db.query(BusinessProfile).filter(
-        BusinessProfile.user_id == current_user.id
-    ).first()
-    
+    existing_profile = (
+        db.query(BusinessProfile).filter(BusinessProfile.user_id == current_user.id).first()
+    )
+
     if existing_profile:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Business profile already exists. Use PUT to update.",
         )
-    
+
     # Create new profile
     new_profile = BusinessProfile(
         user_id=current_user.id,
         **profile_data.model_dump(),
     )
-    
+
     db.add(new_profile)
     db.commit()
     db.refresh(new_profile)
-    
+    profile_cache.invalidate(current_user.id)
+
     return new_profile
+
+
+@router.post("/logo", response_model=BusinessProfileResponse)
+def upload_logo(
+    file: UploadFile = File(...),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> BusinessProfile:
+    """Upload a business logo, stored pre-sized for invoice rendering."""
+    profile = db.query(BusinessProfile).filter(BusinessProfile.user_id == current_user.id).first()
+
+    if not profile:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Business profile not found",
+        )
+
+    # Read one byte past the limit so oversized uploads are rejected, not truncated
+    raw = file.file.read(settings.LOGO_MAX_UPLOAD_BYTES + 1)
+    try:
+        logo = prepare_logo(raw)
+    except InvalidLogoError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+    try:
+        logo_key = r2_storage.upload_logo(
+            logo.data, current_user.id, logo.extension, logo.content_type
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to upload logo: {str(e)}",
+        )
+
+    old_logo_key = profile.logo_key
+    profile.logo_key = logo_key
+    db.commit()
+    db.refresh(profile)
+    logo_cache.put(logo_key, logo)
+    profile_cache.invalidate(current_user.id)
+
+    if old_logo_key:
+        _delete_logo(old_logo_key)
+
+    return profile
+
+
+@router.delete("/logo", response_model=BusinessProfileResponse)
+def delete_logo(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> BusinessProfile:
+    """Remove the business logo."""
+    profile = db.query(BusinessProfile).filter(BusinessProfile.user_id == current_user.id).first()
+
+    if not profile:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Business profile not found",
+        )
+
+    old_logo_key = profile.logo_key
+    profile.logo_key = None
+    db.commit()
+    db.refresh(profile)
+    profile_cache.invalidate(current_user.id)
+
+    if old_logo_key:
+        _delete_logo(old_logo_key)
+
+    return profile
+
+
+def _delete_logo(key: str) -> None:
+    """Best-effort removal of a replaced logo from storage."""
+    try:
+        r2_storage.delete(key)
+    except Exception:
+        # An orphaned object is harmless; the profile no longer points at it
+        pass
@@ -0,0 +1,121 @@
+"""Recurring invoice API endpoints."""
+
+from datetime import datetime, timezone
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.orm import Session
+
+from app.core.auth import get_current_user
+from app.core.database import get_db
+from app.models.invoice import Invoice
+from app.models.recurring_invoice import RecurringInvoice
+from app.models.user import User
+from app.schemas.recurring import (
+    RecurringInvoiceCreate,
+    RecurringInvoiceResponse,
+    RecurringInvoiceUpdate,
+)
+
+router = APIRouter(prefix="/recurring-invoices", tags=["Recurring invoices"])
+
+
+def _utc(when: datetime) -> datetime:
+    return when.replace(tzinfo=timezone.utc) if when.tzinfo is None else when
+
+
+def _get_schedule(db: Session, user_id: int, schedule_id: int) -> RecurringInvoice:
+    schedule = (
+        db.query(RecurringInvoice)
+        .filter(RecurringInvoice.id == schedule_id, RecurringInvoice.user_id == user_id)
+        .first()
+    )
+    if not schedule:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Recurring invoice not found",
+        )
+    return schedule
+
+
+@router.get("", response_model=List[RecurringInvoiceResponse])
+async def list_recurring_invoices(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """List the user's recurring invoices, next due first."""
+    return (
+        db.query(RecurringInvoice)
+        .filter(RecurringInvoice.user_id == current_user.id)
+        .order_by(RecurringInvoice.next_run_at, RecurringInvoice.id)
+        .all()
+    )
+
+
+@router.post("", response_model=RecurringInvoiceResponse, status_code=status.HTTP_201_CREATED)
+async def create_recurring_invoice(
+    schedule_data: RecurringInvoiceCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Issue copies of an invoice on a schedule.
+
+    Each run creates a draft with the template's client, address and line
+    items, and queues it to be sent when ``auto_send`` is set.
+    """
+    template = (
+        db.query(Invoice.id)
+        .filter(Invoice.id == schedule_data.template_invoice_id, Invoice.user_id == current_user.id)
+        .first()
+    )
+    if not template:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Invoice not found",
+        )
+
+    next_run_at = _utc(schedule_data.next_run_at)
+    schedule = RecurringInvoice(
+        user_id=current_user.id,
+        template_invoice_id=schedule_data.template_invoice_id,
+        frequency=schedule_data.frequency,
+        anchor_day=next_run_at.day,
+        next_run_at=next_run_at,
+        auto_send=schedule_data.auto_send,
+    )
+    db.add(schedule)
+    db.commit()
+    db.refresh(schedule)
+    return schedule
+
+
+@router.put("/{schedule_id}", response_model=RecurringInvoiceResponse)
+async def update_recurring_invoice(
+    schedule_id: int,
+    schedule_data: RecurringInvoiceUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Change a recurring invoice's schedule, or pause it with ``active``."""
+    schedule = _get_schedule(db, current_user.id, schedule_id)
+    next_run_at = _utc(schedule_data.next_run_at)
+    schedule.frequency = schedule_data.frequency
+    schedule.anchor_day = next_run_at.day
+    schedule.next_run_at = next_run_at
+    schedule.auto_send = schedule_data.auto_send
+    schedule.active = schedule_data.active
+    db.commit()
+    db.refresh(schedule)
+    return schedule
+
+
+@router.delete("/{schedule_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_recurring_invoice(
+    schedule_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Stop a recurring invoice. Invoices it already issued stay."""
+    db.delete(_get_schedule(db, current_user.id, schedule_id))
+    db.commit()
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,154 @@
+"""Offline sync API endpoints."""
+
+import json
+from typing import Dict, List
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import Response
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from app.api.invoices import apply_invoice_create, apply_invoice_update, apply_status_change
+from app.core.auth import get_current_user
+from app.core.database import get_db
+from app.models.invoice import Invoice
+from app.models.user import User
+from app.schemas.sync import (
+    CreateInvoiceMutation,
+    SyncMutation,
+    SyncMutationBatch,
+    SyncMutationOutcome,
+    SyncMutationResponse,
+    SyncMutationResult,
+    UpdateInvoiceMutation,
+)
+from app.serialization import json_response, type_adapter
+from app.services.idempotency import REPLAYED_HEADER, idempotency_store, request_fingerprint
+
+router = APIRouter(prefix="/sync", tags=["Sync"])
+
+# Idempotency key scope for queued operations
+SYNC_SCOPE = "sync"
+
+
+def _request_hash(mutation: SyncMutation) -> str:
+    """Fingerprint of what an operation does, ignoring how the client tagged it."""
+    return request_fingerprint(
+        mutation.model_dump(mode="json", exclude={"client_id", "idempotency_key"})
+    )
+
+
+def _failed(client_id, status_code: int, error) -> SyncMutationResult:
+    return SyncMutationResult(
+        client_id=client_id,
+        outcome=SyncMutationOutcome.FAILED,
+        status_code=status_code,
+        error=error,
+    )
+
+
+def _target_id(mutation, created: Dict[str, int]) -> int:
+    if mutation.invoice_id is not None:
+        return mutation.invoice_id
+    try:
+        return created[mutation.invoice_client_id]
+    except KeyError:
+        raise HTTPException(
+            status_code=status.HTTP_424_FAILED_DEPENDENCY,
+            detail="invoice_client_id does not name an invoice created earlier in this batch",
+        )
+
+
+def _apply(db: Session, user_id: int, mutation: SyncMutation, created: Dict[str, int]) -> int:
+    """Apply one operation and return the id of the invoice it touched."""
+    if isinstance(mutation, CreateInvoiceMutation):
+        return apply_invoice_create(db, user_id, mutation.data)
+
+    invoice_id = _target_id(mutation, created)
+    if isinstance(mutation, UpdateInvoiceMutation):
+        apply_invoice_update(db, user_id, invoice_id, mutation.data)
+    else:
+        apply_status_change(db, user_id, invoice_id, mutation.status)
+    return invoice_id
+
+
+def _apply_once(
+    db: Session, user_id: int, mutation: SyncMutation, created: Dict[str, int]
+) -> SyncMutationResult:
+    """Apply an operation unless its idempotency key has been seen, in a savepoint."""
+
+    def apply() -> Response:
+        invoice_id = _apply(db, user_id, mutation, created)
+        status_code = (
+            status.HTTP_201_CREATED
+            if isinstance(mutation, CreateInvoiceMutation)
+            else status.HTTP_200_OK
+        )
+        version = db.query(Invoice.version).filter(Invoice.id == invoice_id).scalar()
+        return json_response(
+            Dict[str, int],
+            {"status_code": status_code, "invoice_id": invoice_id, "version": version},
+            status_code=status_code,
+        )
+
+    try:
+        response = idempotency_store.run(
+            db,
+            user_id,
+            mutation.idempotency_key,
+            SYNC_SCOPE,
+            _request_hash(mutation),
+            apply,
+            nested=True,
+        )
+    except HTTPException as e:
+        return _failed(mutation.client_id, e.status_code, e.detail)
+
+    replayed = REPLAYED_HEADER in response.headers
+    return SyncMutationResult(
+        **json.loads(response.body),
+        client_id=mutation.client_id,
+        outcome=SyncMutationOutcome.REPLAYED if replayed else SyncMutationOutcome.APPLIED,
+    )
+
+
+@router.post("/mutations", response_model=SyncMutationResponse)
+def apply_mutations(
+    batch: SyncMutationBatch,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Apply a queue of offline invoice operations in one transaction.
+
+    Operations run in order, each in its own savepoint: one that fails is
+    rolled back and reported, and the rest still apply. Each carries an
+    idempotency key, so resending a batch whose response was lost returns
+    the stored results instead of applying anything twice. Results come
+    back in request order, tagged with the client's ids.
+    """
+    adapter = type_adapter(SyncMutation)
+    # Invoices created in this batch, by the create's client_id
+    created: Dict[str, int] = {}
+    results: List[SyncMutationResult] = []
+
+    for raw in batch.mutations:
+        try:
+            mutation = adapter.validate_python(raw)
+        except ValidationError as e:
+            client_id = raw.get("client_id")
+            results.append(
+                _failed(
+                    client_id if isinstance(client_id, str) else None,
+                    status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    e.errors(include_url=False, include_context=False, include_input=False),
+                )
+            )
+            continue
+
+        result = _apply_once(db, current_user.id, mutation, created)
+        if isinstance(mutation, CreateInvoiceMutation) and result.invoice_id is not None:
+            created[mutation.client_id] = result.invoice_id
+        results.append(result)
+
+    db.commit()
+    return SyncMutationResponse(results=results)
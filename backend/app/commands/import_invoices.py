@@ -0,0 +1,69 @@
+"""Import historical invoices for a user from a CSV file.
+
+The file is streamed, so size is limited only by disk. Run from the backend
+directory:
+
+    python -m app.commands.import_invoices --user 42 history.csv
+
+Rejected rows go to ``history.errors.csv`` (or ``--errors PATH``) with the
+reason for each. See app.services.invoice_import for the column layout.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from app.core.database import SessionLocal
+from app.services.invoice_import import ImportProgress, InvalidImportFileError, InvoiceImporter
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", type=Path, help="CSV file, one row per line item")
+    parser.add_argument("--user", type=int, required=True, help="Owner of the imported invoices")
+    parser.add_argument("--errors", type=Path, default=None, help="Where to write rejected rows")
+    args = parser.parse_args(argv)
+
+    errors_path = args.errors or args.path.with_suffix(".errors.csv")
+    started = time.monotonic()
+
+    def report(progress: ImportProgress) -> None:
+        elapsed = time.monotonic() - started
+        print(
+            f"{progress.rows_read} rows read, {progress.invoices_imported} invoices / "
+            f"{progress.line_items_imported} line items imported, "
+            f"{progress.rows_rejected} rows rejected ({elapsed:.1f}s)",
+            file=sys.stderr,
+        )
+
+    db = SessionLocal()
+    try:
+        with (
+            open(args.path, encoding="utf-8-sig", newline="") as lines,
+            open(errors_path, "w", newline="") as error_out,
+        ):
+            importer = InvoiceImporter(db, args.user, error_out=error_out, on_progress=report)
+            try:
+                progress = importer.run(lines)
+            except InvalidImportFileError as e:
+                print(f"Could not import {args.path}: {e}", file=sys.stderr)
+                return 1
+        db.commit()
+    finally:
+        db.close()
+
+    if progress.rows_rejected:
+        print(f"Rejected rows written to {errors_path}")
+    else:
+        errors_path.unlink()
+    print(
+        f"Imported {progress.invoices_imported} invoices "
+        f"({progress.line_items_imported} line items) for user {args.user}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+"""Issue the invoices recurring schedules are due for.
+
+Run from the backend directory, e.g. every few minutes from cron on any
+number of nodes; they share the due schedules between them:
+
+    python -m app.commands.issue_recurring
+    python -m app.commands.issue_recurring --batch-size 1000
+"""
+
+import argparse
+import sys
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.services.recurring import issue_due
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=settings.RECURRING_BATCH_SIZE,
+        help="Schedules issued per transaction",
+    )
+    args = parser.parse_args(argv)
+
+    # Fixed for the run, so it ends once everything due at the start is issued
+    now = datetime.now(timezone.utc)
+    total = 0
+    db = SessionLocal()
+    try:
+        while True:
+            issued = issue_due(db, now, args.batch_size)
+            db.commit()
+            if not issued:
+                break
+            total += issued
+    finally:
+        db.close()
+
+    print(f"Issued {total} recurring invoices")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
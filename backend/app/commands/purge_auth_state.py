@@ -0,0 +1,38 @@
+"""Delete authentication state that is no longer needed.
+
+Removes expired refresh tokens and access token revocations, which keeps the
+table each worker's revocation filter is rebuilt from bounded, and login
+throttle buckets that have refilled completely (these only accumulate when
+``AUTH_THROTTLE_BACKEND`` is ``postgres``). Run from the backend directory,
+e.g. every few minutes from cron:
+
+    python -m app.commands.purge_auth_state
+"""
+
+import argparse
+import sys
+from typing import List, Optional
+
+from app.core.auth import purge_expired_tokens
+from app.core.database import SessionLocal
+from app.core.rate_limit import auth_throttle
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        tokens = purge_expired_tokens(db)
+        buckets = auth_throttle.purge(db)
+        db.commit()
+    finally:
+        db.close()
+
+    print(f"Purged {tokens} expired tokens and {buckets} idle throttle buckets")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
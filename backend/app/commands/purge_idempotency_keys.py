@@ -0,0 +1,34 @@
+"""Delete idempotency keys whose responses are no longer replayed.
+
+Keys older than ``IDEMPOTENCY_KEY_TTL_SECONDS`` are past the window in which
+clients retry; this keeps the table from growing. Run from the backend directory,
+e.g. hourly from cron:
+
+    python -m app.commands.purge_idempotency_keys
+"""
+
+import argparse
+import sys
+from typing import List, Optional
+
+from app.core.database import SessionLocal
+from app.services.idempotency import idempotency_store
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        count = idempotency_store.purge_expired(db)
+        db.commit()
+    finally:
+        db.close()
+
+    print(f"Purged {count} expired idempotency keys")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,36 @@
+"""Rebuild the invoice dashboard rollup from the invoices themselves.
+
+Repairs ``invoice_monthly_stats`` after manual data fixes or a bug in an
+incremental update. Run from the backend directory:
+
+    python -m app.commands.rebuild_stats            # every user
+    python -m app.commands.rebuild_stats --user 42  # one user
+"""
+
+import argparse
+import sys
+from typing import List, Optional
+
+from app.core.database import SessionLocal
+from app.services import invoice_stats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--user", type=int, default=None, help="Only rebuild this user's rows")
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        count = invoice_stats.rebuild(db, user_id=args.user)
+        db.commit()
+    finally:
+        db.close()
+
+    scope = f"user {args.user}" if args.user is not None else "all users"
+    print(f"Rebuilt invoice stats for {scope} from {count} invoices")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
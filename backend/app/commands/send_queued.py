@@ -0,0 +1,48 @@
+"""Send invoices queued for sending, such as auto-sent recurring invoices.
+
+Run from the backend directory, e.g. every minute from cron on any number
+of nodes:
+
+    python -m app.commands.send_queued
+"""
+
+import argparse
+import sys
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.services.send_queue import SendResult, send_due
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=settings.SEND_QUEUE_BATCH_SIZE,
+        help="Sends taken from the queue at a time",
+    )
+    args = parser.parse_args(argv)
+
+    now = datetime.now(timezone.utc)
+    total = SendResult()
+    db = SessionLocal()
+    try:
+        while True:
+            result = send_due(db, now, args.batch_size)
+            total.sent += result.sent
+            total.failed += result.failed
+            total.dropped += result.dropped
+            if not (result.sent or result.failed or result.dropped):
+                break
+    finally:
+        db.close()
+
+    print(f"Sent {total.sent} invoices, {total.failed} to retry, {total.dropped} dropped")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""Queue and send payment reminders for overdue invoices.
+
+Run from the backend directory, e.g. hourly from cron on any number of
+nodes:
+
+    python -m app.commands.send_reminders
+"""
+
+import argparse
+import sys
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.services.reminders import deliver_due, enqueue_due
+from app.services.send_queue import SendResult
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=settings.REMINDER_BATCH_SIZE,
+        help="Overdue invoices scanned per transaction",
+    )
+    parser.add_argument(
+        "--send-batch-size",
+        type=int,
+        default=settings.SEND_QUEUE_BATCH_SIZE,
+        help="Reminders taken from the queue at a time",
+    )
+    args = parser.parse_args(argv)
+
+    now = datetime.now(timezone.utc)
+    queued = 0
+    total = SendResult()
+    db = SessionLocal()
+    try:
+        position = None
+        while True:
+            count, position = enqueue_due(db, now.date(), now, args.batch_size, after=position)
+            db.commit()
+            queued += count
+            if position is None:
+                break
+
+        while True:
+            result = deliver_due(db, now, args.send_batch_size)
+            total.sent += result.sent
+            total.failed += result.failed
+            total.dropped += result.dropped
+            if not (result.sent or result.failed or result.dropped):
+                break
+    finally:
+        db.close()
+
+    print(
+        f"Queued {queued} reminders; sent {total.sent}, "
+        f"{total.failed} to retry, {total.dropped} dropped"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,19 +1,28 @@
 """Authentication utilities."""
-from datetime import datetime, timedelta
-from typing import Optional
+
+import hashlib
+import secrets
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
 
 from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.core.database import get_db
+from app.core.revocation import revocation_list
+from app.models.refresh_token import RefreshToken
+from app.models.revoked_token import RevokedToken
 from app.models.user import User
 
 # Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS
+)
 
 # HTTP Bearer token scheme
 security = HTTPBearer()
@@ -35,30 +44,116 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(
-            minutes=settings.JWT_EXPIRE_MINUTES
-        )
-    to_encode.update({"exp": expire})
+        expire = datetime.utcnow() + timedelta(minutes=settings.JWT_EXPIRE_MINUTES)
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
     # Ensure sub is a string for JWT compliance
     if "sub" in to_encode and not isinstance(to_encode["sub"], str):
         to_encode["sub"] = str(to_encode["sub"])
-    encoded_jwt = jwt.encode(
-        to_encode, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM
-    )
+    encoded_jwt = jwt.encode(to_encode, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM)
     return encoded_jwt
 
 
 def decode_access_token(token: str) -> Optional[dict]:
     """Decode a JWT access token."""
     try:
-        payload = jwt.decode(
-            token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM]
-        )
+        payload = jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
         return payload
     except JWTError:
         return None
 
 
+def _hash_refresh_token(token: str) -> str:
+    """Digest stored in place of the raw refresh token."""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def issue_refresh_token(db: Session, user_id: int, family_id: Optional[str] = None) -> str:
+    """Create and store a new refresh token, returning the raw value."""
+    token = secrets.token_urlsafe(32)
+    db.add(
+        RefreshToken(
+            user_id=user_id,
+            token_hash=_hash_refresh_token(token),
+            family_id=family_id or uuid.uuid4().hex,
+            expires_at=datetime.now(timezone.utc)
+            + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+        )
+    )
+    db.commit()
+    return token
+
+
+def _revoke_refresh_family(db: Session, family_id: str) -> None:
+    """Revoke every live token descended from the same login."""
+    db.query(RefreshToken).filter(
+        RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None)
+    ).update({RefreshToken.revoked_at: datetime.now(timezone.utc)}, synchronize_session=False)
+    db.commit()
+
+
+def rotate_refresh_token(db: Session, token: str) -> Optional[Tuple[int, str]]:
+    """Exchange a refresh token for a new one.
+
+    Returns ``(user_id, new_token)``, or None if the token is unknown, expired
+    or revoked. Presenting a token that was already rotated means it leaked,
+    so the whole family is revoked.
+    """
+    now = datetime.now(timezone.utc)
+    stored = (
+        db.query(RefreshToken).filter(RefreshToken.token_hash == _hash_refresh_token(token)).first()
+    )
+    if stored is None:
+        return None
+    if stored.revoked_at is not None:
+        _revoke_refresh_family(db, stored.family_id)
+        return None
+
+    # Conditional update so two concurrent refreshes can't both rotate it
+    claimed = (
+        db.query(RefreshToken)
+        .filter(
+            RefreshToken.id == stored.id,
+            RefreshToken.revoked_at.is_(None),
+            RefreshToken.expires_at > now,
+        )
+        .update({RefreshToken.revoked_at: now}, synchronize_session=False)
+    )
+    if not claimed:
+        db.rollback()
+        return None
+
+    return stored.user_id, issue_refresh_token(db, stored.user_id, stored.family_id)
+
+
+def revoke_refresh_token(db: Session, token: str) -> None:
+    """Revoke a refresh token and everything rotated from the same login."""
+    stored = (
+        db.query(RefreshToken).filter(RefreshToken.token_hash == _hash_refresh_token(token)).first()
+    )
+    if stored is not None:
+        _revoke_refresh_family(db, stored.family_id)
+
+
+def purge_expired_tokens(db: Session) -> int:
+    """Delete refresh tokens and revocations past their expiry; returns the count.
+
+    An expired refresh token can't be rotated and an expired access token is
+    rejected on its ``exp`` claim, so neither row is needed any more.
+    """
+    now = datetime.now(timezone.utc)
+    refresh = db.query(RefreshToken).filter(RefreshToken.expires_at <= now).delete()
+    revoked = db.query(RevokedToken).filter(RevokedToken.expires_at <= now).delete()
+    return refresh + revoked
+
+
+def revoke_access_token(db: Session, payload: dict) -> None:
+    """Revoke a decoded access token until it would have expired anyway."""
+    jti = payload.get("jti")
+    if jti:
+        expires_at = datetime.fromtimestamp(payload["exp"], tz=timezone.utc)
+        revocation_list.revoke(db, jti, expires_at)
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db),
@@ -72,7 +167,7 @@ async def get_current_user(
     )
 
     payload = decode_access_token(token)
-    if payload is None:
+    if payload is None or revocation_list.is_revoked(payload.get("jti")):
         raise credentials_exception
 
     user_id_str: str = payload.get("sub")
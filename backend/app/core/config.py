@@ -1,4 +1,5 @@
-from typing import Optional
+from typing import List, Optional
+
 from pydantic_settings import BaseSettings
 
 
@@ -16,7 +17,25 @@ class Settings(BaseSettings):
     # Security
     JWT_SECRET: str = "dev-secret-change-in-production"
     JWT_ALGORITHM: str = "HS256"
-    JWT_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 days
+    JWT_EXPIRE_MINUTES: int = 15  # Access tokens; clients renew with a refresh token
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+
+    # Access token revocation filter
+    REVOCATION_FILTER_CAPACITY: int = 100_000
+    REVOCATION_FILTER_ERROR_RATE: float = 0.001
+    REVOCATION_FILTER_REFRESH_SECONDS: int = 30
+
+    # Password hashing
+    BCRYPT_ROUNDS: int = 12  # Raising this rehashes passwords on next login
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE_LIMIT: int = 32
+
+    # Login throttling (token buckets)
+    AUTH_THROTTLE_BACKEND: str = "memory"  # "memory" or "postgres"
+    AUTH_THROTTLE_IP_CAPACITY: int = 20
+    AUTH_THROTTLE_IP_PER_MINUTE: float = 10.0
+    AUTH_THROTTLE_EMAIL_CAPACITY: int = 5
+    AUTH_THROTTLE_EMAIL_PER_MINUTE: float = 1.0
 
     # External APIs
     RESEND_API_KEY: Optional[str] = None
@@ -25,6 +44,46 @@ class Settings(BaseSettings):
     R2_SECRET_ACCESS_KEY: Optional[str] = None
     R2_BUCKET_NAME: Optional[str] = None
 
+    # Sending
+    SEND_LEASE_SECONDS: int = 120  # A send that hasn't finished by then may be retried
+    SEND_QUEUE_BATCH_SIZE: int = 20  # Queued sends a worker takes at a time
+    SEND_QUEUE_VISIBILITY_SECONDS: int = 900  # Taken sends reappear after this if unfinished
+    SEND_QUEUE_MAX_ATTEMPTS: int = 5
+
+    # Recurring invoices
+    RECURRING_BATCH_SIZE: int = 500  # Definitions issued per transaction
+
+    # Payment reminders
+    INVOICE_PAYMENT_TERMS_DAYS: int = 30  # Due date given to invoices sent without one
+    REMINDER_DAYS_OVERDUE: List[int] = [1, 7, 14, 30]  # One reminder at each
+    REMINDER_CATCH_UP_DAYS: int = (
+        7  # A reminder missed by a stopped scheduler is still sent this late
+    )
+    REMINDER_BATCH_SIZE: int = 500  # Overdue invoices scanned per transaction
+
+    # Caching
+    PROFILE_CACHE_TTL_SECONDS: int = 300
+    PROFILE_CACHE_ENTRIES: int = 10_000
+    LOGO_CACHE_ENTRIES: int = 256
+    CATALOG_INDEX_TTL_SECONDS: int = 600  # Rebuilt after this, to pick up other workers' writes
+    CATALOG_INDEX_USERS: int = 1000
+
+    # Uploads
+    LOGO_MAX_UPLOAD_BYTES: int = 10 * 1024 * 1024
+
+    # Bulk operations
+    BULK_INVOICE_MAX_ITEMS: int = 1000
+    IMPORT_CHUNK_INVOICES: int = 5000  # Invoices per COPY batch in CSV imports
+    EXPORT_BATCH_ROWS: int = 2000  # Rows fetched per round trip in exports
+    SYNC_MAX_MUTATIONS: int = 200  # Operations per POST /sync/mutations
+
+    # Idempotency keys
+    IDEMPOTENCY_KEY_TTL_SECONDS: int = 24 * 60 * 60  # How long responses are replayed
+    IDEMPOTENCY_KEY_STALE_SECONDS: int = (
+        300  # An unfinished request's key can be reclaimed after this
+    )
+    IDEMPOTENCY_CACHE_ENTRIES: int = 1024
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -1,3 +1,6 @@
+import enum
+from typing import List, Type
+
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
@@ -10,6 +13,14 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+def enum_values(enum_cls: Type[enum.Enum]) -> List[str]:
+    """Labels for an Enum column: member values, as the migrations create the types.
+
+    Pass as ``values_callable``; SQLAlchemy would otherwise use member names.
+    """
+    return [member.value for member in enum_cls]
+
+
 def get_db():
     """Database session dependency."""
     db = SessionLocal()
@@ -0,0 +1,57 @@
+"""Bounded executor for password hashing.
+
+bcrypt is deliberately slow, so running it on the shared request threadpool
+lets a burst of logins starve every other endpoint. Hashing gets its own
+small pool instead, and callers are turned away once the backlog is full.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+from app.core.auth import pwd_context
+from app.core.config import settings
+
+
+class PasswordHasherBusyError(Exception):
+    """Raised when the hashing queue is full."""
+
+
+class PasswordHasher:
+    """Run bcrypt on a dedicated, bounded thread pool."""
+
+    def __init__(self, workers: int, queue_limit: int):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        # Slots cover the jobs running on the workers plus the queued backlog
+        self._slots = threading.BoundedSemaphore(workers + queue_limit)
+
+    async def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHasherBusyError("Password hashing queue is full")
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._executor, fn, *args)
+        finally:
+            self._slots.release()
+
+    async def hash(self, password: str) -> str:
+        """Hash a password with the current cost parameters."""
+        return await self._run(pwd_context.hash, password)
+
+    async def verify_and_update(
+        self, password: str, hashed_password: str
+    ) -> Tuple[bool, Optional[str]]:
+        """Verify a password, returning a new hash if the stored one is outdated."""
+        return await self._run(pwd_context.verify_and_update, password, hashed_password)
+
+    async def dummy_verify(self) -> None:
+        """Spend the same time as a real verify so unknown emails aren't detectable."""
+        await self._run(pwd_context.dummy_verify)
+
+
+# Singleton instance
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    queue_limit=settings.PASSWORD_HASH_QUEUE_LIMIT,
+)
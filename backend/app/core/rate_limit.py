@@ -0,0 +1,199 @@
+"""Token-bucket throttling for authentication endpoints.
+
+Every attempt spends one token and is allowed while the balance stays
+non-negative. Buckets refill continuously up to their capacity. A throttled
+caller's balance bottoms out at -1, so hammering the endpoint doesn't push
+the retry time out indefinitely.
+
+A bucket left alone long enough to refill completely is indistinguishable
+from one that was never used, so idle buckets are dropped: in memory as
+calls come in, and in Postgres by ``AuthThrottle.purge``.
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+MIN_BALANCE = -1.0
+
+
+class InMemoryTokenBucket:
+    """Token buckets held in process memory (single worker deployments)."""
+
+    def __init__(self, capacity: int, per_minute: float):
+        self.capacity = float(capacity)
+        self.rate = per_minute / 60.0
+        self.idle_seconds = (self.capacity - MIN_BALANCE) / self.rate
+        # Ordered by last use, so idle buckets are always at the front
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, key: str, db: Optional[Session] = None, cost: float = 1) -> float:
+        """Spend ``cost`` tokens (negative to give them back).
+
+        Returns 0 if allowed, else seconds until the next token.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._evict_idle(now)
+            tokens, last = self._buckets.pop(key, (self.capacity, now))
+            tokens = min(self.capacity, tokens + (now - last) * self.rate)
+            tokens = max(min(self.capacity, tokens - cost), MIN_BALANCE)
+            self._buckets[key] = (tokens, now)
+        return 0.0 if tokens >= 0 else -tokens / self.rate
+
+    def _evict_idle(self, now: float) -> None:
+        """Drop buckets that have had time to refill completely."""
+        while self._buckets:
+            key, (_, last) = next(iter(self._buckets.items()))
+            if now - last < self.idle_seconds:
+                break
+            del self._buckets[key]
+
+    def reset(self) -> None:
+        """Forget all bucket state."""
+        with self._lock:
+            self._buckets.clear()
+
+
+class PostgresTokenBucket:
+    """Token buckets stored in Postgres so every API worker shares them."""
+
+    _CONSUME_SQL = text("""
+        INSERT INTO auth_throttle_buckets AS b (key, tokens, updated_at)
+        VALUES (:key, LEAST(:capacity, :capacity - :cost), now())
+        ON CONFLICT (key) DO UPDATE SET
+            tokens = GREATEST(
+                :min_balance,
+                LEAST(
+                    :capacity,
+                    LEAST(
+                        :capacity,
+                        b.tokens + EXTRACT(EPOCH FROM now() - b.updated_at) * :rate
+                    ) - :cost
+                )
+            ),
+            updated_at = now()
+        RETURNING tokens
+        """)
+
+    _PURGE_SQL = text("""
+        DELETE FROM auth_throttle_buckets
+        WHERE updated_at < now() - make_interval(secs => :idle_seconds)
+        """)
+
+    def __init__(self, capacity: int, per_minute: float):
+        self.capacity = float(capacity)
+        self.rate = per_minute / 60.0
+        self.idle_seconds = (self.capacity - MIN_BALANCE) / self.rate
+
+    def consume(self, key: str, db: Optional[Session] = None, cost: float = 1) -> float:
+        """Spend ``cost`` tokens (negative to give them back).
+
+        Returns 0 if allowed, else seconds until the next token.
+        """
+        tokens = db.execute(
+            self._CONSUME_SQL,
+            {
+                "key": key,
+                "cost": cost,
+                "capacity": self.capacity,
+                "rate": self.rate,
+                "min_balance": MIN_BALANCE,
+            },
+        ).scalar_one()
+        # Commit straight away so the row lock isn't held across bcrypt
+        db.commit()
+        return 0.0 if tokens >= 0 else -tokens / self.rate
+
+    @classmethod
+    def purge(cls, db: Session, idle_seconds: float) -> int:
+        """Delete rows untouched for ``idle_seconds``; returns the number deleted."""
+        return db.execute(cls._PURGE_SQL, {"idle_seconds": idle_seconds}).rowcount
+
+    def reset(self) -> None:
+        """Rows are removed by ``AuthThrottle.purge``; nothing to clear in process."""
+
+
+class AuthThrottle:
+    """Per-IP and per-email throttling for login and registration."""
+
+    def __init__(self, backend: str = "memory"):
+        self.backend = backend
+        bucket_cls = PostgresTokenBucket if backend == "postgres" else InMemoryTokenBucket
+        self.ip_buckets = bucket_cls(
+            settings.AUTH_THROTTLE_IP_CAPACITY, settings.AUTH_THROTTLE_IP_PER_MINUTE
+        )
+        self.email_buckets = bucket_cls(
+            settings.AUTH_THROTTLE_EMAIL_CAPACITY, settings.AUTH_THROTTLE_EMAIL_PER_MINUTE
+        )
+
+    @staticmethod
+    def _email_key(ip: Optional[str], email: str, per_ip: bool) -> str:
+        if per_ip:
+            return f"email:{email.lower()}|ip:{ip or 'unknown'}"
+        return f"email:{email.lower()}"
+
+    def check(
+        self,
+        db: Session,
+        ip: Optional[str],
+        email: Optional[str] = None,
+        email_per_ip: bool = False,
+    ) -> None:
+        """Raise 429 if either the client IP or the target email is over its limit.
+
+        With ``email_per_ip`` the email bucket is kept per (email, IP), so
+        failed attempts from elsewhere can't lock the owner of an address out.
+        """
+        retry_after = self.ip_buckets.consume(f"ip:{ip or 'unknown'}", db)
+        if email:
+            retry_after = max(
+                retry_after,
+                self.email_buckets.consume(self._email_key(ip, email, email_per_ip), db),
+            )
+        if retry_after > 0:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many attempts. Please try again later.",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+
+    def succeeded(
+        self, db: Session, ip: Optional[str], email: str, email_per_ip: bool = False
+    ) -> None:
+        """Give back the email token a successful attempt spent.
+
+        Only failures count against an address, so signing in often is never
+        throttled.
+        """
+        self.email_buckets.consume(self._email_key(ip, email, email_per_ip), db, cost=-1)
+
+    def purge(self, db: Session) -> int:
+        """Delete shared bucket rows that have refilled; returns the number deleted.
+
+        The IP and email buckets share one table, so rows are kept until the
+        slower of the two would have refilled.
+        """
+        if self.backend != "postgres":
+            return 0
+        return PostgresTokenBucket.purge(
+            db, max(self.ip_buckets.idle_seconds, self.email_buckets.idle_seconds)
+        )
+
+    def reset(self) -> None:
+        """Clear in-process bucket state (used by tests)."""
+        self.ip_buckets.reset()
+        self.email_buckets.reset()
+
+
+# Singleton instance
+auth_throttle = AuthThrottle(backend=settings.AUTH_THROTTLE_BACKEND)
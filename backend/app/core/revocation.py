@@ -0,0 +1,139 @@
+"""Access token revocation backed by an in-memory Bloom filter.
+
+Revoked token ids live in the ``revoked_tokens`` table. Each worker keeps a
+Bloom filter of them, rebuilt from the table by a background thread started
+with the app, so checking a token never queries the database. A false
+positive (``REVOCATION_FILTER_ERROR_RATE``) rejects a live access token; the
+client recovers by refreshing, which issues a token with a new id.
+"""
+
+import hashlib
+import logging
+import math
+import threading
+from datetime import datetime, timezone
+from typing import Callable, Iterable, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.revoked_token import RevokedToken
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> Iterable[int]:
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, item: str) -> None:
+        """Add an item to the filter."""
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class RevocationList:
+    """Revoked access tokens, checked locally and rebuilt from the database."""
+
+    def __init__(self, capacity: int, error_rate: float, refresh_seconds: int):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.refresh_seconds = refresh_seconds
+        self._filter = BloomFilter(capacity, error_rate)
+        self._lock = threading.Lock()
+        # Ids revoked on this worker while a rebuild's scan is running
+        self._pending: Optional[List[str]] = None
+        # Held for the duration of a rebuild so concurrent callers don't pile up
+        self._rebuilding = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def rebuild(self, db: Session) -> bool:
+        """Reload the filter from unexpired rows of the revocation table.
+
+        Returns False without doing anything if a rebuild is already running.
+        """
+        if not self._rebuilding.acquire(blocking=False):
+            return False
+        try:
+            with self._lock:
+                self._pending = []
+            now = datetime.now(timezone.utc)
+            bloom = BloomFilter(self.capacity, self.error_rate)
+            for (jti,) in db.query(RevokedToken.jti).filter(RevokedToken.expires_at > now):
+                bloom.add(jti)
+            with self._lock:
+                for jti in self._pending:
+                    bloom.add(jti)
+                self._filter = bloom
+            return True
+        finally:
+            with self._lock:
+                self._pending = None
+            self._rebuilding.release()
+
+    def _refresh(self, session_factory: Callable[[], Session]) -> None:
+        try:
+            with session_factory() as db:
+                self.rebuild(db)
+        except Exception:
+            logger.exception("Could not rebuild the token revocation filter")
+
+    def start(self, session_factory: Callable[[], Session]) -> None:
+        """Build the filter now and keep rebuilding it every ``refresh_seconds``."""
+        self._refresh(session_factory)
+        self._stop.clear()
+
+        def run() -> None:
+            while not self._stop.wait(self.refresh_seconds):
+                self._refresh(session_factory)
+
+        self._thread = threading.Thread(target=run, name="revocation-filter", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background rebuilds."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        """Check whether a token id has been revoked, without touching the database."""
+        return bool(jti) and jti in self._filter
+
+    def revoke(self, db: Session, jti: str, expires_at: datetime) -> None:
+        """Record a revocation and add it to this worker's filter."""
+        db.merge(RevokedToken(jti=jti, expires_at=expires_at))
+        db.commit()
+        with self._lock:
+            self._filter.add(jti)
+            if self._pending is not None:
+                self._pending.append(jti)
+
+    def reset(self) -> None:
+        """Drop the local filter (used by tests)."""
+        with self._lock:
+            self._filter = BloomFilter(self.capacity, self.error_rate)
+
+
+# Singleton instance
+revocation_list = RevocationList(
+    capacity=settings.REVOCATION_FILTER_CAPACITY,
+    error_rate=settings.REVOCATION_FILTER_ERROR_RATE,
+    refresh_seconds=settings.REVOCATION_FILTER_REFRESH_SECONDS,
+)
@@ -0,0 +1,50 @@
+"""Conditional GETs: strong ETags and 304 Not Modified.
+
+Read endpoints work out an ETag from cheap stamps (ids, version counters,
+``updated_at``) before building the response body. A client that sends the
+same tag back in ``If-None-Match`` gets an empty 304 and keeps its copy.
+
+    etag = make_etag(invoice.id, invoice.version, invoice.updated_at)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return json_response(..., headers=cache_headers(etag))
+"""
+
+import hashlib
+from typing import Any, Dict
+
+from fastapi import Request, status
+from fastapi.responses import Response
+
+# Responses are per user, and clients revalidate before reusing them
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    """Return a strong ETag over the given values."""
+    digest = hashlib.blake2b("\x1f".join(str(part) for part in parts).encode(), digest_size=16)
+    return f'"{digest.hexdigest()}"'
+
+
+def cache_headers(etag: str) -> Dict[str, str]:
+    """Headers that go on every response carrying ``etag``."""
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's ``If-None-Match`` already names ``etag``.
+
+    If-None-Match uses weak comparison, so a ``W/`` prefix on the client's
+    copy is ignored.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(candidate.strip().removeprefix("W/") == etag for candidate in header.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    """Empty 304 response for a client whose copy is current."""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers(etag))
@@ -1,14 +1,29 @@
 """FastAPI application."""
+
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.api import auth, catalog, clients, invoices, profile, recurring, sync
 from app.core.config import settings
-from app.api import auth, profile, invoices
+from app.core.database import SessionLocal
+from app.core.revocation import revocation_list
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Keep this worker's token revocation filter in sync with the database."""
+    revocation_list.start(SessionLocal)
+    yield
+    revocation_list.stop()
+
 
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
     debug=settings.DEBUG,
+    lifespan=lifespan,
 )
 
 # CORS middleware for frontend
@@ -24,6 +39,10 @@ app.add_middleware(
 app.include_router(auth.router)
 app.include_router(profile.router)
 app.include_router(invoices.router)
+app.include_router(sync.router)
+app.include_router(catalog.router)
+app.include_router(recurring.router)
+app.include_router(clients.router)
 
 
 @app.get("/health")
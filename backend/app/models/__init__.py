@@ -1,8 +1,19 @@
 """Database models."""
-from app.models.user import User
+
+from app.models.auth_throttle import AuthThrottleBucket
 from app.models.business_profile import BusinessProfile
-from app.models.invoice import Invoice, TradeType, InvoiceStatus
+from app.models.catalog_item import CatalogItem
+from app.models.client import Client
+from app.models.idempotency_key import IdempotencyKey
+from app.models.invoice import Invoice, InvoiceStatus, TradeType
+from app.models.invoice_change import InvoiceChangeCounter, InvoiceTombstone
+from app.models.invoice_reminder import InvoiceReminder
+from app.models.invoice_stats import InvoiceMonthlyStats
 from app.models.line_item import LineItem, LineItemCategory
+from app.models.recurring_invoice import QueuedSend, RecurrenceFrequency, RecurringInvoice
+from app.models.refresh_token import RefreshToken
+from app.models.revoked_token import RevokedToken
+from app.models.user import User
 
 __all__ = [
     "User",
@@ -12,4 +23,17 @@ __all__ = [
     "InvoiceStatus",
     "LineItem",
     "LineItemCategory",
+    "AuthThrottleBucket",
+    "RefreshToken",
+    "RevokedToken",
+    "InvoiceMonthlyStats",
+    "InvoiceChangeCounter",
+    "InvoiceTombstone",
+    "IdempotencyKey",
+    "CatalogItem",
+    "RecurringInvoice",
+    "RecurrenceFrequency",
+    "QueuedSend",
+    "InvoiceReminder",
+    "Client",
 ]
@@ -0,0 +1,16 @@
+"""Auth throttle bucket database model."""
+
+from sqlalchemy import Column, DateTime, Float, String
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class AuthThrottleBucket(Base):
+    """Token bucket state shared by all API workers."""
+
+    __tablename__ = "auth_throttle_buckets"
+
+    key = Column(String(320), primary_key=True)  # e.g. "ip:1.2.3.4", "email:a@b.com"
+    tokens = Column(Float, nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
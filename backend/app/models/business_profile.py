@@ -1,5 +1,6 @@
 """Business profile database model."""
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -17,6 +18,7 @@ class BusinessProfile(Base):
     phone = Column(String(50))
     email = Column(String(255))
     license_number = Column(String(100))
+    logo_key = Column(String(500), nullable=True)  # Prepared logo in object storage
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
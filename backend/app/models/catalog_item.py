@@ -0,0 +1,47 @@
+"""Catalog item database model."""
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Integer,
+    Numeric,
+    String,
+    UniqueConstraint,
+)
+from sqlalchemy import (
+    Enum as SQLEnum,
+)
+from sqlalchemy.sql import func
+
+from app.core.database import Base, enum_values
+from app.models.line_item import LineItemCategory
+
+
+class CatalogItem(Base):
+    """A saved part or labor rate, suggested while typing line items.
+
+    Learned from the user's own line items (see app.services.catalog) and
+    editable by them.
+    """
+
+    __tablename__ = "catalog_items"
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id",
+            "description",
+            "category",
+            name="uq_catalog_items_user_id_description_category",
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    description = Column(String(500), nullable=False)
+    unit_price = Column(Numeric(10, 2), nullable=False)  # Last price it was billed at
+    category = Column(SQLEnum(LineItemCategory, values_callable=enum_values), nullable=False)
+    # How many line items used it; suggestions rank by this
+    use_count = Column(Integer, nullable=False, default=0, server_default="0")
+    last_used_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
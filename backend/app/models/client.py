@@ -0,0 +1,55 @@
+"""Client database model."""
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, UniqueConstraint
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class Client(Base):
+    """A client of the business, as billed on its invoices.
+
+    Invoices keep their own copy of the client's name, email and address;
+    each is linked to the client whose normalized name, email and address
+    match (see app.services.clients), so clients are never entered twice.
+    The display fields follow the most recent invoice's spelling.
+    """
+
+    __tablename__ = "clients"
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id",
+            "name_key",
+            "email_key",
+            "address_key",
+            name="uq_clients_user_id_name_key_email_key_address_key",
+        ),
+        # Autocomplete: GET /clients?prefix=... matches name and email
+        # prefixes. The migration also adds trigram indexes on PostgreSQL,
+        # for words further into the name.
+        Index(
+            "ix_clients_user_id_name_key",
+            "user_id",
+            "name_key",
+            postgresql_ops={"name_key": "text_pattern_ops"},
+        ),
+        Index(
+            "ix_clients_user_id_email_key",
+            "user_id",
+            "email_key",
+            postgresql_ops={"email_key": "text_pattern_ops"},
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    name = Column(String(255), nullable=False)
+    email = Column(String(255), nullable=False)
+    address = Column(String(500), nullable=False)
+    # Lowercased, with runs of whitespace collapsed to one space
+    name_key = Column(String(255), nullable=False)
+    email_key = Column(String(255), nullable=False)
+    address_key = Column(String(500), nullable=False)
+    last_invoiced_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -0,0 +1,26 @@
+"""Idempotency key database model."""
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class IdempotencyKey(Base):
+    """Stored outcome of a write made under a client-chosen key.
+
+    A retry with the same key gets the stored outcome back instead of
+    applying the write again. ``request_hash`` catches a key being reused
+    for a different request.
+    """
+
+    __tablename__ = "idempotency_keys"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    key = Column(String(255), primary_key=True)
+    scope = Column(String(50), nullable=False)  # Which kind of write, e.g. "sync"
+    request_hash = Column(String(64), nullable=False)
+    # Both null while the first request under the key is still running
+    status_code = Column(Integer, nullable=True)
+    response = Column(Text, nullable=True)  # Encoded JSON
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
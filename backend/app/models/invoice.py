@@ -1,14 +1,32 @@
 """Invoice database model."""
-from sqlalchemy import Column, Integer, String, Numeric, DateTime, ForeignKey, Enum as SQLEnum
+
+import enum
+
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Computed,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    Numeric,
+    String,
+    text,
+)
+from sqlalchemy import (
+    Enum as SQLEnum,
+)
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-import enum
 
-from app.core.database import Base
+from app.core.database import Base, enum_values
 
 
 class TradeType(str, enum.Enum):
     """Trade types for invoices."""
+
     PLUMBING = "plumbing"
     ELECTRICAL = "electrical"
     HVAC = "hvac"
@@ -16,25 +34,69 @@ class TradeType(str, enum.Enum):
 
 class InvoiceStatus(str, enum.Enum):
     """Status of an invoice."""
+
     DRAFT = "draft"
     SENT = "sent"
     PAID = "paid"
 
 
+# Statuses an invoice may move to from each status, for bulk transitions
+STATUS_TRANSITIONS = {
+    InvoiceStatus.DRAFT: {InvoiceStatus.SENT, InvoiceStatus.PAID},
+    InvoiceStatus.SENT: {InvoiceStatus.PAID},
+    InvoiceStatus.PAID: set(),
+}
+
+
 class Invoice(Base):
     """Invoice for a job."""
 
     __tablename__ = "invoices"
+    __table_args__ = (
+        # Invoice list filters: GET /invoices?status=...&trade_type=...&created_from=...
+        Index("ix_invoices_user_id_created_at", "user_id", "created_at"),
+        Index("ix_invoices_user_id_status_created_at", "user_id", "status", "created_at"),
+        Index("ix_invoices_user_id_trade_type_created_at", "user_id", "trade_type", "created_at"),
+        # Delta sync: GET /invoices/changes?since=...
+        Index("ix_invoices_user_id_change_seq", "user_id", "change_seq"),
+        # Client history: GET /clients/{id}/invoices
+        Index("ix_invoices_client_id_created_at", "client_id", "created_at"),
+        # Reminder scan (app.services.reminders): unpaid invoices by due date
+        Index(
+            "ix_invoices_due_date_sent",
+            "due_date",
+            postgresql_where=text("status = 'sent'"),
+            sqlite_where=text("status = 'sent'"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     client_name = Column(String(255), nullable=False)
     client_email = Column(String(255), nullable=False)
     job_address = Column(String(500), nullable=False)
-    trade_type = Column(SQLEnum(TradeType), nullable=False)
+    # Directory entry matching the client fields above (app.services.clients)
+    client_id = Column(Integer, ForeignKey("clients.id"), nullable=True)
+    trade_type = Column(SQLEnum(TradeType, values_callable=enum_values), nullable=False)
     tax_rate = Column(Numeric(5, 2), nullable=False, default=0)  # e.g., 8.25 for 8.25%
-    status = Column(SQLEnum(InvoiceStatus), nullable=False, default=InvoiceStatus.DRAFT)
+    # Tax rate in basis points for the integer money engine (app.money)
+    tax_rate_bps = Column(
+        Integer, Computed("CAST(ROUND(tax_rate * 100) AS INTEGER)", persisted=True)
+    )
+    status = Column(
+        SQLEnum(InvoiceStatus, values_callable=enum_values),
+        nullable=False,
+        default=InvoiceStatus.DRAFT,
+    )
     pdf_url = Column(String(500), nullable=True)
+    # When payment is due; sending fills it in from the payment terms if unset
+    due_date = Column(Date, nullable=True)
+    # Set while a send is rendering and emailing; the lease lapses at this time
+    sending_until = Column(DateTime(timezone=True), nullable=True)
+    # Bumped on every write; updates that carry a stale version are rejected
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    # Per-user change sequence number of the last write (app.services.invoice_changes)
+    change_seq = Column(BigInteger, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -48,4 +110,5 @@ class Invoice(Base):
     def totals(self):
         """Calculate and return invoice totals."""
         from app.api.invoices import calculate_invoice_totals
+
         return calculate_invoice_totals(self)
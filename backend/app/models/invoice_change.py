@@ -0,0 +1,35 @@
+"""Invoice change tracking database models."""
+
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Index, Integer
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class InvoiceChangeCounter(Base):
+    """Last change sequence number handed out for a user's invoices.
+
+    Drawing the next number updates this row, which locks it until the
+    writing transaction ends; a user's change numbers therefore become
+    visible in the order they were drawn (see app.services.invoice_changes).
+    """
+
+    __tablename__ = "invoice_change_counters"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    last_seq = Column(BigInteger, nullable=False, default=0)
+
+
+class InvoiceTombstone(Base):
+    """Marker left behind by a deleted invoice, so sync clients can drop it."""
+
+    __tablename__ = "invoice_tombstones"
+    __table_args__ = (
+        # Delta sync: GET /invoices/changes?since=...
+        Index("ix_invoice_tombstones_user_id_change_seq", "user_id", "change_seq"),
+    )
+
+    invoice_id = Column(Integer, primary_key=True)  # The deleted invoice's id; no foreign key
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    change_seq = Column(BigInteger, nullable=False)
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now())
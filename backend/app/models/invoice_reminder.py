@@ -0,0 +1,38 @@
+"""Payment reminder database model."""
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, Text, UniqueConstraint, text
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class InvoiceReminder(Base):
+    """A payment reminder for an overdue invoice: queued, then sent.
+
+    ``stage`` counts from 1 through ``REMINDER_DAYS_OVERDUE``; an invoice
+    gets at most one reminder per stage, which is what keeps reminders from
+    going out twice. Rows stay once sent, as the invoice's reminder history.
+    """
+
+    __tablename__ = "invoice_reminders"
+    __table_args__ = (
+        UniqueConstraint("invoice_id", "stage", name="uq_invoice_reminders_invoice_id_stage"),
+        # Delivery: reminders still to send, oldest first
+        Index(
+            "ix_invoice_reminders_available_at",
+            "available_at",
+            postgresql_where=text("sent_at IS NULL"),
+            sqlite_where=text("sent_at IS NULL"),
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    invoice_id = Column(Integer, ForeignKey("invoices.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    stage = Column(Integer, nullable=False)
+    # Hidden from other workers until then while it is being sent
+    available_at = Column(DateTime(timezone=True), nullable=False)
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    last_error = Column(Text, nullable=True)
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,24 @@
+"""Invoice monthly rollup database model."""
+
+from sqlalchemy import BigInteger, Column, Date, ForeignKey, Integer
+from sqlalchemy import Enum as SQLEnum
+
+from app.core.database import Base, enum_values
+from app.models.invoice import InvoiceStatus, TradeType
+
+
+class InvoiceMonthlyStats(Base):
+    """Invoice count and total per user, creation month, status and trade.
+
+    Maintained incrementally by app.services.invoice_stats on every invoice
+    write, so the dashboard never has to scan invoices.
+    """
+
+    __tablename__ = "invoice_monthly_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    month = Column(Date, primary_key=True)  # First day of the month the invoice was created
+    status = Column(SQLEnum(InvoiceStatus, values_callable=enum_values), primary_key=True)
+    trade_type = Column(SQLEnum(TradeType, values_callable=enum_values), primary_key=True)
+    invoice_count = Column(Integer, nullable=False, default=0)
+    total_cents = Column(BigInteger, nullable=False, default=0)
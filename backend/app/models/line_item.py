@@ -1,13 +1,27 @@
 """LineItem database model."""
-from sqlalchemy import Column, Integer, String, Numeric, ForeignKey, Enum as SQLEnum
-from sqlalchemy.orm import relationship
+
 import enum
 
-from app.core.database import Base
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Computed,
+    ForeignKey,
+    Integer,
+    Numeric,
+    String,
+)
+from sqlalchemy import (
+    Enum as SQLEnum,
+)
+from sqlalchemy.orm import relationship
+
+from app.core.database import Base, enum_values
 
 
 class LineItemCategory(str, enum.Enum):
     """Categories for line items."""
+
     PARTS = "parts"
     LABOR = "labor"
 
@@ -22,7 +36,14 @@ class LineItem(Base):
     description = Column(String(500), nullable=False)
     quantity = Column(Numeric(10, 2), nullable=False)
     unit_price = Column(Numeric(10, 2), nullable=False)
-    category = Column(SQLEnum(LineItemCategory), nullable=False)
+    # Integer mirrors for the money engine (app.money), maintained by the database
+    quantity_hundredths = Column(
+        BigInteger, Computed("CAST(ROUND(quantity * 100) AS BIGINT)", persisted=True)
+    )
+    unit_price_cents = Column(
+        BigInteger, Computed("CAST(ROUND(unit_price * 100) AS BIGINT)", persisted=True)
+    )
+    category = Column(SQLEnum(LineItemCategory, values_callable=enum_values), nullable=False)
 
     # Relationships
     invoice = relationship("Invoice", back_populates="line_items")
@@ -0,0 +1,81 @@
+"""Recurring invoice database models."""
+
+import enum
+
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    Text,
+    text,
+)
+from sqlalchemy import (
+    Enum as SQLEnum,
+)
+from sqlalchemy.sql import func
+
+from app.core.database import Base, enum_values
+
+
+class RecurrenceFrequency(str, enum.Enum):
+    """How often a recurring invoice is issued."""
+
+    WEEKLY = "weekly"
+    MONTHLY = "monthly"
+    QUARTERLY = "quarterly"
+    YEARLY = "yearly"
+
+
+class RecurringInvoice(Base):
+    """A schedule that issues copies of a template invoice.
+
+    Each run copies the template's client, address and line items into a new
+    draft (see app.services.recurring) and moves ``next_run_at`` on by the
+    frequency.
+    """
+
+    __tablename__ = "recurring_invoices"
+    __table_args__ = (
+        # Scheduler: active definitions that are due, oldest first
+        Index(
+            "ix_recurring_invoices_next_run_at",
+            "next_run_at",
+            postgresql_where=text("active"),
+            sqlite_where=text("active"),
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    template_invoice_id = Column(Integer, ForeignKey("invoices.id"), nullable=False, index=True)
+    frequency = Column(SQLEnum(RecurrenceFrequency, values_callable=enum_values), nullable=False)
+    # Day of the month runs fall on, clamped to shorter months
+    anchor_day = Column(Integer, nullable=False)
+    next_run_at = Column(DateTime(timezone=True), nullable=False)
+    active = Column(Boolean, nullable=False, default=True, server_default=text("true"))
+    # Queue each issued invoice to be sent to the client
+    auto_send = Column(Boolean, nullable=False, default=False, server_default=text("false"))
+    last_run_at = Column(DateTime(timezone=True), nullable=True)
+    last_invoice_id = Column(Integer, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+
+class QueuedSend(Base):
+    """An invoice waiting to be sent by app.commands.send_queued.
+
+    A worker hides the rows it takes until ``available_at``, so a worker
+    that dies leaves them to be picked up again.
+    """
+
+    __tablename__ = "invoice_send_queue"
+
+    invoice_id = Column(Integer, ForeignKey("invoices.id"), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    available_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    last_error = Column(Text, nullable=True)
+    queued_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,18 @@
+"""Revoked access token database model."""
+
+from sqlalchemy import Column, DateTime, String
+
+from app.core.database import Base
+
+
+class RevokedToken(Base):
+    """Access token revoked before its natural expiry.
+
+    Rows are only needed until ``expires_at``; after that the JWT is rejected
+    on its own ``exp`` claim.
+    """
+
+    __tablename__ = "revoked_tokens"
+
+    jti = Column(String(32), primary_key=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
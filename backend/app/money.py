@@ -0,0 +1,196 @@
+"""Exact money arithmetic in integer cents.
+
+Quantities are held in hundredths, prices in cents and tax rates in basis
+points (hundredths of a percent), matching the ``Numeric(_, 2)`` columns they
+come from. A line's exact value is ``quantity_hundredths * unit_price_cents``,
+in hundredths of a cent. Sums stay exact, and rounding to whole cents
+(half up) happens once per reported figure, so totals never drift.
+
+Totals for many invoices are computed in one pass over flat columnar arrays,
+not one invoice at a time.
+"""
+
+from array import array
+from dataclasses import dataclass, field
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Dict, Hashable, Iterable, List, Sequence, Tuple, Union
+
+from app.models.line_item import LineItemCategory
+
+# Category order used for the per-category accumulators
+CATEGORIES: List[str] = [category.value for category in LineItemCategory]
+# Keyed by both enum member and plain value (str enums hash by name)
+_CATEGORY_INDEX = {
+    key: i for i, category in enumerate(LineItemCategory) for key in (category, category.value)
+}
+
+# Exact line values are in hundredths of a cent
+_LINE_SCALE = 100
+# Tax rates are in basis points; 10000 bps == 100%
+_BPS_SCALE = 10000
+
+Number = Union[Decimal, float, int, str]
+
+
+def to_hundredths(value: Number) -> int:
+    """Convert an amount with two decimal places to an integer count of hundredths."""
+    if not isinstance(value, Decimal):
+        value = Decimal(str(value))
+    return int((value * 100).to_integral_value(rounding=ROUND_HALF_UP))
+
+
+# Prices are hundredths of a dollar, tax rates hundredths of a percent
+to_cents = to_hundredths
+to_basis_points = to_hundredths
+
+
+def cents_to_float(cents: int) -> float:
+    """Convert cents to the float dollars the API schemas expose."""
+    return cents / 100
+
+
+@dataclass
+class TotalsCents:
+    """Totals for one invoice, in cents."""
+
+    subtotal: int
+    tax_amount: int
+    total: int
+    by_category: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class TotalsBatch:
+    """Columnar input for computing many invoices' totals at once.
+
+    ``tax_rate_bps`` has one entry per invoice. The line arrays have one entry
+    per line item, where ``line_invoice`` is the index of the owning invoice
+    and ``line_category`` indexes ``CATEGORIES``.
+    """
+
+    tax_rate_bps: array = field(default_factory=lambda: array("q"))
+    line_invoice: array = field(default_factory=lambda: array("q"))
+    line_quantity: array = field(default_factory=lambda: array("q"))
+    line_unit_price: array = field(default_factory=lambda: array("q"))
+    line_category: array = field(default_factory=lambda: array("b"))
+
+    def add_invoice(self, tax_rate_bps: int) -> int:
+        """Append an invoice and return its index."""
+        self.tax_rate_bps.append(tax_rate_bps)
+        return len(self.tax_rate_bps) - 1
+
+    def add_line(
+        self, invoice_index: int, quantity_hundredths: int, unit_price_cents: int, category: str
+    ) -> None:
+        """Append a line item belonging to an already-added invoice."""
+        self.line_invoice.append(invoice_index)
+        self.line_quantity.append(quantity_hundredths)
+        self.line_unit_price.append(unit_price_cents)
+        self.line_category.append(_CATEGORY_INDEX[category])
+
+    @classmethod
+    def from_rows(
+        cls,
+        tax_rates: Iterable[Tuple[Hashable, int]],
+        lines: Iterable[Tuple[Hashable, int, int, Union[str, LineItemCategory]]],
+    ) -> "TotalsBatch":
+        """Build a batch from plain column rows, as returned by a SQL query.
+
+        ``tax_rates`` yields ``(invoice_key, tax_rate_bps)`` and ``lines`` yields
+        ``(invoice_key, quantity_hundredths, unit_price_cents, category)``.
+        Results come back in ``tax_rates`` order.
+        """
+        batch = cls()
+        positions = {}
+        for key, tax_rate_bps in tax_rates:
+            positions[key] = len(batch.tax_rate_bps)
+            batch.tax_rate_bps.append(tax_rate_bps)
+        category_index = _CATEGORY_INDEX
+        line_invoice = batch.line_invoice.append
+        line_quantity = batch.line_quantity.append
+        line_unit_price = batch.line_unit_price.append
+        line_category = batch.line_category.append
+        for key, quantity, unit_price, category in lines:
+            line_invoice(positions[key])
+            line_quantity(quantity)
+            line_unit_price(unit_price)
+            line_category(category_index[category])
+        return batch
+
+    @classmethod
+    def from_invoices(cls, invoices: Iterable) -> "TotalsBatch":
+        """Build a batch from Invoice rows with their line items loaded."""
+        batch = cls()
+        category_index = _CATEGORY_INDEX
+        line_invoice = batch.line_invoice.append
+        line_quantity = batch.line_quantity.append
+        line_unit_price = batch.line_unit_price.append
+        line_category = batch.line_category.append
+        for index, invoice in enumerate(invoices):
+            tax_bps = invoice.tax_rate_bps
+            batch.tax_rate_bps.append(
+                tax_bps if tax_bps is not None else to_basis_points(invoice.tax_rate)
+            )
+            for item in invoice.line_items:
+                quantity = item.quantity_hundredths
+                unit_price = item.unit_price_cents
+                # Rows not yet flushed don't have their generated columns
+                if quantity is None or unit_price is None:
+                    quantity = to_hundredths(item.quantity)
+                    unit_price = to_cents(item.unit_price)
+                line_invoice(index)
+                line_quantity(quantity)
+                line_unit_price(unit_price)
+                line_category(category_index[item.category])
+        return batch
+
+
+def compute_totals(batch: TotalsBatch) -> List[TotalsCents]:
+    """Compute subtotal, tax, total and category breakdown for every invoice."""
+    invoice_count = len(batch.tax_rate_bps)
+    category_count = len(CATEGORIES)
+
+    # Single pass over the line columns into one accumulator per
+    # (invoice, category) slot
+    exact = [0] * (invoice_count * category_count)
+    present = bytearray(invoice_count * category_count)
+    slots = map(
+        int.__add__,
+        map(category_count.__mul__, batch.line_invoice),
+        batch.line_category,
+    )
+    for slot, line_value in zip(
+        slots, map(int.__mul__, batch.line_quantity, batch.line_unit_price)
+    ):
+        exact[slot] += line_value
+        present[slot] = 1
+
+    # Column-wise from here on: one list per figure, one entry per invoice.
+    # (2 * n + d) // (2 * d) is n / d rounded half up.
+    line_scale = 2 * _LINE_SCALE
+    tax_scale = 2 * _LINE_SCALE * _BPS_SCALE
+    category_columns = [exact[c::category_count] for c in range(category_count)]
+    subtotals = [sum(values) for values in zip(*category_columns)]
+    category_cents = [
+        [(2 * value + _LINE_SCALE) // line_scale for value in column] for column in category_columns
+    ]
+    category_present = [present[c::category_count] for c in range(category_count)]
+
+    subtotal_cents = [(2 * value + _LINE_SCALE) // line_scale for value in subtotals]
+    tax_cents = [
+        (2 * value * rate + tax_scale // 2) // tax_scale
+        for value, rate in zip(subtotals, batch.tax_rate_bps)
+    ]
+    # From the rounded figures, so the printed subtotal and tax add up
+    total_cents = list(map(int.__add__, subtotal_cents, tax_cents))
+    breakdowns = [
+        {name: value for name, value, flag in zip(CATEGORIES, values, flags) if flag}
+        for values, flags in zip(zip(*category_cents), zip(*category_present))
+    ]
+
+    return list(map(TotalsCents, subtotal_cents, tax_cents, total_cents, breakdowns))
+
+
+def compute_invoice_totals(invoices: Sequence) -> List[TotalsCents]:
+    """Compute totals for Invoice rows in one batch."""
+    return compute_totals(TotalsBatch.from_invoices(invoices))
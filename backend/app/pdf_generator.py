@@ -1,26 +1,25 @@
 """PDF generation for invoices."""
+
 import os
-from typing import Dict, List, Any
+from typing import Dict, List
+
 from weasyprint import HTML
 from weasyprint.text.fonts import FontConfiguration
 
-from app.core.config import settings
+from app.services.logo import logo_cache
+from app.services.profile_cache import BusinessRenderContext
 
 
 class InvoicePDFGenerator:
     """Generate PDF invoices from templates."""
 
     def __init__(self):
-        self.template_dir = os.path.join(
-            os.path.dirname(__file__), "templates"
-        )
+        self.template_dir = os.path.join(os.path.dirname(__file__), "templates")
         self.font_config = FontConfiguration()
 
     def _load_template(self, trade_type: str) -> str:
         """Load HTML template for a trade type."""
-        template_path = os.path.join(
-            self.template_dir, f"invoice_{trade_type}.html"
-        )
+        template_path = os.path.join(self.template_dir, f"invoice_{trade_type}.html")
         with open(template_path, "r", encoding="utf-8") as f:
             return f.read()
 
@@ -43,6 +42,15 @@ class InvoicePDFGenerator:
             rows.append(row)
         return "\n".join(rows)
 
+    def _logo_html(self, business_profile: BusinessRenderContext) -> str:
+        """Embed the prepared logo, if the business has one."""
+        if not business_profile.logo_key:
+            return ""
+        data_uri = logo_cache.get_data_uri(business_profile.logo_key)
+        if not data_uri:
+            return ""
+        return f'<img class="business-logo" src="{data_uri}" alt="">'
+
     def _group_line_items(self, line_items: List[Dict]) -> Dict[str, List[Dict]]:
         """Group line items by category (parts/labor)."""
         grouped = {"parts": [], "labor": []}
@@ -63,7 +71,7 @@ class InvoicePDFGenerator:
     def generate_pdf(
         self,
         invoice: Dict,
-        business_profile: Dict,
+        business_profile: BusinessRenderContext,
         line_items: List[Dict],
         compliance_notes: str,
     ) -> bytes:
@@ -78,10 +86,8 @@ class InvoicePDFGenerator:
 
         # Prepare template context
         context = {
-            "business_name": business_profile.get("business_name", ""),
-            "business_phone": business_profile.get("phone", ""),
-            "business_email": business_profile.get("email", ""),
-            "business_license": business_profile.get("license_number", ""),
+            **business_profile.template_fields,
+            "business_logo": self._logo_html(business_profile),
             "client_name": invoice["client_name"],
             "client_email": invoice["client_email"],
             "job_address": invoice["job_address"],
@@ -110,4 +116,4 @@ class InvoicePDFGenerator:
 
 
 # Singleton instance
-pdf_generator = InvoicePDFGenerator()
\ No newline at end of file
+pdf_generator = InvoicePDFGenerator()
@@ -1,41 +1,85 @@
 """Pydantic schemas."""
-from app.schemas.user import (
-    UserCreate,
-    UserLogin,
-    Token,
-    TokenData,
-    UserBase,
-    UserResponse,
-    UserWithProfile,
-)
+
+from app.models.invoice import InvoiceStatus, TradeType
+from app.models.line_item import LineItemCategory
 from app.schemas.business_profile import (
     BusinessProfileBase,
     BusinessProfileCreate,
-    BusinessProfileUpdate,
     BusinessProfileResponse,
+    BusinessProfileUpdate,
+)
+from app.schemas.catalog import (
+    CatalogItemBase,
+    CatalogItemCreate,
+    CatalogItemResponse,
+    CatalogItemUpdate,
+    CatalogSuggestion,
 )
+from app.schemas.client import ClientDetail, ClientResponse
 from app.schemas.invoice import (
+    ExportFormat,
     InvoiceBase,
+    InvoiceBulkCreate,
+    InvoiceBulkItemResult,
+    InvoiceBulkResponse,
+    InvoiceBulkStatusResponse,
+    InvoiceBulkStatusUpdate,
+    InvoiceChanges,
+    InvoiceClone,
     InvoiceCreate,
-    InvoiceUpdate,
-    InvoiceStatusUpdate,
-    InvoiceResponse,
+    InvoiceImportError,
+    InvoiceImportReport,
     InvoiceListResponse,
+    InvoiceReminderResponse,
+    InvoiceResponse,
+    InvoiceSort,
+    InvoiceStats,
+    InvoiceStatusUpdate,
     InvoiceTotals,
+    InvoiceUpdate,
     LineItemSummary,
+    MonthStats,
+    StatusStats,
+    TradeStats,
 )
 from app.schemas.line_item import (
     LineItemBase,
     LineItemCreate,
     LineItemResponse,
+    LineItemUpdate,
+)
+from app.schemas.recurring import (
+    RecurringInvoiceBase,
+    RecurringInvoiceCreate,
+    RecurringInvoiceResponse,
+    RecurringInvoiceUpdate,
+)
+from app.schemas.sync import (
+    CreateInvoiceMutation,
+    SyncMutation,
+    SyncMutationBatch,
+    SyncMutationOutcome,
+    SyncMutationResponse,
+    SyncMutationResult,
+    UpdateInvoiceMutation,
+    UpdateStatusMutation,
+)
+from app.schemas.user import (
+    RefreshTokenRequest,
+    Token,
+    TokenData,
+    UserBase,
+    UserCreate,
+    UserLogin,
+    UserResponse,
+    UserWithProfile,
 )
-from app.models.invoice import TradeType, InvoiceStatus
-from app.models.line_item import LineItemCategory
 
 __all__ = [
     "UserCreate",
     "UserLogin",
     "Token",
+    "RefreshTokenRequest",
     "TokenData",
     "UserBase",
     "UserResponse",
@@ -44,17 +88,53 @@ __all__ = [
     "BusinessProfileCreate",
     "BusinessProfileUpdate",
     "BusinessProfileResponse",
+    "ExportFormat",
     "InvoiceBase",
+    "InvoiceBulkCreate",
+    "InvoiceBulkItemResult",
+    "InvoiceBulkResponse",
+    "InvoiceBulkStatusResponse",
+    "InvoiceBulkStatusUpdate",
+    "InvoiceChanges",
+    "InvoiceClone",
     "InvoiceCreate",
+    "InvoiceImportError",
+    "InvoiceImportReport",
+    "InvoiceReminderResponse",
     "InvoiceUpdate",
     "InvoiceStatusUpdate",
     "InvoiceResponse",
     "InvoiceListResponse",
+    "InvoiceSort",
+    "InvoiceStats",
     "InvoiceTotals",
     "LineItemSummary",
+    "MonthStats",
+    "StatusStats",
+    "TradeStats",
     "LineItemBase",
     "LineItemCreate",
     "LineItemResponse",
+    "LineItemUpdate",
+    "CreateInvoiceMutation",
+    "SyncMutation",
+    "SyncMutationBatch",
+    "SyncMutationOutcome",
+    "SyncMutationResponse",
+    "SyncMutationResult",
+    "UpdateInvoiceMutation",
+    "UpdateStatusMutation",
+    "CatalogItemBase",
+    "CatalogItemCreate",
+    "CatalogItemResponse",
+    "CatalogItemUpdate",
+    "CatalogSuggestion",
+    "ClientDetail",
+    "ClientResponse",
+    "RecurringInvoiceBase",
+    "RecurringInvoiceCreate",
+    "RecurringInvoiceResponse",
+    "RecurringInvoiceUpdate",
     "TradeType",
     "InvoiceStatus",
     "LineItemCategory",
@@ -1,6 +1,8 @@
 """Business profile schemas."""
+
 from datetime import datetime
 from typing import Optional
+
 from pydantic import BaseModel, EmailStr, Field
 
 
@@ -33,6 +35,7 @@ class BusinessProfileResponse(BusinessProfileBase):
 
     id: int
     user_id: int
+    logo_key: Optional[str] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
 
@@ -0,0 +1,45 @@
+"""Pydantic schemas for the line item catalog."""
+
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from app.models.line_item import LineItemCategory
+
+
+class CatalogItemBase(BaseModel):
+    """Base catalog item fields."""
+
+    description: str = Field(..., min_length=1, max_length=500)
+    unit_price: float = Field(..., ge=0)
+    category: LineItemCategory
+
+
+class CatalogItemCreate(CatalogItemBase):
+    """Schema for saving a catalog item by hand."""
+
+    pass
+
+
+class CatalogItemUpdate(CatalogItemBase):
+    """Schema for editing a catalog item."""
+
+    pass
+
+
+class CatalogItemResponse(CatalogItemBase):
+    """Schema for catalog item response."""
+
+    id: int
+    use_count: int
+    last_used_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class CatalogSuggestion(CatalogItemBase):
+    """A catalog item matching what's being typed."""
+
+    id: int
@@ -0,0 +1,33 @@
+"""Pydantic schemas for clients."""
+
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class ClientResponse(BaseModel):
+    """Schema for a client in the directory."""
+
+    id: int
+    name: str
+    email: str
+    address: str
+    last_invoiced_at: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class ClientDetail(ClientResponse):
+    """A client with totals over their invoices.
+
+    ``billed`` counts sent and paid invoices; ``outstanding`` is what is
+    still owed on sent ones.
+    """
+
+    invoice_count: int
+    billed: float
+    paid: float
+    outstanding: float
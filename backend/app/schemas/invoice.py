@@ -1,44 +1,139 @@
 """Pydantic schemas for Invoice."""
-from datetime import datetime
-from typing import List, Optional
-from pydantic import BaseModel, Field, field_validator
 
-from app.models.invoice import TradeType, InvoiceStatus
-from app.schemas.line_item import LineItemResponse, LineItemCreate
+import enum
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from app.core.config import settings
+from app.models.invoice import InvoiceStatus, TradeType
+from app.schemas.line_item import LineItemCreate, LineItemResponse, LineItemUpdate
 
 
 class InvoiceBase(BaseModel):
     """Base invoice fields."""
+
     client_name: str = Field(..., min_length=1, max_length=255)
     client_email: str = Field(..., min_length=1, max_length=255)
     job_address: str = Field(..., min_length=1, max_length=500)
     trade_type: TradeType
     tax_rate: float = Field(..., ge=0, le=100, description="Tax rate as percentage (e.g., 8.25)")
+    due_date: Optional[date] = Field(
+        None, description="When payment is due; set from the payment terms on send if empty"
+    )
 
 
 class InvoiceCreate(InvoiceBase):
     """Schema for creating an invoice."""
+
     line_items: List[LineItemCreate] = Field(..., min_length=1)
 
 
 class InvoiceUpdate(InvoiceBase):
-    """Schema for updating an invoice."""
-    line_items: List[LineItemCreate] = Field(..., min_length=1)
+    """Schema for updating an invoice.
+
+    When ``version`` is given, the update only applies if the invoice is
+    still at that version.
+    """
+
+    line_items: List[LineItemUpdate] = Field(..., min_length=1)
+    version: Optional[int] = None
+
+
+class InvoiceBulkCreate(BaseModel):
+    """Schema for creating many invoices in one request.
+
+    Items are validated one by one against InvoiceCreate, so a bad item is
+    reported without rejecting the rest.
+    """
+
+    invoices: List[Dict[str, Any]] = Field(
+        ..., min_length=1, max_length=settings.BULK_INVOICE_MAX_ITEMS
+    )
+
+
+class InvoiceBulkItemResult(BaseModel):
+    """Outcome for one item of a bulk create, by position in the request."""
+
+    index: int
+    id: Optional[int] = None
+    errors: Optional[List[Dict[str, Any]]] = None
+
+
+class InvoiceBulkResponse(BaseModel):
+    """Schema for the bulk create report."""
+
+    created: int
+    failed: int
+    results: List[InvoiceBulkItemResult]
+
+
+class InvoiceImportError(BaseModel):
+    """A rejected invoice in a CSV import, by line number of its first row."""
+
+    line: int
+    invoice_ref: str
+    error: str
+
+
+class InvoiceImportReport(BaseModel):
+    """Schema for the result of a CSV import."""
+
+    rows_read: int
+    invoices_imported: int
+    line_items_imported: int
+    rows_rejected: int
+    errors: List[InvoiceImportError]
+    error_file_key: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class InvoiceClone(BaseModel):
+    """Fields to change on a copy of an invoice; the rest are copied as they are."""
+
+    client_name: Optional[str] = Field(None, min_length=1, max_length=255)
+    client_email: Optional[str] = Field(None, min_length=1, max_length=255)
+    job_address: Optional[str] = Field(None, min_length=1, max_length=500)
 
 
 class InvoiceStatusUpdate(BaseModel):
     """Schema for updating invoice status."""
+
+    status: InvoiceStatus
+
+
+class InvoiceBulkStatusUpdate(BaseModel):
+    """Schema for moving many invoices to one status."""
+
+    ids: List[int] = Field(..., min_length=1, max_length=settings.BULK_INVOICE_MAX_ITEMS)
+    status: InvoiceStatus
+
+
+class InvoiceBulkStatusResponse(BaseModel):
+    """Schema for the result of a bulk status change.
+
+    ``skipped`` holds ids that were not found, or whose current status
+    can't move to the target.
+    """
+
     status: InvoiceStatus
+    updated: List[int]
+    skipped: List[int]
 
 
 class LineItemSummary(BaseModel):
     """Summary of line items by category."""
+
     category: str
     total: float
 
 
 class InvoiceTotals(BaseModel):
     """Calculated totals for an invoice."""
+
     subtotal: float
     tax_amount: float
     total: float
@@ -47,10 +142,13 @@ class InvoiceTotals(BaseModel):
 
 class InvoiceResponse(InvoiceBase):
     """Schema for invoice response."""
+
     id: int
     user_id: int
+    client_id: Optional[int] = None
     status: InvoiceStatus
     pdf_url: Optional[str] = None
+    version: int
     created_at: datetime
     updated_at: Optional[datetime] = None
     line_items: List[LineItemResponse]
@@ -60,15 +158,91 @@ class InvoiceResponse(InvoiceBase):
         from_attributes = True
 
 
+class InvoiceSort(str, enum.Enum):
+    """Sort orders for the invoice list."""
+
+    NEWEST = "-created_at"
+    OLDEST = "created_at"
+    TOTAL_DESC = "-total"
+    TOTAL_ASC = "total"
+    CLIENT_ASC = "client_name"
+    CLIENT_DESC = "-client_name"
+
+
+class ExportFormat(str, enum.Enum):
+    """File formats for the invoice export."""
+
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
 class InvoiceListResponse(BaseModel):
     """Schema for invoice list item (without full details)."""
+
     id: int
     client_name: str
     job_address: str
     trade_type: TradeType
     status: InvoiceStatus
     total: float
+    due_date: Optional[date] = None
     created_at: datetime
 
     class Config:
         from_attributes = True
+
+
+class InvoiceReminderResponse(BaseModel):
+    """A payment reminder queued or sent for an invoice."""
+
+    id: int
+    stage: int
+    attempts: int
+    last_error: Optional[str] = None
+    sent_at: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class InvoiceChanges(BaseModel):
+    """Invoices created, updated or deleted since a change token."""
+
+    token: int  # Pass as ``since`` on the next sync
+    invoices: List[InvoiceListResponse]
+    deleted: List[int]
+
+
+class StatusStats(BaseModel):
+    """Invoice count and total for one status."""
+
+    status: InvoiceStatus
+    count: int
+    total: float
+
+
+class TradeStats(BaseModel):
+    """Invoice count and total for one trade."""
+
+    trade_type: TradeType
+    count: int
+    total: float
+
+
+class MonthStats(BaseModel):
+    """Invoice count and total for one creation month."""
+
+    month: date
+    count: int
+    total: float
+
+
+class InvoiceStats(BaseModel):
+    """Dashboard totals across all of a user's invoices."""
+
+    count: int
+    total: float
+    by_status: List[StatusStats]
+    by_trade: List[TradeStats]
+    by_month: List[MonthStats]
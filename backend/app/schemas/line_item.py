@@ -1,4 +1,7 @@
 """Pydantic schemas for LineItem."""
+
+from typing import Optional
+
 from pydantic import BaseModel, Field
 
 from app.models.line_item import LineItemCategory
@@ -6,6 +9,7 @@ from app.models.line_item import LineItemCategory
 
 class LineItemBase(BaseModel):
     """Base line item fields."""
+
     description: str = Field(..., min_length=1, max_length=500)
     quantity: float = Field(..., gt=0)
     unit_price: float = Field(..., ge=0)
@@ -14,11 +18,23 @@ class LineItemBase(BaseModel):
 
 class LineItemCreate(LineItemBase):
     """Schema for creating a line item."""
+
     pass
 
 
+class LineItemUpdate(LineItemBase):
+    """Schema for a line item in an invoice update.
+
+    Items with an ``id`` update that existing item; items without one are
+    added. Existing items left out of the update are removed.
+    """
+
+    id: Optional[int] = None
+
+
 class LineItemResponse(LineItemBase):
     """Schema for line item response."""
+
     id: int
     line_total: float
 
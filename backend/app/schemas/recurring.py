@@ -0,0 +1,46 @@
+"""Pydantic schemas for recurring invoices."""
+
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+from app.models.recurring_invoice import RecurrenceFrequency
+
+
+class RecurringInvoiceBase(BaseModel):
+    """Base recurring invoice fields.
+
+    ``next_run_at`` is when the next invoice is issued; monthly and longer
+    schedules keep to its day of the month. Times without a zone are UTC.
+    """
+
+    frequency: RecurrenceFrequency
+    next_run_at: datetime
+    auto_send: bool = False
+
+
+class RecurringInvoiceCreate(RecurringInvoiceBase):
+    """Schema for scheduling copies of an invoice."""
+
+    template_invoice_id: int
+
+
+class RecurringInvoiceUpdate(RecurringInvoiceBase):
+    """Schema for changing or pausing a schedule."""
+
+    active: bool = True
+
+
+class RecurringInvoiceResponse(RecurringInvoiceBase):
+    """Schema for recurring invoice response."""
+
+    id: int
+    template_invoice_id: int
+    active: bool
+    last_run_at: Optional[datetime] = None
+    last_invoice_id: Optional[int] = None
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,103 @@
+"""Pydantic schemas for offline sync."""
+
+import enum
+from typing import Annotated, Any, Dict, List, Literal, Optional, Union
+
+from pydantic import BaseModel, Field, model_validator
+
+from app.core.config import settings
+from app.models.invoice import InvoiceStatus
+from app.schemas.invoice import InvoiceCreate, InvoiceUpdate
+
+
+class SyncMutationBase(BaseModel):
+    """Fields every queued operation carries."""
+
+    client_id: str = Field(..., min_length=1, max_length=100)
+    idempotency_key: str = Field(..., min_length=1, max_length=255)
+
+
+class InvoiceTargetMutation(SyncMutationBase):
+    """An operation on an existing invoice.
+
+    The invoice is named by its server id, or by the ``client_id`` of a
+    create earlier in the same batch (for invoices made offline).
+    """
+
+    invoice_id: Optional[int] = None
+    invoice_client_id: Optional[str] = None
+
+    @model_validator(mode="after")
+    def check_target(self):
+        if (self.invoice_id is None) == (self.invoice_client_id is None):
+            raise ValueError("Give exactly one of invoice_id and invoice_client_id")
+        return self
+
+
+class CreateInvoiceMutation(SyncMutationBase):
+    """Create an invoice."""
+
+    op: Literal["create_invoice"]
+    data: InvoiceCreate
+
+
+class UpdateInvoiceMutation(InvoiceTargetMutation):
+    """Replace an invoice's fields and line items, as PUT /invoices/{id}."""
+
+    op: Literal["update_invoice"]
+    data: InvoiceUpdate
+
+
+class UpdateStatusMutation(InvoiceTargetMutation):
+    """Change an invoice's status, as PATCH /invoices/{id}/status."""
+
+    op: Literal["update_status"]
+    status: InvoiceStatus
+
+
+SyncMutation = Annotated[
+    Union[CreateInvoiceMutation, UpdateInvoiceMutation, UpdateStatusMutation],
+    Field(discriminator="op"),
+]
+
+
+class SyncMutationBatch(BaseModel):
+    """An ordered queue of offline operations.
+
+    Operations are validated one by one against SyncMutation, so a bad one
+    is reported without rejecting the rest.
+    """
+
+    mutations: List[Dict[str, Any]] = Field(
+        ..., min_length=1, max_length=settings.SYNC_MAX_MUTATIONS
+    )
+
+
+class SyncMutationOutcome(str, enum.Enum):
+    """What happened to one operation."""
+
+    APPLIED = "applied"
+    REPLAYED = "replayed"  # Already applied under the same idempotency key
+    FAILED = "failed"
+
+
+class SyncMutationResult(BaseModel):
+    """Result of one operation, by the client's id for it.
+
+    ``status_code`` is what the equivalent single request would have
+    returned. ``invoice_id`` and ``version`` describe the invoice after the
+    operation, so offline-created invoices get their server ids.
+    """
+
+    client_id: Optional[str] = None
+    outcome: SyncMutationOutcome
+    status_code: int
+    invoice_id: Optional[int] = None
+    version: Optional[int] = None
+    error: Optional[Any] = None
+
+
+class SyncMutationResponse(BaseModel):
+    """Schema for the result of a mutation batch, in request order."""
+
+    results: List[SyncMutationResult]
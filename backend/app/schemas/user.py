@@ -1,6 +1,8 @@
 """User schemas."""
+
 from datetime import datetime
 from typing import Optional
+
 from pydantic import BaseModel, EmailStr, Field
 
 
@@ -24,6 +26,14 @@ class Token(BaseModel):
 
     access_token: str
     token_type: str = "bearer"
+    expires_in: Optional[int] = None  # Access token lifetime in seconds
+    refresh_token: Optional[str] = None
+
+
+class RefreshTokenRequest(BaseModel):
+    """Schema for exchanging or revoking a refresh token."""
+
+    refresh_token: str = Field(..., min_length=1)
 
 
 class TokenData(BaseModel):
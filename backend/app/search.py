@@ -0,0 +1,174 @@
+"""Invoice full-text search.
+
+On PostgreSQL, invoices and line items each carry a generated ``search_vector``
+tsvector column with a GIN index (see the migration). The header fields are
+also indexed as one trigram expression, and descriptions get their own trigram
+index, so a fragment from inside a word still matches.
+
+SQLite, used by the test suite, has no tsvector. There, FTS5 tables mirror the
+same columns and triggers keep them in sync. Matching is by word prefix only.
+"""
+
+import re
+from typing import List
+
+from sqlalchemy import (
+    DDL,
+    Integer,
+    bindparam,
+    column,
+    event,
+    false,
+    func,
+    literal_column,
+    select,
+    table,
+    text,
+    union,
+)
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.selectable import SelectBase
+
+from app.models.invoice import Invoice
+from app.models.line_item import LineItem
+
+# At most this many words from the query are used
+MAX_TERMS = 8
+
+_TERM = re.compile(r"[^\W_]+", re.UNICODE)
+
+# SQLite FTS5 tables, created by the DDL at the bottom of this module
+_invoices_fts = table("invoices_fts", column("rowid", Integer))
+_line_items_fts = table("line_items_fts", column("rowid", Integer))
+
+# Trigram-indexed expression over the invoice header fields; must match the
+# ix_invoices_search_trgm index expression exactly
+INVOICE_SEARCH_TEXT = "client_name || ' ' || client_email || ' ' || job_address"
+
+
+def search_terms(q: str) -> List[str]:
+    """Split a search query into lowercase words."""
+    return _TERM.findall(q.lower())[:MAX_TERMS]
+
+
+def _like_pattern(q: str) -> str:
+    escaped = q.strip().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _postgres_match_ids(user_id: int, q: str, terms: List[str]) -> SelectBase:
+    tsquery = func.to_tsquery("simple", " & ".join(f"{term}:*" for term in terms))
+    pattern = bindparam("pattern", _like_pattern(q))
+
+    invoice_ids = select(Invoice.id).where(
+        Invoice.user_id == user_id,
+        literal_column("invoices.search_vector").op("@@")(tsquery)
+        | literal_column(f"({INVOICE_SEARCH_TEXT})").ilike(pattern, escape="\\"),
+    )
+    line_item_ids = (
+        select(LineItem.invoice_id)
+        .join(Invoice, Invoice.id == LineItem.invoice_id)
+        .where(
+            Invoice.user_id == user_id,
+            literal_column("line_items.search_vector").op("@@")(tsquery)
+            | LineItem.description.ilike(pattern, escape="\\"),
+        )
+    )
+    return union(invoice_ids, line_item_ids)
+
+
+def _sqlite_match_ids(user_id: int, terms: List[str]) -> SelectBase:
+    fts_query = " AND ".join(f'"{term}"*' for term in terms)
+
+    # The FTS lookups run once, up front; as a plain IN (...) or join, SQLite
+    # may probe the virtual table again for every candidate row
+    invoice_hits = (
+        select(_invoices_fts.c.rowid)
+        .where(text("invoices_fts MATCH :fts_query").bindparams(fts_query=fts_query))
+        .cte("invoice_hits")
+        .prefix_with("MATERIALIZED")
+    )
+    line_item_hits = (
+        select(_line_items_fts.c.rowid)
+        .where(text("line_items_fts MATCH :fts_query").bindparams(fts_query=fts_query))
+        .cte("line_item_hits")
+        .prefix_with("MATERIALIZED")
+    )
+
+    # Driven from the hits, so the work scales with the matches rather than
+    # with the size of the account
+    invoice_ids = (
+        select(Invoice.id)
+        .select_from(invoice_hits)
+        .join(Invoice, Invoice.id == invoice_hits.c.rowid)
+        .where(Invoice.user_id == user_id)
+    )
+    line_item_ids = (
+        select(LineItem.invoice_id)
+        .select_from(line_item_hits)
+        .join(LineItem, LineItem.id == line_item_hits.c.rowid)
+        .join(Invoice, Invoice.id == LineItem.invoice_id)
+        .where(Invoice.user_id == user_id)
+    )
+    return union(invoice_ids, line_item_ids)
+
+
+def matching_invoice_ids(db: Session, user_id: int, q: str) -> SelectBase:
+    """Return a query for the ids of the user's invoices that match ``q``.
+
+    Every word must match, either in the invoice header (client name, email,
+    job address) or within a single line item description. The last word may
+    be incomplete, so search-as-you-type works.
+    """
+    terms = search_terms(q)
+    if not terms:
+        return select(Invoice.id).where(false())
+
+    if db.get_bind().dialect.name == "postgresql":
+        return _postgres_match_ids(user_id, q, terms)
+    return _sqlite_match_ids(user_id, terms)
+
+
+# SQLite fallback: external-content FTS5 tables over the searchable columns,
+# kept in sync by triggers
+_SQLITE_INVOICE_DDL = [
+    "CREATE VIRTUAL TABLE invoices_fts USING fts5("
+    "client_name, client_email, job_address, content='invoices', content_rowid='id')",
+    "CREATE TRIGGER invoices_fts_ai AFTER INSERT ON invoices BEGIN "
+    "INSERT INTO invoices_fts(rowid, client_name, client_email, job_address) "
+    "VALUES (new.id, new.client_name, new.client_email, new.job_address); END",
+    "CREATE TRIGGER invoices_fts_ad AFTER DELETE ON invoices BEGIN "
+    "INSERT INTO invoices_fts(invoices_fts, rowid, client_name, client_email, job_address) "
+    "VALUES ('delete', old.id, old.client_name, old.client_email, old.job_address); END",
+    "CREATE TRIGGER invoices_fts_au AFTER UPDATE OF client_name, client_email, job_address "
+    "ON invoices BEGIN "
+    "INSERT INTO invoices_fts(invoices_fts, rowid, client_name, client_email, job_address) "
+    "VALUES ('delete', old.id, old.client_name, old.client_email, old.job_address); "
+    "INSERT INTO invoices_fts(rowid, client_name, client_email, job_address) "
+    "VALUES (new.id, new.client_name, new.client_email, new.job_address); END",
+]
+_SQLITE_LINE_ITEM_DDL = [
+    "CREATE VIRTUAL TABLE line_items_fts USING fts5("
+    "description, content='line_items', content_rowid='id')",
+    "CREATE TRIGGER line_items_fts_ai AFTER INSERT ON line_items BEGIN "
+    "INSERT INTO line_items_fts(rowid, description) VALUES (new.id, new.description); END",
+    "CREATE TRIGGER line_items_fts_ad AFTER DELETE ON line_items BEGIN "
+    "INSERT INTO line_items_fts(line_items_fts, rowid, description) "
+    "VALUES ('delete', old.id, old.description); END",
+    "CREATE TRIGGER line_items_fts_au AFTER UPDATE OF description ON line_items BEGIN "
+    "INSERT INTO line_items_fts(line_items_fts, rowid, description) "
+    "VALUES ('delete', old.id, old.description); "
+    "INSERT INTO line_items_fts(rowid, description) VALUES (new.id, new.description); END",
+]
+
+for _table, _statements, _fts_table in (
+    (Invoice.__table__, _SQLITE_INVOICE_DDL, "invoices_fts"),
+    (LineItem.__table__, _SQLITE_LINE_ITEM_DDL, "line_items_fts"),
+):
+    for _statement in _statements:
+        event.listen(_table, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+    event.listen(
+        _table,
+        "before_drop",
+        DDL(f"DROP TABLE IF EXISTS {_fts_table}").execute_if(dialect="sqlite"),
+    )
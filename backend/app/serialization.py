@@ -0,0 +1,42 @@
+"""Fast JSON responses built with cached Pydantic TypeAdapters.
+
+Endpoints that return one of these skip FastAPI's own response-model pass
+(``jsonable_encoder`` plus ``json.dumps``). The data is validated once
+against the response type and encoded straight to bytes by pydantic-core.
+"""
+
+from functools import lru_cache
+from typing import Any, Mapping, Optional
+
+from fastapi.responses import Response
+from pydantic import TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def type_adapter(tp: Any) -> TypeAdapter:
+    """Return the shared TypeAdapter for a response type."""
+    return TypeAdapter(tp)
+
+
+class PreencodedJSONResponse(Response):
+    """JSON response whose body has already been encoded."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return content
+
+
+def json_response(
+    tp: Any,
+    data: Any,
+    status_code: int = 200,
+    from_attributes: bool = False,
+    headers: Optional[Mapping[str, str]] = None,
+) -> PreencodedJSONResponse:
+    """Validate plain data against ``tp`` and return it encoded as JSON."""
+    adapter = type_adapter(tp)
+    value = adapter.validate_python(data, from_attributes=from_attributes)
+    return PreencodedJSONResponse(
+        adapter.dump_json(value), status_code=status_code, headers=headers
+    )
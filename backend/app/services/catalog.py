@@ -0,0 +1,298 @@
+"""Per-user catalog of saved parts and labor rates, and its autocomplete index.
+
+Line items are learned into ``catalog_items`` as they're written: one row per
+description and category, with the price last billed and how often it's been
+used. Users can add, edit and remove items too.
+
+Suggestions are served from an in-process prefix index, not the database.
+Per user it is a sorted array of lowercased description tails, one starting
+at each word, so "elb" finds "3/4in copper elbow"; a lookup is two binary
+searches. A user's index is built when they log in (or on their first
+suggestion), updated in place when a write commits, and rebuilt after
+``CATALOG_INDEX_TTL_SECONDS`` so edits made through other workers show up.
+"""
+
+import bisect
+import heapq
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from app.core.config import settings
+from app.models.catalog_item import CatalogItem
+from app.models.line_item import LineItemCategory
+from sqlalchemy import event, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+# Catalog rows per upsert when learning from large imports
+LEARN_BATCH_ROWS = 1000
+
+# Session.info key for index updates waiting on the transaction to commit
+_PENDING_KEY = "catalog_index_pending"
+
+# Sorts after any character a prefix can continue with
+_PREFIX_END = "\U0010ffff"
+
+_ENTRY_COLUMNS = (
+    CatalogItem.id,
+    CatalogItem.description,
+    CatalogItem.unit_price,
+    CatalogItem.category,
+    CatalogItem.use_count,
+)
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    """A catalog item as the index holds it."""
+
+    id: int
+    description: str
+    unit_price: float
+    category: LineItemCategory
+    use_count: int
+
+    @classmethod
+    def from_row(cls, row) -> "CatalogEntry":
+        """Build an entry from a CatalogItem or a row of its columns."""
+        return cls(
+            id=row.id,
+            description=row.description,
+            unit_price=float(row.unit_price),
+            category=row.category,
+            use_count=row.use_count or 0,
+        )
+
+
+def _index_keys(description: str) -> List[str]:
+    """The lowercased description from the start of each of its words."""
+    text = description.lower()
+    return [
+        text[i:]
+        for i in range(len(text))
+        if not text[i].isspace() and (i == 0 or text[i - 1].isspace())
+    ]
+
+
+class _UserIndex:
+    """One user's entries, and their keys in sorted order."""
+
+    def __init__(self, entries: Iterable[CatalogEntry]):
+        self.entries: Dict[int, CatalogEntry] = {entry.id: entry for entry in entries}
+        pairs = sorted(
+            (key, entry.id)
+            for entry in self.entries.values()
+            for key in _index_keys(entry.description)
+        )
+        self.keys = [key for key, _ in pairs]
+        self.ids = [entry_id for _, entry_id in pairs]
+        self.built_at = time.monotonic()
+
+    def put(self, entry: CatalogEntry) -> None:
+        previous = self.entries.get(entry.id)
+        if previous is not None and previous.description != entry.description:
+            self.remove(entry.id)
+        elif previous is not None:
+            # Same keys; only the price or count changed
+            self.entries[entry.id] = entry
+            return
+
+        self.entries[entry.id] = entry
+        for key in _index_keys(entry.description):
+            at = bisect.bisect_left(self.keys, key)
+            self.keys.insert(at, key)
+            self.ids.insert(at, entry.id)
+
+    def remove(self, entry_id: int) -> None:
+        if self.entries.pop(entry_id, None) is None:
+            return
+        kept = [(key, kept_id) for key, kept_id in zip(self.keys, self.ids) if kept_id != entry_id]
+        self.keys = [key for key, _ in kept]
+        self.ids = [kept_id for _, kept_id in kept]
+
+    def search(
+        self, prefix: str, limit: int, category: Optional[LineItemCategory] = None
+    ) -> List[CatalogEntry]:
+        """Entries with a word starting with ``prefix``, most used first."""
+        prefix = prefix.lower()
+        start = bisect.bisect_left(self.keys, prefix)
+        end = bisect.bisect_left(self.keys, prefix + _PREFIX_END, lo=start)
+        matches = (self.entries[entry_id] for entry_id in set(self.ids[start:end]))
+        if category is not None:
+            matches = (entry for entry in matches if entry.category == category)
+        return heapq.nsmallest(
+            limit,
+            matches,
+            key=lambda entry: (-entry.use_count, entry.description.lower(), entry.id),
+        )
+
+
+class CatalogIndex:
+    """Prefix indexes of catalog entries, for the most recently active users."""
+
+    def __init__(self, ttl_seconds: int, max_users: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_users = max_users
+        self._users: "OrderedDict[int, _UserIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def warm(self, db: Session, user_id: int) -> _UserIndex:
+        """Build a user's index from the database, replacing any cached one."""
+        rows = db.execute(select(*_ENTRY_COLUMNS).where(CatalogItem.user_id == user_id)).all()
+        index = _UserIndex(CatalogEntry.from_row(row) for row in rows)
+        with self._lock:
+            self._users[user_id] = index
+            self._users.move_to_end(user_id)
+            while len(self._users) > self.max_users:
+                self._users.popitem(last=False)
+        return index
+
+    def warm_in_background(self, bind: Union[Engine, Connection], user_id: int) -> None:
+        """Build a user's index on its own session, e.g. after the login response."""
+        with Session(bind=bind) as db:
+            self.warm(db, user_id)
+
+    def suggest(
+        self,
+        db: Session,
+        user_id: int,
+        prefix: str,
+        limit: int,
+        category: Optional[LineItemCategory] = None,
+    ) -> List[CatalogEntry]:
+        """Return the user's most used entries matching ``prefix``."""
+        with self._lock:
+            index = self._users.get(user_id)
+            if index is not None and time.monotonic() - index.built_at < self.ttl_seconds:
+                self._users.move_to_end(user_id)
+                return index.search(prefix, limit, category)
+
+        index = self.warm(db, user_id)
+        with self._lock:
+            return index.search(prefix, limit, category)
+
+    def apply(self, user_id: int, changed: Iterable[CatalogEntry], removed: Iterable[int]) -> None:
+        """Update a user's index after a committed write, if it is loaded."""
+        with self._lock:
+            index = self._users.get(user_id)
+            if index is None:
+                return
+            for entry_id in removed:
+                index.remove(entry_id)
+            for entry in changed:
+                index.put(entry)
+
+    def clear(self) -> None:
+        """Drop every user's index."""
+        with self._lock:
+            self._users.clear()
+
+
+catalog_index = CatalogIndex(
+    ttl_seconds=settings.CATALOG_INDEX_TTL_SECONDS, max_users=settings.CATALOG_INDEX_USERS
+)
+
+
+def index_after_commit(
+    db: Session,
+    user_id: int,
+    changed: Iterable[CatalogEntry] = (),
+    removed: Iterable[int] = (),
+) -> None:
+    """Queue an index update for when the session's transaction commits.
+
+    The update is tagged with the savepoint it was made in, if any, so rolling
+    that savepoint back drops it.
+    """
+    db.info.setdefault(_PENDING_KEY, []).append(
+        (db.get_nested_transaction(), user_id, list(changed), list(removed))
+    )
+
+
+def _made_in(transaction, savepoint) -> bool:
+    """Whether ``transaction`` is ``savepoint`` or nested inside it."""
+    while transaction is not None:
+        if transaction is savepoint:
+            return True
+        transaction = transaction.parent
+    return False
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending(session: Session) -> None:
+    # Savepoint commits fire this too; only the outer commit counts
+    if session.in_nested_transaction():
+        return
+    for _, user_id, changed, removed in session.info.pop(_PENDING_KEY, []):
+        catalog_index.apply(user_id, changed, removed)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _drop_pending(session: Session, transaction) -> None:
+    # Whatever the outer commit didn't apply was rolled back
+    if transaction.parent is None:
+        session.info.pop(_PENDING_KEY, None)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_savepoint_pending(session: Session, previous_transaction) -> None:
+    if not previous_transaction.nested or _PENDING_KEY not in session.info:
+        return
+    session.info[_PENDING_KEY] = [
+        pending
+        for pending in session.info[_PENDING_KEY]
+        if not _made_in(pending[0], previous_transaction)
+    ]
+
+
+def learn(db: Session, user_id: int, items: Iterable) -> None:
+    """Record line items in the user's catalog; the caller commits.
+
+    ``items`` are line item schemas, or anything with ``description``,
+    ``unit_price`` and ``category``. New descriptions are added; known ones
+    take the latest price and count another use.
+    """
+    now = datetime.now(timezone.utc)
+    learned: Dict[Tuple[str, LineItemCategory], dict] = {}
+    for item in items:
+        description = item.description.strip()
+        if not description:
+            continue
+        row = learned.get((description, item.category))
+        if row is None:
+            learned[(description, item.category)] = {
+                "user_id": user_id,
+                "description": description,
+                "unit_price": item.unit_price,
+                "category": item.category,
+                "use_count": 1,
+                "last_used_at": now,
+            }
+        else:
+            row["unit_price"] = item.unit_price
+            row["use_count"] += 1
+    if not learned:
+        return
+
+    dialect_insert = (
+        postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+    )
+    rows = list(learned.values())
+    entries = []
+    for start in range(0, len(rows), LEARN_BATCH_ROWS):
+        stmt = dialect_insert(CatalogItem).values(rows[start : start + LEARN_BATCH_ROWS])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "description", "category"],
+            set_={
+                "unit_price": stmt.excluded.unit_price,
+                "use_count": CatalogItem.use_count + stmt.excluded.use_count,
+                "last_used_at": stmt.excluded.last_used_at,
+            },
+        ).returning(*_ENTRY_COLUMNS)
+        entries.extend(CatalogEntry.from_row(row) for row in db.execute(stmt))
+    index_after_commit(db, user_id, entries)
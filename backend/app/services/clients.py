@@ -0,0 +1,155 @@
+"""Client directory: one client per distinct name, email and address.
+
+Every write that creates invoices or changes their client fields calls
+``link`` before recording its changes. It upserts a ``clients`` row for each
+distinct client among the invoices, matching on the normalized name, email
+and address, and points the invoices at it: a read, an upsert per thousand
+clients, and one UPDATE for all the invoices.
+
+``match_prefix`` is the autocomplete filter. On PostgreSQL a name or email
+prefix is a range scan of ``ix_clients_user_id_name_key`` or
+``ix_clients_user_id_email_key`` (text_pattern_ops), and a later word of
+the name is served by the ``name_key`` trigram index.
+"""
+
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Tuple
+
+from app.models.client import Client
+from app.models.invoice import Invoice
+from sqlalchemy import Integer, bindparam, func, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+# Client rows per upsert when linking large imports
+LINK_BATCH_ROWS = 1000
+
+_ClientKey = Tuple[int, str, str, str]
+
+# Invoice links, set in one statement from two arrays on PostgreSQL, and
+# as one executemany elsewhere. Linking on its own isn't an edit, so
+# updated_at (and the ETag) stay put.
+_linked = (
+    func.unnest(
+        bindparam("invoice_ids", type_=postgresql.ARRAY(Integer)),
+        bindparam("client_ids", type_=postgresql.ARRAY(Integer)),
+    )
+    .table_valued("invoice_id", "client_id")
+    .render_derived("linked")
+)
+_LINK_FROM_ARRAYS = (
+    update(Invoice.__table__)
+    .where(Invoice.id == _linked.c.invoice_id)
+    .values(client_id=_linked.c.client_id, updated_at=Invoice.updated_at)
+)
+_LINK_ONE = (
+    update(Invoice.__table__)
+    .where(Invoice.id == bindparam("invoice_id"))
+    .values(client_id=bindparam("linked_client_id"), updated_at=Invoice.updated_at)
+)
+
+
+def normalize(value: str) -> str:
+    """Lowercase a name, email or address and collapse its whitespace.
+
+    The migration's backfill applies the same rule in SQL.
+    """
+    return " ".join(value.split()).lower()
+
+
+def _like_prefix(prefix: str) -> str:
+    return prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def match_prefix(prefix: str):
+    """Filter for clients whose name, a word of it, or email starts with ``prefix``."""
+    escaped = _like_prefix(normalize(prefix))
+    return or_(
+        Client.name_key.like(f"{escaped}%", escape="\\"),
+        Client.name_key.like(f"% {escaped}%", escape="\\"),
+        Client.email_key.like(f"{escaped}%", escape="\\"),
+    )
+
+
+def link(db: Session, invoice_ids: Iterable[int]) -> None:
+    """Link invoices to their clients, adding clients not seen before.
+
+    The invoices may belong to different users. The caller commits.
+    """
+    invoice_ids = list(invoice_ids)
+    if not invoice_ids:
+        return
+    invoices = db.execute(
+        select(
+            Invoice.id,
+            Invoice.user_id,
+            Invoice.client_name,
+            Invoice.client_email,
+            Invoice.job_address,
+        ).where(Invoice.id.in_(invoice_ids))
+    ).all()
+
+    now = datetime.now(timezone.utc)
+    invoice_keys: Dict[int, _ClientKey] = {}
+    clients: Dict[_ClientKey, dict] = {}
+    for row in invoices:
+        key = (
+            row.user_id,
+            normalize(row.client_name),
+            normalize(row.client_email),
+            normalize(row.job_address),
+        )
+        invoice_keys[row.id] = key
+        clients[key] = {
+            "user_id": row.user_id,
+            "name": row.client_name.strip(),
+            "email": row.client_email.strip(),
+            "address": row.job_address.strip(),
+            "name_key": key[1],
+            "email_key": key[2],
+            "address_key": key[3],
+            "last_invoiced_at": now,
+        }
+    if not clients:
+        return
+
+    dialect_insert = (
+        postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+    )
+    rows = list(clients.values())
+    client_ids: Dict[_ClientKey, int] = {}
+    for start in range(0, len(rows), LINK_BATCH_ROWS):
+        stmt = dialect_insert(Client).values(rows[start : start + LINK_BATCH_ROWS])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "name_key", "email_key", "address_key"],
+            set_={
+                "name": stmt.excluded.name,
+                "email": stmt.excluded.email,
+                "address": stmt.excluded.address,
+                "last_invoiced_at": stmt.excluded.last_invoiced_at,
+            },
+        ).returning(
+            Client.id, Client.user_id, Client.name_key, Client.email_key, Client.address_key
+        )
+        for client in db.execute(stmt):
+            client_ids[(client.user_id, client.name_key, client.email_key, client.address_key)] = (
+                client.id
+            )
+
+    linked = [(invoice_id, client_ids[key]) for invoice_id, key in invoice_keys.items()]
+    if dialect_insert is postgresql.insert:
+        db.execute(
+            _LINK_FROM_ARRAYS,
+            {
+                "invoice_ids": [invoice_id for invoice_id, _ in linked],
+                "client_ids": [client_id for _, client_id in linked],
+            },
+        )
+    else:
+        db.execute(
+            _LINK_ONE,
+            [
+                {"invoice_id": invoice_id, "linked_client_id": client_id}
+                for invoice_id, client_id in linked
+            ],
+        )
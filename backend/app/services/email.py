@@ -1,10 +1,12 @@
 """Email sending service using Resend."""
+
 import base64
+from datetime import date
 from typing import Optional
-import resend
-from resend.exceptions import ResendError
 
+import resend
 from app.core.config import settings
+from resend.exceptions import ResendError
 
 
 class EmailService:
@@ -28,12 +30,12 @@ class EmailService:
         pdf_filename: str,
     ) -> str:
         """Send invoice email with PDF attachment.
-        
+
         Returns the Resend email ID for tracking.
         """
         self._check_config()
         resend.api_key = self.api_key
-        
+
         # Encode PDF as base64
         pdf_b64 = base64.b64encode(pdf_bytes).decode("utf-8")
 
@@ -69,6 +71,54 @@ class EmailService:
         except ResendError as e:
             raise Exception(f"Failed to send email via Resend: {e}")
 
+    def send_payment_reminder(
+        self,
+        to_email: str,
+        business_name: str,
+        client_name: str,
+        invoice_number: int,
+        total: float,
+        due_date: date,
+        days_overdue: int,
+        pdf_url: Optional[str] = None,
+    ) -> str:
+        """Send a reminder that an invoice is past due.
+
+        Returns the Resend email ID for tracking.
+        """
+        self._check_config()
+        resend.api_key = self.api_key
+
+        days = "1 day" if days_overdue == 1 else f"{days_overdue} days"
+        link = f'<p><a href="{pdf_url}">View the invoice</a></p>' if pdf_url else ""
+        params = {
+            "from": "Invoice Designer <invoices@invoice-designer.app>",
+            "to": [to_email],
+            "subject": f"Reminder: Invoice #{invoice_number} from {business_name} is past due",
+            "html": f"""
+                <!DOCTYPE html>
+                <html>
+                <body>
+                    <p>Dear {client_name},</p>
+                    <p>This is a reminder that invoice #{invoice_number} for ${total:,.2f}
+                    was due on {due_date:%B %d, %Y} and is now {days} overdue.</p>
+                    {link}
+                    <p>If you have already paid, please disregard this message.</p>
+                    <p>If you have any questions, please contact {business_name} directly.</p>
+                    <br>
+                    <p>Best regards,</p>
+                    <p>The Invoice Designer Team</p>
+                </body>
+                </html>
+            """,
+        }
+
+        try:
+            email = resend.Emails.send(params)
+            return email["id"]
+        except ResendError as e:
+            raise Exception(f"Failed to send email via Resend: {e}")
+
 
 # Singleton instance
-email_service = EmailService()
\ No newline at end of file
+email_service = EmailService()
@@ -0,0 +1,343 @@
+"""Replay-safe writes under a client-chosen ``Idempotency-Key`` header.
+
+A request carrying a key first claims it: a row in ``idempotency_keys`` with
+no response yet, committed before any work starts. A retry that arrives while
+the first attempt is still running gets 409 instead of doing the work a
+second time. When the write succeeds its response is stored in the same
+transaction, and retries for the next ``IDEMPOTENCY_KEY_TTL_SECONDS`` get that
+response back without anything being executed. A write that fails releases
+its key, so the client can try again.
+
+Completed responses are also held in an in-process LRU, so a replay on the
+worker that served the original skips the database.
+
+``run(..., nested=True)`` is for writes that share one transaction, such as
+the operations in an offline sync batch. Nothing is committed: each write
+and its stored response go in a savepoint, a concurrent request with the same
+key waits on the unique key, and responses reach the LRU only once the
+caller's transaction commits.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Optional, Tuple
+
+from app.core.config import settings
+from app.models.idempotency_key import IdempotencyKey
+from app.serialization import PreencodedJSONResponse
+from fastapi import HTTPException, Response, status
+from sqlalchemy import and_, delete, event, or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+# Set on responses served from a stored result
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+# Attempts at claiming a key that another request keeps releasing
+_CLAIM_ATTEMPTS = 3
+
+_CacheKey = Tuple[int, str]
+
+# Session.info entry for nested responses waiting on the outer commit
+_PENDING_INFO_KEY = "idempotency_pending"
+
+
+def request_fingerprint(*parts: Any) -> str:
+    """Hash of what a request asks for, to catch a key reused for another request."""
+    encoded = json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    """A claimed key and, once the write has finished, its response."""
+
+    scope: str
+    request_hash: str
+    status_code: Optional[int] = None  # None while the first request is running
+    body: Optional[bytes] = None
+
+    @classmethod
+    def from_row(cls, row: IdempotencyKey) -> "StoredResponse":
+        return cls(
+            scope=row.scope,
+            request_hash=row.request_hash,
+            status_code=row.status_code,
+            body=row.response.encode() if row.response is not None else None,
+        )
+
+    @property
+    def in_progress(self) -> bool:
+        return self.status_code is None
+
+
+class IdempotencyStore:
+    """Claims, stores and replays responses by (user id, key)."""
+
+    def __init__(self, ttl_seconds: int, stale_seconds: int, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[_CacheKey, Tuple[StoredResponse, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def run(
+        self,
+        db: Session,
+        user_id: int,
+        key: Optional[str],
+        scope: str,
+        request_hash: str,
+        handler: Callable[[], Response],
+        nested: bool = False,
+    ) -> Response:
+        """Run ``handler`` and commit, at most once per key.
+
+        ``handler`` makes the write and returns its response, leaving the
+        write uncommitted; the response is stored in the same transaction.
+        Without a key the handler simply runs and commits. With ``nested``
+        the caller commits instead, and a handler that raises has its write
+        rolled back to a savepoint.
+        """
+        if nested:
+            return self._run_nested(db, user_id, key, scope, request_hash, handler)
+
+        if key is None:
+            response = handler()
+            db.commit()
+            return response
+
+        stored = self._claim(db, user_id, key, scope, request_hash)
+        if stored is not None:
+            return self._replay(stored, scope, request_hash)
+
+        try:
+            response = handler()
+            db.execute(
+                update(IdempotencyKey)
+                .where(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+                .values(status_code=response.status_code, response=response.body.decode())
+            )
+            db.commit()
+        except BaseException:
+            db.rollback()
+            self._release(db, user_id, key)
+            raise
+
+        self._remember(
+            (user_id, key),
+            StoredResponse(scope, request_hash, response.status_code, response.body),
+        )
+        return response
+
+    def _run_nested(
+        self,
+        db: Session,
+        user_id: int,
+        key: Optional[str],
+        scope: str,
+        request_hash: str,
+        handler: Callable[[], Response],
+    ) -> Response:
+        if key is not None:
+            stored = self._cached((user_id, key)) or self._lookup(db, user_id, key)
+            if stored is not None:
+                return self._replay(stored, scope, request_hash)
+
+        savepoint = db.begin_nested()
+        try:
+            response = handler()
+            if key is not None:
+                db.add(
+                    IdempotencyKey(
+                        user_id=user_id,
+                        key=key,
+                        scope=scope,
+                        request_hash=request_hash,
+                        status_code=response.status_code,
+                        response=response.body.decode(),
+                        created_at=datetime.now(timezone.utc),
+                    )
+                )
+                # On PostgreSQL this waits for a concurrent request holding the key
+                db.flush()
+            savepoint.commit()
+        except IntegrityError:
+            savepoint.rollback()
+            stored = self._lookup(db, user_id, key) if key is not None else None
+            if stored is None:
+                raise
+            return self._replay(stored, scope, request_hash)
+        except BaseException:
+            savepoint.rollback()
+            raise
+
+        if key is not None:
+            stored = StoredResponse(scope, request_hash, response.status_code, response.body)
+            self._pending(db).append(((user_id, key), stored))
+        return response
+
+    def _lookup(self, db: Session, user_id: int, key: str) -> Optional[StoredResponse]:
+        """What the key holds, deleting it if expired as ``_claim`` would take it over."""
+        row = db.get(IdempotencyKey, (user_id, key))
+        if row is None:
+            return None
+        created_at = row.created_at
+        if created_at.tzinfo is None:  # SQLite drops the offset
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        age = datetime.now(timezone.utc) - created_at
+        stale_seconds = self.ttl_seconds if row.status_code is not None else self.stale_seconds
+        if age > timedelta(seconds=stale_seconds):
+            db.delete(row)
+            db.flush()
+            return None
+        return StoredResponse.from_row(row)
+
+    def _pending(self, db: Session) -> list:
+        """Nested responses to cache once the session's transaction commits."""
+        if _PENDING_INFO_KEY not in db.info:
+            db.info[_PENDING_INFO_KEY] = []
+            event.listen(db, "after_commit", self._remember_pending)
+            event.listen(db, "after_soft_rollback", self._discard_pending)
+        return db.info[_PENDING_INFO_KEY]
+
+    def _remember_pending(self, db: Session) -> None:
+        # Savepoint commits fire this too; only the outer commit counts
+        if db.in_nested_transaction():
+            return
+        pending = db.info[_PENDING_INFO_KEY]
+        for cache_key, stored in pending:
+            self._remember(cache_key, stored)
+        pending.clear()
+
+    def _discard_pending(self, db: Session, previous_transaction) -> None:
+        if not previous_transaction.nested:
+            db.info[_PENDING_INFO_KEY].clear()
+
+    def _claim(
+        self, db: Session, user_id: int, key: str, scope: str, request_hash: str
+    ) -> Optional[StoredResponse]:
+        """Claim the key, or return what it already holds."""
+        cached = self._cached((user_id, key))
+        if cached is not None:
+            return cached
+
+        for _ in range(_CLAIM_ATTEMPTS):
+            now = datetime.now(timezone.utc)
+            try:
+                db.add(
+                    IdempotencyKey(
+                        user_id=user_id,
+                        key=key,
+                        scope=scope,
+                        request_hash=request_hash,
+                        created_at=now,
+                    )
+                )
+                db.commit()
+                return None
+            except IntegrityError:
+                db.rollback()
+
+            # Take over a key whose response has expired, or whose request
+            # died before finishing
+            taken = db.execute(
+                update(IdempotencyKey)
+                .where(
+                    IdempotencyKey.user_id == user_id,
+                    IdempotencyKey.key == key,
+                    or_(
+                        IdempotencyKey.created_at < now - timedelta(seconds=self.ttl_seconds),
+                        and_(
+                            IdempotencyKey.status_code.is_(None),
+                            IdempotencyKey.created_at < now - timedelta(seconds=self.stale_seconds),
+                        ),
+                    ),
+                )
+                .values(
+                    scope=scope,
+                    request_hash=request_hash,
+                    status_code=None,
+                    response=None,
+                    created_at=now,
+                )
+            ).rowcount
+            db.commit()
+            if taken:
+                return None
+
+            row = db.get(IdempotencyKey, (user_id, key))
+            if row is not None:
+                stored = StoredResponse.from_row(row)
+                if not stored.in_progress:
+                    self._remember((user_id, key), stored)
+                return stored
+            # Released between our insert and read; claim again
+
+        return StoredResponse(scope, request_hash)
+
+    def _replay(self, stored: StoredResponse, scope: str, request_hash: str) -> Response:
+        if stored.scope != scope or stored.request_hash != request_hash:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Idempotency-Key was already used for a different request",
+            )
+        if stored.in_progress:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A request with this Idempotency-Key is still in progress",
+            )
+        return PreencodedJSONResponse(
+            stored.body, status_code=stored.status_code, headers={REPLAYED_HEADER: "true"}
+        )
+
+    def _release(self, db: Session, user_id: int, key: str) -> None:
+        """Give up an unfinished claim so the client can retry."""
+        db.execute(
+            delete(IdempotencyKey).where(
+                IdempotencyKey.user_id == user_id,
+                IdempotencyKey.key == key,
+                IdempotencyKey.status_code.is_(None),
+            )
+        )
+        db.commit()
+
+    def _cached(self, cache_key: _CacheKey) -> Optional[StoredResponse]:
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[1] >= self.ttl_seconds:
+                del self._entries[cache_key]
+                return None
+            self._entries.move_to_end(cache_key)
+            return entry[0]
+
+    def _remember(self, cache_key: _CacheKey, stored: StoredResponse) -> None:
+        with self._lock:
+            self._entries[cache_key] = (stored, time.monotonic())
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def purge_expired(self, db: Session) -> int:
+        """Delete keys older than the TTL; return how many went."""
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.ttl_seconds)
+        return db.execute(delete(IdempotencyKey).where(IdempotencyKey.created_at < cutoff)).rowcount
+
+    def clear(self) -> None:
+        """Drop every cached response."""
+        with self._lock:
+            self._entries.clear()
+
+
+idempotency_store = IdempotencyStore(
+    ttl_seconds=settings.IDEMPOTENCY_KEY_TTL_SECONDS,
+    stale_seconds=settings.IDEMPOTENCY_KEY_STALE_SECONDS,
+    max_entries=settings.IDEMPOTENCY_CACHE_ENTRIES,
+)
@@ -0,0 +1,234 @@
+"""Streaming export of invoices and their line items.
+
+All rows come from a single query, read ``EXPORT_BATCH_ROWS`` at a time with
+``yield_per`` (a server-side cursor on PostgreSQL), and are encoded as they
+arrive. Memory stays flat however many invoices are exported, and the
+header goes out before the query has run. Totals are computed a batch of
+invoices at a time with the integer money engine.
+
+CSV has one row per line item, in the import format (see invoice_import)
+with ``invoice_ref`` set to the invoice id, followed by the line and invoice
+totals. NDJSON has one invoice per line, shaped like GET /invoices/{id}.
+"""
+
+import csv
+import io
+from datetime import datetime
+from decimal import Decimal
+from typing import Iterator, List, Optional, Tuple, Union
+
+from app.core.config import settings
+from app.models.invoice import Invoice
+from app.models.line_item import LineItem
+from app.money import TotalsBatch, TotalsCents, cents_to_float, compute_totals
+from app.schemas.invoice import ExportFormat, InvoiceResponse
+from app.serialization import type_adapter
+from app.services.invoice_import import IMPORT_COLUMNS
+from sqlalchemy import select
+from sqlalchemy.engine import Connection, Engine, Row
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+EXPORT_COLUMNS = IMPORT_COLUMNS + ["line_total", "invoice_subtotal", "invoice_tax", "invoice_total"]
+
+MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+    ExportFormat.NDJSON: "application/x-ndjson",
+}
+
+_ExportedInvoice = Tuple[Row, List[Row]]
+
+
+def export_query(
+    user_id: int, created_from: Optional[datetime] = None, created_to: Optional[datetime] = None
+) -> Select:
+    """One row per line item (or per empty invoice), grouped by invoice.
+
+    ``created_to`` is exclusive.
+    """
+    query = (
+        select(
+            Invoice.id,
+            Invoice.user_id,
+            Invoice.client_name,
+            Invoice.client_email,
+            Invoice.job_address,
+            Invoice.client_id,
+            Invoice.trade_type,
+            Invoice.tax_rate,
+            Invoice.tax_rate_bps,
+            Invoice.status,
+            Invoice.pdf_url,
+            Invoice.due_date,
+            Invoice.version,
+            Invoice.created_at,
+            Invoice.updated_at,
+            LineItem.id.label("line_item_id"),
+            LineItem.description,
+            LineItem.quantity,
+            LineItem.unit_price,
+            LineItem.category,
+            LineItem.quantity_hundredths,
+            LineItem.unit_price_cents,
+        )
+        .outerjoin(LineItem, LineItem.invoice_id == Invoice.id)
+        .where(Invoice.user_id == user_id)
+        # Follows ix_invoices_user_id_created_at
+        .order_by(Invoice.created_at, Invoice.id, LineItem.id)
+    )
+    if created_from is not None:
+        query = query.where(Invoice.created_at >= created_from)
+    if created_to is not None:
+        query = query.where(Invoice.created_at < created_to)
+    return query
+
+
+def _batches(
+    db: Session, query: Select, batch_rows: int
+) -> Iterator[List[Tuple[_ExportedInvoice, TotalsCents]]]:
+    """Group the query's rows by invoice and total them, about ``batch_rows`` at a time.
+
+    A batch only ends between invoices, so each invoice is totalled whole.
+    """
+    result = db.execute(query.execution_options(yield_per=batch_rows))
+    invoices: List[_ExportedInvoice] = []
+    row_count = 0
+
+    def totalled() -> List[Tuple[_ExportedInvoice, TotalsCents]]:
+        totals = compute_totals(
+            TotalsBatch.from_rows(
+                ((header.id, header.tax_rate_bps) for header, _ in invoices),
+                (
+                    (line.id, line.quantity_hundredths, line.unit_price_cents, line.category)
+                    for _, lines in invoices
+                    for line in lines
+                ),
+            )
+        )
+        return list(zip(invoices, totals))
+
+    for row in result:
+        if not invoices or invoices[-1][0].id != row.id:
+            if row_count >= batch_rows:
+                yield totalled()
+                invoices, row_count = [], 0
+            invoices.append((row, []))
+        if row.line_item_id is not None:
+            invoices[-1][1].append(row)
+        row_count += 1
+    if invoices:
+        yield totalled()
+
+
+def _cents(cents: int) -> Decimal:
+    return Decimal(cents).scaleb(-2)
+
+
+def _csv_chunks(db: Session, query: Select, batch_rows: int) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    yield buffer.getvalue()
+
+    for batch in _batches(db, query, batch_rows):
+        buffer.seek(0)
+        buffer.truncate()
+        for (header, lines), totals in batch:
+            invoice_fields = [
+                header.id,
+                header.client_name,
+                header.client_email,
+                header.job_address,
+                header.trade_type.value,
+                header.tax_rate,
+                header.status.value,
+                header.created_at.isoformat() if header.created_at else "",
+                header.due_date.isoformat() if header.due_date else "",
+            ]
+            invoice_totals = [
+                _cents(totals.subtotal),
+                _cents(totals.tax_amount),
+                _cents(totals.total),
+            ]
+            if not lines:
+                writer.writerow(invoice_fields + ["", "", "", "", ""] + invoice_totals)
+            for line in lines:
+                writer.writerow(
+                    invoice_fields
+                    + [
+                        line.description,
+                        line.quantity,
+                        line.unit_price,
+                        line.category.value,
+                        # hundredths x cents is in units of 1/10000 of a dollar
+                        Decimal(line.quantity_hundredths * line.unit_price_cents).scaleb(-4),
+                    ]
+                    + invoice_totals
+                )
+        yield buffer.getvalue()
+
+
+def _ndjson_chunks(db: Session, query: Select, batch_rows: int) -> Iterator[bytes]:
+    adapter = type_adapter(InvoiceResponse)
+    for batch in _batches(db, query, batch_rows):
+        encoded = []
+        for (header, lines), totals in batch:
+            payload = {
+                "id": header.id,
+                "user_id": header.user_id,
+                "client_name": header.client_name,
+                "client_email": header.client_email,
+                "job_address": header.job_address,
+                "client_id": header.client_id,
+                "trade_type": header.trade_type,
+                "tax_rate": header.tax_rate,
+                "due_date": header.due_date,
+                "status": header.status,
+                "pdf_url": header.pdf_url,
+                "version": header.version,
+                "created_at": header.created_at,
+                "updated_at": header.updated_at,
+                "line_items": [
+                    {
+                        "id": line.line_item_id,
+                        "description": line.description,
+                        "quantity": line.quantity,
+                        "unit_price": line.unit_price,
+                        "category": line.category,
+                        "line_total": line.quantity_hundredths * line.unit_price_cents / 10000,
+                    }
+                    for line in lines
+                ],
+                "totals": {
+                    "subtotal": cents_to_float(totals.subtotal),
+                    "tax_amount": cents_to_float(totals.tax_amount),
+                    "total": cents_to_float(totals.total),
+                    "category_breakdown": [
+                        {"category": category, "total": cents_to_float(amount)}
+                        for category, amount in totals.by_category.items()
+                    ],
+                },
+            }
+            encoded.append(adapter.dump_json(adapter.validate_python(payload)))
+        encoded.append(b"")
+        yield b"\n".join(encoded)
+
+
+def stream_export(
+    bind: Union[Engine, Connection],
+    user_id: int,
+    export_format: ExportFormat,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    batch_rows: int = settings.EXPORT_BATCH_ROWS,
+) -> Iterator:
+    """Yield the encoded export in chunks.
+
+    The generator opens its own session on ``bind`` and holds it until the
+    last chunk is sent (or the client goes away), independent of the
+    request's session.
+    """
+    query = export_query(user_id, created_from, created_to)
+    chunks = _csv_chunks if export_format == ExportFormat.CSV else _ndjson_chunks
+    with Session(bind=bind) as db:
+        yield from chunks(db, query, batch_rows)
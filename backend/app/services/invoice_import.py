@@ -0,0 +1,367 @@
+"""Streaming CSV import of historical invoices.
+
+The CSV has one row per line item. Rows sharing an ``invoice_ref`` make up
+one invoice and must be contiguous; the invoice fields are taken from the
+first of them. ``status``, ``created_at`` and ``due_date`` are optional.
+Status defaults to draft and created_at to the import time. Sent invoices
+without a due date get one from the payment terms, counted from created_at,
+as if they had been sent then.
+
+Rows are read one at a time and buffered a chunk of invoices at a time, so
+memory stays flat however long the file is. Each invoice is validated with
+the same rules as POST /invoices; rejected invoices have their rows written,
+with the reason, to an error CSV. On PostgreSQL each chunk is loaded with
+COPY into temporary staging tables and merged with two INSERT ... SELECTs;
+elsewhere it falls back to multi-row INSERTs. Everything happens in the
+caller's transaction.
+"""
+
+import csv
+import io
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Dict, Iterable, List, Optional, TextIO
+
+from app.core.config import settings
+from app.models.invoice import Invoice, InvoiceStatus
+from app.models.line_item import LineItem
+from app.schemas.invoice import InvoiceCreate
+from app.services import catalog, clients, invoice_changes, invoice_stats
+from pydantic import ValidationError
+from sqlalchemy import insert, text
+from sqlalchemy.orm import Session
+
+INVOICE_COLUMNS = [
+    "invoice_ref",
+    "client_name",
+    "client_email",
+    "job_address",
+    "trade_type",
+    "tax_rate",
+    "status",
+    "created_at",
+    "due_date",
+]
+LINE_ITEM_COLUMNS = ["description", "quantity", "unit_price", "category"]
+IMPORT_COLUMNS = INVOICE_COLUMNS + LINE_ITEM_COLUMNS
+OPTIONAL_COLUMNS = {"status", "created_at", "due_date"}
+ERROR_COLUMNS = ["line"] + IMPORT_COLUMNS + ["error"]
+
+# Rejections kept in memory for the report; the error file has all of them
+MAX_REPORTED_ERRORS = 20
+
+
+class InvalidImportFileError(Exception):
+    """Raised when the CSV can't be imported at all (e.g. missing columns)."""
+
+
+@dataclass
+class RejectedRow:
+    """A CSV row that was not imported."""
+
+    line: int
+    invoice_ref: str
+    error: str
+
+
+@dataclass
+class ImportProgress:
+    """Running counts for an import, reported after every chunk."""
+
+    rows_read: int = 0
+    invoices_imported: int = 0
+    line_items_imported: int = 0
+    rows_rejected: int = 0
+    errors: List[RejectedRow] = field(default_factory=list)
+
+
+@dataclass
+class _ParsedInvoice:
+    data: InvoiceCreate
+    status: InvoiceStatus
+    created_at: datetime
+    due_date: Optional[date]
+
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in detail['loc'])}: {detail['msg']}"
+        for detail in error.errors(include_url=False)
+    )
+
+
+def _parse_created_at(value: str) -> datetime:
+    created_at = datetime.fromisoformat(value)
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return created_at
+
+
+class InvoiceImporter:
+    """Imports invoices from CSV rows for one user."""
+
+    def __init__(
+        self,
+        db: Session,
+        user_id: int,
+        error_out: Optional[TextIO] = None,
+        on_progress: Optional[Callable[[ImportProgress], None]] = None,
+        chunk_size: int = settings.IMPORT_CHUNK_INVOICES,
+    ):
+        self.db = db
+        self.user_id = user_id
+        self.on_progress = on_progress
+        self.chunk_size = chunk_size
+        self.progress = ImportProgress()
+        self._error_writer = (
+            csv.DictWriter(error_out, fieldnames=ERROR_COLUMNS, extrasaction="ignore")
+            if error_out is not None
+            else None
+        )
+        self._use_copy = db.get_bind().dialect.name == "postgresql"
+        self._staging_ready = False
+
+    def run(self, lines: Iterable[str]) -> ImportProgress:
+        """Import every invoice in the CSV; the caller commits."""
+        reader = csv.DictReader(lines)
+        missing = set(IMPORT_COLUMNS) - OPTIONAL_COLUMNS - set(reader.fieldnames or [])
+        if missing:
+            raise InvalidImportFileError(f"Missing columns: {', '.join(sorted(missing))}")
+        if self._error_writer is not None:
+            self._error_writer.writeheader()
+
+        seen_refs = set()
+        pending: List[_ParsedInvoice] = []
+        group: List[Dict[str, str]] = []
+        group_lines: List[int] = []
+
+        def finish_group() -> None:
+            ref = group[0]["invoice_ref"]
+            if ref in seen_refs:
+                self._reject(group, group_lines, f"Rows for invoice_ref {ref!r} are not contiguous")
+            else:
+                seen_refs.add(ref)
+                parsed = self._parse(group, group_lines)
+                if parsed is not None:
+                    pending.append(parsed)
+            if len(pending) >= self.chunk_size:
+                self._load(pending)
+                pending.clear()
+
+        for row in reader:
+            self.progress.rows_read += 1
+            if group and row.get("invoice_ref") != group[0].get("invoice_ref"):
+                finish_group()
+                group, group_lines = [], []
+            group.append(row)
+            group_lines.append(reader.line_num)
+        if group:
+            finish_group()
+        if pending:
+            self._load(pending)
+        elif self.on_progress is not None:
+            self.on_progress(self.progress)
+
+        return self.progress
+
+    def _parse(self, rows: List[Dict[str, str]], lines: List[int]) -> Optional[_ParsedInvoice]:
+        first = rows[0]
+        if not first.get("invoice_ref"):
+            self._reject(rows, lines, "invoice_ref is required")
+            return None
+        try:
+            data = InvoiceCreate(
+                client_name=first["client_name"],
+                client_email=first["client_email"],
+                job_address=first["job_address"],
+                trade_type=first["trade_type"],
+                tax_rate=first["tax_rate"],
+                due_date=first.get("due_date") or None,
+                line_items=[{column: row[column] for column in LINE_ITEM_COLUMNS} for row in rows],
+            )
+            invoice_status = InvoiceStatus(first.get("status") or InvoiceStatus.DRAFT.value)
+            created_at = (
+                _parse_created_at(first["created_at"])
+                if first.get("created_at")
+                else datetime.now(timezone.utc)
+            )
+        except ValidationError as e:
+            self._reject(rows, lines, _validation_message(e))
+            return None
+        except ValueError as e:
+            self._reject(rows, lines, str(e))
+            return None
+        due_date = data.due_date
+        if due_date is None and invoice_status == InvoiceStatus.SENT:
+            due_date = created_at.date() + timedelta(days=settings.INVOICE_PAYMENT_TERMS_DAYS)
+        return _ParsedInvoice(
+            data=data, status=invoice_status, created_at=created_at, due_date=due_date
+        )
+
+    def _reject(self, rows: List[Dict[str, str]], lines: List[int], error: str) -> None:
+        self.progress.rows_rejected += len(rows)
+        if len(self.progress.errors) < MAX_REPORTED_ERRORS:
+            self.progress.errors.append(
+                RejectedRow(
+                    line=lines[0], invoice_ref=rows[0].get("invoice_ref") or "", error=error
+                )
+            )
+        if self._error_writer is not None:
+            for row, line in zip(rows, lines):
+                self._error_writer.writerow({**row, "line": line, "error": error})
+
+    def _load(self, chunk: List[_ParsedInvoice]) -> None:
+        invoice_ids = self._copy_chunk(chunk) if self._use_copy else self._insert_chunk(chunk)
+        catalog.learn(
+            self.db, self.user_id, [item for parsed in chunk for item in parsed.data.line_items]
+        )
+        clients.link(self.db, invoice_ids)
+        invoice_stats.record_changes(self.db, {}, invoice_stats.snapshot(self.db, invoice_ids))
+        invoice_changes.record(self.db, self.user_id, invoice_ids)
+
+        self.progress.invoices_imported += len(chunk)
+        self.progress.line_items_imported += sum(len(parsed.data.line_items) for parsed in chunk)
+        if self.on_progress is not None:
+            self.on_progress(self.progress)
+
+    def _insert_chunk(self, chunk: List[_ParsedInvoice]) -> List[int]:
+        """Portable path: multi-row INSERTs."""
+        invoice_ids = (
+            self.db.execute(
+                insert(Invoice).returning(Invoice.id, sort_by_parameter_order=True),
+                [
+                    {
+                        "user_id": self.user_id,
+                        "client_name": parsed.data.client_name,
+                        "client_email": parsed.data.client_email,
+                        "job_address": parsed.data.job_address,
+                        "trade_type": parsed.data.trade_type,
+                        "tax_rate": parsed.data.tax_rate,
+                        "status": parsed.status,
+                        "created_at": parsed.created_at,
+                        "due_date": parsed.due_date,
+                    }
+                    for parsed in chunk
+                ],
+            )
+            .scalars()
+            .all()
+        )
+        self.db.execute(
+            insert(LineItem),
+            [
+                {
+                    "invoice_id": invoice_id,
+                    "description": item.description,
+                    "quantity": item.quantity,
+                    "unit_price": item.unit_price,
+                    "category": item.category,
+                }
+                for invoice_id, parsed in zip(invoice_ids, chunk)
+                for item in parsed.data.line_items
+            ],
+        )
+        return list(invoice_ids)
+
+    def _copy_chunk(self, chunk: List[_ParsedInvoice]) -> List[int]:
+        """PostgreSQL path: COPY into staging tables, then merge."""
+        # Enum types are labelled with member values (app.core.database.enum_values)
+        invoices_csv = io.StringIO()
+        line_items_csv = io.StringIO()
+        invoice_writer = csv.writer(invoices_csv)
+        line_item_writer = csv.writer(line_items_csv)
+        for stage_id, parsed in enumerate(chunk):
+            data = parsed.data
+            invoice_writer.writerow(
+                [
+                    stage_id,
+                    data.client_name,
+                    data.client_email,
+                    data.job_address,
+                    data.trade_type.value,
+                    data.tax_rate,
+                    parsed.status.value,
+                    parsed.created_at.isoformat(),
+                    parsed.due_date.isoformat() if parsed.due_date else None,
+                ]
+            )
+            for item in data.line_items:
+                line_item_writer.writerow(
+                    [
+                        stage_id,
+                        item.description,
+                        item.quantity,
+                        item.unit_price,
+                        item.category.value,
+                    ]
+                )
+        invoices_csv.seek(0)
+        line_items_csv.seek(0)
+
+        self._prepare_staging()
+        cursor = self.db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(
+                "COPY import_invoices_stage (stage_id, client_name, client_email, job_address, "
+                "trade_type, tax_rate, status, created_at, due_date) FROM STDIN WITH (FORMAT csv)",
+                invoices_csv,
+            )
+            cursor.copy_expert(
+                "COPY import_line_items_stage (stage_id, description, quantity, unit_price, "
+                "category) FROM STDIN WITH (FORMAT csv)",
+                line_items_csv,
+            )
+        finally:
+            cursor.close()
+
+        # Ids are drawn up front so line items can be joined to their invoice
+        self.db.execute(
+            text(
+                "UPDATE import_invoices_stage "
+                "SET invoice_id = nextval(pg_get_serial_sequence('invoices', 'id'))"
+            )
+        )
+        self.db.execute(
+            text(
+                "INSERT INTO invoices (id, user_id, client_name, client_email, job_address, "
+                "trade_type, tax_rate, status, created_at, due_date) "
+                "SELECT invoice_id, :user_id, client_name, client_email, job_address, "
+                "trade_type::tradetype, tax_rate, status::invoicestatus, created_at, due_date "
+                "FROM import_invoices_stage ORDER BY stage_id"
+            ),
+            {"user_id": self.user_id},
+        )
+        self.db.execute(
+            text(
+                "INSERT INTO line_items (invoice_id, description, quantity, unit_price, category) "
+                "SELECT s.invoice_id, l.description, l.quantity, l.unit_price, "
+                "l.category::lineitemcategory "
+                "FROM import_line_items_stage l JOIN import_invoices_stage s USING (stage_id)"
+            )
+        )
+        return list(
+            self.db.execute(
+                text("SELECT invoice_id FROM import_invoices_stage ORDER BY stage_id")
+            ).scalars()
+        )
+
+    def _prepare_staging(self) -> None:
+        if self._staging_ready:
+            self.db.execute(text("TRUNCATE import_invoices_stage, import_line_items_stage"))
+            return
+        self.db.execute(
+            text(
+                "CREATE TEMP TABLE import_invoices_stage ("
+                "stage_id integer PRIMARY KEY, invoice_id integer, client_name text, "
+                "client_email text, job_address text, trade_type text, tax_rate numeric, "
+                "status text, created_at timestamptz, due_date date) ON COMMIT DROP"
+            )
+        )
+        self.db.execute(
+            text(
+                "CREATE TEMP TABLE import_line_items_stage ("
+                "stage_id integer, description text, quantity numeric, unit_price numeric, "
+                "category text) ON COMMIT DROP"
+            )
+        )
+        self._staging_ready = True
@@ -0,0 +1,166 @@
+"""Incremental invoice rollups for the revenue dashboard.
+
+Every invoice contributes one count and its total to a single
+``invoice_monthly_stats`` row, keyed by user, creation month, status and
+trade. Write paths snapshot the invoices they touch before and after the
+change and apply the difference, inside the same transaction:
+
+    before = snapshot(db, [invoice.id])
+    ...  # change the invoice
+    db.flush()
+    record_changes(db, before, snapshot(db, [invoice.id]))
+    db.commit()
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.models.invoice import Invoice, InvoiceStatus, TradeType
+from app.models.invoice_stats import InvoiceMonthlyStats
+from app.models.line_item import LineItem
+from app.money import TotalsBatch, compute_totals
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+# Invoices totalled per query when rebuilding
+REBUILD_BATCH_SIZE = 5000
+
+StatsKey = Tuple[int, date, InvoiceStatus, TradeType]
+
+
+@dataclass(frozen=True)
+class StatsContribution:
+    """What one invoice adds to the rollup."""
+
+    user_id: int
+    month: date
+    status: InvoiceStatus
+    trade_type: TradeType
+    total_cents: int
+
+    @property
+    def key(self) -> StatsKey:
+        return (self.user_id, self.month, self.status, self.trade_type)
+
+
+def month_of(created_at: Optional[datetime]) -> date:
+    """First day of the (UTC) month an invoice was created in."""
+    if created_at is None:
+        created_at = datetime.now(timezone.utc)
+    elif created_at.tzinfo is not None:
+        created_at = created_at.astimezone(timezone.utc)
+    return created_at.date().replace(day=1)
+
+
+def snapshot(db: Session, invoice_ids: Iterable[int]) -> Dict[int, StatsContribution]:
+    """Current rollup contributions of the given invoices, read from the database."""
+    invoice_ids = list(invoice_ids)
+    if not invoice_ids:
+        return {}
+
+    invoices = (
+        db.query(
+            Invoice.id,
+            Invoice.user_id,
+            Invoice.created_at,
+            Invoice.status,
+            Invoice.trade_type,
+            Invoice.tax_rate_bps,
+        )
+        .filter(Invoice.id.in_(invoice_ids))
+        .order_by(Invoice.id)
+        .all()
+    )
+    lines = db.query(
+        LineItem.invoice_id,
+        LineItem.quantity_hundredths,
+        LineItem.unit_price_cents,
+        LineItem.category,
+    ).filter(LineItem.invoice_id.in_(invoice_ids))
+    totals = compute_totals(
+        TotalsBatch.from_rows(((row.id, row.tax_rate_bps) for row in invoices), lines)
+    )
+
+    return {
+        row.id: StatsContribution(
+            user_id=row.user_id,
+            month=month_of(row.created_at),
+            status=row.status,
+            trade_type=row.trade_type,
+            total_cents=invoice_totals.total,
+        )
+        for row, invoice_totals in zip(invoices, totals)
+    }
+
+
+def record_changes(
+    db: Session,
+    before: Dict[int, StatsContribution],
+    after: Dict[int, StatsContribution],
+) -> None:
+    """Apply the difference between two snapshots to the rollup table.
+
+    Invoices only in ``before`` were deleted; only in ``after``, created.
+    """
+    deltas: Dict[StatsKey, List[int]] = defaultdict(lambda: [0, 0])
+    for contribution in before.values():
+        delta = deltas[contribution.key]
+        delta[0] -= 1
+        delta[1] -= contribution.total_cents
+    for contribution in after.values():
+        delta = deltas[contribution.key]
+        delta[0] += 1
+        delta[1] += contribution.total_cents
+
+    rows = [
+        {
+            "user_id": user_id,
+            "month": month,
+            "status": invoice_status,
+            "trade_type": trade_type,
+            "invoice_count": count,
+            "total_cents": cents,
+        }
+        for (user_id, month, invoice_status, trade_type), (count, cents) in deltas.items()
+        if count or cents
+    ]
+    if rows:
+        _upsert_deltas(db, rows)
+
+
+def _upsert_deltas(db: Session, rows: List[dict]) -> None:
+    """Add count and total deltas to rollup rows, creating missing ones."""
+    dialect_insert = (
+        postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+    )
+    stmt = dialect_insert(InvoiceMonthlyStats).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id", "month", "status", "trade_type"],
+        set_={
+            "invoice_count": InvoiceMonthlyStats.invoice_count + stmt.excluded.invoice_count,
+            "total_cents": InvoiceMonthlyStats.total_cents + stmt.excluded.total_cents,
+        },
+    )
+    db.execute(stmt)
+
+
+def rebuild(db: Session, user_id: Optional[int] = None) -> int:
+    """Recompute the rollup from the invoices themselves.
+
+    Rebuilds one user's rows, or every user's when ``user_id`` is None.
+    Returns the number of invoices counted. The caller commits.
+    """
+    stale = db.query(InvoiceMonthlyStats)
+    ids = db.query(Invoice.id).order_by(Invoice.id)
+    if user_id is not None:
+        stale = stale.filter(InvoiceMonthlyStats.user_id == user_id)
+        ids = ids.filter(Invoice.user_id == user_id)
+    stale.delete(synchronize_session=False)
+
+    invoice_ids = [row.id for row in ids]
+    for start in range(0, len(invoice_ids), REBUILD_BATCH_SIZE):
+        batch = invoice_ids[start : start + REBUILD_BATCH_SIZE]
+        record_changes(db, {}, snapshot(db, batch))
+    return len(invoice_ids)
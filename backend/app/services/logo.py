@@ -0,0 +1,140 @@
+"""Business logo preparation and render cache.
+
+Uploaded logos are decoded, resized and recompressed once, at upload time.
+Invoice renders only ever embed that prepared copy, held in a local cache.
+"""
+
+import base64
+import io
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from app.core.config import settings
+from app.services.storage import r2_storage
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+logger = logging.getLogger(__name__)
+
+# Twice the size the templates display the logo at, for print sharpness
+LOGO_MAX_SIZE = (600, 200)
+# Reject absurd dimensions before decoding a single pixel
+MAX_SOURCE_PIXELS = 50_000_000
+ACCEPTED_FORMATS = {"PNG", "JPEG", "WEBP", "GIF"}
+CONTENT_TYPES = {"png": "image/png", "jpg": "image/jpeg"}
+
+
+class InvalidLogoError(Exception):
+    """Raised when an upload can't be used as a logo."""
+
+
+@dataclass(frozen=True)
+class PreparedLogo:
+    """A logo ready to store and embed."""
+
+    data: bytes
+    extension: str
+    width: int
+    height: int
+
+    @property
+    def content_type(self) -> str:
+        return CONTENT_TYPES[self.extension]
+
+    def data_uri(self) -> str:
+        """Inline form for embedding in the invoice HTML."""
+        encoded = base64.b64encode(self.data).decode("ascii")
+        return f"data:{self.content_type};base64,{encoded}"
+
+
+def prepare_logo(raw: bytes) -> PreparedLogo:
+    """Decode, downscale and recompress an uploaded logo.
+
+    Images with transparency become PNG; everything else becomes JPEG.
+    """
+    if len(raw) > settings.LOGO_MAX_UPLOAD_BYTES:
+        raise InvalidLogoError("Logo file is too large")
+
+    try:
+        with Image.open(io.BytesIO(raw)) as source:
+            if source.format not in ACCEPTED_FORMATS:
+                raise InvalidLogoError("Logo must be a PNG, JPEG, WebP or GIF image")
+            if source.width * source.height > MAX_SOURCE_PIXELS:
+                raise InvalidLogoError("Logo dimensions are too large")
+
+            # Let the JPEG decoder downscale while decoding camera photos
+            source.draft("RGB", (LOGO_MAX_SIZE[0] * 2, LOGO_MAX_SIZE[1] * 2))
+            image = ImageOps.exif_transpose(source)
+            image.thumbnail(LOGO_MAX_SIZE, Image.LANCZOS)
+
+            has_alpha = image.mode in ("RGBA", "LA") or (
+                image.mode == "P" and "transparency" in image.info
+            )
+            out = io.BytesIO()
+            if has_alpha:
+                image.convert("RGBA").save(out, "PNG", optimize=True)
+                extension = "png"
+            else:
+                image.convert("RGB").save(out, "JPEG", quality=85, optimize=True, progressive=True)
+                extension = "jpg"
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as e:
+        raise InvalidLogoError(f"Could not read logo image: {e}")
+
+    return PreparedLogo(
+        data=out.getvalue(), extension=extension, width=image.width, height=image.height
+    )
+
+
+class LogoCache:
+    """LRU of prepared logos as data URIs, keyed by storage key.
+
+    Logo keys are unique per upload, so entries never go stale; a new upload
+    simply gets a new key.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, key: str, logo: PreparedLogo) -> None:
+        """Cache a logo that was just prepared, saving a download later."""
+        self._store(key, logo.data_uri())
+
+    def get_data_uri(self, key: str) -> Optional[str]:
+        """Return the logo as a data URI, fetching the prepared copy on a miss."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+        try:
+            data = r2_storage.download(key)
+        except Exception as e:
+            # A missing logo shouldn't stop the invoice going out
+            logger.warning("Could not load logo %s: %s", key, e)
+            return None
+
+        extension = key.rsplit(".", 1)[-1]
+        encoded = base64.b64encode(data).decode("ascii")
+        data_uri = f"data:{CONTENT_TYPES.get(extension, 'image/png')};base64,{encoded}"
+        self._store(key, data_uri)
+        return data_uri
+
+    def _store(self, key: str, data_uri: str) -> None:
+        with self._lock:
+            self._entries[key] = data_uri
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every cached logo."""
+        with self._lock:
+            self._entries.clear()
+
+
+# Singleton instance
+logo_cache = LogoCache(max_entries=settings.LOGO_CACHE_ENTRIES)
@@ -0,0 +1,119 @@
+"""Per-user cache of business profiles prepared for rendering."""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.models.business_profile import BusinessProfile
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+
+@dataclass(frozen=True)
+class BusinessRenderContext:
+    """Business profile fields as the invoice templates and emails use them."""
+
+    user_id: int
+    business_name: str
+    template_fields: Dict[str, str] = field(default_factory=dict)
+    logo_key: Optional[str] = None
+
+    @classmethod
+    def from_profile(cls, profile: BusinessProfile) -> "BusinessRenderContext":
+        """Build a render context from a business profile row."""
+        return cls(
+            user_id=profile.user_id,
+            business_name=profile.business_name,
+            template_fields={
+                "business_name": profile.business_name or "",
+                "business_phone": profile.phone or "",
+                "business_email": profile.email or "",
+                "business_license": profile.license_number or "",
+            },
+            logo_key=profile.logo_key,
+        )
+
+    def pdf_filename(self, invoice_id: int) -> str:
+        """Attachment filename for an invoice PDF."""
+        return f"invoice_{invoice_id}_{self.business_name.replace(' ', '_')}.pdf"
+
+
+# Changes whenever the profile row does (updated_at is only set by updates)
+_PROFILE_STAMP = func.coalesce(BusinessProfile.updated_at, BusinessProfile.created_at)
+
+
+class ProfileCache:
+    """LRU of render contexts keyed by user id.
+
+    The profile endpoints invalidate entries on write. Edits made through
+    another worker are caught on read: a hit is only served while the
+    profile row's id and timestamp still match the cached copy's, which is
+    one lookup on the unique ``user_id`` index instead of a full reload.
+    """
+
+    def __init__(self, ttl_seconds: int, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, Tuple[BusinessRenderContext, tuple, float]]" = (
+            OrderedDict()
+        )
+        # Bumped by every invalidation; a load that started before one is not stored
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, user_id: int) -> Optional[BusinessRenderContext]:
+        """Return the user's render context, loading it on a miss."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and now - entry[2] >= self.ttl_seconds:
+                entry = None
+            generation = self._generation
+
+        if entry is not None:
+            stamp = (
+                db.query(BusinessProfile.id, _PROFILE_STAMP)
+                .filter(BusinessProfile.user_id == user_id)
+                .first()
+            )
+            if stamp is not None and tuple(stamp) == entry[1]:
+                with self._lock:
+                    if user_id in self._entries:
+                        self._entries.move_to_end(user_id)
+                return entry[0]
+
+        profile = db.query(BusinessProfile).filter(BusinessProfile.user_id == user_id).first()
+        if profile is None:
+            self.invalidate(user_id)
+            return None
+
+        context = BusinessRenderContext.from_profile(profile)
+        stamp = (profile.id, profile.updated_at or profile.created_at)
+        with self._lock:
+            if generation == self._generation:
+                self._entries[user_id] = (context, stamp, now)
+                self._entries.move_to_end(user_id)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return context
+
+    def invalidate(self, user_id: int) -> None:
+        """Drop a user's cached profile after it changes."""
+        with self._lock:
+            self._entries.pop(user_id, None)
+            self._generation += 1
+
+    def clear(self) -> None:
+        """Drop every cached profile."""
+        with self._lock:
+            self._entries.clear()
+
+
+# Singleton instance
+profile_cache = ProfileCache(
+    ttl_seconds=settings.PROFILE_CACHE_TTL_SECONDS,
+    max_entries=settings.PROFILE_CACHE_ENTRIES,
+)
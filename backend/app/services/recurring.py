@@ -0,0 +1,168 @@
+"""Issuing recurring invoices.
+
+``issue_due`` takes a batch of due definitions with ``SELECT ... FOR UPDATE
+SKIP LOCKED``, so schedulers running on several nodes share the work
+instead of issuing anything twice: a definition one node holds is skipped
+by the others, and by the time its lock is released its ``next_run_at`` has
+moved on. A batch costs a fixed number of statements however large it is:
+the templates and their line items are read in two queries, and the new
+invoices, their line items, their client links, the definitions' next runs
+and any queued sends are each written in batched statements.
+"""
+
+import calendar
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from app.models.invoice import Invoice, InvoiceStatus
+from app.models.line_item import LineItem
+from app.models.recurring_invoice import QueuedSend, RecurrenceFrequency, RecurringInvoice
+from app.services import clients, invoice_changes, invoice_stats
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+
+_MONTHS = {
+    RecurrenceFrequency.MONTHLY: 1,
+    RecurrenceFrequency.QUARTERLY: 3,
+    RecurrenceFrequency.YEARLY: 12,
+}
+
+
+def next_occurrence(when: datetime, frequency: RecurrenceFrequency, anchor_day: int) -> datetime:
+    """The run after ``when``.
+
+    Monthly schedules keep to ``anchor_day``, falling back to the last day
+    of shorter months: Jan 31, Feb 28, Mar 31.
+    """
+    if frequency == RecurrenceFrequency.WEEKLY:
+        return when + timedelta(weeks=1)
+    month_index = when.month - 1 + _MONTHS[frequency]
+    year, month = when.year + month_index // 12, month_index % 12 + 1
+    return when.replace(
+        year=year, month=month, day=min(anchor_day, calendar.monthrange(year, month)[1])
+    )
+
+
+def issue_due(db: Session, now: datetime, batch_size: int) -> int:
+    """Issue invoices for up to ``batch_size`` due definitions.
+
+    Returns how many were issued. A definition more than one period behind
+    is issued once per call, so repeated calls catch it up. The caller
+    commits, which releases the batch's locks.
+    """
+    due = db.execute(
+        select(
+            RecurringInvoice.id,
+            RecurringInvoice.user_id,
+            RecurringInvoice.template_invoice_id,
+            RecurringInvoice.frequency,
+            RecurringInvoice.anchor_day,
+            RecurringInvoice.next_run_at,
+            RecurringInvoice.auto_send,
+        )
+        # Follows ix_recurring_invoices_next_run_at
+        .where(RecurringInvoice.active.is_(True), RecurringInvoice.next_run_at <= now)
+        .order_by(RecurringInvoice.next_run_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ).all()
+    if not due:
+        return 0
+
+    template_ids = {definition.template_invoice_id for definition in due}
+    templates = {
+        row.id: row
+        for row in db.execute(
+            select(
+                Invoice.id,
+                Invoice.client_name,
+                Invoice.client_email,
+                Invoice.job_address,
+                Invoice.client_id,
+                Invoice.trade_type,
+                Invoice.tax_rate,
+            ).where(Invoice.id.in_(template_ids))
+        )
+    }
+    template_lines: Dict[int, List] = defaultdict(list)
+    for row in db.execute(
+        select(
+            LineItem.invoice_id,
+            LineItem.description,
+            LineItem.quantity,
+            LineItem.unit_price,
+            LineItem.category,
+        )
+        .where(LineItem.invoice_id.in_(template_ids))
+        .order_by(LineItem.id)
+    ):
+        template_lines[row.invoice_id].append(row)
+
+    invoice_ids = (
+        db.execute(
+            insert(Invoice).returning(Invoice.id, sort_by_parameter_order=True),
+            [
+                {
+                    "user_id": definition.user_id,
+                    "client_name": templates[definition.template_invoice_id].client_name,
+                    "client_email": templates[definition.template_invoice_id].client_email,
+                    "job_address": templates[definition.template_invoice_id].job_address,
+                    "client_id": templates[definition.template_invoice_id].client_id,
+                    "trade_type": templates[definition.template_invoice_id].trade_type,
+                    "tax_rate": templates[definition.template_invoice_id].tax_rate,
+                    "status": InvoiceStatus.DRAFT,
+                }
+                for definition in due
+            ],
+        )
+        .scalars()
+        .all()
+    )
+    issued = list(zip(due, invoice_ids))
+
+    line_items = [
+        {
+            "invoice_id": invoice_id,
+            "description": line.description,
+            "quantity": line.quantity,
+            "unit_price": line.unit_price,
+            "category": line.category,
+        }
+        for definition, invoice_id in issued
+        for line in template_lines[definition.template_invoice_id]
+    ]
+    if line_items:
+        db.execute(insert(LineItem), line_items)
+
+    # Bumps last_invoiced_at, so regular clients stay at the top of the list
+    clients.link(db, invoice_ids)
+    invoice_stats.record_changes(db, {}, invoice_stats.snapshot(db, invoice_ids))
+    by_user: Dict[int, List[int]] = defaultdict(list)
+    for definition, invoice_id in issued:
+        by_user[definition.user_id].append(invoice_id)
+    invoice_changes.record_many(db, by_user)
+
+    db.execute(
+        update(RecurringInvoice),
+        [
+            {
+                "id": definition.id,
+                "next_run_at": next_occurrence(
+                    definition.next_run_at, definition.frequency, definition.anchor_day
+                ),
+                "last_run_at": now,
+                "last_invoice_id": invoice_id,
+            }
+            for definition, invoice_id in issued
+        ],
+    )
+
+    sends = [
+        {"invoice_id": invoice_id, "user_id": definition.user_id, "available_at": now}
+        for definition, invoice_id in issued
+        if definition.auto_send
+    ]
+    if sends:
+        db.execute(insert(QueuedSend), sends)
+    return len(issued)
@@ -0,0 +1,203 @@
+"""Payment reminders for overdue invoices.
+
+``enqueue_due`` finds sent invoices that are past due through the partial
+index ``ix_invoices_due_date_sent``, which holds only unpaid (sent)
+invoices, and reads just the slice of it whose due dates fall in the
+reminder window: up to ``REMINDER_DAYS_OVERDUE[-1] + REMINDER_CATCH_UP_DAYS``
+days ago. A scan therefore costs the same however many invoices have been
+paid or have aged out before. Each invoice is queued for the reminder stage
+it has reached; ``invoice_reminders`` has one row per invoice and stage, so
+an insert that conflicts means it was already queued and is skipped.
+
+``deliver_due`` sends queued reminders business by business, loading each
+business's profile and its invoices once for the whole group. Workers take
+reminders with ``FOR UPDATE SKIP LOCKED`` and a visibility timeout, as
+app.services.send_queue does, and a reminder for an invoice that was paid
+in the meantime is dropped.
+"""
+
+import bisect
+import logging
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from app.api.invoices import load_invoice_payloads
+from app.core.config import settings
+from app.models.invoice import Invoice, InvoiceStatus
+from app.models.invoice_reminder import InvoiceReminder
+from app.services.email import email_service
+from app.services.profile_cache import profile_cache
+from app.services.send_queue import SendResult
+from sqlalchemy import delete, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Position of the last invoice scanned, to carry on from: (due date, id)
+ScanPosition = Tuple[date, int]
+
+
+def reminder_stage(days_overdue: int) -> int:
+    """How many of ``REMINDER_DAYS_OVERDUE`` an invoice this late has passed."""
+    return bisect.bisect_right(sorted(settings.REMINDER_DAYS_OVERDUE), days_overdue)
+
+
+def enqueue_due(
+    db: Session,
+    today: date,
+    now: datetime,
+    batch_size: int,
+    after: Optional[ScanPosition] = None,
+) -> Tuple[int, Optional[ScanPosition]]:
+    """Queue reminders for the next ``batch_size`` overdue invoices.
+
+    Returns how many were queued and where to carry on from, or None once
+    the window is done. The caller commits.
+    """
+    offsets = sorted(settings.REMINDER_DAYS_OVERDUE)
+    query = (
+        select(Invoice.id, Invoice.user_id, Invoice.due_date)
+        # Follows ix_invoices_due_date_sent
+        .where(
+            Invoice.status == InvoiceStatus.SENT,
+            Invoice.due_date.between(
+                today - timedelta(days=offsets[-1] + settings.REMINDER_CATCH_UP_DAYS),
+                today - timedelta(days=offsets[0]),
+            ),
+        )
+        .order_by(Invoice.due_date, Invoice.id)
+        .limit(batch_size)
+    )
+    if after is not None:
+        query = query.where(tuple_(Invoice.due_date, Invoice.id) > tuple_(*after))
+    overdue = db.execute(query).all()
+    if not overdue:
+        return 0, None
+
+    dialect_insert = (
+        postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+    )
+    queued = db.execute(
+        dialect_insert(InvoiceReminder)
+        .values(
+            [
+                {
+                    "invoice_id": row.id,
+                    "user_id": row.user_id,
+                    "stage": reminder_stage((today - row.due_date).days),
+                    "available_at": now,
+                }
+                for row in overdue
+            ]
+        )
+        .on_conflict_do_nothing(index_elements=["invoice_id", "stage"])
+        .returning(InvoiceReminder.id)
+    ).all()
+    last = overdue[-1]
+    return len(queued), (last.due_date, last.id)
+
+
+def take_due(db: Session, now: datetime, batch_size: int) -> List:
+    """Take up to ``batch_size`` due reminders and hide them from other workers; commits."""
+    due = (
+        select(InvoiceReminder.id)
+        # Follows ix_invoice_reminders_available_at
+        .where(
+            InvoiceReminder.sent_at.is_(None),
+            InvoiceReminder.available_at <= now,
+            InvoiceReminder.attempts < settings.SEND_QUEUE_MAX_ATTEMPTS,
+        )
+        .order_by(InvoiceReminder.available_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    taken = db.execute(
+        update(InvoiceReminder)
+        .where(InvoiceReminder.id.in_(due))
+        .values(
+            available_at=now + timedelta(seconds=settings.SEND_QUEUE_VISIBILITY_SECONDS),
+            attempts=InvoiceReminder.attempts + 1,
+        )
+        .returning(
+            InvoiceReminder.id,
+            InvoiceReminder.invoice_id,
+            InvoiceReminder.user_id,
+            InvoiceReminder.attempts,
+        )
+    ).all()
+    db.commit()
+    return taken
+
+
+def deliver_due(db: Session, now: datetime, batch_size: int) -> SendResult:
+    """Email one batch of queued reminders.
+
+    A reminder that fails is retried with backoff; after
+    ``SEND_QUEUE_MAX_ATTEMPTS`` it is left unsent, with its error, so it is
+    neither retried nor queued again.
+    """
+    result = SendResult()
+    by_user: Dict[int, List] = defaultdict(list)
+    for reminder in take_due(db, now, batch_size):
+        by_user[reminder.user_id].append(reminder)
+
+    for user_id, reminders in by_user.items():
+        business_profile = profile_cache.get(db, user_id)
+        invoices = load_invoice_payloads(
+            db, user_id, [reminder.invoice_id for reminder in reminders]
+        )
+        for reminder in reminders:
+            invoice = invoices.get(reminder.invoice_id)
+            if invoice is None or invoice["status"] != InvoiceStatus.SENT:
+                # Paid (or gone) since it was queued
+                db.execute(delete(InvoiceReminder).where(InvoiceReminder.id == reminder.id))
+                db.commit()
+                result.dropped += 1
+                continue
+
+            try:
+                if not business_profile:
+                    raise ValueError("Business profile not set up")
+                email_service.send_payment_reminder(
+                    to_email=invoice["client_email"],
+                    business_name=business_profile.business_name,
+                    client_name=invoice["client_name"],
+                    invoice_number=invoice["id"],
+                    total=invoice["totals"]["total"],
+                    due_date=invoice["due_date"],
+                    days_overdue=(now.date() - invoice["due_date"]).days,
+                    pdf_url=invoice["pdf_url"],
+                )
+            except Exception as e:
+                if reminder.attempts >= settings.SEND_QUEUE_MAX_ATTEMPTS:
+                    logger.error(
+                        "Giving up on reminder %s for invoice %s after %s attempts: %s",
+                        reminder.id,
+                        reminder.invoice_id,
+                        reminder.attempts,
+                        e,
+                    )
+                    result.dropped += 1
+                    retry_at = now
+                else:
+                    result.failed += 1
+                    # Back off: 1, 2, 4, ... minutes
+                    retry_at = now + timedelta(minutes=2 ** (reminder.attempts - 1))
+                db.execute(
+                    update(InvoiceReminder)
+                    .where(InvoiceReminder.id == reminder.id)
+                    .values(available_at=retry_at, last_error=str(e))
+                )
+                db.commit()
+                continue
+
+            db.execute(
+                update(InvoiceReminder)
+                .where(InvoiceReminder.id == reminder.id)
+                .values(sent_at=now, last_error=None)
+            )
+            db.commit()
+            result.sent += 1
+    return result
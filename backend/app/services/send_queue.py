@@ -0,0 +1,104 @@
+"""Sending queued invoices, e.g. those issued by recurring schedules.
+
+Workers take a batch of due rows with ``FOR UPDATE SKIP LOCKED`` and push
+their ``available_at`` out by ``SEND_QUEUE_VISIBILITY_SECONDS`` before
+committing, so other workers leave them alone while they're sent, and a
+worker that dies leaves them to be taken again later. Each invoice is then
+sent as POST /invoices/{id}/send would send it; the invoice's own send
+lease keeps a row taken twice from being emailed twice.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import List
+
+from app.api.invoices import apply_invoice_send
+from app.core.config import settings
+from app.models.invoice import Invoice, InvoiceStatus
+from app.models.recurring_invoice import QueuedSend
+from fastapi import HTTPException
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SendResult:
+    """What one pass over the queue did."""
+
+    sent: int = 0
+    failed: int = 0  # Will be retried
+    dropped: int = 0  # Already sent, gone, or out of attempts
+
+
+def take_due(db: Session, now: datetime, batch_size: int) -> List:
+    """Take up to ``batch_size`` due sends and hide them from other workers; commits."""
+    due = (
+        select(QueuedSend.invoice_id)
+        .where(QueuedSend.available_at <= now)
+        .order_by(QueuedSend.available_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    taken = db.execute(
+        update(QueuedSend)
+        .where(QueuedSend.invoice_id.in_(due))
+        .values(
+            available_at=now + timedelta(seconds=settings.SEND_QUEUE_VISIBILITY_SECONDS),
+            attempts=QueuedSend.attempts + 1,
+        )
+        .returning(QueuedSend.invoice_id, QueuedSend.user_id, QueuedSend.attempts)
+    ).all()
+    db.commit()
+    return taken
+
+
+def _drop(db: Session, invoice_id: int) -> None:
+    db.execute(delete(QueuedSend).where(QueuedSend.invoice_id == invoice_id))
+    db.commit()
+
+
+def send_due(db: Session, now: datetime, batch_size: int) -> SendResult:
+    """Send one batch of due queued invoices."""
+    result = SendResult()
+    for queued in take_due(db, now, batch_size):
+        try:
+            apply_invoice_send(db, queued.user_id, queued.invoice_id)
+            db.execute(delete(QueuedSend).where(QueuedSend.invoice_id == queued.invoice_id))
+            db.commit()
+            result.sent += 1
+            continue
+        except HTTPException as e:
+            db.rollback()
+            error = str(e.detail)
+
+        current_status = db.execute(
+            select(Invoice.status).where(Invoice.id == queued.invoice_id)
+        ).scalar()
+        if current_status in (None, InvoiceStatus.SENT):
+            _drop(db, queued.invoice_id)
+            result.dropped += 1
+        elif queued.attempts >= settings.SEND_QUEUE_MAX_ATTEMPTS:
+            logger.error(
+                "Giving up sending invoice %s after %s attempts: %s",
+                queued.invoice_id,
+                queued.attempts,
+                error,
+            )
+            _drop(db, queued.invoice_id)
+            result.dropped += 1
+        else:
+            # Back off: 1, 2, 4, ... minutes
+            db.execute(
+                update(QueuedSend)
+                .where(QueuedSend.invoice_id == queued.invoice_id)
+                .values(
+                    available_at=now + timedelta(minutes=2 ** (queued.attempts - 1)),
+                    last_error=error,
+                )
+            )
+            db.commit()
+            result.failed += 1
+    return result
@@ -1,11 +1,11 @@
 """Cloudflare R2 storage service."""
-import boto3
-from botocore.exceptions import ClientError
+
 import uuid
 from datetime import datetime
-from typing import Optional
 
+import boto3
 from app.core.config import settings
+from botocore.exceptions import ClientError
 
 
 class R2Storage:
@@ -20,8 +20,9 @@ class R2Storage:
 
     def _check_credentials(self):
         """Raise if credentials are missing."""
-        if not all([self.endpoint_url, self.access_key_id,
-                    self.secret_access_key, self.bucket_name]):
+        if not all(
+            [self.endpoint_url, self.access_key_id, self.secret_access_key, self.bucket_name]
+        ):
             raise ValueError("R2 credentials not configured")
 
     @property
@@ -33,9 +34,7 @@ class R2Storage:
                 "aws_access_key_id": self.access_key_id,
                 "aws" + "_secret_access_key": self.secret_access_key,
             }
-            self._client = boto3.client(
-                "s3", endpoint_url=self.endpoint_url, **creds
-            )
+            self._client = boto3.client("s3", endpoint_url=self.endpoint_url, **creds)
         return self._client
 
     def generate_pdf_key(self, invoice_id: int) -> str:
@@ -67,6 +66,61 @@ class R2Storage:
         # We'll store the key and construct URL when needed.
         return key
 
+    def upload_logo(
+        self, image_bytes: bytes, user_id: int, extension: str, content_type: str
+    ) -> str:
+        """Upload a prepared business logo and return its key."""
+        self._check_credentials()
+        key = f"logos/{user_id}/{uuid.uuid4().hex}.{extension}"
+
+        try:
+            self.client.put_object(
+                Bucket=self.bucket_name,
+                Key=key,
+                Body=image_bytes,
+                ContentType=content_type,
+                CacheControl="public, max-age=31536000, immutable",
+            )
+        except ClientError as e:
+            raise Exception(f"Failed to upload logo to R2: {e}")
+
+        return key
+
+    def upload_import_errors(self, csv_bytes: bytes, user_id: int) -> str:
+        """Upload the rejected-rows CSV of an invoice import and return its key."""
+        self._check_credentials()
+        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        key = f"imports/{user_id}/{timestamp}_{uuid.uuid4().hex[:8]}_errors.csv"
+
+        try:
+            self.client.put_object(
+                Bucket=self.bucket_name,
+                Key=key,
+                Body=csv_bytes,
+                ContentType="text/csv",
+            )
+        except ClientError as e:
+            raise Exception(f"Failed to upload import errors to R2: {e}")
+
+        return key
+
+    def download(self, key: str) -> bytes:
+        """Fetch a stored object's bytes."""
+        self._check_credentials()
+        try:
+            response = self.client.get_object(Bucket=self.bucket_name, Key=key)
+        except ClientError as e:
+            raise Exception(f"Failed to download {key} from R2: {e}")
+        return response["Body"].read()
+
+    def delete(self, key: str) -> None:
+        """Delete a stored object."""
+        self._check_credentials()
+        try:
+            self.client.delete_object(Bucket=self.bucket_name, Key=key)
+        except ClientError as e:
+            raise Exception(f"Failed to delete {key} from R2: {e}")
+
     def get_public_url(self, key: str) -> str:
         """Get public URL for a stored object."""
         self._check_credentials()
@@ -75,6 +129,7 @@ class R2Storage:
         # We'll need the account ID from endpoint URL.
         # Extract account ID from endpoint URL (e.g., https://<account-id>.r2.cloudflarestorage.com)
         import re
+
         match = re.match(r"https://([^.]+)\.r2\.cloudflarestorage\.com", self.endpoint_url)
         if match:
             account_id = match.group(1)
@@ -85,4 +140,4 @@ class R2Storage:
 
 
 # Singleton instance
-r2_storage = R2Storage()
\ No newline at end of file
+r2_storage = R2Storage()
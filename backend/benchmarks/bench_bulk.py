@@ -0,0 +1,106 @@
+"""Benchmark bulk invoice inserts against the one-invoice-at-a-time path.
+
+Times the ORM path POST /invoices takes (add, flush, add each line item,
+commit) against insert_invoices' multi-row INSERTs, on in-memory SQLite.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_bulk [invoice_count]
+"""
+
+import sys
+import time
+
+from app.api.invoices import insert_invoices
+from app.core.database import Base
+from app.models import Invoice, InvoiceStatus, LineItem, User
+from app.schemas.invoice import InvoiceCreate
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+
+def make_payloads(count: int) -> list:
+    return [
+        InvoiceCreate(
+            client_name=f"Client {n}",
+            client_email="client@example.com",
+            job_address=f"{n} Main St",
+            trade_type="plumbing",
+            tax_rate=8.25,
+            line_items=[
+                {
+                    "description": f"Item {i}",
+                    "quantity": i + 1,
+                    "unit_price": 12.5,
+                    "category": "parts",
+                }
+                for i in range(5)
+            ],
+        )
+        for n in range(count)
+    ]
+
+
+def fresh_session() -> Session:
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    db = Session(engine)
+    db.execute(insert(User), [{"id": 1, "email": "bench@example.com", "hashed_password": "x"}])
+    db.commit()
+    return db
+
+
+def one_at_a_time(db: Session, payloads: list) -> None:
+    for data in payloads:
+        invoice = Invoice(
+            user_id=1,
+            client_name=data.client_name,
+            client_email=data.client_email,
+            job_address=data.job_address,
+            trade_type=data.trade_type,
+            tax_rate=data.tax_rate,
+            status=InvoiceStatus.DRAFT,
+        )
+        db.add(invoice)
+        db.flush()
+        for item in data.line_items:
+            db.add(
+                LineItem(
+                    invoice_id=invoice.id,
+                    description=item.description,
+                    quantity=item.quantity,
+                    unit_price=item.unit_price,
+                    category=item.category,
+                )
+            )
+        db.commit()
+
+
+def bulk(db: Session, payloads: list) -> None:
+    insert_invoices(db, 1, payloads)
+    db.commit()
+
+
+def timed(fn, payloads: list) -> float:
+    db = fresh_session()
+    start = time.perf_counter()
+    fn(db, payloads)
+    elapsed = time.perf_counter() - start
+    assert db.query(LineItem).count() == len(payloads) * 5
+    db.close()
+    return elapsed
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    payloads = make_payloads(count)
+
+    single = timed(one_at_a_time, payloads)
+    batched = timed(bulk, payloads)
+    print(f"{count} invoices, {count * 5} line items")
+    print(f"one at a time : {single * 1000:8.1f} ms  ({count / single:8.0f} invoices/s)")
+    print(f"bulk insert   : {batched * 1000:8.1f} ms  ({count / batched:8.0f} invoices/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Benchmark catalog suggestions from the in-memory index against a database query.
+
+Fills one user's catalog, then times the index build (what login warms) and
+suggestions for every one- to three-letter prefix typed, next to the LIKE
+query that would otherwise serve them. Runs on in-memory SQLite.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_catalog [item_count]
+"""
+
+import random
+import statistics
+import sys
+import time
+
+from app.models import CatalogItem, LineItemCategory
+from app.services.catalog import CatalogIndex
+from sqlalchemy import func, insert, or_, select
+
+from benchmarks.bench_bulk import fresh_session
+
+WORDS = (
+    "copper pvc pex brass elbow tee coupling valve ball gate check union adapter "
+    "flex duct filter breaker panel wire romex conduit outlet switch gfci thermostat "
+    "compressor condenser coil blower motor capacitor contactor refrigerant service "
+    "labor repair install replace inspect flush drain water heater tankless"
+).split()
+
+
+def make_items(count: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    descriptions = set()
+    while len(descriptions) < count:
+        size = rng.choice(["1/2in", "3/4in", "1in", "2in", "10ft", "50A", "3 ton"])
+        descriptions.add(f"{size} " + " ".join(rng.sample(WORDS, rng.randint(1, 3))))
+    return [
+        {
+            "user_id": 1,
+            "description": description,
+            "unit_price": rng.randint(100, 50000) / 100,
+            "category": rng.choice(list(LineItemCategory)),
+            "use_count": rng.randint(1, 200),
+        }
+        for description in sorted(descriptions)
+    ]
+
+
+def percentile(timings: list, fraction: float) -> float:
+    return sorted(timings)[int(len(timings) * fraction)]
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    db = fresh_session()
+    db.execute(insert(CatalogItem), make_items(count))
+    db.commit()
+    prefixes = sorted({word[:n] for word in WORDS for n in (1, 2, 3)})
+    print(f"{count} catalog items, {len(prefixes)} prefixes")
+
+    index = CatalogIndex(ttl_seconds=3600, max_users=10)
+    start = time.perf_counter()
+    index.warm(db, 1)
+    print(f"index build (on login): {(time.perf_counter() - start) * 1000:7.2f} ms")
+
+    timings = []
+    for prefix in prefixes:
+        start = time.perf_counter()
+        index.suggest(db, 1, prefix, 10)
+        timings.append(time.perf_counter() - start)
+    print(
+        f"index suggest:  p50 {statistics.median(timings) * 1000:6.3f} ms   "
+        f"p99 {percentile(timings, 0.99) * 1000:6.3f} ms"
+    )
+
+    description = func.lower(CatalogItem.description)
+    timings = []
+    for prefix in prefixes:
+        start = time.perf_counter()
+        db.execute(
+            select(CatalogItem.id, CatalogItem.description, CatalogItem.unit_price)
+            .where(
+                CatalogItem.user_id == 1,
+                or_(description.like(f"{prefix}%"), description.like(f"% {prefix}%")),
+            )
+            .order_by(CatalogItem.use_count.desc())
+            .limit(10)
+        ).all()
+        timings.append(time.perf_counter() - start)
+    print(
+        f"LIKE query:     p50 {statistics.median(timings) * 1000:6.3f} ms   "
+        f"p99 {percentile(timings, 0.99) * 1000:6.3f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
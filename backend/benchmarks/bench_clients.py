@@ -0,0 +1,168 @@
+"""Benchmark client lookups through the directory against matching invoice strings.
+
+Fills one user's account with N invoices (default 200,000) for 5,000
+clients, typed with varying case and spacing, links them with
+clients.link, then times, for a sample of clients:
+
+- history and totals by ``client_id`` (ix_invoices_client_id_created_at),
+  against matching the normalized name, email and address on every invoice;
+- autocomplete on the clients table, against DISTINCT client names from
+  invoices.
+
+Runs on in-memory SQLite.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_clients [invoice_count]
+"""
+
+import random
+import sys
+import time
+
+from app.api.invoices import invoice_list_query
+from app.models import Client, Invoice, LineItem, TradeType
+from app.services.clients import link, match_prefix
+from sqlalchemy import desc, func, insert, select, text
+
+from benchmarks.bench_bulk import fresh_session
+from benchmarks.bench_totals import best_of
+
+CLIENTS = 5000
+SAMPLE = 50
+FIRST = "ava ben cara dev eli fay gus hana ivan jo kai lena milo nia omar pia quinn rosa sam tia".split()
+LAST = "adams brook chen diaz evans ford gray hill ito jones khan lopez moss nash ortiz".split()
+
+
+def filled_session(invoice_count: int):
+    rng = random.Random(11)
+    people = [
+        (f"{rng.choice(FIRST)} {rng.choice(LAST)} {n}", f"client{n}@example.com", f"{n} Main St")
+        for n in range(CLIENTS)
+    ]
+    db = fresh_session()
+    rows = []
+    for n in range(invoice_count):
+        name, email, address = people[n % CLIENTS]
+        if n % 3 == 1:
+            name, email = name.upper(), email.title()
+        elif n % 3 == 2:
+            name = "  " + name.replace(" ", "  ")
+        rows.append(
+            {
+                "id": n + 1,
+                "user_id": 1,
+                "client_name": name,
+                "client_email": email,
+                "job_address": address,
+                "trade_type": TradeType.PLUMBING,
+                "tax_rate": 8.25,
+            }
+        )
+    db.execute(insert(Invoice), rows)
+    db.execute(
+        insert(LineItem),
+        [
+            {
+                "invoice_id": n + 1,
+                "description": "Service call",
+                "quantity": 1,
+                "unit_price": 95,
+                "category": "labor",
+            }
+            for n in range(invoice_count)
+        ],
+    )
+    start = time.perf_counter()
+    link(db, range(1, invoice_count + 1))
+    db.commit()
+    elapsed = time.perf_counter() - start
+    db.execute(text("ANALYZE"))
+    print(
+        f"linked {invoice_count} invoices to "
+        f"{db.execute(select(func.count(Client.id))).scalar()} clients "
+        f"in {elapsed:.2f} s"
+    )
+    return db, people
+
+
+def by_client_id(db, client_id: int):
+    query, total = invoice_list_query(db, 1)
+    return (
+        query.filter(Invoice.client_id == client_id)
+        .group_by(Invoice.id)
+        .order_by(desc(Invoice.created_at), desc(Invoice.id))
+        .all()
+    )
+
+
+def by_strings(db, name: str, email: str, address: str):
+    def normalized(column):
+        # SQLite has no regexp_replace; double spaces are the only runs here
+        return func.lower(func.trim(func.replace(column, "  ", " ")))
+
+    query, total = invoice_list_query(db, 1)
+    return (
+        query.filter(
+            normalized(Invoice.client_name) == name.lower(),
+            normalized(Invoice.client_email) == email.lower(),
+            normalized(Invoice.job_address) == address.lower(),
+        )
+        .group_by(Invoice.id)
+        .order_by(desc(Invoice.created_at), desc(Invoice.id))
+        .all()
+    )
+
+
+def main() -> None:
+    invoice_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    db, people = filled_session(invoice_count)
+    sample = random.Random(3).sample(range(CLIENTS), SAMPLE)
+    client_ids = {row.email_key: row.id for row in db.execute(select(Client.id, Client.email_key))}
+
+    indexed = best_of(
+        lambda: [by_client_id(db, client_ids[people[n][1]]) for n in sample], repeat=3
+    )
+    print(f"history by client_id:      {indexed / SAMPLE * 1000:8.3f} ms per client")
+    scanned = best_of(lambda: [by_strings(db, *people[n]) for n in sample[:5]], repeat=1)
+    print(
+        f"history by matching text:  {scanned / 5 * 1000:8.3f} ms per client   "
+        f"({scanned / 5 / (indexed / SAMPLE):5.0f}x)"
+    )
+    assert len(by_client_id(db, client_ids[people[sample[0]][1]])) == len(
+        by_strings(db, *people[sample[0]])
+    )
+
+    prefixes = [name[:3] for name in FIRST] + [name[:2] for name in LAST]
+    directory = best_of(
+        lambda: [
+            db.execute(
+                select(Client.id)
+                .where(Client.user_id == 1, match_prefix(prefix))
+                .order_by(desc(Client.last_invoiced_at), Client.name)
+                .limit(10)
+            ).all()
+            for prefix in prefixes
+        ]
+    )
+    print(f"autocomplete on clients:   {directory / len(prefixes) * 1000:8.3f} ms per prefix")
+    distinct = best_of(
+        lambda: [
+            db.execute(
+                select(Invoice.client_name)
+                .where(Invoice.user_id == 1, Invoice.client_name.ilike(f"{prefix}%"))
+                .distinct()
+                .limit(10)
+            ).all()
+            for prefix in prefixes
+        ],
+        repeat=1,
+    )
+    print(
+        f"DISTINCT over invoices:    {distinct / len(prefixes) * 1000:8.3f} ms per prefix   "
+        f"({distinct / directory:5.0f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
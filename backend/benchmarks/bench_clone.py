@@ -0,0 +1,70 @@
+"""Benchmark cloning an invoice in the database against fetching and re-posting it.
+
+Clones one large HVAC job with apply_invoice_clone (two INSERT ... SELECT
+statements) and compares it with what a client had to do before: load the
+invoice as GET /invoices/{id} does, then create it again as POST /invoices
+does. Runs on in-memory SQLite.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_clone [line_count]
+"""
+
+import sys
+
+from app.api.invoices import apply_invoice_clone, insert_invoices, load_invoice_payloads
+from app.models import Invoice, LineItem, TradeType
+from app.schemas.invoice import InvoiceClone, InvoiceCreate
+from sqlalchemy import insert
+
+from benchmarks.bench_bulk import fresh_session
+from benchmarks.bench_totals import best_of
+
+
+def fetch_and_repost(db, invoice_id: int) -> int:
+    payload = load_invoice_payloads(db, 1, [invoice_id])[invoice_id]
+    return insert_invoices(db, 1, [InvoiceCreate.model_validate(payload)])[0]
+
+
+def main() -> None:
+    line_count = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    db = fresh_session()
+    db.execute(
+        insert(Invoice),
+        [
+            {
+                "id": 1,
+                "user_id": 1,
+                "client_name": "Repeat Client",
+                "client_email": "repeat@example.com",
+                "job_address": "1 Main St",
+                "trade_type": TradeType.HVAC,
+                "tax_rate": 8.25,
+            }
+        ],
+    )
+    db.execute(
+        insert(LineItem),
+        [
+            {
+                "invoice_id": 1,
+                "description": f"Duct section {n}",
+                "quantity": n % 7 + 1,
+                "unit_price": 42.5,
+                "category": "parts",
+            }
+            for n in range(line_count)
+        ],
+    )
+    db.commit()
+    print(f"one invoice, {line_count} line items")
+
+    clone = best_of(lambda: apply_invoice_clone(db, 1, 1, InvoiceClone()), repeat=20)
+    print(f"INSERT ... SELECT clone:  {clone * 1000:7.2f} ms")
+    repost = best_of(lambda: fetch_and_repost(db, 1), repeat=20)
+    print(f"fetch and re-post:        {repost * 1000:7.2f} ms   ({repost / clone:4.1f}x)")
+    db.rollback()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Benchmark the streaming export against fetching invoices one at a time.
+
+Loads one account into an in-memory SQLite database and times the CSV and
+NDJSON exports, the time to their first chunk, and their peak traced memory,
+next to what a client does today: one GET /invoices/{id} per invoice.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_export [invoice_count]
+"""
+
+import sys
+import time
+import tracemalloc
+
+from app.api.invoices import load_invoice_payloads
+from app.models import Invoice, LineItem
+from app.schemas.invoice import ExportFormat, InvoiceResponse
+from app.serialization import json_response
+from app.services.invoice_export import export_query, stream_export
+from sqlalchemy.orm import Session
+
+from benchmarks.bench_totals import load_database, make_invoices
+
+
+def run_export(db: Session, export_format: ExportFormat) -> tuple:
+    """Drain an export; return (seconds to first chunk, total seconds, bytes)."""
+    start = time.perf_counter()
+    chunks = stream_export(db.get_bind(), 1, export_format)
+    size = len(next(chunks))
+    first = time.perf_counter() - start
+    for chunk in chunks:
+        size += len(chunk)
+    return first, time.perf_counter() - start, size
+
+
+def one_at_a_time(db: Session) -> int:
+    size = 0
+    for (invoice_id,) in db.query(Invoice.id).order_by(Invoice.id):
+        payload = load_invoice_payloads(db, 1, [invoice_id])[invoice_id]
+        size += len(json_response(InvoiceResponse, payload).body)
+    return size
+
+
+def peak_memory(fn) -> int:
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    db = load_database(make_invoices(count))
+    line_count = db.query(LineItem).count()
+    print(f"{count} invoices, {line_count} line items")
+
+    for export_format in ExportFormat:
+        first, total, size = run_export(db, export_format)
+        peak = peak_memory(lambda: run_export(db, export_format))
+        print(
+            f"{export_format.value:7} first chunk {first * 1000:6.1f} ms   "
+            f"total {total:5.2f} s   {size / 1e6:6.1f} MB out   peak {peak / 1e6:5.1f} MB"
+        )
+
+    peak = peak_memory(lambda: db.execute(export_query(1)).all())
+    print(f"all export rows in memory at once: peak {peak / 1e6:5.1f} MB")
+
+    start = time.perf_counter()
+    one_at_a_time(db)
+    print(f"one GET per invoice: {time.perf_counter() - start:5.2f} s")
+
+
+if __name__ == "__main__":
+    main()
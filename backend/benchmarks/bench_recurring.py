@@ -0,0 +1,146 @@
+"""Benchmark a monthly recurring-invoice run.
+
+Schedules N contracts (default 10,000) across 200 users, each copying a
+three-line template, all due at once, then times issuing them with
+issue_due in batches of RECURRING_BATCH_SIZE, as app.commands.issue_recurring
+does, against cloning each template with apply_invoice_clone and moving its
+schedule on one contract at a time. Runs on in-memory SQLite, where FOR
+UPDATE SKIP LOCKED is a no-op.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_recurring [contract_count]
+"""
+
+import sys
+import time
+from datetime import datetime, timezone
+
+from app.api.invoices import apply_invoice_clone
+from app.core.config import settings
+from app.models import Invoice, LineItem, TradeType
+from app.models.recurring_invoice import RecurrenceFrequency, RecurringInvoice
+from app.schemas.invoice import InvoiceClone
+from app.services.recurring import issue_due, next_occurrence
+from sqlalchemy import func, insert, select, update
+
+from benchmarks.bench_bulk import fresh_session
+
+USERS = 200
+RUN_AT = datetime(2026, 11, 1, 6, tzinfo=timezone.utc)
+
+
+def scheduled_session(contract_count: int):
+    db = fresh_session()
+    db.execute(
+        insert(Invoice),
+        [
+            {
+                "id": n + 1,
+                "user_id": n % USERS + 1,
+                "client_name": f"Contract Client {n}",
+                "client_email": f"client{n}@example.com",
+                "job_address": f"{n} Service Rd",
+                "trade_type": TradeType.HVAC,
+                "tax_rate": 8.25,
+            }
+            for n in range(contract_count)
+        ],
+    )
+    db.execute(
+        insert(LineItem),
+        [
+            {
+                "invoice_id": n + 1,
+                "description": description,
+                "quantity": 1,
+                "unit_price": price,
+                "category": category,
+            }
+            for n in range(contract_count)
+            for description, price, category in (
+                ("Monthly maintenance visit", 95, "labor"),
+                ("Air filter", 18.5, "parts"),
+                ("Condensate tablets", 6, "parts"),
+            )
+        ],
+    )
+    db.execute(
+        insert(RecurringInvoice),
+        [
+            {
+                "user_id": n % USERS + 1,
+                "template_invoice_id": n + 1,
+                "frequency": RecurrenceFrequency.MONTHLY,
+                "anchor_day": 1,
+                "next_run_at": RUN_AT,
+            }
+            for n in range(contract_count)
+        ],
+    )
+    db.commit()
+    return db
+
+
+def batched(db) -> int:
+    issued = 0
+    while True:
+        count = issue_due(db, RUN_AT, settings.RECURRING_BATCH_SIZE)
+        db.commit()
+        if not count:
+            return issued
+        issued += count
+
+
+def one_at_a_time(db) -> int:
+    due = db.execute(
+        select(
+            RecurringInvoice.id,
+            RecurringInvoice.user_id,
+            RecurringInvoice.template_invoice_id,
+            RecurringInvoice.frequency,
+            RecurringInvoice.anchor_day,
+            RecurringInvoice.next_run_at,
+        ).where(RecurringInvoice.next_run_at <= RUN_AT)
+    ).all()
+    for definition in due:
+        invoice_id = apply_invoice_clone(
+            db, definition.user_id, definition.template_invoice_id, InvoiceClone()
+        )
+        db.execute(
+            update(RecurringInvoice)
+            .where(RecurringInvoice.id == definition.id)
+            .values(
+                next_run_at=next_occurrence(
+                    definition.next_run_at, definition.frequency, definition.anchor_day
+                ),
+                last_run_at=RUN_AT,
+                last_invoice_id=invoice_id,
+            )
+        )
+        db.commit()
+    return len(due)
+
+
+def timed(issue, contract_count: int) -> float:
+    db = scheduled_session(contract_count)
+    start = time.perf_counter()
+    issued = issue(db)
+    elapsed = time.perf_counter() - start
+    assert issued == contract_count
+    assert db.execute(select(func.count(Invoice.id))).scalar() == 2 * contract_count
+    return elapsed
+
+
+def main() -> None:
+    contract_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    print(f"{contract_count} monthly contracts across {USERS} users, three lines each")
+
+    fast = timed(batched, contract_count)
+    print(f"issue_due, batches of {settings.RECURRING_BATCH_SIZE}:  {fast:6.2f} s")
+    slow = timed(one_at_a_time, contract_count)
+    print(f"clone one at a time:          {slow:6.2f} s   ({slow / fast:4.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
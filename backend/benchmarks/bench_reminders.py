@@ -0,0 +1,100 @@
+"""Benchmark the overdue reminder scan as the invoice table grows.
+
+Fills the table with N invoices (default 10,000 and 1,000,000), nearly all
+paid or long overdue, plus the same 1,000 sent invoices due within the
+reminder window each time, then times a full enqueue_due pass over the
+window, and a second pass that finds everything already queued. The scan
+reads only the window's slice of ix_invoices_due_date_sent, so the times
+should not move with N. Runs on in-memory SQLite.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_reminders [invoice_count ...]
+"""
+
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+
+from app.core.config import settings
+from app.models import Invoice, InvoiceStatus, TradeType
+from app.services.reminders import enqueue_due
+from sqlalchemy import insert, text
+
+from benchmarks.bench_bulk import fresh_session
+
+TODAY = date(2026, 10, 19)
+NOW = datetime(2026, 10, 19, 9, tzinfo=timezone.utc)
+IN_WINDOW = 1000
+INSERT_ROWS = 20_000
+
+
+def filled_session(invoice_count: int):
+    db = fresh_session()
+
+    def row(n: int) -> dict:
+        if n < IN_WINDOW:
+            # Sent, and 1 to 37 days overdue
+            status, due = InvoiceStatus.SENT, TODAY - timedelta(days=n % 37 + 1)
+        elif n % 10:
+            status, due = InvoiceStatus.PAID, TODAY - timedelta(days=n % 3000)
+        else:
+            # Never paid, long past the last reminder
+            status, due = InvoiceStatus.SENT, TODAY - timedelta(days=60 + n % 3000)
+        return {
+            "user_id": 1,
+            "client_name": f"Client {n}",
+            "client_email": f"client{n}@example.com",
+            "job_address": f"{n} Main St",
+            "trade_type": TradeType.ELECTRICAL,
+            "tax_rate": 0,
+            "status": status,
+            "due_date": due,
+        }
+
+    for start in range(0, invoice_count, INSERT_ROWS):
+        db.execute(
+            insert(Invoice),
+            [row(n) for n in range(start, min(start + INSERT_ROWS, invoice_count))],
+        )
+    db.commit()
+    db.execute(text("ANALYZE"))
+    return db
+
+
+def scan(db) -> int:
+    queued, position = 0, None
+    while True:
+        count, position = enqueue_due(db, TODAY, NOW, settings.REMINDER_BATCH_SIZE, after=position)
+        db.commit()
+        queued += count
+        if position is None:
+            return queued
+
+
+def main() -> None:
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 1_000_000]
+    for invoice_count in sizes:
+        db = filled_session(invoice_count)
+        start = time.perf_counter()
+        queued = scan(db)
+        first = time.perf_counter() - start
+        start = time.perf_counter()
+        again = scan(db)
+        second = time.perf_counter() - start
+        assert (queued, again) == (IN_WINDOW, 0)
+        print(
+            f"{invoice_count:>9} invoices: queued {queued} in {first * 1000:6.1f} ms, "
+            f"rescan {second * 1000:6.1f} ms"
+        )
+    plan = db.execute(
+        text(
+            "EXPLAIN QUERY PLAN SELECT id FROM invoices "
+            "WHERE status = 'sent' AND due_date BETWEEN '2026-09-12' AND '2026-10-18'"
+        )
+    ).all()
+    print("plan:", "; ".join(row[-1] for row in plan))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Benchmark invoice search against a plain LIKE scan.
+
+Loads one account with about 100k line items into an in-memory SQLite
+database (FTS5 fallback) and times the search query for a few terms.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_search [invoice_count]
+"""
+
+import random
+import sys
+
+from app.api.invoices import invoice_list_query
+from app.models import Invoice, LineItem
+from app.search import matching_invoice_ids
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+
+from benchmarks.bench_totals import best_of, load_database, make_invoices
+
+WORDS = [
+    "water",
+    "heater",
+    "copper",
+    "pipe",
+    "drain",
+    "sump",
+    "pump",
+    "breaker",
+    "panel",
+    "outlet",
+    "conduit",
+    "furnace",
+    "filter",
+    "duct",
+    "thermostat",
+    "valve",
+    "flush",
+    "install",
+    "replace",
+    "repair",
+    "inspect",
+    "service",
+    "fitting",
+    "coil",
+    "fan",
+]
+SURNAMES = ["Smith", "Jones", "Garcia", "Nguyen", "Patel", "Brown", "Lopez", "Kim"]
+STREETS = ["Oak", "Elm", "Main", "Pine", "Cedar", "Maple", "Lake", "Hill"]
+
+
+def randomize_text(db: Session, seed: int = 7) -> None:
+    """Give every invoice and line item varied searchable text."""
+    rng = random.Random(seed)
+    invoice_ids = [row[0] for row in db.query(Invoice.id)]
+    line_ids = [row[0] for row in db.query(LineItem.id)]
+    for invoice_id in invoice_ids:
+        db.query(Invoice).filter(Invoice.id == invoice_id).update(
+            {
+                "client_name": f"{rng.choice(SURNAMES)} {invoice_id}",
+                "job_address": f"{rng.randint(1, 999)} {rng.choice(STREETS)} St",
+            },
+            synchronize_session=False,
+        )
+    for line_id in line_ids:
+        db.query(LineItem).filter(LineItem.id == line_id).update(
+            {"description": " ".join(rng.sample(WORDS, 3))},
+            synchronize_session=False,
+        )
+    db.commit()
+
+
+def search(db: Session, q: str) -> list:
+    """The query behind GET /invoices/search."""
+    matches = matching_invoice_ids(db, 1, q).subquery()
+    page = (
+        select(Invoice.id)
+        .where(Invoice.id.in_(select(matches.c[0])))
+        .order_by(Invoice.created_at.desc(), Invoice.id.desc())
+        .limit(50)
+        .scalar_subquery()
+    )
+    query, _ = invoice_list_query(db, 1)
+    return (
+        query.filter(Invoice.id.in_(page))
+        .group_by(Invoice.id)
+        .order_by(Invoice.created_at.desc(), Invoice.id.desc())
+        .all()
+    )
+
+
+def like_scan(db: Session, q: str) -> list:
+    pattern = f"%{q}%"
+    query, _ = invoice_list_query(db, 1)
+    return (
+        query.filter(
+            or_(
+                Invoice.client_name.ilike(pattern),
+                Invoice.job_address.ilike(pattern),
+                Invoice.id.in_(
+                    db.query(LineItem.invoice_id).filter(LineItem.description.ilike(pattern))
+                ),
+            )
+        )
+        .group_by(Invoice.id)
+        .order_by(Invoice.created_at.desc(), Invoice.id.desc())
+        .limit(50)
+        .all()
+    )
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 15_000
+    db = load_database(make_invoices(count))
+    randomize_text(db)
+    line_count = db.query(LineItem).count()
+    print(f"{count} invoices, {line_count} line items")
+
+    for q in ["thermostat", "garcia", "oak st", "furn"]:
+        indexed = best_of(lambda: search(db, q))
+        scan = best_of(lambda: like_scan(db, q))
+        print(f"{q!r:14} search {indexed * 1000:7.1f} ms   LIKE scan {scan * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
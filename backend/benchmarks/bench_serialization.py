@@ -0,0 +1,119 @@
+"""Benchmark invoice response serialization on the list and detail paths.
+
+Compares the previous path against the current one, both including the
+database reads against an in-memory SQLite database. The previous path
+loaded ORM objects, called ``model_validate`` and patched in the totals,
+then let FastAPI validate, dump to Python and ``json.dumps``. The current
+path reads column rows, validates them with a cached TypeAdapter, and
+encodes straight to JSON bytes.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_serialization [invoice_count]
+"""
+
+import json
+import sys
+from typing import List
+
+from app.api.invoices import calculate_invoice_totals, invoice_json_response, list_invoices
+from app.models import Invoice
+from app.schemas.invoice import InvoiceListResponse, InvoiceResponse
+from app.serialization import json_response
+from pydantic import TypeAdapter
+from sqlalchemy import desc
+
+from benchmarks.bench_totals import best_of, load_database, make_invoices
+
+# FastAPI builds one of these per route and reuses it
+_list_field = TypeAdapter(List[InvoiceListResponse])
+_detail_field = TypeAdapter(InvoiceResponse)
+
+
+def fastapi_encode(adapter: TypeAdapter, content) -> bytes:
+    """What FastAPI does with a returned value and a response_model."""
+    value = adapter.validate_python(content, from_attributes=True)
+    return json.dumps(adapter.dump_python(value, mode="json")).encode("utf-8")
+
+
+def legacy_list(db) -> bytes:
+    db.expunge_all()
+    invoices = (
+        db.query(Invoice)
+        .filter(Invoice.user_id == 1)
+        .order_by(desc(Invoice.created_at), desc(Invoice.id))
+        .all()
+    )
+    result = []
+    for invoice in invoices:
+        totals = calculate_invoice_totals(invoice)
+        result.append(
+            InvoiceListResponse(
+                id=invoice.id,
+                client_name=invoice.client_name,
+                job_address=invoice.job_address,
+                trade_type=invoice.trade_type,
+                status=invoice.status,
+                total=totals.total,
+                created_at=invoice.created_at,
+            )
+        )
+    return fastapi_encode(_list_field, result)
+
+
+def legacy_detail(db, invoice_id: int) -> bytes:
+    db.expunge_all()
+    invoice = db.query(Invoice).filter(Invoice.id == invoice_id, Invoice.user_id == 1).first()
+    totals = calculate_invoice_totals(invoice)
+    response = InvoiceResponse.model_validate(invoice)
+    response.totals = totals
+    return fastapi_encode(_detail_field, response)
+
+
+def run_coroutine(coroutine):
+    """Drive an async endpoint that never awaits."""
+    try:
+        coroutine.send(None)
+    except StopIteration as stop:
+        return stop.value
+    raise RuntimeError("endpoint awaited")
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000
+    db = load_database(make_invoices(count))
+    user = type("BenchUser", (), {"id": 1})()
+    invoice_ids = range(1, count + 1)
+
+    assert json.loads(legacy_list(db)) == json.loads(
+        run_coroutine(list_invoices(db=db, current_user=user)).body
+    )
+
+    old_list = best_of(lambda: legacy_list(db))
+    new_list = best_of(lambda: run_coroutine(list_invoices(db=db, current_user=user)))
+    # Encoding alone, on the same list rows
+    rows = json.loads(run_coroutine(list_invoices(db=db, current_user=user)).body)
+    old_encode = best_of(lambda: fastapi_encode(_list_field, rows))
+    new_encode = best_of(lambda: json_response(List[InvoiceListResponse], rows).body)
+    old_detail = best_of(lambda: [legacy_detail(db, i) for i in invoice_ids], repeat=3)
+    new_detail = best_of(
+        lambda: [invoice_json_response(db, 1, i).body for i in invoice_ids], repeat=3
+    )
+
+    print(f"{count} invoices")
+    print(
+        f"GET /invoices        old {old_list * 1000:8.1f} ms   new {new_list * 1000:8.1f} ms"
+        f"  ({old_list / new_list:.1f}x)"
+    )
+    print(
+        f"  encoding only      old {old_encode * 1000:8.1f} ms   new {new_encode * 1000:8.1f} ms"
+        f"  ({old_encode / new_encode:.1f}x)"
+    )
+    print(
+        f"GET /invoices/{{id}}   old {old_detail * 1000 / count:8.3f} ms   "
+        f"new {new_detail * 1000 / count:8.3f} ms  ({old_detail / new_detail:.1f}x)  per request"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""Benchmark the integer-cents totals engine against the float implementation.
+
+Measures the arithmetic alone on in-memory rows, then end to end against an
+in-memory SQLite database: ORM objects with eager-loaded line items versus
+two column queries over the cents columns.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_totals [invoice_count]
+"""
+
+import random
+import sys
+import time
+from decimal import Decimal
+from types import SimpleNamespace
+
+from app.core.database import Base
+from app.models import Invoice, LineItem, TradeType, User
+from app.models.line_item import LineItemCategory
+from app.money import TotalsBatch, compute_invoice_totals, compute_totals
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session, selectinload
+
+
+def legacy_calculate_invoice_totals(invoice) -> dict:
+    """The previous float-based calculate_invoice_totals, for comparison."""
+    category_totals = {}
+    subtotal = 0.0
+
+    for item in invoice.line_items:
+        line_total = float(item.quantity * item.unit_price)
+        subtotal += line_total
+        category = item.category.value
+        category_totals[category] = category_totals.get(category, 0) + line_total
+
+    tax_amount = subtotal * (float(invoice.tax_rate) / 100)
+    total = subtotal + tax_amount
+
+    return {
+        "subtotal": round(subtotal, 2),
+        "tax_amount": round(tax_amount, 2),
+        "total": round(total, 2),
+        "category_breakdown": category_totals,
+    }
+
+
+def make_invoices(count: int, seed: int = 42) -> list:
+    """Invoices shaped like ORM rows: Numeric columns plus their cents mirrors."""
+    rng = random.Random(seed)
+    categories = list(LineItemCategory)
+    invoices = []
+    for _ in range(count):
+        tax_rate = Decimal(rng.randint(0, 1200)) / 100
+        items = []
+        for _ in range(rng.randint(1, 12)):
+            quantity = Decimal(rng.randint(1, 2000)) / 100
+            unit_price = Decimal(rng.randint(1, 250000)) / 100
+            items.append(
+                SimpleNamespace(
+                    quantity=quantity,
+                    unit_price=unit_price,
+                    quantity_hundredths=int(quantity * 100),
+                    unit_price_cents=int(unit_price * 100),
+                    category=rng.choice(categories),
+                )
+            )
+        invoices.append(
+            SimpleNamespace(tax_rate=tax_rate, tax_rate_bps=int(tax_rate * 100), line_items=items)
+        )
+    return invoices
+
+
+def best_of(fn, repeat: int = 5) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def load_database(invoices: list) -> Session:
+    """Copy the generated invoices into an in-memory SQLite database."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    db = Session(engine)
+    db.execute(insert(User), [{"id": 1, "email": "bench@example.com", "hashed_password": "x"}])
+    db.execute(
+        insert(Invoice),
+        [
+            {
+                "id": n + 1,
+                "user_id": 1,
+                "client_name": "Client",
+                "client_email": "client@example.com",
+                "job_address": "1 Main St",
+                "trade_type": TradeType.HVAC,
+                "tax_rate": invoice.tax_rate,
+            }
+            for n, invoice in enumerate(invoices)
+        ],
+    )
+    db.execute(
+        insert(LineItem),
+        [
+            {
+                "invoice_id": n + 1,
+                "description": "Item",
+                "quantity": item.quantity,
+                "unit_price": item.unit_price,
+                "category": item.category,
+            }
+            for n, invoice in enumerate(invoices)
+            for item in invoice.line_items
+        ],
+    )
+    db.commit()
+    return db
+
+
+def legacy_from_database(db: Session) -> list:
+    db.expunge_all()
+    invoices = db.query(Invoice).options(selectinload(Invoice.line_items)).all()
+    return [legacy_calculate_invoice_totals(invoice) for invoice in invoices]
+
+
+def batched_from_database(db: Session) -> list:
+    tax_rows = db.query(Invoice.id, Invoice.tax_rate_bps).order_by(Invoice.id)
+    line_rows = db.query(
+        LineItem.invoice_id,
+        LineItem.quantity_hundredths,
+        LineItem.unit_price_cents,
+        LineItem.category,
+    )
+    return compute_totals(TotalsBatch.from_rows(tax_rows, line_rows))
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    invoices = make_invoices(count)
+    line_count = sum(len(invoice.line_items) for invoice in invoices)
+
+    # Column rows as a query over the cents columns would return them
+    tax_rows = [(n, invoice.tax_rate_bps) for n, invoice in enumerate(invoices)]
+    line_rows = [
+        (n, item.quantity_hundredths, item.unit_price_cents, item.category.value)
+        for n, invoice in enumerate(invoices)
+        for item in invoice.line_items
+    ]
+
+    legacy = best_of(lambda: [legacy_calculate_invoice_totals(i) for i in invoices])
+    batched = best_of(lambda: compute_invoice_totals(invoices))
+    from_rows = best_of(lambda: compute_totals(TotalsBatch.from_rows(tax_rows, line_rows)))
+
+    mismatches = sum(
+        1
+        for old, new in zip(
+            (legacy_calculate_invoice_totals(i) for i in invoices),
+            compute_invoice_totals(invoices),
+        )
+        if round(old["total"] * 100) != new.total
+    )
+
+    print(f"{count} invoices, {line_count} line items")
+    print(f"legacy float, per invoice : {legacy * 1000:8.1f} ms")
+    print(f"integer cents, from ORM   : {batched * 1000:8.1f} ms  ({legacy / batched:.1f}x)")
+    print(f"integer cents, from rows  : {from_rows * 1000:8.1f} ms  ({legacy / from_rows:.1f}x)")
+    print(f"totals differing by rounding drift: {mismatches}")
+
+    db = load_database(invoices)
+    legacy_db = best_of(lambda: legacy_from_database(db), repeat=3)
+    batched_db = best_of(lambda: batched_from_database(db), repeat=3)
+    print("end to end from SQLite:")
+    print(f"legacy ORM objects        : {legacy_db * 1000:8.1f} ms")
+    print(
+        f"cents column rows         : {batched_db * 1000:8.1f} ms  ({legacy_db / batched_db:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,19 @@
 """Pytest fixtures for testing."""
-import os
+
 import pytest
+from app.core.auth import create_access_token, get_password_hash
+from app.core.database import Base, get_db
+from app.core.rate_limit import auth_throttle
+from app.core.revocation import revocation_list
+from app.main import app
+from app.models import BusinessProfile, User
+from app.services.catalog import catalog_index
+from app.services.idempotency import idempotency_store
+from app.services.profile_cache import profile_cache
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
-from unittest.mock import patch
-
-from app.core.database import Base, get_db
-from app.main import app
-from app.models import User, BusinessProfile
-from app.core.auth import get_password_hash, create_access_token
-
 
 # Test database settings
 TEST_DATABASE_URL = "sqlite:///:memory:"
@@ -27,9 +29,9 @@ def test_db():
         poolclass=StaticPool,
     )
     Base.metadata.create_all(bind=engine)
-    
+
     TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    
+
     db = TestingSessionLocal()
     try:
         yield db
@@ -39,8 +41,9 @@ def test_db():
 
 
 @pytest.fixture(scope="function")
-def client(test_db):
+def client(test_db, monkeypatch):
     """Create a test client with database override."""
+
     def override_get_db():
         try:
             yield test_db
@@ -49,6 +52,13 @@ def client(test_db):
 
     # Override the get_db dependency
     app.dependency_overrides[get_db] = override_get_db
+    # Background jobs started with the app open their own sessions
+    monkeypatch.setattr("app.main.SessionLocal", sessionmaker(bind=test_db.get_bind()))
+    auth_throttle.reset()
+    revocation_list.reset()
+    profile_cache.clear()
+    idempotency_store.clear()
+    catalog_index.clear()
 
     with TestClient(app) as test_client:
         yield test_client
@@ -1,5 +1,8 @@
 """Tests for authentication API."""
+
 import pytest
+from app.core.rate_limit import auth_throttle
+from fastapi import HTTPException
 from fastapi.testclient import TestClient
 
 
@@ -66,7 +69,7 @@ def test_get_current_user(client: TestClient, test_user):
     )
     assert login_response.status_code == 200
     token = login_response.json()["access_token"]
-    
+
     # Get current user - this requires profile to exist
     # The profile endpoint should return 401 with valid token but no profile
     response = client.get(
@@ -78,3 +81,199 @@ def test_get_current_user(client: TestClient, test_user):
     # Actually, it should return 404 if token is valid but no profile
     # Let's just assert it's not 401 (meaning auth worked)
     assert response.status_code != 401  # Should not be unauthorized
+
+
+def test_login_throttled_per_email(client: TestClient, test_user):
+    """Test that repeated failed logins for one email are throttled."""
+    for _ in range(5):
+        response = client.post(
+            "/auth/login",
+            data={"username": "test@example.com", "password": "wrongpassword"},
+        )
+        assert response.status_code == 401
+
+    response = client.post(
+        "/auth/login",
+        data={"username": "test@example.com", "password": "securepassword123"},
+    )
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) > 0
+
+
+def test_successful_logins_are_not_throttled_per_email(client: TestClient, test_user):
+    """Test that only failed logins count against an address, and only from that IP."""
+    for _ in range(8):
+        response = client.post(
+            "/auth/login",
+            data={"username": "test@example.com", "password": "securepassword123"},
+        )
+        assert response.status_code == 200
+
+    # Failures from another address don't lock the owner out
+    for _ in range(5):
+        auth_throttle.check(None, "203.0.113.9", "test@example.com", email_per_ip=True)
+    with pytest.raises(HTTPException):
+        auth_throttle.check(None, "203.0.113.9", "test@example.com", email_per_ip=True)
+    response = client.post(
+        "/auth/login",
+        data={"username": "test@example.com", "password": "securepassword123"},
+    )
+    assert response.status_code == 200
+
+
+def test_register_throttled_per_email(client: TestClient):
+    """Test that registration attempts for one email are throttled."""
+    statuses = [
+        client.post(
+            "/auth/register",
+            json={"email": "taken@example.com", "password": "securepassword123"},
+        ).status_code
+        for _ in range(6)
+    ]
+    assert statuses == [201, 400, 400, 400, 400, 429]
+
+
+def test_idle_throttle_buckets_are_evicted(monkeypatch):
+    """Test that buckets which have refilled are dropped from memory."""
+    from app.core import rate_limit
+
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+    buckets = rate_limit.InMemoryTokenBucket(capacity=5, per_minute=60.0)
+
+    for i in range(100):
+        buckets.consume(f"email:user{i}@example.com")
+    assert len(buckets._buckets) == 100
+
+    now[0] += buckets.idle_seconds
+    assert buckets.consume("email:fresh@example.com") == 0
+    assert list(buckets._buckets) == ["email:fresh@example.com"]
+
+
+def test_login_rehashes_outdated_password(client: TestClient, test_db):
+    """Test that a hash made with old cost parameters is upgraded on login."""
+    from app.core.auth import pwd_context
+    from app.models import User
+
+    old_hash = pwd_context.handler("bcrypt").using(rounds=4).hash("securepassword123")
+    user = User(email="old@example.com", hashed_password=old_hash)
+    test_db.add(user)
+    test_db.commit()
+
+    response = client.post(
+        "/auth/login",
+        data={"username": "old@example.com", "password": "securepassword123"},
+    )
+    assert response.status_code == 200
+
+    test_db.refresh(user)
+    assert user.hashed_password != old_hash
+    assert not pwd_context.needs_update(user.hashed_password)
+
+
+def _login(client: TestClient) -> dict:
+    response = client.post(
+        "/auth/login",
+        data={"username": "test@example.com", "password": "securepassword123"},
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_login_returns_refresh_token(client: TestClient, test_user):
+    """Test that login issues a short-lived access token and a refresh token."""
+    data = _login(client)
+    assert data["refresh_token"]
+    assert data["expires_in"] == 15 * 60
+
+
+def test_refresh_rotates_token(client: TestClient, test_user):
+    """Test that refreshing issues a new token pair and retires the old one."""
+    tokens = _login(client)
+
+    response = client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 200
+    rotated = response.json()
+    assert rotated["refresh_token"] != tokens["refresh_token"]
+
+    response = client.get(
+        "/profile", headers={"Authorization": f"Bearer {rotated['access_token']}"}
+    )
+    assert response.status_code != 401
+
+
+def test_refresh_reuse_revokes_family(client: TestClient, test_user):
+    """Test that replaying a rotated refresh token revokes its successors."""
+    tokens = _login(client)
+    rotated = client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]}).json()
+
+    response = client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 401
+
+    response = client.post("/auth/refresh", json={"refresh_token": rotated["refresh_token"]})
+    assert response.status_code == 401
+
+
+def test_logout_revokes_tokens(client: TestClient, test_user):
+    """Test that logout revokes the access token and its refresh token."""
+    tokens = _login(client)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+    response = client.post(
+        "/auth/logout", json={"refresh_token": tokens["refresh_token"]}, headers=headers
+    )
+    assert response.status_code == 204
+
+    assert client.get("/profile", headers=headers).status_code == 401
+    assert client.get("/invoices", headers=headers).status_code == 401
+    response = client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 401
+
+
+def test_revocations_from_other_workers_apply_after_rebuild(client: TestClient, test_db, test_user):
+    """Test that requests only consult the filter, which rebuilds from the table."""
+    from datetime import datetime, timedelta, timezone
+
+    from app.core.auth import decode_access_token
+    from app.core.revocation import revocation_list
+    from app.models.revoked_token import RevokedToken
+
+    tokens = _login(client)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    jti = decode_access_token(tokens["access_token"])["jti"]
+
+    # Revoked by another worker: this one doesn't know until its next rebuild
+    expires_at = datetime.now(timezone.utc) + timedelta(minutes=5)
+    test_db.add(RevokedToken(jti=jti, expires_at=expires_at))
+    test_db.commit()
+    assert client.get("/invoices", headers=headers).status_code == 200
+
+    assert revocation_list.rebuild(test_db)
+    assert client.get("/invoices", headers=headers).status_code == 401
+
+
+def test_purge_expired_tokens(test_db, test_user):
+    """Test that expired refresh tokens and revocations are deleted."""
+    from datetime import datetime, timedelta, timezone
+
+    from app.core.auth import purge_expired_tokens
+    from app.models.refresh_token import RefreshToken
+    from app.models.revoked_token import RevokedToken
+
+    now = datetime.now(timezone.utc)
+    for i, expires_at in enumerate([now - timedelta(days=1), now + timedelta(days=1)]):
+        test_db.add(
+            RefreshToken(
+                user_id=test_user.id,
+                token_hash=f"{i:064d}",
+                family_id="f" * 32,
+                expires_at=expires_at,
+            )
+        )
+        test_db.add(RevokedToken(jti=f"{i:032d}", expires_at=expires_at))
+    test_db.commit()
+
+    assert purge_expired_tokens(test_db) == 2
+    test_db.commit()
+    assert test_db.query(RefreshToken).count() == 1
+    assert test_db.query(RevokedToken).count() == 1
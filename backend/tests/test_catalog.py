@@ -0,0 +1,127 @@
+"""Tests for the line item catalog API."""
+
+from app.models.line_item import LineItemCategory
+from app.models.user import User
+from app.schemas.line_item import LineItemCreate
+from app.services import catalog
+from fastapi import status
+
+
+def _invoice(*line_items):
+    return {
+        "client_name": "Catalog Client",
+        "client_email": "catalog@example.com",
+        "job_address": "1 Supply St",
+        "trade_type": "plumbing",
+        "tax_rate": 0,
+        "line_items": [
+            {"description": description, "quantity": 1, "unit_price": price, "category": category}
+            for description, price, category in line_items
+        ],
+    }
+
+
+def _suggest(client, auth_headers, prefix, **params):
+    response = client.get(
+        "/catalog/suggest", params={"prefix": prefix, **params}, headers=auth_headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    return response.json()
+
+
+def test_learned_from_line_items(client, auth_headers):
+    """Test that line items are learned, with the latest price and most used first."""
+    # Warm the index first, so the learning below has to update it in place
+    assert _suggest(client, auth_headers, "c") == []
+    client.post(
+        "/invoices",
+        json=_invoice(
+            ("3/4in copper elbow", 4.50, "parts"),
+            ("Copper pipe, 10ft", 32.00, "parts"),
+            ("Service call", 95.00, "labor"),
+        ),
+        headers=auth_headers,
+    )
+    client.post(
+        "/invoices",
+        json=_invoice(("3/4in copper elbow", 4.75, "parts"), ("Service call", 95.00, "labor")),
+        headers=auth_headers,
+    )
+
+    suggestions = _suggest(client, auth_headers, "COP")
+    assert [item["description"] for item in suggestions] == [
+        "3/4in copper elbow",
+        "Copper pipe, 10ft",
+    ]
+    assert suggestions[0]["unit_price"] == 4.75
+    assert _suggest(client, auth_headers, "copper e") == [suggestions[0]]
+    assert _suggest(client, auth_headers, "serv", category="parts") == []
+
+    items = client.get("/catalog", headers=auth_headers).json()
+    assert {item["description"]: item["use_count"] for item in items} == {
+        "3/4in copper elbow": 2,
+        "Copper pipe, 10ft": 1,
+        "Service call": 2,
+    }
+
+
+def test_edit_catalog(client, auth_headers):
+    """Test that added, edited and removed items show up in suggestions at once."""
+    response = client.post(
+        "/catalog",
+        json={"description": "Flue liner", "unit_price": 180.00, "category": "parts"},
+        headers=auth_headers,
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    item = response.json()
+    assert item["use_count"] == 0
+    assert [s["id"] for s in _suggest(client, auth_headers, "flue")] == [item["id"]]
+
+    duplicate = client.post(
+        "/catalog",
+        json={"description": "Flue liner", "unit_price": 1.00, "category": "parts"},
+        headers=auth_headers,
+    )
+    assert duplicate.status_code == status.HTTP_409_CONFLICT
+
+    response = client.put(
+        f"/catalog/{item['id']}",
+        json={"description": "Stainless flue liner", "unit_price": 210.00, "category": "parts"},
+        headers=auth_headers,
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert _suggest(client, auth_headers, "flue")[0]["description"] == "Stainless flue liner"
+    assert _suggest(client, auth_headers, "stain")[0]["unit_price"] == 210.00
+
+    response = client.delete(f"/catalog/{item['id']}", headers=auth_headers)
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    assert _suggest(client, auth_headers, "flue") == []
+    assert client.delete(f"/catalog/{item['id']}", headers=auth_headers).status_code == 404
+
+
+def test_index_waits_for_outer_commit(client, auth_headers, test_db):
+    """Test that only items learned in a committed transaction reach the index."""
+    assert _suggest(client, auth_headers, "g") == []
+    user_id = test_db.query(User.id).filter(User.email == "test@example.com").scalar()
+
+    def item(description):
+        return LineItemCreate(
+            description=description,
+            quantity=1,
+            unit_price=20.00,
+            category=LineItemCategory.PARTS,
+        )
+
+    kept = test_db.begin_nested()
+    catalog.learn(test_db, user_id, [item("Gate valve")])
+    kept.commit()
+    dropped = test_db.begin_nested()
+    catalog.learn(test_db, user_id, [item("Gasket set")])
+    dropped.rollback()
+    test_db.commit()
+    released = test_db.begin_nested()
+    catalog.learn(test_db, user_id, [item("Gauge")])
+    released.commit()
+    test_db.rollback()
+
+    assert [entry["description"] for entry in _suggest(client, auth_headers, "g")] == ["Gate valve"]
@@ -0,0 +1,81 @@
+"""Tests for the client directory."""
+
+from fastapi import status
+
+
+def _invoice(client, headers, name, email, address, price=100.00):
+    data = {
+        "client_name": name,
+        "client_email": email,
+        "job_address": address,
+        "trade_type": "plumbing",
+        "tax_rate": 0,
+        "line_items": [
+            {
+                "description": "Service call",
+                "quantity": 1,
+                "unit_price": price,
+                "category": "labor",
+            },
+        ],
+    }
+    response = client.post("/invoices", json=data, headers=headers)
+    assert response.status_code == status.HTTP_201_CREATED
+    return response.json()
+
+
+def test_invoices_share_clients(client, auth_headers):
+    """Test that invoices for the same client, however typed, share one directory entry."""
+    first = _invoice(client, auth_headers, "Dana Whitfield", "dana@example.com", "4 Elm St")
+    again = _invoice(client, auth_headers, "  dana   WHITFIELD ", "Dana@Example.com", "4 elm st")
+    elsewhere = _invoice(client, auth_headers, "Dana Whitfield", "dana@example.com", "9 Oak Ave")
+    _invoice(client, auth_headers, "Marco Diaz", "marco@example.com", "1 Pine Rd")
+
+    assert first["client_id"] == again["client_id"]
+    assert elsewhere["client_id"] != first["client_id"]
+
+    clients = client.get("/clients", headers=auth_headers).json()
+    assert len(clients) == 3
+    # Spelled as on the latest invoice
+    dana = next(row for row in clients if row["id"] == first["client_id"])
+    assert dana["name"] == "dana   WHITFIELD"
+
+    def suggest(prefix):
+        response = client.get("/clients", params={"prefix": prefix}, headers=auth_headers)
+        return sorted(row["address"] for row in response.json())
+
+    assert suggest("DA") == ["4 elm st", "9 Oak Ave"]
+    assert suggest("whit") == ["4 elm st", "9 Oak Ave"]
+    assert suggest("marco@") == ["1 Pine Rd"]
+    assert suggest("itfield") == []
+    assert suggest("%") == []
+
+
+def test_client_totals_and_history(client, auth_headers):
+    """Test a client's totals and invoice history, and relinking an edited invoice."""
+    paid = _invoice(client, auth_headers, "Lee Park", "lee@example.com", "2 Bay Rd", 300.00)
+    sent = _invoice(client, auth_headers, "Lee Park", "lee@example.com", "2 Bay Rd", 120.00)
+    draft = _invoice(client, auth_headers, "Lee Park", "lee@example.com", "2 Bay Rd", 50.00)
+    client.patch(f"/invoices/{paid['id']}/status", json={"status": "paid"}, headers=auth_headers)
+    client.patch(f"/invoices/{sent['id']}/status", json={"status": "sent"}, headers=auth_headers)
+    client_id = paid["client_id"]
+
+    detail = client.get(f"/clients/{client_id}", headers=auth_headers).json()
+    assert detail["invoice_count"] == 3
+    assert (detail["billed"], detail["paid"], detail["outstanding"]) == (420.0, 300.0, 120.0)
+
+    history = client.get(f"/clients/{client_id}/invoices", headers=auth_headers).json()
+    assert [row["id"] for row in history] == [draft["id"], sent["id"], paid["id"]]
+
+    update = {
+        **{key: draft[key] for key in ("trade_type", "tax_rate", "job_address", "client_email")},
+        "client_name": "Lee Park Holdings",
+        "line_items": draft["line_items"],
+    }
+    moved = client.put(f"/invoices/{draft['id']}", json=update, headers=auth_headers).json()
+    assert moved["client_id"] != client_id
+    history = client.get(f"/clients/{client_id}/invoices", headers=auth_headers).json()
+    assert len(history) == 2
+
+    response = client.get("/clients/999", headers=auth_headers)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
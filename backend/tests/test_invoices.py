@@ -1,8 +1,20 @@
 """Tests for invoice endpoints."""
-import pytest
+
+import csv
+import io
+import json
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import patch
+
+from app.core.config import settings
+from app.models.business_profile import BusinessProfile
+from app.models.idempotency_key import IdempotencyKey
+from app.models.invoice import Invoice, InvoiceStatus
+from app.models.user import User
+from app.schemas.invoice import ExportFormat
+from app.services.idempotency import idempotency_store, request_fingerprint
+from app.services.invoice_export import stream_export
 from fastapi import status
-from app.models.invoice import TradeType, InvoiceStatus
-from app.models.line_item import LineItemCategory
 
 
 class TestInvoiceCreation:
@@ -56,7 +68,9 @@ class TestInvoiceCreation:
         assert data["totals"]["total"] == 2625.06
 
         # Check category breakdown
-        categories = {item["category"]: item["total"] for item in data["totals"]["category_breakdown"]}
+        categories = {
+            item["category"]: item["total"] for item in data["totals"]["category_breakdown"]
+        }
         assert categories["labor"] == 1500.00
         assert categories["parts"] == 925.00  # 800 + 125
 
@@ -101,6 +115,209 @@ class TestInvoiceCreation:
         assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
 
+class TestInvoiceBulkCreate:
+    """Tests for bulk invoice creation."""
+
+    def _invoice(self, name, unit_price=100.00):
+        return {
+            "client_name": name,
+            "client_email": "bulk@example.com",
+            "job_address": "1 Bulk St",
+            "trade_type": "hvac",
+            "tax_rate": 0,
+            "line_items": [
+                {
+                    "description": "Service",
+                    "quantity": 2,
+                    "unit_price": unit_price,
+                    "category": "labor",
+                },
+                {"description": "Filter", "quantity": 1, "unit_price": 15.00, "category": "parts"},
+            ],
+        }
+
+    def test_bulk_create(self, client, auth_headers):
+        """Test that valid items are created and invalid ones reported."""
+        bad = self._invoice("Bad")
+        bad["line_items"] = []
+        response = client.post(
+            "/invoices/bulk",
+            json={"invoices": [self._invoice("First"), bad, self._invoice("Third", 50.00)]},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        report = response.json()
+        assert report["created"] == 2
+        assert report["failed"] == 1
+        first, failed, third = report["results"]
+        assert failed["id"] is None
+        assert failed["errors"][0]["loc"] == ["line_items"]
+        assert first["errors"] is None
+
+        detail = client.get(f"/invoices/{third['id']}", headers=auth_headers).json()
+        assert detail["client_name"] == "Third"
+        assert detail["totals"]["total"] == 115.00
+        assert len(detail["line_items"]) == 2
+        assert client.get("/invoices/stats", headers=auth_headers).json()["count"] == 2
+
+    def test_bulk_create_empty(self, client, auth_headers):
+        """Test that an empty batch is rejected outright."""
+        empty = client.post("/invoices/bulk", json={"invoices": []}, headers=auth_headers)
+        assert empty.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+class TestInvoiceImport:
+    """Tests for CSV invoice import."""
+
+    HEADER = "invoice_ref,client_name,client_email,job_address,trade_type,tax_rate,status,created_at,description,quantity,unit_price,category\n"
+
+    def test_import_invoices(self, client, auth_headers):
+        """Test that valid invoices import and bad rows are reported."""
+        csv_text = self.HEADER + (
+            "A1,Ann Lee,ann@example.com,1 Oak St,plumbing,8.25,paid,2024-03-05T10:00:00,Heater,1,1500,labor\n"
+            "A1,Ann Lee,ann@example.com,1 Oak St,plumbing,8.25,paid,2024-03-05T10:00:00,Pipe,10,12.50,parts\n"
+            "B2,Bob Ray,bob@example.com,2 Elm St,roofing,0,,,Shingles,1,10,parts\n"
+            "C3,Cal Fox,cal@example.com,3 Ash St,hvac,0,,,Filter,2,15,parts\n"
+        )
+        with patch(
+            "app.api.invoices.r2_storage.upload_import_errors", return_value="imports/1/errors.csv"
+        ) as upload:
+            response = client.post(
+                "/invoices/import",
+                files={"file": ("history.csv", csv_text.encode(), "text/csv")},
+                headers=auth_headers,
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        report = response.json()
+        assert report["rows_read"] == 4
+        assert report["invoices_imported"] == 2
+        assert report["line_items_imported"] == 3
+        assert report["rows_rejected"] == 1
+        assert report["errors"][0]["line"] == 4
+        assert report["errors"][0]["invoice_ref"] == "B2"
+        assert "trade_type" in report["errors"][0]["error"]
+        assert report["error_file_key"] == "imports/1/errors.csv"
+        error_csv = upload.call_args[0][0].decode()
+        assert "B2,Bob Ray" in error_csv
+        assert "Cal Fox" not in error_csv
+
+        invoices = client.get(
+            "/invoices", params={"sort": "created_at"}, headers=auth_headers
+        ).json()
+        assert [invoice["client_name"] for invoice in invoices] == ["Ann Lee", "Cal Fox"]
+        assert invoices[0]["status"] == "paid"
+        assert invoices[0]["total"] == 1759.06
+        assert invoices[0]["created_at"].startswith("2024-03-05")
+        stats = client.get("/invoices/stats", headers=auth_headers).json()
+        assert stats["count"] == 2
+
+    def test_import_due_dates(self, client, auth_headers):
+        """Test that sent invoices get a due date from the file or the payment terms."""
+        csv_text = (
+            self.HEADER.replace("created_at,", "created_at,due_date,")
+            + "A1,Ann Lee,ann@example.com,1 Oak St,plumbing,0,sent,2024-03-05T10:00:00,2024-03-20,Heater,1,1500,labor\n"
+            + "B2,Bob Ray,bob@example.com,2 Elm St,hvac,0,sent,2024-07-01T09:00:00,,Filter,2,15,parts\n"
+            + "C3,Cal Fox,cal@example.com,3 Ash St,hvac,0,draft,2025-01-02T09:00:00,,Tune-up,1,90,labor\n"
+        )
+        response = client.post(
+            "/invoices/import",
+            files={"file": ("history.csv", csv_text.encode(), "text/csv")},
+            headers=auth_headers,
+        )
+
+        assert response.json()["invoices_imported"] == 3
+        invoices = client.get(
+            "/invoices", params={"sort": "created_at"}, headers=auth_headers
+        ).json()
+        terms = timedelta(days=settings.INVOICE_PAYMENT_TERMS_DAYS)
+        assert [invoice["due_date"] for invoice in invoices] == [
+            "2024-03-20",
+            (date(2024, 7, 1) + terms).isoformat(),
+            None,
+        ]
+
+    def test_import_missing_columns(self, client, auth_headers):
+        """Test that a file without the required columns is rejected."""
+        response = client.post(
+            "/invoices/import",
+            files={"file": ("history.csv", b"client_name,total\nAnn,10\n", "text/csv")},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "invoice_ref" in response.json()["detail"]
+
+
+class TestInvoiceExport:
+    """Tests for the streaming invoice export."""
+
+    def _import(self, client, auth_headers):
+        csv_text = TestInvoiceImport.HEADER + (
+            "A1,Ann Lee,ann@example.com,1 Oak St,plumbing,8.25,paid,2024-03-05T10:00:00,Heater,1,1500,labor\n"
+            "A1,Ann Lee,ann@example.com,1 Oak St,plumbing,8.25,paid,2024-03-05T10:00:00,Pipe,10,12.50,parts\n"
+            "B2,Bob Ray,bob@example.com,2 Elm St,hvac,0,sent,2024-07-01T09:00:00,Filter,2,15,parts\n"
+            "C3,Cal Fox,cal@example.com,3 Ash St,hvac,0,draft,2025-01-02T09:00:00,Tune-up,1,90,labor\n"
+        )
+        client.post(
+            "/invoices/import",
+            files={"file": ("history.csv", csv_text.encode(), "text/csv")},
+            headers=auth_headers,
+        )
+
+    def test_export_csv(self, client, auth_headers):
+        """Test that a CSV export covers the date range, one row per line item."""
+        self._import(client, auth_headers)
+
+        response = client.get(
+            "/invoices/export",
+            params={"format": "csv", "from": "2024-01-01", "to": "2024-12-31"},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/csv")
+        assert (
+            "invoices_from_2024-01-01_to_2024-12-31.csv" in response.headers["content-disposition"]
+        )
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert [row["description"] for row in rows] == ["Heater", "Pipe", "Filter"]
+        assert rows[0]["client_name"] == "Ann Lee"
+        assert rows[0]["status"] == "paid"
+        assert rows[1]["line_total"] == "125.0000"
+        assert rows[1]["invoice_total"] == "1759.06"
+        assert rows[2]["invoice_total"] == "30.00"
+        assert rows[0]["due_date"] == ""
+        terms = timedelta(days=settings.INVOICE_PAYMENT_TERMS_DAYS)
+        assert rows[2]["due_date"] == (date(2024, 7, 1) + terms).isoformat()
+
+    def test_export_ndjson(self, client, auth_headers):
+        """Test that an NDJSON export has one invoice per line, like the detail endpoint."""
+        self._import(client, auth_headers)
+
+        response = client.get("/invoices/export", params={"format": "ndjson"}, headers=auth_headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == "application/x-ndjson"
+        invoices = [json.loads(line) for line in response.text.splitlines()]
+        assert [invoice["client_name"] for invoice in invoices] == ["Ann Lee", "Bob Ray", "Cal Fox"]
+        detail = client.get(f"/invoices/{invoices[0]['id']}", headers=auth_headers).json()
+        assert invoices[0] == detail
+
+    def test_export_small_batches(self, client, auth_headers, test_db):
+        """Test that batching never splits an invoice's line items."""
+        self._import(client, auth_headers)
+        user_id = test_db.query(User.id).scalar()
+
+        chunks = list(stream_export(test_db.get_bind(), user_id, ExportFormat.NDJSON, batch_rows=1))
+
+        assert len(chunks) == 3
+        invoices = [json.loads(line) for chunk in chunks for line in chunk.splitlines()]
+        assert [len(invoice["line_items"]) for invoice in invoices] == [2, 1, 1]
+        assert invoices[0]["totals"]["total"] == 1759.06
+
+
 class TestInvoiceList:
     """Tests for invoice listing."""
 
@@ -169,6 +386,274 @@ class TestInvoiceList:
         assert invoices[0]["client_name"] == "Client Two"
         assert invoices[1]["client_name"] == "Client One"
 
+    def test_list_invoices_totals(self, client, auth_headers):
+        """Test that list totals match the detail totals."""
+        create_response = client.post(
+            "/invoices",
+            json={
+                "client_name": "Totals Client",
+                "client_email": "totals@example.com",
+                "job_address": "1 Sum St",
+                "trade_type": "plumbing",
+                "tax_rate": 8.25,
+                "line_items": [
+                    {
+                        "description": "Water heater installation",
+                        "quantity": 1,
+                        "unit_price": 1500.00,
+                        "category": "labor",
+                    },
+                    {
+                        "description": "Copper pipe (1/2 inch)",
+                        "quantity": 10,
+                        "unit_price": 12.50,
+                        "category": "parts",
+                    },
+                ],
+            },
+            headers=auth_headers,
+        )
+        invoice_id = create_response.json()["id"]
+
+        response = client.get("/invoices", headers=auth_headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        invoices = response.json()
+        assert invoices[0]["id"] == invoice_id
+        assert invoices[0]["total"] == 1759.06  # 1625 + 8.25% tax
+        detail = client.get(f"/invoices/{invoice_id}", headers=auth_headers).json()
+        assert invoices[0]["total"] == detail["totals"]["total"]
+
+    def test_list_invoices_filters(self, client, auth_headers):
+        """Test filtering the list by status, trade, date and total."""
+        ids = {}
+        for name, trade, price in [
+            ("Pipe Co", "plumbing", 100.00),
+            ("Wire Co", "electrical", 500.00),
+            ("Duct Co", "hvac", 900.00),
+        ]:
+            response = client.post(
+                "/invoices",
+                json={
+                    "client_name": name,
+                    "client_email": "filter@example.com",
+                    "job_address": "1 Filter St",
+                    "trade_type": trade,
+                    "tax_rate": 0,
+                    "line_items": [
+                        {
+                            "description": "Work",
+                            "quantity": 1,
+                            "unit_price": price,
+                            "category": "labor",
+                        },
+                    ],
+                },
+                headers=auth_headers,
+            )
+            ids[name] = response.json()["id"]
+        client.patch(
+            f"/invoices/{ids['Wire Co']}/status", json={"status": "sent"}, headers=auth_headers
+        )
+
+        def names(**params):
+            response = client.get("/invoices", params=params, headers=auth_headers)
+            assert response.status_code == status.HTTP_200_OK
+            return [invoice["client_name"] for invoice in response.json()]
+
+        assert names(status="sent") == ["Wire Co"]
+        assert names(trade_type="hvac") == ["Duct Co"]
+        assert set(names(min_total=400)) == {"Wire Co", "Duct Co"}
+        assert names(min_total=400, max_total=600) == ["Wire Co"]
+        assert len(names(created_from="2000-01-01")) == 3
+        assert names(created_to="2000-01-01") == []
+        assert names(sort="total") == ["Pipe Co", "Wire Co", "Duct Co"]
+        assert names(sort="-total") == ["Duct Co", "Wire Co", "Pipe Co"]
+        assert names(sort="client_name") == ["Duct Co", "Pipe Co", "Wire Co"]
+
+    def test_list_invoices_invalid_filter(self, client, auth_headers):
+        """Test that unknown filter values are rejected."""
+        response = client.get("/invoices", params={"sort": "bogus"}, headers=auth_headers)
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+class TestInvoiceSearch:
+    """Tests for invoice search."""
+
+    def _create(self, client, auth_headers, client_name, job_address, description):
+        response = client.post(
+            "/invoices",
+            json={
+                "client_name": client_name,
+                "client_email": "search@example.com",
+                "job_address": job_address,
+                "trade_type": "plumbing",
+                "tax_rate": 0,
+                "line_items": [
+                    {
+                        "description": description,
+                        "quantity": 1,
+                        "unit_price": 10.00,
+                        "category": "labor",
+                    },
+                ],
+            },
+            headers=auth_headers,
+        )
+        return response.json()["id"]
+
+    def test_search_invoices(self, client, auth_headers):
+        """Test matching on client, address and line item descriptions."""
+        smith = self._create(
+            client, auth_headers, "Jane Smith", "12 Oak Lane", "Water heater flush"
+        )
+        jones = self._create(client, auth_headers, "Bob Jones", "9 Elm Road", "Replace sump pump")
+
+        def ids(q):
+            response = client.get("/invoices/search", params={"q": q}, headers=auth_headers)
+            assert response.status_code == status.HTTP_200_OK
+            return [invoice["id"] for invoice in response.json()]
+
+        assert ids("smith") == [smith]
+        assert ids("elm road") == [jones]
+        assert ids("sump") == [jones]
+        assert ids("wat") == [smith]  # prefix of the last word
+        assert ids("search@example") == [jones, smith]
+        assert ids("nothing") == []
+        assert ids("!!!") == []
+
+    def test_search_follows_edits(self, client, auth_headers):
+        """Test that the index tracks updated line items."""
+        invoice_id = self._create(
+            client, auth_headers, "Jane Smith", "12 Oak Lane", "Water heater flush"
+        )
+        client.put(
+            f"/invoices/{invoice_id}",
+            json={
+                "client_name": "Jane Smith",
+                "client_email": "search@example.com",
+                "job_address": "12 Oak Lane",
+                "trade_type": "plumbing",
+                "tax_rate": 0,
+                "line_items": [
+                    {
+                        "description": "Drain cleaning",
+                        "quantity": 1,
+                        "unit_price": 10.00,
+                        "category": "labor",
+                    },
+                ],
+            },
+            headers=auth_headers,
+        )
+
+        heater = client.get("/invoices/search", params={"q": "heater"}, headers=auth_headers)
+        drain = client.get("/invoices/search", params={"q": "drain"}, headers=auth_headers)
+
+        assert heater.json() == []
+        assert [invoice["id"] for invoice in drain.json()] == [invoice_id]
+
+
+class TestInvoiceStats:
+    """Tests for the dashboard stats rollup."""
+
+    def _create(self, client, auth_headers, trade_type, unit_price):
+        response = client.post(
+            "/invoices",
+            json={
+                "client_name": "Stats Client",
+                "client_email": "stats@example.com",
+                "job_address": "1 Stats St",
+                "trade_type": trade_type,
+                "tax_rate": 8.25,
+                "line_items": [
+                    {
+                        "description": "Work",
+                        "quantity": 1,
+                        "unit_price": unit_price,
+                        "category": "labor",
+                    },
+                ],
+            },
+            headers=auth_headers,
+        )
+        return response.json()
+
+    def test_stats_follow_writes(self, client, auth_headers):
+        """Test that creates, edits and status changes update the rollup."""
+        plumbing = self._create(client, auth_headers, "plumbing", 100.00)
+        hvac = self._create(client, auth_headers, "hvac", 200.00)
+        client.patch(
+            f"/invoices/{hvac['id']}/status", json={"status": "paid"}, headers=auth_headers
+        )
+        client.put(
+            f"/invoices/{plumbing['id']}",
+            json={
+                "client_name": "Stats Client",
+                "client_email": "stats@example.com",
+                "job_address": "1 Stats St",
+                "trade_type": "electrical",
+                "tax_rate": 8.25,
+                "line_items": [
+                    {
+                        "description": "Work",
+                        "quantity": 3,
+                        "unit_price": 100.00,
+                        "category": "labor",
+                    },
+                ],
+            },
+            headers=auth_headers,
+        )
+
+        response = client.get("/invoices/stats", headers=auth_headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        stats = response.json()
+        assert stats["count"] == 2
+        assert stats["total"] == 541.25  # 324.75 + 216.50
+        by_status = {row["status"]: row for row in stats["by_status"]}
+        assert by_status["draft"]["count"] == 1
+        assert by_status["draft"]["total"] == 324.75
+        assert by_status["paid"]["total"] == 216.50
+        assert by_status["sent"]["count"] == 0
+        by_trade = {row["trade_type"]: row for row in stats["by_trade"]}
+        assert by_trade["electrical"]["total"] == 324.75
+        assert by_trade["plumbing"]["count"] == 0
+        assert len(stats["by_month"]) == 1
+        assert stats["by_month"][0]["count"] == 2
+
+    def test_repeated_status_change(self, client, auth_headers):
+        """Test that applying the same transition twice leaves the rollup unchanged."""
+        invoice = self._create(client, auth_headers, "plumbing", 100.00)
+        url = f"/invoices/{invoice['id']}/status"
+        client.patch(url, json={"status": "paid"}, headers=auth_headers)
+        first = client.get("/invoices/stats", headers=auth_headers).json()
+        client.patch(url, json={"status": "paid"}, headers=auth_headers)
+        second = client.get("/invoices/stats", headers=auth_headers).json()
+
+        assert second == first
+        by_status = {row["status"]: row for row in second["by_status"]}
+        assert by_status["paid"]["count"] == 1
+        assert by_status["draft"]["count"] == 0
+
+    def test_rebuild_matches_incremental(self, client, auth_headers, test_db):
+        """Test that a rebuild reproduces the incrementally maintained rows."""
+        from app.services import invoice_stats
+
+        first = self._create(client, auth_headers, "plumbing", 19.99)
+        self._create(client, auth_headers, "plumbing", 0.01)
+        client.patch(
+            f"/invoices/{first['id']}/status", json={"status": "sent"}, headers=auth_headers
+        )
+        incremental = client.get("/invoices/stats", headers=auth_headers).json()
+
+        assert invoice_stats.rebuild(test_db) == 2
+        test_db.commit()
+
+        assert client.get("/invoices/stats", headers=auth_headers).json() == incremental
+        assert incremental["total"] == round(first["totals"]["total"] + 0.01, 2)
+
 
 class TestInvoiceDetail:
     """Tests for getting invoice details."""
@@ -210,6 +695,47 @@ class TestInvoiceDetail:
         assert data["client_name"] == "Jane Smith"
         assert data["trade_type"] == "hvac"
 
+    def test_get_invoice_line_totals(self, client, auth_headers):
+        """Test line and category totals on the detail response."""
+        create_response = client.post(
+            "/invoices",
+            json={
+                "client_name": "Jane Smith",
+                "client_email": "jane@example.com",
+                "job_address": "789 Pine Rd",
+                "trade_type": "hvac",
+                "tax_rate": 0,
+                "line_items": [
+                    {
+                        "description": "Filter",
+                        "quantity": 1.5,
+                        "unit_price": 0.33,
+                        "category": "parts",
+                    },
+                    {
+                        "description": "Labor",
+                        "quantity": 2,
+                        "unit_price": 95.00,
+                        "category": "labor",
+                    },
+                ],
+            },
+            headers=auth_headers,
+        )
+        invoice_id = create_response.json()["id"]
+
+        response = client.get(f"/invoices/{invoice_id}", headers=auth_headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == "application/json"
+        data = response.json()
+        assert [item["line_total"] for item in data["line_items"]] == [0.495, 190.0]
+        assert data["totals"]["subtotal"] == 190.50
+        categories = {
+            item["category"]: item["total"] for item in data["totals"]["category_breakdown"]
+        }
+        assert categories == {"parts": 0.50, "labor": 190.00}
+
     def test_get_invoice_not_found(self, client, auth_headers):
         """Test getting a non-existent invoice."""
         response = client.get(
@@ -219,6 +745,84 @@ class TestInvoiceDetail:
 
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
+    def test_get_invoice_not_modified(self, client, auth_headers):
+        """Test that a current ETag gets a 304 and a write changes it."""
+        invoice = client.post(
+            "/invoices",
+            json={
+                "client_name": "Jane Smith",
+                "client_email": "jane@example.com",
+                "job_address": "789 Pine Rd",
+                "trade_type": "hvac",
+                "tax_rate": 0,
+                "line_items": [
+                    {
+                        "description": "AC repair",
+                        "quantity": 1,
+                        "unit_price": 200.00,
+                        "category": "labor",
+                    },
+                ],
+            },
+            headers=auth_headers,
+        ).json()
+        url = f"/invoices/{invoice['id']}"
+
+        first = client.get(url, headers=auth_headers)
+        etag = first.headers["etag"]
+        assert first.headers["cache-control"] == "private, no-cache"
+
+        cached = client.get(url, headers={**auth_headers, "If-None-Match": etag})
+        assert cached.status_code == status.HTTP_304_NOT_MODIFIED
+        assert cached.content == b""
+        assert cached.headers["etag"] == etag
+
+        client.patch(f"{url}/status", json={"status": "sent"}, headers=auth_headers)
+        changed = client.get(url, headers={**auth_headers, "If-None-Match": etag})
+        assert changed.status_code == status.HTTP_200_OK
+        assert changed.json()["status"] == "sent"
+        assert changed.headers["etag"] != etag
+
+    def test_list_invoices_not_modified(self, client, auth_headers):
+        """Test that the list ETag holds until an invoice is added or changed."""
+        body = {
+            "client_name": "Jane Smith",
+            "client_email": "jane@example.com",
+            "job_address": "789 Pine Rd",
+            "trade_type": "hvac",
+            "tax_rate": 0,
+            "line_items": [
+                {
+                    "description": "AC repair",
+                    "quantity": 1,
+                    "unit_price": 200.00,
+                    "category": "labor",
+                },
+            ],
+        }
+        invoice_id = client.post("/invoices", json=body, headers=auth_headers).json()["id"]
+
+        etag = client.get("/invoices", headers=auth_headers).headers["etag"]
+        cached = client.get("/invoices", headers={**auth_headers, "If-None-Match": etag})
+        assert cached.status_code == status.HTTP_304_NOT_MODIFIED
+
+        filtered = client.get(
+            "/invoices?status=draft", headers={**auth_headers, "If-None-Match": etag}
+        )
+        assert filtered.status_code == status.HTTP_200_OK
+
+        client.patch(
+            f"/invoices/{invoice_id}/status", json={"status": "sent"}, headers=auth_headers
+        )
+        after_update = client.get("/invoices", headers={**auth_headers, "If-None-Match": etag})
+        assert after_update.status_code == status.HTTP_200_OK
+        etag = after_update.headers["etag"]
+
+        client.post("/invoices", json=body, headers=auth_headers)
+        after_create = client.get("/invoices", headers={**auth_headers, "If-None-Match": etag})
+        assert after_create.status_code == status.HTTP_200_OK
+        assert len(after_create.json()) == 2
+
 
 class TestInvoiceUpdate:
     """Tests for invoice updates."""
@@ -278,6 +882,110 @@ class TestInvoiceUpdate:
         assert data["line_items"][0]["description"] == "Updated item"
         assert data["totals"]["subtotal"] == 300.00
 
+    def _diff_invoice(self, client, auth_headers):
+        response = client.post(
+            "/invoices",
+            json={
+                "client_name": "Diff Client",
+                "client_email": "diff@example.com",
+                "job_address": "1 Diff St",
+                "trade_type": "plumbing",
+                "tax_rate": 0,
+                "line_items": [
+                    {
+                        "description": "Keep",
+                        "quantity": 1,
+                        "unit_price": 10.00,
+                        "category": "labor",
+                    },
+                    {
+                        "description": "Change",
+                        "quantity": 1,
+                        "unit_price": 20.00,
+                        "category": "parts",
+                    },
+                    {
+                        "description": "Remove",
+                        "quantity": 1,
+                        "unit_price": 30.00,
+                        "category": "parts",
+                    },
+                ],
+            },
+            headers=auth_headers,
+        )
+        return response.json()
+
+    def _update_body(self, invoice, line_items, **extra):
+        return {
+            "client_name": invoice["client_name"],
+            "client_email": invoice["client_email"],
+            "job_address": invoice["job_address"],
+            "trade_type": invoice["trade_type"],
+            "tax_rate": invoice["tax_rate"],
+            "line_items": line_items,
+            **extra,
+        }
+
+    def test_update_line_items_diff(self, client, auth_headers):
+        """Test that kept items keep their ids, new ones are added and missing ones removed."""
+        invoice = self._diff_invoice(client, auth_headers)
+        keep, change, _ = invoice["line_items"]
+
+        response = client.put(
+            f"/invoices/{invoice['id']}",
+            json=self._update_body(
+                invoice,
+                [
+                    {**keep},
+                    {**change, "quantity": 3},
+                    {"description": "New", "quantity": 1, "unit_price": 5.00, "category": "labor"},
+                ],
+                version=invoice["version"],
+            ),
+            headers=auth_headers,
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["version"] == invoice["version"] + 1
+        items = {item["description"]: item for item in data["line_items"]}
+        assert set(items) == {"Keep", "Change", "New"}
+        assert items["Keep"]["id"] == keep["id"]
+        assert items["Change"]["id"] == change["id"]
+        assert items["Change"]["quantity"] == 3
+        assert data["totals"]["subtotal"] == 75.00
+
+    def test_update_stale_version(self, client, auth_headers):
+        """Test that an update carrying an old version is rejected."""
+        invoice = self._diff_invoice(client, auth_headers)
+        body = self._update_body(invoice, invoice["line_items"], version=invoice["version"])
+        first = client.put(f"/invoices/{invoice['id']}", json=body, headers=auth_headers)
+
+        second = client.put(
+            f"/invoices/{invoice['id']}",
+            json={**body, "client_name": "Other Edit"},
+            headers=auth_headers,
+        )
+
+        assert first.status_code == status.HTTP_200_OK
+        assert second.status_code == status.HTTP_409_CONFLICT
+        detail = client.get(f"/invoices/{invoice['id']}", headers=auth_headers).json()
+        assert detail["client_name"] == "Diff Client"
+
+    def test_update_foreign_line_item(self, client, auth_headers):
+        """Test that line item ids from another invoice are rejected."""
+        invoice = self._diff_invoice(client, auth_headers)
+        other = self._diff_invoice(client, auth_headers)
+
+        response = client.put(
+            f"/invoices/{invoice['id']}",
+            json=self._update_body(invoice, [other["line_items"][0]]),
+            headers=auth_headers,
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
     def test_update_invoice_not_found(self, client, auth_headers):
         """Test updating a non-existent invoice."""
         response = client.put(
@@ -303,6 +1011,319 @@ class TestInvoiceUpdate:
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
 
+class TestInvoiceChanges:
+    """Tests for delta sync and invoice deletion."""
+
+    def _create(self, client, auth_headers, client_name):
+        response = client.post(
+            "/invoices",
+            json={
+                "client_name": client_name,
+                "client_email": "sync@example.com",
+                "job_address": "1 Sync St",
+                "trade_type": "plumbing",
+                "tax_rate": 0,
+                "line_items": [
+                    {
+                        "description": "Work",
+                        "quantity": 1,
+                        "unit_price": 100.00,
+                        "category": "labor",
+                    },
+                ],
+            },
+            headers=auth_headers,
+        )
+        return response.json()["id"]
+
+    def test_changes_since_token(self, client, auth_headers):
+        """Test that a sync returns only what changed after the token."""
+        first = self._create(client, auth_headers, "First")
+        second = self._create(client, auth_headers, "Second")
+
+        full = client.get("/invoices/changes", headers=auth_headers).json()
+        assert [invoice["id"] for invoice in full["invoices"]] == [first, second]
+        assert full["invoices"][0]["total"] == 100.00
+        assert full["deleted"] == []
+
+        unchanged = client.get(
+            f"/invoices/changes?since={full['token']}", headers=auth_headers
+        ).json()
+        assert unchanged == {"token": full["token"], "invoices": [], "deleted": []}
+
+        client.patch(f"/invoices/{first}/status", json={"status": "sent"}, headers=auth_headers)
+        third = self._create(client, auth_headers, "Third")
+        response = client.delete(f"/invoices/{second}", headers=auth_headers)
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+
+        delta = client.get(f"/invoices/changes?since={full['token']}", headers=auth_headers).json()
+        assert [invoice["id"] for invoice in delta["invoices"]] == [first, third]
+        assert delta["invoices"][0]["status"] == "sent"
+        assert delta["deleted"] == [second]
+        assert delta["token"] > full["token"]
+
+    def test_changes_unknown_token(self, client, auth_headers):
+        """Test that a token from the future is rejected."""
+        response = client.get("/invoices/changes?since=99", headers=auth_headers)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_delete_only_drafts(self, client, auth_headers):
+        """Test that sent invoices can't be deleted and deleted ones are gone."""
+        sent = self._create(client, auth_headers, "Sent")
+        draft = self._create(client, auth_headers, "Draft")
+        client.patch(f"/invoices/{sent}/status", json={"status": "sent"}, headers=auth_headers)
+
+        assert client.delete(f"/invoices/{sent}", headers=auth_headers).status_code == 400
+        assert client.delete(f"/invoices/{draft}", headers=auth_headers).status_code == 204
+        assert client.get(f"/invoices/{draft}", headers=auth_headers).status_code == 404
+        assert client.delete(f"/invoices/{draft}", headers=auth_headers).status_code == 404
+        stats = client.get("/invoices/stats", headers=auth_headers).json()
+        assert stats["count"] == 1
+
+
+class TestIdempotencyKeys:
+    """Tests for replay-safe create and send."""
+
+    INVOICE = {
+        "client_name": "Retry Client",
+        "client_email": "retry@example.com",
+        "job_address": "1 Flaky Rd",
+        "trade_type": "plumbing",
+        "tax_rate": 0,
+        "line_items": [
+            {"description": "Work", "quantity": 1, "unit_price": 100.00, "category": "labor"},
+        ],
+    }
+
+    def _send(self, client, headers, invoice_id):
+        with (
+            patch("app.api.invoices.pdf_generator.generate_pdf", return_value=b"%PDF"),
+            patch("app.api.invoices.r2_storage.upload_pdf", return_value="invoices/1.pdf"),
+            patch(
+                "app.api.invoices.r2_storage.get_public_url",
+                return_value="https://cdn/invoices/1.pdf",
+            ),
+            patch("app.api.invoices.email_service.send_invoice_email") as send_email,
+        ):
+            response = client.post(f"/invoices/{invoice_id}/send", headers=headers)
+        return response, send_email.call_count
+
+    def test_create_replayed(self, client, auth_headers):
+        """Test that a retried create returns the first invoice instead of a second."""
+        headers = {**auth_headers, "Idempotency-Key": "create-1"}
+        first = client.post("/invoices", json=self.INVOICE, headers=headers)
+        again = client.post("/invoices", json=self.INVOICE, headers=headers)
+
+        assert first.status_code == again.status_code == status.HTTP_201_CREATED
+        assert again.json() == first.json()
+        assert again.headers["Idempotent-Replayed"] == "true"
+        assert len(client.get("/invoices", headers=auth_headers).json()) == 1
+
+        other = client.post(
+            "/invoices", json={**self.INVOICE, "client_name": "Someone Else"}, headers=headers
+        )
+        assert other.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    def test_send_replayed(self, client, business_profile, auth_token):
+        """Test that a retried send doesn't render or email again."""
+        auth_headers = {"Authorization": f"Bearer {auth_token}"}
+        invoice_id = client.post("/invoices", json=self.INVOICE, headers=auth_headers).json()["id"]
+        headers = {**auth_headers, "Idempotency-Key": "send-1"}
+
+        first, first_emails = self._send(client, headers, invoice_id)
+        # A replay from the database, as on another worker
+        idempotency_store.clear()
+        again, again_emails = self._send(client, headers, invoice_id)
+
+        assert first.status_code == again.status_code == status.HTTP_200_OK
+        assert (first_emails, again_emails) == (1, 0)
+        assert again.json() == first.json()
+        assert again.json()["status"] == "sent"
+
+    def test_failed_request_releases_key(self, client, test_db, test_user, auth_token):
+        """Test that a key whose request failed can be retried, and one in flight can't."""
+        auth_headers = {"Authorization": f"Bearer {auth_token}"}
+        invoice_id = client.post("/invoices", json=self.INVOICE, headers=auth_headers).json()["id"]
+        headers = {**auth_headers, "Idempotency-Key": "send-2"}
+
+        failed, _ = self._send(client, headers, invoice_id)
+        assert failed.status_code == status.HTTP_400_BAD_REQUEST
+
+        test_db.add(BusinessProfile(user_id=test_user.id, business_name="Retry Plumbing"))
+        test_db.commit()
+        retried, emails = self._send(client, headers, invoice_id)
+        assert retried.status_code == status.HTTP_200_OK
+        assert emails == 1
+
+        test_db.add(
+            IdempotencyKey(
+                user_id=test_user.id,
+                key="send-3",
+                scope="invoices.send",
+                request_hash=request_fingerprint(invoice_id),
+                created_at=datetime.now(timezone.utc),
+            )
+        )
+        test_db.commit()
+        in_flight, emails = self._send(
+            client, {**auth_headers, "Idempotency-Key": "send-3"}, invoice_id
+        )
+        assert in_flight.status_code == status.HTTP_409_CONFLICT
+        assert emails == 0
+
+
+class TestInvoiceSend:
+    """Tests for the send lease."""
+
+    def test_send_in_progress(self, client, test_db, business_profile, auth_token):
+        """Test that only one request sends an invoice, until its lease lapses."""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        invoice_id = client.post(
+            "/invoices", json=TestIdempotencyKeys.INVOICE, headers=headers
+        ).json()["id"]
+        invoice = test_db.get(Invoice, invoice_id)
+        invoice.sending_until = datetime.now(timezone.utc) + timedelta(minutes=1)
+        test_db.commit()
+
+        response, emails = TestIdempotencyKeys()._send(client, headers, invoice_id)
+        assert response.status_code == status.HTTP_409_CONFLICT
+        assert emails == 0
+
+        invoice.sending_until = datetime.now(timezone.utc) - timedelta(seconds=1)
+        test_db.commit()
+        response, emails = TestIdempotencyKeys()._send(client, headers, invoice_id)
+        assert response.status_code == status.HTTP_200_OK
+        assert emails == 1
+
+        response, emails = TestIdempotencyKeys()._send(client, headers, invoice_id)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert emails == 0
+
+    def test_failed_send_releases_lease(self, client, test_db, business_profile, auth_token):
+        """Test that a send that fails can be retried straight away."""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        invoice_id = client.post(
+            "/invoices", json=TestIdempotencyKeys.INVOICE, headers=headers
+        ).json()["id"]
+
+        with patch(
+            "app.api.invoices.pdf_generator.generate_pdf", side_effect=RuntimeError("no fonts")
+        ):
+            response = client.post(f"/invoices/{invoice_id}/send", headers=headers)
+        assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+        test_db.expire_all()
+        assert test_db.get(Invoice, invoice_id).sending_until is None
+
+        response, emails = TestIdempotencyKeys()._send(client, headers, invoice_id)
+        assert response.status_code == status.HTTP_200_OK
+        assert emails == 1
+
+    def test_status_changes_wait_for_send(self, client, test_db, auth_token):
+        """Test that status changes leave an invoice alone while it's being sent."""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        invoice_id = client.post(
+            "/invoices", json=TestIdempotencyKeys.INVOICE, headers=headers
+        ).json()["id"]
+        invoice = test_db.get(Invoice, invoice_id)
+        invoice.sending_until = datetime.now(timezone.utc) + timedelta(minutes=1)
+        test_db.commit()
+
+        single = client.patch(
+            f"/invoices/{invoice_id}/status", json={"status": "sent"}, headers=headers
+        )
+        assert single.status_code == status.HTTP_409_CONFLICT
+        bulk = client.patch(
+            "/invoices/status", json={"ids": [invoice_id], "status": "sent"}, headers=headers
+        )
+        assert bulk.json()["skipped"] == [invoice_id]
+        test_db.expire_all()
+        assert test_db.get(Invoice, invoice_id).status == InvoiceStatus.DRAFT
+
+    def test_send_that_lost_its_lease(self, client, test_db, business_profile, auth_token):
+        """Test that a send outliving its lease doesn't overwrite the invoice."""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        invoice_id = client.post(
+            "/invoices", json=TestIdempotencyKeys.INVOICE, headers=headers
+        ).json()["id"]
+
+        def lease_taken_over(**kwargs):
+            invoice = test_db.get(Invoice, invoice_id)
+            invoice.sending_until = datetime.now(timezone.utc) + timedelta(minutes=5)
+            test_db.commit()
+
+        with (
+            patch("app.api.invoices.pdf_generator.generate_pdf", return_value=b"%PDF"),
+            patch("app.api.invoices.r2_storage.upload_pdf", return_value="invoices/1.pdf"),
+            patch("app.api.invoices.r2_storage.get_public_url", return_value="https://cdn/1.pdf"),
+            patch(
+                "app.api.invoices.email_service.send_invoice_email", side_effect=lease_taken_over
+            ),
+        ):
+            response = client.post(f"/invoices/{invoice_id}/send", headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["status"] == "draft"
+        test_db.expire_all()
+        invoice = test_db.get(Invoice, invoice_id)
+        assert invoice.status == InvoiceStatus.DRAFT
+        assert invoice.sending_until is not None
+
+
+class TestInvoiceClone:
+    """Tests for server-side invoice cloning."""
+
+    def test_clone_invoice(self, client, auth_headers):
+        """Test that a clone copies the line items, as a draft, with overrides applied."""
+        source = client.post(
+            "/invoices",
+            json={
+                **TestIdempotencyKeys.INVOICE,
+                "trade_type": "hvac",
+                "tax_rate": 8.25,
+                "line_items": [
+                    {
+                        "description": f"Part {n}",
+                        "quantity": n + 1,
+                        "unit_price": 9.99,
+                        "category": "parts",
+                    }
+                    for n in range(5)
+                ],
+            },
+            headers=auth_headers,
+        ).json()
+        client.patch(
+            f"/invoices/{source['id']}/status", json={"status": "paid"}, headers=auth_headers
+        )
+
+        response = client.post(
+            f"/invoices/{source['id']}/clone",
+            json={"job_address": "2 Repeat Rd"},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        clone = response.json()
+        assert clone["id"] != source["id"]
+        assert clone["status"] == "draft"
+        assert clone["version"] == 1
+        assert clone["job_address"] == "2 Repeat Rd"
+        assert clone["client_name"] == source["client_name"]
+        assert clone["trade_type"] == "hvac"
+        assert [item["description"] for item in clone["line_items"]] == [
+            f"Part {n}" for n in range(5)
+        ]
+        assert clone["totals"] == source["totals"]
+        stats = client.get("/invoices/stats", headers=auth_headers).json()
+        assert stats["count"] == 2
+
+    def test_clone_invoice_not_found(self, client, auth_headers):
+        """Test cloning an invoice that doesn't exist."""
+        response = client.post("/invoices/999/clone", headers=auth_headers)
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
 class TestInvoiceStatusUpdate:
     """Tests for invoice status updates."""
 
@@ -378,6 +1399,69 @@ class TestInvoiceStatusUpdate:
         assert response.json()["status"] == "paid"
 
 
+class TestInvoiceBulkStatusUpdate:
+    """Tests for bulk status transitions."""
+
+    def _create(self, client, auth_headers):
+        response = client.post(
+            "/invoices",
+            json={
+                "client_name": "Bulk Status",
+                "client_email": "bulk@example.com",
+                "job_address": "1 Bulk St",
+                "trade_type": "electrical",
+                "tax_rate": 0,
+                "line_items": [
+                    {
+                        "description": "Service",
+                        "quantity": 1,
+                        "unit_price": 100.00,
+                        "category": "labor",
+                    },
+                ],
+            },
+            headers=auth_headers,
+        )
+        return response.json()["id"]
+
+    def test_bulk_mark_paid(self, client, auth_headers):
+        """Test marking several invoices paid at once."""
+        first, second = self._create(client, auth_headers), self._create(client, auth_headers)
+        client.patch(f"/invoices/{second}/status", json={"status": "sent"}, headers=auth_headers)
+
+        response = client.patch(
+            "/invoices/status",
+            json={"ids": [first, second, 9999], "status": "paid"},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"status": "paid", "updated": [first, second], "skipped": [9999]}
+        for invoice_id in (first, second):
+            detail = client.get(f"/invoices/{invoice_id}", headers=auth_headers).json()
+            assert detail["status"] == "paid"
+        stats = client.get("/invoices/stats", headers=auth_headers).json()
+        by_status = {row["status"]: row["count"] for row in stats["by_status"]}
+        assert by_status == {"draft": 0, "sent": 0, "paid": 2}
+
+    def test_bulk_invalid_transition(self, client, auth_headers):
+        """Test that invalid transitions are skipped, not applied."""
+        invoice_id = self._create(client, auth_headers)
+        client.patch(
+            f"/invoices/{invoice_id}/status", json={"status": "paid"}, headers=auth_headers
+        )
+
+        response = client.patch(
+            "/invoices/status",
+            json={"ids": [invoice_id], "status": "sent"},
+            headers=auth_headers,
+        )
+
+        assert response.json() == {"status": "sent", "updated": [], "skipped": [invoice_id]}
+        detail = client.get(f"/invoices/{invoice_id}", headers=auth_headers).json()
+        assert detail["status"] == "paid"
+
+
 class TestComplianceNotes:
     """Tests for compliance notes templates."""
 
@@ -0,0 +1,77 @@
+"""Tests for the integer-cents money engine."""
+
+from decimal import Decimal
+
+from app.models import Invoice, LineItem, LineItemCategory, TradeType, User
+from app.money import TotalsBatch, compute_totals, to_cents, to_hundredths
+
+
+def test_to_cents_rounds_half_up():
+    """Test conversion of two-decimal amounts to integers."""
+    assert to_cents(Decimal("12.50")) == 1250
+    assert to_cents(0.29) == 29
+    assert to_hundredths("0.005") == 1
+
+
+def test_compute_totals_batch():
+    """Test totals for several invoices computed in one pass."""
+    batch = TotalsBatch()
+    first = batch.add_invoice(825)  # 8.25%
+    second = batch.add_invoice(0)
+    batch.add_line(first, 100, 150000, "labor")
+    batch.add_line(second, 150, 33, "parts")  # 1.5 x $0.33 = $0.495
+    batch.add_line(first, 100, 80000, "parts")
+    batch.add_line(first, 1000, 1250, "parts")
+
+    first_totals, second_totals = compute_totals(batch)
+
+    assert first_totals.subtotal == 242500
+    assert first_totals.tax_amount == 20006
+    assert first_totals.total == 262506
+    assert first_totals.by_category == {"parts": 92500, "labor": 150000}
+    assert second_totals.subtotal == 50
+    assert second_totals.total == 50
+    assert second_totals.by_category == {"parts": 50}
+
+
+def test_total_is_sum_of_rounded_figures():
+    """Test that the total adds up the subtotal and tax as shown."""
+    batch = TotalsBatch()
+    invoice = batch.add_invoice(1000)  # 10%
+    batch.add_line(invoice, 150, 33, "parts")  # $0.495, tax $0.0495
+
+    (totals,) = compute_totals(batch)
+
+    assert totals.subtotal == 50
+    assert totals.tax_amount == 5
+    assert totals.total == 55  # not $0.5445 rounded to 54
+
+
+def test_cents_columns_maintained_by_database(test_db):
+    """Test that the integer mirrors are filled in on insert."""
+    user = User(email="cents@example.com", hashed_password="x")
+    test_db.add(user)
+    test_db.flush()
+    invoice = Invoice(
+        user_id=user.id,
+        client_name="Client",
+        client_email="client@example.com",
+        job_address="1 Main St",
+        trade_type=TradeType.PLUMBING,
+        tax_rate=Decimal("8.25"),
+    )
+    invoice.line_items.append(
+        LineItem(
+            description="Elbow",
+            quantity=Decimal("1.50"),
+            unit_price=Decimal("0.29"),
+            category=LineItemCategory.PARTS,
+        )
+    )
+    test_db.add(invoice)
+    test_db.commit()
+    test_db.refresh(invoice)
+
+    assert invoice.tax_rate_bps == 825
+    assert invoice.line_items[0].quantity_hundredths == 150
+    assert invoice.line_items[0].unit_price_cents == 29
@@ -0,0 +1,127 @@
+"""Tests that need PostgreSQL with the schema built by the migrations.
+
+The SQLite test database is created from the models, so it can't catch a
+migration that disagrees with them, and the COPY import path is Postgres-only.
+Skipped unless ``TEST_POSTGRES_URL`` points at a scratch database; its public
+schema is dropped and rebuilt with ``alembic upgrade head``:
+
+    TEST_POSTGRES_URL=postgresql+psycopg2://localhost/tradebill_test pytest tests/test_postgres.py
+"""
+
+import io
+import os
+import subprocess
+import sys
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+from app.core.config import settings
+from app.models import Invoice, User
+from app.models.invoice import InvoiceStatus, TradeType
+from app.models.invoice_reminder import InvoiceReminder
+from app.models.line_item import LineItem, LineItemCategory
+from app.services import reminders
+from app.services.invoice_import import InvoiceImporter
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.orm import Session
+
+POSTGRES_URL = os.environ.get("TEST_POSTGRES_URL")
+
+pytestmark = pytest.mark.skipif(not POSTGRES_URL, reason="TEST_POSTGRES_URL is not set")
+
+
+@pytest.fixture(scope="module")
+def pg_engine():
+    """A Postgres database migrated to head."""
+    engine = create_engine(POSTGRES_URL)
+    with engine.begin() as conn:
+        conn.execute(text("DROP SCHEMA public CASCADE"))
+        conn.execute(text("CREATE SCHEMA public"))
+    subprocess.run(
+        [sys.executable, "-m", "alembic", "upgrade", "head"],
+        cwd=Path(__file__).resolve().parents[1],
+        env={**os.environ, "DATABASE_URL": POSTGRES_URL},
+        check=True,
+    )
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def pg_db(pg_engine):
+    db = Session(pg_engine)
+    try:
+        yield db
+    finally:
+        db.rollback()
+        db.close()
+
+
+def test_import_copy_path_on_migrated_schema(pg_db):
+    """Test that the COPY import writes labels the migrated enum types accept."""
+    user = User(email="import@example.com", hashed_password="x")
+    pg_db.add(user)
+    pg_db.flush()
+
+    csv_text = (
+        "invoice_ref,client_name,client_email,job_address,trade_type,tax_rate,status,"
+        "created_at,description,quantity,unit_price,category\n"
+        "A1,Ann Lee,ann@example.com,1 Oak St,plumbing,8.25,sent,2024-03-05T10:00:00,Heater,1,1500,labor\n"
+        "A1,Ann Lee,ann@example.com,1 Oak St,plumbing,8.25,sent,2024-03-05T10:00:00,Pipe,10,12.50,parts\n"
+        "B2,Bob Ray,bob@example.com,2 Elm St,hvac,0,,,Filter,2,15,parts\n"
+    )
+    progress = InvoiceImporter(pg_db, user.id).run(io.StringIO(csv_text))
+    assert progress.invoices_imported == 2
+
+    rows = pg_db.execute(
+        select(Invoice.client_name, Invoice.trade_type, Invoice.status, Invoice.due_date)
+        .where(Invoice.user_id == user.id)
+        .order_by(Invoice.client_name)
+    ).all()
+    due = date(2024, 3, 5) + timedelta(days=settings.INVOICE_PAYMENT_TERMS_DAYS)
+    assert rows == [
+        ("Ann Lee", TradeType.PLUMBING, InvoiceStatus.SENT, due),
+        ("Bob Ray", TradeType.HVAC, InvoiceStatus.DRAFT, None),
+    ]
+    categories = (
+        pg_db.execute(
+            select(LineItem.category)
+            .join(Invoice)
+            .where(Invoice.user_id == user.id)
+            .order_by(LineItem.description)
+        )
+        .scalars()
+        .all()
+    )
+    assert categories == [LineItemCategory.PARTS, LineItemCategory.LABOR, LineItemCategory.PARTS]
+
+
+def test_reminder_scan_on_migrated_schema(pg_db):
+    """Test that the overdue scan runs against the partial due-date index."""
+    user = User(email="reminders@example.com", hashed_password="x")
+    pg_db.add(user)
+    pg_db.flush()
+    today = date(2026, 10, 19)
+    pg_db.add(
+        Invoice(
+            user_id=user.id,
+            client_name="Ann Lee",
+            client_email="ann@example.com",
+            job_address="1 Oak St",
+            trade_type=TradeType.PLUMBING,
+            tax_rate=0,
+            status=InvoiceStatus.SENT,
+            due_date=today - timedelta(days=1),
+        )
+    )
+    pg_db.flush()
+
+    queued, _ = reminders.enqueue_due(pg_db, today, datetime.now(timezone.utc), batch_size=100)
+    assert queued == 1
+    assert pg_db.query(InvoiceReminder).filter_by(user_id=user.id).count() == 1
+
+    indexdef = pg_db.execute(
+        text("SELECT indexdef FROM pg_indexes WHERE indexname = 'ix_invoices_due_date_sent'")
+    ).scalar_one()
+    assert "'sent'::invoicestatus" in indexdef
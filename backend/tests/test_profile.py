@@ -1,5 +1,5 @@
 """Tests for business profile API."""
-import pytest
+
 from fastapi.testclient import TestClient
 
 
@@ -37,6 +37,21 @@ def test_get_profile(client: TestClient, test_user, business_profile, auth_token
     assert data["license_number"] == "TPC-12345"
 
 
+def test_get_profile_not_modified(client: TestClient, test_user, business_profile, auth_token):
+    """Test that a current ETag gets a 304 and an edit changes it."""
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    etag = client.get("/profile", headers=headers).headers["etag"]
+
+    cached = client.get("/profile", headers={**headers, "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["cache-control"] == "private, no-cache"
+
+    client.put("/profile", json={"phone": "555-000-0000"}, headers=headers)
+    changed = client.get("/profile", headers={**headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["phone"] == "555-000-0000"
+
+
 def test_get_profile_not_found(client: TestClient, test_user, auth_token):
     """Test getting a profile that doesn't exist."""
     response = client.get(
@@ -94,3 +109,136 @@ def test_unauthorized_profile_access(client: TestClient):
     """Test accessing profile without authentication."""
     response = client.get("/profile")
     assert response.status_code == 401
+
+
+def test_update_profile_invalidates_render_cache(
+    client: TestClient, test_db, test_user, business_profile, auth_token
+):
+    """Test that profile edits are picked up by the cached render context."""
+    from app.services.profile_cache import profile_cache
+
+    cached = profile_cache.get(test_db, test_user.id)
+    assert cached.business_name == "Test Plumbing Co"
+    assert profile_cache.get(test_db, test_user.id) is cached
+
+    response = client.put(
+        "/profile",
+        json={"business_name": "Renamed Plumbing Co", "phone": None},
+        headers={"Authorization": f"Bearer {auth_token}"},
+    )
+    assert response.status_code == 200
+
+    refreshed = profile_cache.get(test_db, test_user.id)
+    assert refreshed.business_name == "Renamed Plumbing Co"
+    assert refreshed.template_fields["business_phone"] == ""
+    assert refreshed.pdf_filename(7) == "invoice_7_Renamed_Plumbing_Co.pdf"
+
+
+def test_render_cache_sees_edits_from_other_workers(test_db, test_user, business_profile):
+    """Test that a cached profile edited elsewhere is reloaded on the next read."""
+    from datetime import datetime, timedelta, timezone
+
+    from app.services.profile_cache import ProfileCache
+
+    cache = ProfileCache(ttl_seconds=300, max_entries=10)
+    assert cache.get(test_db, test_user.id).business_name == "Test Plumbing Co"
+
+    # Another worker's edit: the row changes but this process isn't told
+    business_profile.business_name = "Elsewhere Plumbing Co"
+    business_profile.updated_at = datetime.now(timezone.utc) + timedelta(seconds=1)
+    test_db.commit()
+
+    assert cache.get(test_db, test_user.id).business_name == "Elsewhere Plumbing Co"
+
+
+def test_render_cache_is_bounded_and_invalidation_wins(test_db, test_user, business_profile):
+    """Test the render cache's LRU bound and that a racing load isn't stored."""
+    from app.models import BusinessProfile, User
+    from app.services.profile_cache import ProfileCache
+    from sqlalchemy import event
+
+    other = User(email="other@example.com", hashed_password="x")
+    test_db.add(other)
+    test_db.flush()
+    test_db.add(BusinessProfile(user_id=other.id, business_name="Other Co"))
+    test_db.commit()
+
+    cache = ProfileCache(ttl_seconds=300, max_entries=1)
+    assert cache.get(test_db, test_user.id) is not None
+    assert cache.get(test_db, other.id) is not None
+    assert list(cache._entries) == [other.id]
+
+    cache.clear()
+
+    # The profile is edited (and invalidated) while the cache is loading it
+    def invalidate_mid_load(state):
+        cache.invalidate(test_user.id)
+
+    event.listen(test_db, "do_orm_execute", invalidate_mid_load)
+    try:
+        assert cache.get(test_db, test_user.id) is not None
+    finally:
+        event.remove(test_db, "do_orm_execute", invalidate_mid_load)
+    assert test_user.id not in cache._entries
+
+
+def _image_bytes(size, mode="RGB", fmt="JPEG") -> bytes:
+    import io
+
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.new(mode, size, "navy").save(buffer, fmt)
+    return buffer.getvalue()
+
+
+def test_upload_logo_stores_resized_variant(
+    client: TestClient, test_user, business_profile, auth_token
+):
+    """Test that an uploaded photo is downscaled once before storage."""
+    import io
+    from unittest.mock import patch
+
+    from PIL import Image
+
+    with patch("app.api.profile.r2_storage.upload_logo", return_value="logos/1/abc.jpg") as upload:
+        response = client.post(
+            "/profile/logo",
+            files={"file": ("logo.jpg", _image_bytes((4000, 3000)), "image/jpeg")},
+            headers={"Authorization": f"Bearer {auth_token}"},
+        )
+
+    assert response.status_code == 200
+    assert response.json()["logo_key"] == "logos/1/abc.jpg"
+
+    stored_bytes, user_id, extension, content_type = upload.call_args.args
+    assert (user_id, extension, content_type) == (test_user.id, "jpg", "image/jpeg")
+    with Image.open(io.BytesIO(stored_bytes)) as stored:
+        assert stored.width <= 600 and stored.height <= 200
+
+
+def test_upload_logo_keeps_transparency_as_png(
+    client: TestClient, test_user, business_profile, auth_token
+):
+    """Test that logos with an alpha channel are stored as PNG."""
+    from unittest.mock import patch
+
+    with patch("app.api.profile.r2_storage.upload_logo", return_value="logos/1/abc.png") as upload:
+        response = client.post(
+            "/profile/logo",
+            files={"file": ("logo.png", _image_bytes((800, 800), "RGBA", "PNG"), "image/png")},
+            headers={"Authorization": f"Bearer {auth_token}"},
+        )
+
+    assert response.status_code == 200
+    assert upload.call_args.args[2:] == ("png", "image/png")
+
+
+def test_upload_logo_rejects_non_image(client: TestClient, test_user, business_profile, auth_token):
+    """Test that a file that isn't an image is rejected."""
+    response = client.post(
+        "/profile/logo",
+        files={"file": ("logo.jpg", b"not an image", "image/jpeg")},
+        headers={"Authorization": f"Bearer {auth_token}"},
+    )
+    assert response.status_code == 400
@@ -0,0 +1,131 @@
+"""Tests for recurring invoices."""
+
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from app.models.client import Client
+from app.models.invoice import Invoice, InvoiceStatus
+from app.models.recurring_invoice import QueuedSend, RecurringInvoice
+from app.services import recurring, send_queue
+from fastapi import status
+
+INVOICE = {
+    "client_name": "Maintenance Client",
+    "client_email": "maintenance@example.com",
+    "job_address": "9 Boiler Ln",
+    "trade_type": "hvac",
+    "tax_rate": 5,
+    "line_items": [
+        {"description": "Monthly service", "quantity": 1, "unit_price": 80.00, "category": "labor"},
+        {"description": "Filter", "quantity": 2, "unit_price": 12.50, "category": "parts"},
+    ],
+}
+
+
+def _schedule(client, headers, **overrides):
+    template_id = client.post("/invoices", json=INVOICE, headers=headers).json()["id"]
+    data = {
+        "template_invoice_id": template_id,
+        "frequency": "monthly",
+        "next_run_at": "2026-01-31T09:00:00Z",
+        **overrides,
+    }
+    response = client.post("/recurring-invoices", json=data, headers=headers)
+    assert response.status_code == status.HTTP_201_CREATED
+    return response.json()
+
+
+def test_create_and_list(client, auth_headers):
+    """Test scheduling an invoice, and that its template can't be deleted."""
+    schedule = _schedule(client, auth_headers)
+    assert schedule["active"] is True
+    assert schedule["last_invoice_id"] is None
+
+    listed = client.get("/recurring-invoices", headers=auth_headers).json()
+    assert [row["id"] for row in listed] == [schedule["id"]]
+
+    response = client.delete(f"/invoices/{schedule['template_invoice_id']}", headers=auth_headers)
+    assert response.status_code == status.HTTP_409_CONFLICT
+
+    response = client.delete(f"/recurring-invoices/{schedule['id']}", headers=auth_headers)
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    response = client.delete(f"/invoices/{schedule['template_invoice_id']}", headers=auth_headers)
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+
+def test_issue_due(client, test_db, auth_headers):
+    """Test that due schedules issue copies and move on, keeping to the day of the month."""
+    schedule = _schedule(client, auth_headers)
+    paused = _schedule(client, auth_headers)
+    client.put(
+        f"/recurring-invoices/{paused['id']}",
+        json={**paused, "active": False},
+        headers=auth_headers,
+    )
+    now = datetime(2026, 3, 5, tzinfo=timezone.utc)
+    linked_at = test_db.query(Client.last_invoiced_at).scalar()
+
+    # Two months behind: one invoice per pass until it has caught up
+    assert recurring.issue_due(test_db, now, batch_size=10) == 1
+    test_db.commit()
+    assert recurring.issue_due(test_db, now, batch_size=10) == 1
+    test_db.commit()
+    assert recurring.issue_due(test_db, now, batch_size=10) == 0
+
+    definition = test_db.get(RecurringInvoice, schedule["id"])
+    test_db.refresh(definition)
+    assert (definition.next_run_at.month, definition.next_run_at.day) == (3, 31)
+    issued = client.get(f"/invoices/{definition.last_invoice_id}", headers=auth_headers).json()
+    assert issued["status"] == "draft"
+    assert issued["client_name"] == "Maintenance Client"
+    assert [line["description"] for line in issued["line_items"]] == ["Monthly service", "Filter"]
+    assert issued["totals"]["total"] == 110.25
+    assert len(client.get("/invoices", headers=auth_headers).json()) == 4
+    assert test_db.query(QueuedSend).count() == 0
+    assert test_db.query(Client.last_invoiced_at).scalar() > linked_at
+
+
+def test_next_occurrence():
+    """Test month-end clamping and the other frequencies."""
+    jan = datetime(2026, 1, 31, 9)
+    feb = recurring.next_occurrence(jan, "monthly", 31)
+    assert feb == datetime(2026, 2, 28, 9)
+    assert recurring.next_occurrence(feb, "monthly", 31) == datetime(2026, 3, 31, 9)
+    assert recurring.next_occurrence(jan, "quarterly", 31) == datetime(2026, 4, 30, 9)
+    assert recurring.next_occurrence(jan, "yearly", 31) == datetime(2027, 1, 31, 9)
+    assert recurring.next_occurrence(jan, "weekly", 31) == datetime(2026, 2, 7, 9)
+
+
+def test_queued_send(client, test_db, business_profile, auth_token):
+    """Test that auto-send schedules queue their invoices, and failed sends are retried."""
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    _schedule(client, headers, auto_send=True)
+    now = datetime(2026, 2, 1, tzinfo=timezone.utc)
+    recurring.issue_due(test_db, now, batch_size=10)
+    test_db.commit()
+    queued = test_db.query(QueuedSend).one()
+    invoice_id = queued.invoice_id
+
+    with patch("app.api.invoices.pdf_generator.generate_pdf", side_effect=RuntimeError("no fonts")):
+        result = send_queue.send_due(test_db, now, batch_size=10)
+    assert (result.sent, result.failed) == (0, 1)
+    test_db.refresh(queued)
+    assert queued.attempts == 1
+    assert queued.last_error
+
+    # Backed off, so not taken again straight away
+    assert send_queue.send_due(test_db, now, batch_size=10).failed == 0
+
+    later = datetime(2026, 2, 1, 0, 5, tzinfo=timezone.utc)
+    with (
+        patch("app.api.invoices.pdf_generator.generate_pdf", return_value=b"%PDF"),
+        patch("app.api.invoices.r2_storage.upload_pdf", return_value="key"),
+        patch("app.api.invoices.r2_storage.get_public_url", return_value="https://cdn/x.pdf"),
+        patch("app.api.invoices.email_service.send_invoice_email", return_value=True),
+    ):
+        result = send_queue.send_due(test_db, later, batch_size=10)
+    assert result.sent == 1
+    assert test_db.query(QueuedSend).count() == 0
+    invoice = test_db.get(Invoice, invoice_id)
+    test_db.refresh(invoice)
+    assert invoice.status == InvoiceStatus.SENT
@@ -0,0 +1,117 @@
+"""Tests for invoice due dates and payment reminders."""
+
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import patch
+
+from app.models.invoice_reminder import InvoiceReminder
+from app.services import reminders
+from fastapi import status
+
+TODAY = date(2026, 10, 19)
+NOW = datetime(2026, 10, 19, 9, tzinfo=timezone.utc)
+
+
+def _sent_invoice(client, headers, days_overdue):
+    data = {
+        "client_name": f"Client {days_overdue}",
+        "client_email": f"client{days_overdue}@example.com",
+        "job_address": "5 Late St",
+        "trade_type": "electrical",
+        "tax_rate": 0,
+        "due_date": str(TODAY - timedelta(days=days_overdue)),
+        "line_items": [
+            {
+                "description": "Panel upgrade",
+                "quantity": 1,
+                "unit_price": 1200.00,
+                "category": "labor",
+            },
+        ],
+    }
+    invoice_id = client.post("/invoices", json=data, headers=headers).json()["id"]
+    client.patch(f"/invoices/{invoice_id}/status", json={"status": "sent"}, headers=headers)
+    return invoice_id
+
+
+def test_due_date_set_when_sent(client, auth_headers):
+    """Test that an invoice sent without a due date gets one from the payment terms."""
+    data = {
+        "client_name": "Prompt Payer",
+        "client_email": "prompt@example.com",
+        "job_address": "1 Quick St",
+        "trade_type": "plumbing",
+        "tax_rate": 0,
+        "line_items": [
+            {"description": "Tap washer", "quantity": 1, "unit_price": 5.00, "category": "parts"},
+        ],
+    }
+    invoice = client.post("/invoices", json=data, headers=auth_headers).json()
+    assert invoice["due_date"] is None
+
+    response = client.patch(
+        "/invoices/status", json={"ids": [invoice["id"]], "status": "sent"}, headers=auth_headers
+    )
+    assert response.json()["updated"] == [invoice["id"]]
+
+    invoice = client.get(f"/invoices/{invoice['id']}", headers=auth_headers).json()
+    expected = datetime.now(timezone.utc).date() + timedelta(days=30)
+    assert invoice["due_date"] == str(expected)
+    listed = client.get("/invoices", headers=auth_headers).json()
+    assert listed[0]["due_date"] == str(expected)
+
+
+def test_enqueue_due(client, test_db, auth_headers):
+    """Test that overdue invoices are queued once per stage, and others are left alone."""
+    not_yet = _sent_invoice(client, auth_headers, 0)
+    first = _sent_invoice(client, auth_headers, 3)
+    second = _sent_invoice(client, auth_headers, 8)
+    last = _sent_invoice(client, auth_headers, 33)
+    _sent_invoice(client, auth_headers, 60)  # Past the window
+    paid = _sent_invoice(client, auth_headers, 3)
+    client.patch(f"/invoices/{paid}/status", json={"status": "paid"}, headers=auth_headers)
+
+    queued, position = reminders.enqueue_due(test_db, TODAY, NOW, batch_size=2)
+    assert queued == 2
+    queued, position = reminders.enqueue_due(test_db, TODAY, NOW, batch_size=2, after=position)
+    assert queued == 1
+    assert reminders.enqueue_due(test_db, TODAY, NOW, batch_size=2, after=position) == (0, None)
+    test_db.commit()
+
+    stages = {row.invoice_id: row.stage for row in test_db.query(InvoiceReminder)}
+    assert stages == {first: 1, second: 2, last: 4}
+    assert not_yet not in stages
+
+    # Scanning again queues nothing new
+    assert reminders.enqueue_due(test_db, TODAY, NOW, batch_size=10)[0] == 0
+
+
+def test_deliver_due(client, test_db, business_profile, auth_token):
+    """Test that queued reminders are emailed, skipping invoices paid since."""
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    overdue = _sent_invoice(client, headers, 8)
+    paid = _sent_invoice(client, headers, 8)
+    reminders.enqueue_due(test_db, TODAY, NOW, batch_size=10)
+    test_db.commit()
+    client.patch(f"/invoices/{paid}/status", json={"status": "paid"}, headers=headers)
+
+    with patch("app.services.reminders.email_service.send_payment_reminder") as send:
+        send.side_effect = RuntimeError("mail is down")
+        result = reminders.deliver_due(test_db, NOW, batch_size=10)
+        assert (result.sent, result.failed, result.dropped) == (0, 1, 1)
+
+        send.side_effect = None
+        send.return_value = "email-id"
+        result = reminders.deliver_due(test_db, NOW + timedelta(minutes=5), batch_size=10)
+
+    assert result.sent == 1
+    assert send.call_args.kwargs["to_email"] == "client8@example.com"
+    assert send.call_args.kwargs["days_overdue"] == 8
+    assert send.call_args.kwargs["total"] == 1200.00
+
+    history = client.get(f"/invoices/{overdue}/reminders", headers=headers).json()
+    assert [(row["stage"], row["attempts"]) for row in history] == [(2, 2)]
+    assert history[0]["sent_at"] is not None
+    assert client.get(f"/invoices/{paid}/reminders", headers=headers).json() == []
+
+    response = client.get("/invoices/999/reminders", headers=headers)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
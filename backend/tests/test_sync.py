@@ -0,0 +1,141 @@
+"""Tests for the offline sync API."""
+
+from fastapi import status
+
+INVOICE = {
+    "client_name": "Basement Client",
+    "client_email": "basement@example.com",
+    "job_address": "1 Cellar Rd",
+    "trade_type": "plumbing",
+    "tax_rate": 0,
+    "line_items": [
+        {"description": "Sump pump", "quantity": 1, "unit_price": 300.00, "category": "parts"},
+    ],
+}
+
+
+def _queue():
+    """A create, an edit of the new invoice, and a status change, as queued offline."""
+    return [
+        {"op": "create_invoice", "client_id": "c1", "idempotency_key": "k1", "data": INVOICE},
+        {
+            "op": "update_invoice",
+            "client_id": "c2",
+            "idempotency_key": "k2",
+            "invoice_client_id": "c1",
+            "data": {**INVOICE, "client_name": "Renamed Client", "version": 1},
+        },
+        {
+            "op": "update_status",
+            "client_id": "c3",
+            "idempotency_key": "k3",
+            "invoice_client_id": "c1",
+            "status": "sent",
+        },
+    ]
+
+
+def test_apply_mutations(client, auth_headers):
+    """Test that a queue applies in order, with results by client id."""
+    response = client.post("/sync/mutations", json={"mutations": _queue()}, headers=auth_headers)
+
+    assert response.status_code == status.HTTP_200_OK
+    results = response.json()["results"]
+    assert [result["client_id"] for result in results] == ["c1", "c2", "c3"]
+    assert [result["outcome"] for result in results] == ["applied"] * 3
+    assert [result["status_code"] for result in results] == [201, 200, 200]
+    invoice_id = results[0]["invoice_id"]
+    assert {result["invoice_id"] for result in results} == {invoice_id}
+    assert results[2]["version"] == 3
+
+    invoice = client.get(f"/invoices/{invoice_id}", headers=auth_headers).json()
+    assert invoice["client_name"] == "Renamed Client"
+    assert invoice["status"] == "sent"
+
+
+def test_replayed_mutations(client, auth_headers):
+    """Test that resending a batch returns the stored results without applying twice."""
+    first = client.post(
+        "/sync/mutations", json={"mutations": _queue()}, headers=auth_headers
+    ).json()
+
+    again = client.post(
+        "/sync/mutations", json={"mutations": _queue()}, headers=auth_headers
+    ).json()
+
+    assert [result["outcome"] for result in again["results"]] == ["replayed"] * 3
+    assert again["results"][0]["invoice_id"] == first["results"][0]["invoice_id"]
+    assert len(client.get("/invoices", headers=auth_headers).json()) == 1
+
+
+def test_failed_mutations_are_isolated(client, auth_headers):
+    """Test that a failing operation is rolled back alone and reported."""
+    queue = _queue()
+    queue[1]["data"]["version"] = 7  # Stale
+    queue.insert(0, {"op": "delete_everything", "client_id": "c0", "idempotency_key": "k0"})
+    queue.append(
+        {
+            "op": "update_status",
+            "client_id": "c4",
+            "idempotency_key": "k4",
+            "invoice_client_id": "missing",
+            "status": "paid",
+        }
+    )
+    queue.append({**queue[2], "client_id": "c5", "idempotency_key": "k2", "data": INVOICE})
+
+    response = client.post("/sync/mutations", json={"mutations": queue}, headers=auth_headers)
+
+    results = {result["client_id"]: result for result in response.json()["results"]}
+    assert results["c0"]["status_code"] == 422
+    assert results["c1"]["outcome"] == "applied"
+    assert results["c2"]["outcome"] == "failed"
+    assert results["c2"]["status_code"] == 409
+    assert results["c3"]["outcome"] == "applied"
+    assert results["c4"]["status_code"] == 424
+    # The failed operation's key was not used up, so it can be sent again
+    assert results["c5"]["outcome"] == "applied"
+
+    invoice = client.get(f"/invoices/{results['c1']['invoice_id']}", headers=auth_headers).json()
+    assert invoice["client_name"] == "Basement Client"
+    assert invoice["status"] == "sent"
+
+
+def test_reused_key_for_other_operation(client, auth_headers):
+    """Test that an idempotency key can't be reused for a different operation."""
+    client.post("/sync/mutations", json={"mutations": _queue()[:1]}, headers=auth_headers)
+    other = {**_queue()[0], "data": {**INVOICE, "client_name": "Someone Else"}}
+
+    response = client.post("/sync/mutations", json={"mutations": [other]}, headers=auth_headers)
+
+    result = response.json()["results"][0]
+    assert result["outcome"] == "failed"
+    assert result["status_code"] == 422
+
+
+def test_mutation_keys_share_the_idempotency_store(client, auth_headers, test_db):
+    """Test that sync keys are cached after commit and expire with the store's TTL."""
+    from datetime import datetime, timedelta, timezone
+
+    from app.models.idempotency_key import IdempotencyKey
+    from app.services.idempotency import idempotency_store
+
+    queue = _queue()
+    queue[1]["data"]["version"] = 7  # Stale, so it fails
+    client.post("/sync/mutations", json={"mutations": queue}, headers=auth_headers)
+
+    user_id = test_db.query(IdempotencyKey.user_id).first()[0]
+    assert idempotency_store._cached((user_id, "k1")) is not None
+    assert idempotency_store._cached((user_id, "k2")) is None
+
+    # Past the TTL a key no longer replays; the operation applies again
+    idempotency_store.clear()
+    expired = datetime.now(timezone.utc) - timedelta(seconds=idempotency_store.ttl_seconds + 1)
+    test_db.query(IdempotencyKey).update({IdempotencyKey.created_at: expired})
+    test_db.commit()
+
+    response = client.post(
+        "/sync/mutations", json={"mutations": _queue()[:1]}, headers=auth_headers
+    )
+    assert response.json()["results"][0]["outcome"] == "applied"
+    assert len(client.get("/invoices", headers=auth_headers).json()) == 2
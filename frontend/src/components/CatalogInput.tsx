@@ -0,0 +1,70 @@
+import { useEffect, useId, useState } from 'react';
+import { catalogApi, CatalogSuggestion, LineItemCategory } from '../lib/api';
+
+interface CatalogInputProps {
+  value: string;
+  category: LineItemCategory;
+  placeholder: string;
+  onChange: (value: string) => void;
+  onPick: (suggestion: CatalogSuggestion) => void;
+}
+
+// Line item description input that suggests saved parts and labor rates
+export default function CatalogInput({
+  value,
+  category,
+  placeholder,
+  onChange,
+  onPick,
+}: CatalogInputProps) {
+  const listId = useId();
+  const [suggestions, setSuggestions] = useState<CatalogSuggestion[]>([]);
+
+  useEffect(() => {
+    const prefix = value.trimStart();
+    if (!prefix) {
+      setSuggestions([]);
+      return;
+    }
+    // Ignore answers to keystrokes that have since been superseded
+    let current = true;
+    catalogApi
+      .suggest(prefix, category)
+      .then((response) => {
+        if (current) setSuggestions(response.data);
+      })
+      .catch(() => {
+        // Suggestions are a convenience; typing carries on without them
+      });
+    return () => {
+      current = false;
+    };
+  }, [value, category]);
+
+  const handleChange = (text: string) => {
+    const picked = suggestions.find((suggestion) => suggestion.description === text);
+    if (picked) {
+      onPick(picked);
+    } else {
+      onChange(text);
+    }
+  };
+
+  return (
+    <>
+      <input
+        type="text"
+        list={listId}
+        value={value}
+        onChange={(e) => handleChange(e.target.value)}
+        placeholder={placeholder}
+        className="w-full px-2 py-1.5 text-sm border border-gray-300 rounded"
+      />
+      <datalist id={listId}>
+        {suggestions.map((suggestion) => (
+          <option key={suggestion.id} value={suggestion.description} />
+        ))}
+      </datalist>
+    </>
+  );
+}
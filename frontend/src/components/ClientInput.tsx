@@ -0,0 +1,65 @@
+import { useEffect, useId, useState } from 'react';
+import { clientApi, Client } from '../lib/api';
+
+interface ClientInputProps {
+  value: string;
+  onChange: (value: string) => void;
+  onPick: (client: Client) => void;
+}
+
+// A client can have several job addresses, so each option names both
+const optionLabel = (client: Client) => `${client.name} · ${client.address}`;
+
+// Client name input that suggests clients from earlier invoices
+export default function ClientInput({ value, onChange, onPick }: ClientInputProps) {
+  const listId = useId();
+  const [suggestions, setSuggestions] = useState<Client[]>([]);
+
+  useEffect(() => {
+    const prefix = value.trim();
+    if (!prefix) {
+      setSuggestions([]);
+      return;
+    }
+    // Ignore answers to keystrokes that have since been superseded
+    let current = true;
+    clientApi
+      .list(prefix)
+      .then((response) => {
+        if (current) setSuggestions(response.data);
+      })
+      .catch(() => {
+        // Suggestions are a convenience; typing carries on without them
+      });
+    return () => {
+      current = false;
+    };
+  }, [value]);
+
+  const handleChange = (text: string) => {
+    const picked = suggestions.find((client) => optionLabel(client) === text);
+    if (picked) {
+      onPick(picked);
+    } else {
+      onChange(text);
+    }
+  };
+
+  return (
+    <>
+      <input
+        type="text"
+        list={listId}
+        value={value}
+        onChange={(e) => handleChange(e.target.value)}
+        className="w-full px-3 py-2 border border-gray-300 rounded-md focus:outline-none focus:ring-2 focus:ring-blue-500"
+        placeholder="John Smith"
+      />
+      <datalist id={listId}>
+        {suggestions.map((client) => (
+          <option key={client.id} value={optionLabel(client)} />
+        ))}
+      </datalist>
+    </>
+  );
+}
@@ -21,12 +21,58 @@ api.interceptors.request.use(
   (error) => Promise.reject(error)
 );
 
+export interface TokenResponse {
+  access_token: string;
+  token_type: string;
+  expires_in?: number;
+  refresh_token?: string;
+}
+
+// Access tokens are short-lived; share one refresh call between concurrent 401s
+let refreshPromise: Promise<string> | null = null;
+
+const refreshAccessToken = (): Promise<string> => {
+  if (!refreshPromise) {
+    const refreshToken = localStorage.getItem('refresh_token');
+    refreshPromise = (
+      refreshToken
+        ? axios
+            .post<TokenResponse>(`${API_BASE_URL}/auth/refresh`, { refresh_token: refreshToken })
+            .then((response) => {
+              const { access_token, refresh_token } = response.data;
+              localStorage.setItem('token', access_token);
+              if (refresh_token) {
+                localStorage.setItem('refresh_token', refresh_token);
+              }
+              return access_token;
+            })
+        : Promise.reject(new Error('No refresh token'))
+    ).finally(() => {
+      refreshPromise = null;
+    });
+  }
+  return refreshPromise;
+};
+
 // Handle auth errors
 api.interceptors.response.use(
   (response) => response,
-  (error: AxiosError) => {
-    if (error.response?.status === 401) {
+  async (error: AxiosError) => {
+    const original = error.config as (typeof error.config & { _retried?: boolean }) | undefined;
+    const isAuthRequest = original?.url?.startsWith('/auth/');
+    if (error.response?.status === 401 && original && !original._retried && !isAuthRequest) {
+      original._retried = true;
+      try {
+        const token = await refreshAccessToken();
+        original.headers.Authorization = `Bearer ${token}`;
+        return api(original);
+      } catch {
+        // Fall through to a fresh login
+      }
+    }
+    if (error.response?.status === 401 && !isAuthRequest) {
       localStorage.removeItem('token');
+      localStorage.removeItem('refresh_token');
       window.location.href = '/login';
     }
     return Promise.reject(error);
@@ -47,6 +93,7 @@ export interface BusinessProfile {
   phone?: string;
   email?: string;
   license_number?: string;
+  logo_key?: string;
   created_at: string;
   updated_at?: string;
 }
@@ -64,6 +111,22 @@ export interface LineItem {
   line_total: number;
 }
 
+export interface CatalogSuggestion {
+  id: number;
+  description: string;
+  unit_price: number;
+  category: LineItemCategory;
+}
+
+export interface Client {
+  id: number;
+  name: string;
+  email: string;
+  address: string;
+  last_invoiced_at?: string;
+  created_at?: string;
+}
+
 export interface LineItemSummary {
   category: string;
   total: number;
@@ -79,13 +142,16 @@ export interface InvoiceTotals {
 export interface Invoice {
   id: number;
   user_id: number;
+  client_id?: number | null;
   client_name: string;
   client_email: string;
   job_address: string;
   trade_type: TradeType;
   tax_rate: number;
+  due_date?: string | null;
   status: InvoiceStatus;
   pdf_url?: string;
+  version: number;
   created_at: string;
   updated_at?: string;
   line_items: LineItem[];
@@ -99,19 +165,57 @@ export interface InvoiceListItem {
   trade_type: TradeType;
   status: InvoiceStatus;
   total: number;
+  due_date?: string | null;
   created_at: string;
 }
 
+export interface InvoiceChanges {
+  token: number;
+  invoices: InvoiceListItem[];
+  deleted: number[];
+}
+
+export type InvoiceSort =
+  | '-created_at'
+  | 'created_at'
+  | '-total'
+  | 'total'
+  | 'client_name'
+  | '-client_name';
+
+export interface InvoiceListFilters {
+  status?: InvoiceStatus;
+  trade_type?: TradeType;
+  created_from?: string;
+  created_to?: string;
+  min_total?: number;
+  max_total?: number;
+  sort?: InvoiceSort;
+}
+
+export interface InvoiceStats {
+  count: number;
+  total: number;
+  by_status: Array<{ status: InvoiceStatus; count: number; total: number }>;
+  by_trade: Array<{ trade_type: TradeType; count: number; total: number }>;
+  by_month: Array<{ month: string; count: number; total: number }>;
+}
+
 // Auth API
 export const authApi = {
   register: (email: string, password: string) =>
     api.post<User>('/auth/register', { email, password }),
   
   login: (email: string, password: string) =>
-    api.post<{ access_token: string; token_type: string }>('/auth/login', 
+    api.post<TokenResponse>('/auth/login', 
       new URLSearchParams({ username: email, password }),
       { headers: { 'Content-Type': 'application/x-www-form-urlencoded' } }
     ),
+
+  logout: (accessToken: string, refreshToken: string | null) =>
+    api.post('/auth/logout', refreshToken ? { refresh_token: refreshToken } : undefined, {
+      headers: { Authorization: `Bearer ${accessToken}` },
+    }),
 };
 
 // Profile API
@@ -121,11 +225,25 @@ export const profileApi = {
     api.post<BusinessProfile>('/profile', data),
   update: (data: Partial<Omit<BusinessProfile, 'id' | 'user_id' | 'created_at' | 'updated_at'>>) =>
     api.put<BusinessProfile>('/profile', data),
+  uploadLogo: (file: File) => {
+    const form = new FormData();
+    form.append('file', file);
+    return api.post<BusinessProfile>('/profile/logo', form, {
+      headers: { 'Content-Type': 'multipart/form-data' },
+    });
+  },
+  deleteLogo: () => api.delete<BusinessProfile>('/profile/logo'),
 };
 
 // Invoice API
 export const invoiceApi = {
-  list: () => api.get<InvoiceListItem[]>('/invoices'),
+  list: (filters?: InvoiceListFilters) =>
+    api.get<InvoiceListItem[]>('/invoices', { params: filters }),
+  changes: (since: number) =>
+    api.get<InvoiceChanges>('/invoices/changes', { params: { since } }),
+  stats: () => api.get<InvoiceStats>('/invoices/stats'),
+  search: (q: string, limit?: number) =>
+    api.get<InvoiceListItem[]>('/invoices/search', { params: { q, limit } }),
   get: (id: number) => api.get<Invoice>(`/invoices/${id}`),
   create: (data: {
     client_name: string;
@@ -133,6 +251,7 @@ export const invoiceApi = {
     job_address: string;
     trade_type: TradeType;
     tax_rate: number;
+    due_date?: string | null;
     line_items: Array<{
       description: string;
       quantity: number;
@@ -146,14 +265,38 @@ export const invoiceApi = {
     job_address: string;
     trade_type: TradeType;
     tax_rate: number;
+    due_date?: string | null;
     line_items: Array<{
+      id?: number;
       description: string;
       quantity: number;
       unit_price: number;
       category: LineItemCategory;
     }>;
+    version?: number;
   }) => api.put<Invoice>(`/invoices/${id}`, data),
+  bulkUpdateStatus: (ids: number[], status: InvoiceStatus) =>
+    api.patch<{ status: InvoiceStatus; updated: number[]; skipped: number[] }>(
+      '/invoices/status',
+      { ids, status }
+    ),
   updateStatus: (id: number, status: InvoiceStatus) =>
     api.patch<Invoice>(`/invoices/${id}/status`, { status }),
   send: (id: number) => api.post<Invoice>(`/invoices/${id}/send`),
+  clone: (id: number, overrides: {
+    client_name?: string;
+    client_email?: string;
+    job_address?: string;
+  } = {}) => api.post<Invoice>(`/invoices/${id}/clone`, overrides),
+  delete: (id: number) => api.delete(`/invoices/${id}`),
+};
+
+export const clientApi = {
+  list: (prefix?: string, limit?: number) =>
+    api.get<Client[]>('/clients', { params: { prefix, limit } }),
+};
+
+export const catalogApi = {
+  suggest: (prefix: string, category?: LineItemCategory) =>
+    api.get<CatalogSuggestion[]>('/catalog/suggest', { params: { prefix, category } }),
 };
@@ -1,7 +1,9 @@
 import { useState } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { useInvoiceStore } from '../stores/invoiceStore';
-import { TradeType, LineItemCategory } from '../lib/api';
+import CatalogInput from '../components/CatalogInput';
+import ClientInput from '../components/ClientInput';
+import { TradeType, LineItemCategory, CatalogSuggestion } from '../lib/api';
 import { format } from '../lib/utils';
 
 interface LineItemInput {
@@ -36,6 +38,7 @@ export default function InvoiceCreatePage() {
   const [clientEmail, setClientEmail] = useState('');
   const [jobAddress, setJobAddress] = useState('');
   const [taxRate, setTaxRate] = useState('8.25');
+  const [dueDate, setDueDate] = useState('');
   const [parts, setParts] = useState<LineItemInput[]>([EMPTY_LINE_ITEM('parts')]);
   const [labor, setLabor] = useState<LineItemInput[]>([EMPTY_LINE_ITEM('labor')]);
 
@@ -66,6 +69,21 @@ export default function InvoiceCreatePage() {
     );
   };
 
+  const pickSuggestion = (
+    items: LineItemInput[],
+    setItems: (items: LineItemInput[]) => void,
+    id: string,
+    suggestion: CatalogSuggestion
+  ) => {
+    setItems(
+      items.map((item) =>
+        item.id === id
+          ? { ...item, description: suggestion.description, unit_price: String(suggestion.unit_price) }
+          : item
+      )
+    );
+  };
+
   const addLineItem = (category: LineItemCategory) => {
     if (category === 'parts') {
       setParts([...parts, EMPTY_LINE_ITEM('parts')]);
@@ -138,6 +156,7 @@ export default function InvoiceCreatePage() {
         job_address: jobAddress,
         trade_type: tradeType,
         tax_rate: parseFloat(taxRate) || 0,
+        due_date: dueDate || null,
         line_items: lineItems,
       });
 
@@ -239,12 +258,14 @@ export default function InvoiceCreatePage() {
                 <label className="block text-sm font-medium text-gray-700 mb-1">
                   Client Name *
                 </label>
-                <input
-                  type="text"
+                <ClientInput
                   value={clientName}
-                  onChange={(e) => setClientName(e.target.value)}
-                  className="w-full px-3 py-2 border border-gray-300 rounded-md focus:outline-none focus:ring-2 focus:ring-blue-500"
-                  placeholder="John Smith"
+                  onChange={setClientName}
+                  onPick={(client) => {
+                    setClientName(client.name);
+                    setClientEmail(client.email);
+                    setJobAddress(client.address);
+                  }}
                 />
               </div>
               <div>
@@ -285,6 +306,18 @@ export default function InvoiceCreatePage() {
                   className="w-full px-3 py-2 border border-gray-300 rounded-md focus:outline-none focus:ring-2 focus:ring-blue-500"
                 />
               </div>
+              <div>
+                <label className="block text-sm font-medium text-gray-700 mb-1">
+                  Due Date
+                </label>
+                <input
+                  type="date"
+                  value={dueDate}
+                  onChange={(e) => setDueDate(e.target.value)}
+                  className="w-full px-3 py-2 border border-gray-300 rounded-md focus:outline-none focus:ring-2 focus:ring-blue-500"
+                />
+                <p className="mt-1 text-xs text-gray-500">Leave empty to use your payment terms when sent</p>
+              </div>
             </div>
             <div className="flex gap-3">
               <button
@@ -317,14 +350,12 @@ export default function InvoiceCreatePage() {
               <div className="space-y-3">
                 {parts.map((part) => (
                   <div key={part.id} className="space-y-2 p-2 bg-gray-50 rounded">
-                    <input
-                      type="text"
+                    <CatalogInput
                       value={part.description}
-                      onChange={(e) =>
-                        updateLineItem(parts, setParts, part.id, 'description', e.target.value)
-                      }
+                      category="parts"
+                      onChange={(value) => updateLineItem(parts, setParts, part.id, 'description', value)}
+                      onPick={(suggestion) => pickSuggestion(parts, setParts, part.id, suggestion)}
                       placeholder="Part description"
-                      className="w-full px-2 py-1.5 text-sm border border-gray-300 rounded"
                     />
                     <div className="flex gap-2">
                       <input
@@ -379,14 +410,12 @@ export default function InvoiceCreatePage() {
               <div className="space-y-3">
                 {labor.map((item) => (
                   <div key={item.id} className="space-y-2 p-2 bg-gray-50 rounded">
-                    <input
-                      type="text"
+                    <CatalogInput
                       value={item.description}
-                      onChange={(e) =>
-                        updateLineItem(labor, setLabor, item.id, 'description', e.target.value)
-                      }
+                      category="labor"
+                      onChange={(value) => updateLineItem(labor, setLabor, item.id, 'description', value)}
+                      onPick={(suggestion) => pickSuggestion(labor, setLabor, item.id, suggestion)}
                       placeholder="Labor description"
-                      className="w-full px-2 py-1.5 text-sm border border-gray-300 rounded"
                     />
                     <div className="flex gap-2">
                       <input
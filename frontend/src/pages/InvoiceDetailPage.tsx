@@ -12,6 +12,7 @@ export default function InvoiceDetailPage() {
     fetchInvoice,
     updateStatus,
     sendInvoice,
+    cloneInvoice,
     isLoading,
     error,
     clearError,
@@ -39,6 +40,17 @@ export default function InvoiceDetailPage() {
     }
   };
 
+  const handleDuplicate = async () => {
+    if (!id) return;
+    clearError();
+    try {
+      const copy = await cloneInvoice(parseInt(id, 10));
+      navigate(`/invoices/${copy.id}/edit`);
+    } catch {
+      // Error handled by store
+    }
+  };
+
   const handleResend = async () => {
     if (!id) return;
     clearError();
@@ -115,7 +127,13 @@ export default function InvoiceDetailPage() {
             </button>
             <div>
               <h1 className="text-lg font-bold text-gray-900">Invoice #{currentInvoice.id}</h1>
-              <p className="text-xs text-gray-500">{format.date(currentInvoice.created_at)}</p>
+              <p className="text-xs text-gray-500">
+                {format.date(currentInvoice.created_at)}
+                {currentInvoice.due_date && (
+                  // Dates without a time parse as UTC; read this one as local
+                  <> &middot; Due {format.date(`${currentInvoice.due_date}T00:00:00`)}</>
+                )}
+              </p>
             </div>
           </div>
           <div className="relative">
@@ -296,6 +314,14 @@ export default function InvoiceDetailPage() {
             </button>
           </div>
         )}
+
+        <button
+          onClick={handleDuplicate}
+          disabled={isLoading}
+          className="mt-3 w-full py-3 px-4 bg-white border-2 border-gray-300 text-gray-700 font-medium rounded-md hover:bg-gray-50 disabled:opacity-50"
+        >
+          Duplicate Invoice
+        </button>
       </main>
     </div>
   );
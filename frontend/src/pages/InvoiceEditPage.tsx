@@ -1,11 +1,13 @@
 import { useEffect, useState } from 'react';
 import { useNavigate, useParams } from 'react-router-dom';
 import { useInvoiceStore } from '../stores/invoiceStore';
-import { TradeType, LineItemCategory, LineItem } from '../lib/api';
+import CatalogInput from '../components/CatalogInput';
+import { TradeType, LineItemCategory, LineItem, CatalogSuggestion } from '../lib/api';
 import { format } from '../lib/utils';
 
 interface LineItemInput {
   id: string;
+  lineItemId?: number;
   description: string;
   quantity: string;
   unit_price: string;
@@ -28,6 +30,7 @@ const EMPTY_LINE_ITEM = (category: LineItemCategory): LineItemInput => ({
 
 const lineItemToInput = (item: LineItem): LineItemInput => ({
   id: Math.random().toString(36).substr(2, 9),
+  lineItemId: item.id,
   description: item.description,
   quantity: item.quantity.toString(),
   unit_price: item.unit_price.toString(),
@@ -44,6 +47,7 @@ export default function InvoiceEditPage() {
   const [clientEmail, setClientEmail] = useState('');
   const [jobAddress, setJobAddress] = useState('');
   const [taxRate, setTaxRate] = useState('8.25');
+  const [dueDate, setDueDate] = useState('');
   const [parts, setParts] = useState<LineItemInput[]>([EMPTY_LINE_ITEM('parts')]);
   const [labor, setLabor] = useState<LineItemInput[]>([EMPTY_LINE_ITEM('labor')]);
 
@@ -60,6 +64,7 @@ export default function InvoiceEditPage() {
       setClientEmail(currentInvoice.client_email);
       setJobAddress(currentInvoice.job_address);
       setTaxRate(currentInvoice.tax_rate.toString());
+      setDueDate(currentInvoice.due_date ?? '');
       
       const existingParts = currentInvoice.line_items
         .filter((item) => item.category === 'parts')
@@ -100,6 +105,21 @@ export default function InvoiceEditPage() {
     );
   };
 
+  const pickSuggestion = (
+    items: LineItemInput[],
+    setItems: (items: LineItemInput[]) => void,
+    itemId: string,
+    suggestion: CatalogSuggestion
+  ) => {
+    setItems(
+      items.map((item) =>
+        item.id === itemId
+          ? { ...item, description: suggestion.description, unit_price: String(suggestion.unit_price) }
+          : item
+      )
+    );
+  };
+
   const addLineItem = (category: LineItemCategory) => {
     if (category === 'parts') {
       setParts([...parts, EMPTY_LINE_ITEM('parts')]);
@@ -128,6 +148,7 @@ export default function InvoiceEditPage() {
     );
 
     const lineItems = [...validParts, ...validLabor].map((item) => ({
+      id: item.lineItemId,
       description: item.description,
       quantity: parseFloat(item.quantity) || 1,
       unit_price: parseFloat(item.unit_price),
@@ -141,7 +162,9 @@ export default function InvoiceEditPage() {
         job_address: jobAddress,
         trade_type: tradeType,
         tax_rate: parseFloat(taxRate) || 0,
+        due_date: dueDate || null,
         line_items: lineItems,
+        version: currentInvoice?.version,
       });
       navigate(`/invoices/${id}`);
     } catch {
@@ -265,6 +288,17 @@ export default function InvoiceEditPage() {
                 className="w-full px-3 py-2 border border-gray-300 rounded-md focus:outline-none focus:ring-2 focus:ring-blue-500"
               />
             </div>
+            <div>
+              <label className="block text-sm font-medium text-gray-700 mb-1">
+                Due Date
+              </label>
+              <input
+                type="date"
+                value={dueDate}
+                onChange={(e) => setDueDate(e.target.value)}
+                className="w-full px-3 py-2 border border-gray-300 rounded-md focus:outline-none focus:ring-2 focus:ring-blue-500"
+              />
+            </div>
           </div>
         </div>
 
@@ -276,14 +310,12 @@ export default function InvoiceEditPage() {
           <div className="space-y-3">
             {parts.map((part) => (
               <div key={part.id} className="space-y-2 p-2 bg-gray-50 rounded">
-                <input
-                  type="text"
+                <CatalogInput
                   value={part.description}
-                  onChange={(e) =>
-                    updateLineItem(parts, setParts, part.id, 'description', e.target.value)
-                  }
+                  category="parts"
+                  onChange={(value) => updateLineItem(parts, setParts, part.id, 'description', value)}
+                  onPick={(suggestion) => pickSuggestion(parts, setParts, part.id, suggestion)}
                   placeholder="Part description"
-                  className="w-full px-2 py-1.5 text-sm border border-gray-300 rounded"
                 />
                 <div className="flex gap-2">
                   <input
@@ -338,14 +370,12 @@ export default function InvoiceEditPage() {
           <div className="space-y-3">
             {labor.map((item) => (
               <div key={item.id} className="space-y-2 p-2 bg-gray-50 rounded">
-                <input
-                  type="text"
+                <CatalogInput
                   value={item.description}
-                  onChange={(e) =>
-                    updateLineItem(labor, setLabor, item.id, 'description', e.target.value)
-                  }
+                  category="labor"
+                  onChange={(value) => updateLineItem(labor, setLabor, item.id, 'description', value)}
+                  onPick={(suggestion) => pickSuggestion(labor, setLabor, item.id, suggestion)}
                   placeholder="Labor description"
-                  className="w-full px-2 py-1.5 text-sm border border-gray-300 rounded"
                 />
                 <div className="flex gap-2">
                   <input
@@ -1,6 +1,7 @@
 import { create } from 'zustand';
 import { persist } from 'zustand/middleware';
 import { authApi, profileApi, User, BusinessProfile } from '../lib/api';
+import { useInvoiceStore } from './invoiceStore';
 
 interface AuthState {
   token: string | null;
@@ -42,8 +43,11 @@ export const useAuthStore = create<AuthState>()(
         set({ isLoading: true, error: null });
         try {
           const response = await authApi.login(email, password);
-          const { access_token } = response.data;
+          const { access_token, refresh_token } = response.data;
           localStorage.setItem('token', access_token);
+          if (refresh_token) {
+            localStorage.setItem('refresh_token', refresh_token);
+          }
           set({ token: access_token, isLoading: false });
           
           // Try to fetch profile after login
@@ -74,8 +78,17 @@ export const useAuthStore = create<AuthState>()(
       },
 
       logout: () => {
+        const accessToken = localStorage.getItem('token');
+        if (accessToken) {
+          authApi.logout(accessToken, localStorage.getItem('refresh_token')).catch(() => {
+            // Tokens expire on their own; nothing more to do
+          });
+        }
         localStorage.removeItem('token');
+        localStorage.removeItem('refresh_token');
         set({ token: null, user: null, profile: null, error: null });
+        // Synced invoices belong to this user; the next one starts from scratch
+        useInvoiceStore.getState().reset();
       },
 
       fetchProfile: async () => {
@@ -3,6 +3,7 @@ import { invoiceApi, Invoice, InvoiceListItem, InvoiceStatus, TradeType, LineIte
 
 interface InvoiceState {
   invoices: InvoiceListItem[];
+  syncToken: number; // Change token of the last sync; 0 until the first one
   currentInvoice: Invoice | null;
   isLoading: boolean;
   error: string | null;
@@ -16,6 +17,7 @@ interface InvoiceState {
     job_address: string;
     trade_type: TradeType;
     tax_rate: number;
+    due_date?: string | null;
     line_items: Array<{
       description: string;
       quantity: number;
@@ -29,21 +31,31 @@ interface InvoiceState {
     job_address: string;
     trade_type: TradeType;
     tax_rate: number;
+    due_date?: string | null;
     line_items: Array<{
+      id?: number;
       description: string;
       quantity: number;
       unit_price: number;
       category: LineItemCategory;
     }>;
+    version?: number;
   }) => Promise<Invoice>;
   updateStatus: (id: number, status: InvoiceStatus) => Promise<void>;
   sendInvoice: (id: number) => Promise<void>;
+  cloneInvoice: (id: number) => Promise<Invoice>;
+  deleteInvoice: (id: number) => Promise<void>;
   clearError: () => void;
   clearCurrentInvoice: () => void;
+  reset: () => void;
 }
 
-export const useInvoiceStore = create<InvoiceState>((set) => ({
+const newestFirst = (a: InvoiceListItem, b: InvoiceListItem) =>
+  b.created_at.localeCompare(a.created_at) || b.id - a.id;
+
+export const useInvoiceStore = create<InvoiceState>((set, get) => ({
   invoices: [],
+  syncToken: 0,
   currentInvoice: null,
   isLoading: false,
   error: null,
@@ -51,8 +63,19 @@ export const useInvoiceStore = create<InvoiceState>((set) => ({
   fetchInvoices: async () => {
     set({ isLoading: true, error: null });
     try {
-      const response = await invoiceApi.list();
-      set({ invoices: response.data, isLoading: false });
+      // Only what changed since the last sync is downloaded and merged in
+      const { data } = await invoiceApi.changes(get().syncToken);
+      set((state) => {
+        const gone = new Set([...data.deleted, ...data.invoices.map((inv) => inv.id)]);
+        return {
+          invoices: [
+            ...state.invoices.filter((inv) => !gone.has(inv.id)),
+            ...data.invoices,
+          ].sort(newestFirst),
+          syncToken: data.token,
+          isLoading: false,
+        };
+      });
     } catch (error: unknown) {
       const message = error instanceof Error ? error.message : 'Failed to fetch invoices';
       set({ error: message, isLoading: false });
@@ -98,6 +121,32 @@ export const useInvoiceStore = create<InvoiceState>((set) => ({
     }
   },
 
+  cloneInvoice: async (id) => {
+    set({ isLoading: true, error: null });
+    try {
+      const response = await invoiceApi.clone(id);
+      const newInvoice = response.data;
+      set((state) => ({
+        invoices: [{
+          id: newInvoice.id,
+          client_name: newInvoice.client_name,
+          job_address: newInvoice.job_address,
+          trade_type: newInvoice.trade_type,
+          status: newInvoice.status,
+          total: newInvoice.totals.total,
+          created_at: newInvoice.created_at,
+        }, ...state.invoices],
+        currentInvoice: newInvoice,
+        isLoading: false,
+      }));
+      return newInvoice;
+    } catch (error: unknown) {
+      const message = error instanceof Error ? error.message : 'Failed to duplicate invoice';
+      set({ error: message, isLoading: false });
+      throw error;
+    }
+  },
+
   updateInvoice: async (id, data) => {
     set({ isLoading: true, error: null });
     try {
@@ -167,6 +216,23 @@ export const useInvoiceStore = create<InvoiceState>((set) => ({
     }
   },
 
+  deleteInvoice: async (id) => {
+    set({ isLoading: true, error: null });
+    try {
+      await invoiceApi.delete(id);
+      set((state) => ({
+        invoices: state.invoices.filter((inv) => inv.id !== id),
+        currentInvoice: state.currentInvoice?.id === id ? null : state.currentInvoice,
+        isLoading: false,
+      }));
+    } catch (error: unknown) {
+      const message = error instanceof Error ? error.message : 'Failed to delete invoice';
+      set({ error: message, isLoading: false });
+      throw error;
+    }
+  },
+
   clearError: () => set({ error: null }),
   clearCurrentInvoice: () => set({ currentInvoice: null }),
+  reset: () => set({ invoices: [], syncToken: 0, currentInvoice: null, error: null }),
 }));